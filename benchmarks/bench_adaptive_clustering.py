@@ -0,0 +1,62 @@
+"""
+Benchmark: clustering methods (rotor_analysis/clustering.py, adaptive.py).
+
+The synthetic catalog of bench_clustering.py (N rotors, diameters 250-400
+mm) is loaded once with load_rotor_columns(), then clustered with:
+- binning: build_clusters_columnar() (the numpy engine)
+- dbscan:  build_clusters_dbscan(), default eps / min_samples
+- kmeans:  build_clusters_kmeans(), default k / batches
+and each method's build time, cluster count, largest cluster and rotors
+left out (incomplete, or DBSCAN noise) are printed. The catalog is uniform,
+so every rotor has neighbours: the DBSCAN time is near its worst case for
+the density, a real catalog is mostly dense cubes.
+
+Usage:
+    python benchmarks/bench_adaptive_clustering.py [rows ...]    (default: 10000 100000 1000000)
+"""
+
+import os
+import sys
+import tempfile
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from rotor_analysis.adaptive import build_clusters_dbscan, build_clusters_kmeans
+from rotor_analysis.columnar import build_clusters_columnar, load_rotor_columns
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+from bench_batch_insert import new_db
+from bench_clustering import fill_db
+
+METHODS = {
+    "binning": build_clusters_columnar,
+    "dbscan": build_clusters_dbscan,
+    "kmeans": build_clusters_kmeans,
+}
+
+
+def main(sizes: list) -> None:
+    print(f"{'Rotors':>8} {'Method':<8} {'Build s':>8} {'Clusters':>9} {'Largest':>8} "
+          f"{'Left out':>9}")
+    with tempfile.TemporaryDirectory() as directory:
+        for rows in sizes:
+            db_path = new_db(directory)
+            fill_db(db_path, rows)
+            start = time.perf_counter()
+            columns = load_rotor_columns(db_path)
+            print(f"{rows:>8} {'(load)':<8} {time.perf_counter() - start:>8.2f}")
+            for method, build in METHODS.items():
+                start = time.perf_counter()
+                clusters = build(columns)
+                build_s = time.perf_counter() - start
+                counts = [cluster["count"] for cluster in clusters.values()]
+                print(f"{rows:>8} {method:<8} {build_s:>8.2f} {len(counts):>9} "
+                      f"{max(counts, default=0):>8} {rows - sum(counts):>9}")
+            del columns
+            os.remove(db_path)
+
+
+if __name__ == "__main__":
+    main([int(arg) for arg in sys.argv[1:]] or [10000, 100000, 1000000])
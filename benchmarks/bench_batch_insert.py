@@ -0,0 +1,113 @@
+"""
+Benchmark: batched executemany() inserts (database/batch_writer.py) vs the
+previous per-record inserts.
+
+A synthetic rotor JSONL file is generated and loaded into a fresh database
+(database/init.sql) with:
+- per-row:  the previous ingest_jsonl() loop - SQL string built from the
+            record keys and one conn.execute() per record, single commit
+- batched:  ingest_jsonl() through BatchWriter, for several commit
+            intervals (rows per transaction)
+Row counts are checked after each load. The per-row baseline writes only the
+record columns; the batched loads also compute content_hash and write the
+change-tracking columns (database/batch_writer.py).
+
+Usage:
+    python benchmarks/bench_batch_insert.py [rows] [batch_size]
+"""
+
+import json
+import os
+import sqlite3
+import sys
+import tempfile
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from database import ingest_pipeline
+from database.batch_writer import DEFAULT_BATCH_SIZE
+
+COMMIT_INTERVALS = [None, 50000, 5000, 500]
+
+
+def write_jsonl(path: str, rows: int) -> None:
+    with open(path, "w", encoding="utf-8") as f:
+        for i in range(rows):
+            record = {
+                "outer_diameter_mm": 250.0 + i % 150, "nominal_thickness_mm": 20.0 + i % 15,
+                "hat_height_mm": 40.0 + i % 20, "overall_height_mm": 50.0 + i % 20,
+                "center_bore_mm": 57.1 + i % 12, "bolt_circle_mm": 100.0 + i % 30,
+                "bolt_hole_count": 4 + i % 3, "ventilation_type": "vented",
+                "directionality": "non_directional", "brand": f"BRAND{i % 40}",
+                "catalog_ref": f"REF{i:08d}",
+            }
+            if i % 3 == 0:
+                record["offset_mm"] = 35.0 + i % 10
+            f.write(json.dumps(record) + "\n")
+
+
+def new_db(directory: str) -> str:
+    fd, path = tempfile.mkstemp(suffix=".db", dir=directory)
+    os.close(fd)
+    conn = sqlite3.connect(path)
+    with open(os.path.join(ROOT, "database", "init.sql"), encoding="utf-8") as f:
+        conn.executescript(f.read())
+    conn.close()
+    return path
+
+
+def per_row_load(db_path: str, jsonl: str) -> None:
+    """Previous ingest_jsonl(): one execute() per record, one commit."""
+    conn = sqlite3.connect(db_path)
+    with open(jsonl, "r", encoding="utf-8") as f:
+        for line in f:
+            rotor = json.loads(line)
+            fields = ",".join(rotor.keys())
+            placeholders = ",".join(["?"] * len(rotor))
+            conn.execute(f"INSERT INTO rotors ({fields}) VALUES ({placeholders})", list(rotor.values()))
+    conn.commit()
+    conn.close()
+
+
+def batched_load(db_path: str, jsonl: str, batch_size: int, commit_interval) -> None:
+    saved = ingest_pipeline.DB_PATH
+    ingest_pipeline.DB_PATH = db_path
+    try:
+        ingest_pipeline.ingest_jsonl(jsonl, "rotors", batch_size=batch_size,
+                                     commit_interval=commit_interval)
+    finally:
+        ingest_pipeline.DB_PATH = saved
+
+
+def timed_load(directory: str, load, rows: int) -> float:
+    db_path = new_db(directory)
+    start = time.perf_counter()
+    load(db_path)
+    elapsed = time.perf_counter() - start
+    conn = sqlite3.connect(db_path)
+    assert conn.execute("SELECT COUNT(*) FROM rotors").fetchone()[0] == rows
+    conn.close()
+    os.remove(db_path)
+    return elapsed
+
+
+def main(rows: int = 200000, batch_size: int = DEFAULT_BATCH_SIZE) -> None:
+    with tempfile.TemporaryDirectory() as directory:
+        jsonl = os.path.join(directory, "rotors.jsonl")
+        write_jsonl(jsonl, rows)
+        print(f"{rows} rows, {os.path.getsize(jsonl) / 1e6:.1f} MB JSONL, batch_size={batch_size}")
+        print(f"{'Mode':<34} {'Seconds':>8} {'Rows/s':>10} {'Speedup':>8}")
+
+        base = timed_load(directory, lambda db: per_row_load(db, jsonl), rows)
+        print(f"{'per-row execute, single commit':<34} {base:>8.2f} {rows / base:>10.0f} {1.0:>7.2f}x")
+        for interval in COMMIT_INTERVALS:
+            label = f"batched, commit every {interval}" if interval else "batched, single commit"
+            elapsed = timed_load(directory, lambda db: batched_load(db, jsonl, batch_size, interval), rows)
+            print(f"{label:<34} {elapsed:>8.2f} {rows / elapsed:>10.0f} {base / elapsed:>7.2f}x")
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 200000,
+         int(sys.argv[2]) if len(sys.argv) > 2 else DEFAULT_BATCH_SIZE)
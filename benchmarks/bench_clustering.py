@@ -0,0 +1,125 @@
+"""
+Benchmark: rotor clustering engines (rotor_analysis/clustering.py).
+
+A synthetic catalog of N rotors (diameters 250-400 mm, a third with an
+explicit offset, the rest derived from the heights) is written to a fresh
+database, then clustered with:
+- list:   load_rotors_from_db() + build_clusters() (every column of every
+          rotor as a dict, the loader before streaming)
+- python: build_clusters(iter_rotors()) (streamed, CLUSTER_COLUMNS only;
+          loading is folded into the build time)
+- numpy:  load_rotor_columns() + build_clusters_columnar() (streamed chunks
+          into arrays)
+Each engine runs in a fresh process, which reports its load, build and
+JSON times and its peak RSS; the engines' JSON output is compared.
+
+Usage:
+    python benchmarks/bench_clustering.py [rows ...]    (default: 10000 100000 1000000)
+"""
+
+import hashlib
+import json
+import multiprocessing
+import os
+import random
+import resource
+import sqlite3
+import sys
+import tempfile
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from rotor_analysis.clustering import (
+    CLUSTER_COLUMNS,
+    build_clusters,
+    clusters_to_json_serializable,
+    iter_rotors,
+    load_rotors_from_db,
+)
+from rotor_analysis.columnar import build_clusters_columnar, load_rotor_columns
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+from bench_batch_insert import new_db
+
+INSERT_SQL = """
+    INSERT INTO rotors (outer_diameter_mm, nominal_thickness_mm, hat_height_mm,
+                        overall_height_mm, center_bore_mm, bolt_circle_mm, bolt_hole_count,
+                        ventilation_type, directionality, offset_mm, brand, catalog_ref)
+    VALUES (?, ?, ?, ?, 66.6, 112.0, 5, 'vented', 'non_directional', ?, ?, ?)
+"""
+
+
+def synthetic_rows(rows: int, seed: int = 42):
+    rnd = random.Random(seed)
+    for i in range(rows):
+        hat = round(rnd.uniform(5.0, 60.0), 1)
+        yield (round(rnd.uniform(250.0, 400.0), 1), round(rnd.uniform(18.0, 36.0), 1), hat,
+               round(hat + rnd.uniform(-5.0, 15.0), 1),
+               round(rnd.uniform(10.0, 60.0), 1) if i % 3 == 0 else None,
+               f"BRAND{i % 40}", f"REF{i:08d}")
+
+
+def fill_db(db_path: str, rows: int) -> None:
+    conn = sqlite3.connect(db_path)
+    conn.executemany(INSERT_SQL, synthetic_rows(rows))
+    conn.commit()
+    conn.close()
+
+
+def timed(fn, *args):
+    start = time.perf_counter()
+    result = fn(*args)
+    return time.perf_counter() - start, result
+
+
+def run(db_path: str, engine: str) -> tuple:
+    if engine == "numpy":
+        load_s, rotors = timed(load_rotor_columns, db_path)
+        build_s, clusters = timed(build_clusters_columnar, rotors)
+    elif engine == "list":
+        load_s, rotors = timed(load_rotors_from_db, db_path)
+        build_s, clusters = timed(build_clusters, rotors)
+    else:
+        load_s, rotors = 0.0, None
+        build_s, clusters = timed(build_clusters, iter_rotors(db_path, CLUSTER_COLUMNS))
+    del rotors
+    json_s, data = timed(clusters_to_json_serializable, clusters)
+    return load_s, build_s, json_s, data
+
+
+def run_isolated(db_path: str, engine: str, results) -> None:
+    """run() in a child process: times, cluster count, JSON digest, peak RSS (MiB)."""
+    load_s, build_s, json_s, data = run(db_path, engine)
+    digest = hashlib.sha256(json.dumps(data).encode()).hexdigest()
+    peak_mib = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+    results.put((load_s, build_s, json_s, data["meta"]["cluster_count"], digest, peak_mib))
+
+
+def main(sizes: list) -> None:
+    context = multiprocessing.get_context("spawn")
+    print(f"{'Rotors':>8} {'Engine':<7} {'Load s':>7} {'Build s':>8} {'JSON s':>7} "
+          f"{'Total s':>8} {'Speedup':>8} {'Peak MiB':>9} {'Clusters':>9}")
+    with tempfile.TemporaryDirectory() as directory:
+        for rows in sizes:
+            db_path = new_db(directory)
+            fill_db(db_path, rows)
+            totals = {}
+            digests = {}
+            for engine in ("list", "python", "numpy"):
+                results = context.Queue()
+                child = context.Process(target=run_isolated, args=(db_path, engine, results))
+                child.start()
+                load_s, build_s, json_s, clusters, digests[engine], peak_mib = results.get()
+                child.join()
+                totals[engine] = load_s + build_s + json_s
+                speedup = totals["list"] / totals[engine]
+                print(f"{rows:>8} {engine:<7} {load_s:>7.2f} {build_s:>8.2f} {json_s:>7.2f} "
+                      f"{totals[engine]:>8.2f} {speedup:>7.2f}x {peak_mib:>9.0f} {clusters:>9}")
+            assert len(set(digests.values())) == 1, "engines returned different clusters"
+            os.remove(db_path)
+
+
+if __name__ == "__main__":
+    main([int(arg) for arg in sys.argv[1:]] or [10000, 100000, 1000000])
@@ -0,0 +1,75 @@
+"""
+Benchmark: HTML parser backends for the product page parsers
+(data_scraper/spec_extract.py).
+
+For each page (the DBA fixture and synthetic product pages of growing size,
+see bench_label_dispatch.synthetic_page) parse_dba_rotor_page() and
+parse_ebc_pad_page() are timed with:
+- html.parser building the full document tree (previous behaviour)
+- each installed backend (html.parser, lxml, selectolax), with the tree
+  restricted to the spec elements (SPEC_FILTER)
+Records must be identical to the full-tree html.parser run.
+
+Usage:
+    python benchmarks/bench_html_backend.py [repeat]
+"""
+
+import os
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from benchmarks.bench_label_dispatch import PAGE_SIZES, synthetic_page
+from data_scraper import spec_extract
+from data_scraper.html_scraper import parse_dba_rotor_page, parse_ebc_pad_page
+
+PARSERS = [parse_dba_rotor_page, parse_ebc_pad_page]
+
+
+def load_pages() -> list:
+    with open(os.path.join(ROOT, "tests", "fixtures", "product_pages", "dba_rotor_01.html"),
+              encoding="utf-8") as f:
+        pages = [("fixture", f.read())]
+    for rows, noise in PAGE_SIZES:
+        html = synthetic_page(rows, noise)
+        pages.append((f"{len(html) // 1024} KB", html))
+    return pages
+
+
+def run(html: str, repeat: int) -> tuple:
+    records = [parse(html) for parse in PARSERS]
+    start = time.perf_counter()
+    for _ in range(repeat):
+        for parse in PARSERS:
+            parse(html)
+    return (time.perf_counter() - start) / repeat, records
+
+
+def main(repeat: int = 5) -> None:
+    backends = [b for b in spec_extract.HTML_BACKENDS if spec_extract.backend_available(b)]
+    print(f"Backends installed: {', '.join(backends)}; repeat={repeat}")
+    print(f"{'Page':>10} {'Backend':<22} {'ms/page':>9} {'Speedup':>8}")
+
+    strainer = spec_extract.SPEC_FILTER
+    try:
+        for label, html in load_pages():
+            spec_extract.set_html_backend("html.parser")
+            spec_extract.SPEC_FILTER = None
+            base_s, base_records = run(html, repeat)
+            spec_extract.SPEC_FILTER = strainer
+            print(f"{label:>10} {'html.parser full tree':<22} {base_s * 1000:>9.2f} {1.0:>7.2f}x")
+
+            for backend in backends:
+                spec_extract.set_html_backend(backend)
+                elapsed, records = run(html, repeat)
+                assert records == base_records, f"{backend}: records differ on {label}"
+                print(f"{label:>10} {backend:<22} {elapsed * 1000:>9.2f} {base_s / elapsed:>7.2f}x")
+    finally:
+        spec_extract.SPEC_FILTER = strainer
+        spec_extract.set_html_backend(spec_extract.DEFAULT_HTML_BACKEND)
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 5)
@@ -0,0 +1,86 @@
+"""
+Benchmark: per-page latency with fresh connections vs the shared pooled session.
+
+Serves tests/fixtures from a local stand-in HTTP server and fetches the same
+catalog page N times:
+- urlopen: new connection per request (previous probe_url/download_real_html)
+- requests.get: new connection per request (previous fetch_html)
+- pooled: data_scraper.http_client shared keep-alive session
+
+Localhost has no real handshake cost, so the run is repeated with a simulated
+connection setup delay (CONNECT_DELAY_MS, roughly one TLS handshake to a
+remote catalog host).
+
+Usage:
+    python benchmarks/bench_http_pool.py [requests]
+"""
+
+import os
+import statistics
+import sys
+import time
+import urllib.request
+
+import requests
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from data_scraper import http_client
+from tests.local_server import LocalServer
+
+
+def time_requests(fetch, url: str, count: int) -> list:
+    timings = []
+    for _ in range(count):
+        start = time.perf_counter()
+        fetch(url)
+        timings.append((time.perf_counter() - start) * 1000)
+    return timings
+
+
+def fetch_fresh(url: str) -> bytes:
+    req = urllib.request.Request(url, headers={"User-Agent": http_client.USER_AGENT})
+    with urllib.request.urlopen(req, timeout=10) as response:
+        return response.read()
+
+
+def fetch_requests(url: str) -> bytes:
+    return requests.get(url, timeout=10, headers={"User-Agent": http_client.USER_AGENT}).content
+
+
+def fetch_pooled(url: str) -> bytes:
+    return http_client.http_get(url).content
+
+
+CONNECT_DELAY_MS = 20
+
+
+def main(count: int = 200) -> None:
+    fixtures = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+                            "tests", "fixtures")
+    fetchers = [
+        ("urlopen", fetch_fresh),
+        ("requests.get", fetch_requests),
+        ("pooled session", fetch_pooled),
+    ]
+
+    print("="*72)
+    print(f"HTTP POOL BENCHMARK ({count} requests per run, same host)")
+    print("="*72)
+    for connect_delay_ms in (0, CONNECT_DELAY_MS):
+        runs = count if connect_delay_ms == 0 else max(10, count // 10)
+        print(f"\nConnection setup cost: {connect_delay_ms} ms ({runs} requests)")
+        with LocalServer(fixtures, connect_delay=connect_delay_ms / 1000) as server:
+            url = server.url("rotor_lists/autodoc_list_01.html")
+            for name, fetch in fetchers:
+                http_client.close_session()
+                server.connections.clear()
+                timings = time_requests(fetch, url, runs)
+                print(f"  {name:<16} median {statistics.median(timings):7.3f} ms   "
+                      f"mean {statistics.mean(timings):7.3f} ms   "
+                      f"connections {len(server.connections)}")
+    print("="*72)
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 200)
@@ -0,0 +1,88 @@
+"""
+Benchmark: streaming JSONL ingestion (database/jsonl_reader.py +
+ingest_jsonl()).
+
+A synthetic rotor JSONL file (plain and gzip) is generated, then:
+- read:   read_records() alone - json vs orjson decoding, with and without
+          schema validation, serial and with worker processes
+- ingest: ingest_jsonl() into a fresh database for the same variants
+Rows per second are reported; row counts are checked after each load.
+
+Usage:
+    python benchmarks/bench_jsonl_ingest.py [rows] [workers]
+"""
+
+import gzip
+import os
+import shutil
+import sqlite3
+import sys
+import tempfile
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from database import ingest_pipeline, jsonl_reader
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+from bench_batch_insert import new_db, write_jsonl
+
+
+def read_only(path: str, **kwargs) -> float:
+    start = time.perf_counter()
+    count = sum(1 for _, record, _ in jsonl_reader.read_records(path, "rotors", **kwargs)
+                if record is not None)
+    elapsed = time.perf_counter() - start
+    return elapsed, count
+
+
+def ingest(directory: str, path: str, **kwargs) -> float:
+    db_path = new_db(directory)
+    start = time.perf_counter()
+    ingest_pipeline.ingest_jsonl(path, "rotors", db_path=db_path, **kwargs)
+    elapsed = time.perf_counter() - start
+    conn = sqlite3.connect(db_path)
+    count = conn.execute("SELECT COUNT(*) FROM rotors").fetchone()[0]
+    conn.close()
+    os.remove(db_path)
+    return elapsed, count
+
+
+def main(rows: int = 200000, workers: int = 2) -> None:
+    orjson = jsonl_reader.orjson
+    with tempfile.TemporaryDirectory() as directory:
+        plain = os.path.join(directory, "rotors.jsonl")
+        write_jsonl(plain, rows)
+        packed = plain + ".gz"
+        with open(plain, "rb") as src, gzip.open(packed, "wb", compresslevel=6) as dst:
+            shutil.copyfileobj(src, dst)
+        print(f"{rows} rows, {os.path.getsize(plain) / 1e6:.1f} MB "
+              f"({os.path.getsize(packed) / 1e6:.1f} MB gzip), orjson "
+              f"{'installed' if orjson else 'not installed'}")
+
+        variants = [
+            ("json, no validation", plain, dict(validate=False), None),
+            ("json", plain, {}, None),
+            ("orjson", plain, {}, orjson),
+            ("orjson, gzip", packed, {}, orjson),
+            (f"orjson, {workers} workers", plain, dict(workers=workers), orjson),
+        ]
+        print(f"{'Variant':<24} {'Read s':>7} {'Rows/s':>8} {'Ingest s':>9} {'Rows/s':>8}")
+        for name, path, kwargs, decoder in variants:
+            if name.startswith("orjson") and orjson is None:
+                continue
+            jsonl_reader.orjson = decoder
+            try:
+                read_s, read_count = read_only(path, **kwargs)
+                ingest_s, ingest_count = ingest(directory, path, **kwargs)
+            finally:
+                jsonl_reader.orjson = orjson
+            assert read_count == ingest_count == rows
+            print(f"{name:<24} {read_s:>7.2f} {rows / read_s:>8.0f} "
+                  f"{ingest_s:>9.2f} {rows / ingest_s:>8.0f}")
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 200000,
+         int(sys.argv[2]) if len(sys.argv) > 2 else 2)
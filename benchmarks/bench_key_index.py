@@ -0,0 +1,86 @@
+"""
+Benchmark: re-ingesting an unchanged catalog with and without the preloaded
+key index (database/key_index.py).
+
+A synthetic rotor JSONL file is loaded once into a fresh database, then
+loaded again with ingest_jsonl() (every record is a duplicate):
+- none:  every record goes through INSERT ... ON CONFLICT DO NOTHING
+- set:   keys preloaded into a set, duplicates never reach SQLite
+- bloom: keys preloaded into a Bloom filter
+The JSON decoding cost is the same in every mode; a decode-only pass is
+timed for reference, and "Excl. JSON" is the load time minus that pass
+(preload included). Row counts are checked after each load.
+
+Usage:
+    python benchmarks/bench_key_index.py [rows]
+"""
+
+import json
+import os
+import sqlite3
+import sys
+import tempfile
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from database import ingest_pipeline
+from database.key_index import KeyIndex
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+from bench_batch_insert import new_db, write_jsonl
+
+
+def load(db_path: str, jsonl: str, key_index) -> float:
+    saved = ingest_pipeline.DB_PATH
+    ingest_pipeline.DB_PATH = db_path
+    try:
+        start = time.perf_counter()
+        ingest_pipeline.ingest_jsonl(jsonl, "rotors", key_index=key_index)
+        return time.perf_counter() - start
+    finally:
+        ingest_pipeline.DB_PATH = saved
+
+
+def decode_only(jsonl: str) -> float:
+    start = time.perf_counter()
+    with open(jsonl, "r", encoding="utf-8") as f:
+        for line in f:
+            json.loads(line)
+    return time.perf_counter() - start
+
+
+def main(rows: int = 200000) -> None:
+    with tempfile.TemporaryDirectory() as directory:
+        jsonl = os.path.join(directory, "rotors.jsonl")
+        write_jsonl(jsonl, rows)
+        db_path = new_db(directory)
+        first = load(db_path, jsonl, None)
+        print(f"{rows} rows, first load {first:.2f}s; re-ingest of the same file:")
+        decode = decode_only(jsonl)
+        print(f"{'Mode':<8} {'Seconds':>8} {'Excl. JSON':>10} {'Preload s':>10} {'Index MB':>9}")
+        print(f"{'decode':<8} {decode:>8.2f} {'-':>10} {'-':>10} {'-':>9}")
+
+        for mode in (None, "set", "bloom"):
+            conn = sqlite3.connect(db_path)
+            start = time.perf_counter()
+            index = KeyIndex.preload(conn, mode=mode) if mode else None
+            preload = time.perf_counter() - start
+            conn.close()
+            if mode == "set":
+                size = "~%.0f" % (len(index) * 200 / 1e6)
+            elif mode == "bloom":
+                size = "%.1f" % (sum(k.size_bytes for k in index.keys.values()) / 1e6)
+            else:
+                size = "-"
+            elapsed = load(db_path, jsonl, mode)
+            conn = sqlite3.connect(db_path)
+            assert conn.execute("SELECT COUNT(*) FROM rotors").fetchone()[0] == rows
+            conn.close()
+            print(f"{mode or 'none':<8} {elapsed:>8.2f} {elapsed - decode:>10.2f} "
+                  f"{preload if mode else 0:>10.2f} {size:>9}")
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 200000)
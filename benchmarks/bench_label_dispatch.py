@@ -0,0 +1,138 @@
+"""
+Benchmark: single-pass label dispatch (data_scraper/spec_extract.py) vs the
+previous multi-pass product page parsers.
+
+The baseline parsers are loaded from git (data_scraper/html_scraper.py as of
+the commit before spec_extract.py was added, or the revision given on the
+command line). Synthetic product pages of growing size (spec table, dl,
+navigation and related-product noise) are parsed by both implementations:
+
+- extract: time spent after the soup is built (traversals + label matching),
+  measured by handing both parsers the same pre-built tree
+- total:   end-to-end parse time, including html.parser tree building
+  (restricted to the spec elements on the current side, see
+  bench_html_backend.py)
+
+Outputs are compared page by page; the baseline Wheel-Size parser raises on
+any <div>/<span> with a class attribute, so it is reported as n/a.
+
+Usage:
+    python benchmarks/bench_label_dispatch.py [baseline_rev] [repeat]
+"""
+
+import os
+import random
+import subprocess
+import sys
+import time
+import types
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from bs4 import BeautifulSoup
+
+from data_scraper import html_scraper, spec_extract
+
+PARSERS = ["parse_dba_rotor_page", "parse_ebc_pad_page", "parse_wheelsize_vehicle_page"]
+
+# (spec rows, noise elements)
+PAGE_SIZES = [(20, 0), (300, 2000), (2000, 8000)]
+
+LABELS = ["Outer Diameter", "Nominal Thickness", "Hat Height", "Overall Height",
+          "Center Bore", "PCD", "Bolt Holes", "Weight", "Finish", "Material",
+          "Shape Code", "Pad Length", "Make", "Model", "Year From", "Part Number"]
+
+
+def default_baseline() -> str:
+    added = subprocess.run(
+        ["git", "log", "--diff-filter=A", "--format=%H", "--", "data_scraper/spec_extract.py"],
+        cwd=ROOT, capture_output=True, text=True).stdout.split()
+    return f"{added[-1]}^" if added else "HEAD"
+
+
+def load_baseline(rev: str) -> types.ModuleType:
+    source = subprocess.run(
+        ["git", "show", f"{rev}:data_scraper/html_scraper.py"],
+        cwd=ROOT, capture_output=True, text=True, check=True).stdout
+    module = types.ModuleType("baseline_html_scraper")
+    exec(compile(source, f"{rev}:data_scraper/html_scraper.py", "exec"), module.__dict__)
+    return module
+
+
+def synthetic_page(rows: int, noise: int, seed: int = 0) -> str:
+    rnd = random.Random(seed)
+    parts = ["<html><head><title>Rotor</title></head><body><nav>"]
+    parts += [f'<div class="menu-item"><a href="/c/{i}">Category {i}</a></div>'
+              for i in range(noise // 4)]
+    parts.append("</nav><h1>DBA 4000 Series T3 Slotted Rotor DBA42134S</h1>")
+    parts.append('<table class="specifications">')
+    parts += [f"<tr><td>{rnd.choice(LABELS)}</td><td>{rnd.randint(1, 400)}mm</td></tr>"
+              for _ in range(rows)]
+    parts.append("</table><dl>")
+    parts += [f"<dt>Feature {i}</dt><dd>Value {i}</dd>" for i in range(rows // 3)]
+    parts.append('</dl><div class="related">')
+    parts += [f'<div class="product-card"><span class="product-title">Rotor {i}</span>'
+              f'<span class="price">{i}.99</span><p>Desc <b>bold</b> text</p></div>'
+              for i in range(noise // 4)]
+    parts.append("</div></body></html>")
+    return "".join(parts)
+
+
+def timed(fn, repeat: int) -> float:
+    start = time.perf_counter()
+    for _ in range(repeat):
+        fn()
+    return (time.perf_counter() - start) / repeat
+
+
+def measure(module, name: str, html: str, soup, repeat: int, tree_builder: tuple) -> tuple:
+    """
+    Return (extract_s, total_s, result) or None if the parser raises.
+    tree_builder = (module, attribute) building the soup, swapped for the
+    pre-built tree while timing the extraction.
+    """
+    parse = getattr(module, name)
+    try:
+        result = parse(html)
+    except Exception:
+        return None
+    total = timed(lambda: parse(html), repeat)
+    owner, attribute = tree_builder
+    original = getattr(owner, attribute)
+    setattr(owner, attribute, lambda *args, **kwargs: soup)
+    try:
+        extract = timed(lambda: parse(html), repeat)
+    finally:
+        setattr(owner, attribute, original)
+    return extract, total, result
+
+
+def main(baseline_rev: str = None, repeat: int = 5) -> None:
+    baseline_rev = baseline_rev or default_baseline()
+    baseline = load_baseline(baseline_rev)
+    print(f"Baseline: {baseline_rev}, repeat={repeat}")
+    print(f"{'Page KB':>8} {'Parser':<30} {'Extract old/new ms':>20} {'Speedup':>8}"
+          f" {'Total old/new ms':>18} {'Speedup':>8}")
+
+    for rows, noise in PAGE_SIZES:
+        html = synthetic_page(rows, noise)
+        soup = BeautifulSoup(html, "html.parser")
+        for name in PARSERS:
+            new = measure(html_scraper, name, html, soup, repeat, (spec_extract, "make_soup"))
+            old = measure(baseline, name, html, soup, repeat, (baseline, "BeautifulSoup"))
+            size = f"{len(html) / 1024:.0f}"
+            if old is None:
+                print(f"{size:>8} {name:<30} {'n/a':>9} /{new[0] * 1000:>8.2f} {'':>8}"
+                      f" {'n/a':>8} /{new[1] * 1000:>7.1f}   (baseline raises)")
+                continue
+            assert old[2] == new[2], f"{name}: output differs from baseline"
+            print(f"{size:>8} {name:<30} {old[0] * 1000:>9.2f} /{new[0] * 1000:>8.2f}"
+                  f" {old[0] / new[0]:>7.1f}x {old[1] * 1000:>8.1f} /{new[1] * 1000:>7.1f}"
+                  f" {old[1] / new[1]:>7.2f}x")
+
+
+if __name__ == "__main__":
+    rev = sys.argv[1] if len(sys.argv) > 1 else None
+    repeat = int(sys.argv[2]) if len(sys.argv) > 2 else 5
+    main(rev, repeat)
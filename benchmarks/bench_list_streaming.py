@@ -0,0 +1,96 @@
+"""
+Benchmark: streaming catalog list parsers vs whole-page parsing
+(data_scraper/html_rotor_list_scraper.py).
+
+Catalog pages of growing size are generated by repeating the product block
+of each list fixture. For every source and size:
+- whole:  the page is joined into one string and parsed with
+          parse_rotor_list_page() (previous behaviour: fetch_html() + parse)
+- stream: the same page is fed as 64 KB chunks to iter_rotor_list_page()
+          and rotors are consumed as they are yielded
+Peak traced memory (tracemalloc, separate run) and wall time are reported;
+both runs must find the same number of rotors.
+
+Usage:
+    python benchmarks/bench_list_streaming.py [products...]
+"""
+
+import os
+import sys
+import time
+import tracemalloc
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from data_scraper.html_rotor_list_scraper import iter_rotor_list_page, parse_rotor_list_page
+
+CHUNK_SIZE = 64 * 1024
+
+# source -> (fixture, block opening marker, block closing marker)
+SOURCES = {
+    "autodoc": ("autodoc_list_01.html", '<div class="product-item">', None),
+    "mister-auto": ("misterauto_list_01.html", '<tr class="product-row">', "</tr>"),
+    "powerstop": ("powerstop_list_01.html", '<article class="rotor-card"', "</article>"),
+}
+
+
+def page_parts(source: str, products: int):
+    """Yield a generated page: fixture head, repeated blocks, fixture tail."""
+    name, opening, closing = SOURCES[source]
+    with open(os.path.join(ROOT, "tests", "fixtures", "rotor_lists", name), encoding="utf-8") as f:
+        html = f.read()
+    first = html.index(opening)
+    if closing is None:
+        second = html.index(opening, first + 1)
+        block = html[first:second]
+        last = html.rindex(opening)
+        tail = html[last + len(block):]
+    else:
+        end = html.index(closing, first) + len(closing)
+        block = html[first:end]
+        tail = html[html.rindex(closing) + len(closing):]
+    yield html[:first]
+    for _ in range(products):
+        yield block
+    yield tail
+
+
+def chunked(parts, size: int = CHUNK_SIZE):
+    buffer = ""
+    for part in parts:
+        buffer += part
+        while len(buffer) >= size:
+            yield buffer[:size]
+            buffer = buffer[size:]
+    yield buffer
+
+
+def measure(fn) -> tuple:
+    """(rotors, seconds, peak bytes); timed without tracemalloc overhead."""
+    start = time.perf_counter()
+    count = fn()
+    elapsed = time.perf_counter() - start
+    tracemalloc.start()
+    fn()
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return count, elapsed, peak
+
+
+def main(sizes: list) -> None:
+    print(f"{'Source':<12} {'Products':>8} {'Page MB':>8} {'Whole MB':>9} {'Stream MB':>10}"
+          f" {'Whole s':>8} {'Stream s':>9}")
+    for source in SOURCES:
+        for products in sizes:
+            page_mb = sum(len(p) for p in page_parts(source, products)) / 1e6
+            whole = measure(lambda: len(parse_rotor_list_page("".join(page_parts(source, products)), source)))
+            stream = measure(lambda: sum(1 for _ in iter_rotor_list_page(
+                chunked(page_parts(source, products)), source)))
+            assert whole[0] == stream[0], f"{source}: {whole[0]} vs {stream[0]} rotors"
+            print(f"{source:<12} {products:>8} {page_mb:>8.1f} {whole[2] / 1e6:>9.1f}"
+                  f" {stream[2] / 1e6:>10.2f} {whole[1]:>8.2f} {stream[1]:>9.2f}")
+
+
+if __name__ == "__main__":
+    main([int(n) for n in sys.argv[1:]] or [1000, 10000])
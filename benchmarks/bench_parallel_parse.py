@@ -0,0 +1,64 @@
+"""
+Benchmark: serial vs process-pool page parsing (data_scraper/parallel_parse.py).
+
+Parses the fixture corpus (3 rotor list pages + 1 DBA product page) repeated
+N times with parse_pages(), serially and with 1, 2, 4... worker processes,
+and reports pages/s and the speedup over serial parsing. The speedup is
+bounded by the number of CPU cores reported at the top of the output.
+
+Usage:
+    python benchmarks/bench_parallel_parse.py [copies] [chunksize]
+"""
+
+import os
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from data_scraper.parallel_parse import DEFAULT_CHUNKSIZE, parse_pages
+
+FIXTURES = [
+    ("autodoc", "rotor_list", "rotor_lists/autodoc_list_01.html"),
+    ("mister-auto", "rotor_list", "rotor_lists/misterauto_list_01.html"),
+    ("powerstop", "rotor_list", "rotor_lists/powerstop_list_01.html"),
+    ("dba", "rotor", "product_pages/dba_rotor_01.html"),
+]
+
+
+def load_corpus(copies: int) -> list:
+    pages = []
+    for source, page_type, path in FIXTURES:
+        with open(os.path.join(ROOT, "tests", "fixtures", path), encoding="utf-8") as f:
+            pages.append((source, page_type, f.read()))
+    return pages * copies
+
+
+def run(corpus: list, workers: int, chunksize: int) -> tuple:
+    start = time.perf_counter()
+    records = sum(len(r[1]) for r in parse_pages(corpus, workers=workers, chunksize=chunksize))
+    return time.perf_counter() - start, records
+
+
+def main(copies: int = 100, chunksize: int = DEFAULT_CHUNKSIZE) -> None:
+    corpus = load_corpus(copies)
+    cores = os.cpu_count() or 1
+    print(f"Corpus: {len(corpus)} pages, chunksize={chunksize}, CPU cores: {cores}")
+    print(f"{'Workers':>8} {'Seconds':>8} {'Pages/s':>9} {'Speedup':>8}")
+
+    serial_s, serial_records = run(corpus, 0, chunksize)
+    print(f"{'serial':>8} {serial_s:>8.2f} {len(corpus) / serial_s:>9.0f} {1.0:>7.2f}x")
+
+    workers = 1
+    while workers <= max(4, cores):
+        elapsed, records = run(corpus, workers, chunksize)
+        assert records == serial_records, "parallel parse returned different records"
+        print(f"{workers:>8} {elapsed:>8.2f} {len(corpus) / elapsed:>9.0f} {serial_s / elapsed:>7.2f}x")
+        workers *= 2
+
+
+if __name__ == "__main__":
+    copies = int(sys.argv[1]) if len(sys.argv) > 1 else 100
+    chunksize = int(sys.argv[2]) if len(sys.argv) > 2 else DEFAULT_CHUNKSIZE
+    main(copies, chunksize)
@@ -0,0 +1,114 @@
+"""
+Benchmark: SQLite pragma profiles (database/connection.py) on a large
+synthetic rotor database.
+
+For each profile ("default" = SQLite's own settings, "bulk_load",
+"read_mostly") a fresh database is loaded with BatchWriter (batched inserts,
+commit every 5000 rows), then read back:
+- load:   rows/s of the bulk load
+- txn:    small transactions (SMALL_TXN_ROWS rows, one commit every
+          SMALL_TXN_INTERVAL rows), where per-commit journal/fsync costs show
+- scan:   load_rotors_from_db()-style full table read
+- lookup: random natural-key point lookups (unique index)
+Each read is timed on a fresh connection with the profile under test, after
+one warm-up pass. Row counts are checked after each load.
+
+Usage:
+    python benchmarks/bench_sqlite_profiles.py [rows] [lookups]
+"""
+
+import os
+import random
+import sys
+import tempfile
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from database.batch_writer import DEFAULT_COMMIT_INTERVAL, BatchWriter
+from database.connection import PROFILES, connect
+
+SCAN_SQL = """
+    SELECT outer_diameter_mm, nominal_thickness_mm, hat_height_mm, overall_height_mm,
+           offset_mm, center_bore_mm, bolt_circle_mm, bolt_hole_count, ventilation_type,
+           directionality, rotor_weight_kg, mounting_type, brand, catalog_ref
+    FROM rotors
+"""
+LOOKUP_SQL = "SELECT * FROM rotors WHERE brand = ? AND catalog_ref = ?"
+
+SMALL_TXN_ROWS = 20000
+SMALL_TXN_INTERVAL = 20
+
+
+def rotor(i: int) -> dict:
+    record = {
+        "outer_diameter_mm": 250.0 + i % 150, "nominal_thickness_mm": 20.0 + i % 15,
+        "hat_height_mm": 40.0 + i % 20, "overall_height_mm": 50.0 + i % 20,
+        "center_bore_mm": 57.1 + i % 12, "bolt_circle_mm": 100.0 + i % 30,
+        "bolt_hole_count": 4 + i % 3, "ventilation_type": "vented",
+        "directionality": "non_directional", "brand": f"BRAND{i % 40}",
+        "catalog_ref": f"REF{i:08d}",
+    }
+    if i % 3 == 0:
+        record["offset_mm"] = 35.0 + i % 10
+    return record
+
+
+def bulk_load(path: str, profile: str, rows: int,
+              commit_interval: int = DEFAULT_COMMIT_INTERVAL) -> float:
+    conn = connect(path, profile)
+    with open(os.path.join(ROOT, "database", "init.sql"), encoding="utf-8") as f:
+        conn.executescript(f.read())
+    start = time.perf_counter()
+    writer = BatchWriter(conn, batch_size=min(commit_interval, 500),
+                         commit_interval=commit_interval)
+    for i in range(rows):
+        writer.add("rotors", rotor(i))
+    writer.commit()
+    elapsed = time.perf_counter() - start
+    assert conn.execute("SELECT COUNT(*) FROM rotors").fetchone()[0] == rows
+    conn.close()
+    return elapsed
+
+
+def timed_read(path: str, profile: str, read) -> float:
+    conn = connect(path, profile)
+    read(conn)      # warm-up: page cache / mmap
+    start = time.perf_counter()
+    read(conn)
+    elapsed = time.perf_counter() - start
+    conn.close()
+    return elapsed
+
+
+def main(rows: int = 300000, lookups: int = 50000) -> None:
+    keys = [(f"BRAND{i % 40}", f"REF{i:08d}")
+            for i in random.Random(0).sample(range(rows), min(lookups, rows))]
+
+    def scan(conn):
+        return len(conn.execute(SCAN_SQL).fetchall())
+
+    def lookup(conn):
+        for key in keys:
+            conn.execute(LOOKUP_SQL, key).fetchone()
+
+    print(f"{rows} rows, {len(keys)} point lookups")
+    print(f"{'Profile':<12} {'Load s':>7} {'Rows/s':>8} {'Txn s':>7} {'Scan s':>7} "
+          f"{'Lookup s':>9} {'DB MB':>7}")
+    with tempfile.TemporaryDirectory() as directory:
+        for profile in PROFILES:
+            path = os.path.join(directory, f"{profile}.db")
+            load_s = bulk_load(path, profile, rows)
+            txn_s = bulk_load(os.path.join(directory, f"{profile}-txn.db"), profile,
+                              SMALL_TXN_ROWS, SMALL_TXN_INTERVAL)
+            scan_s = timed_read(path, profile, scan)
+            lookup_s = timed_read(path, profile, lookup)
+            size = os.path.getsize(path) / 1e6
+            print(f"{profile:<12} {load_s:>7.2f} {rows / load_s:>8.0f} {txn_s:>7.2f} "
+                  f"{scan_s:>7.2f} {lookup_s:>9.2f} {size:>7.1f}")
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 300000,
+         int(sys.argv[2]) if len(sys.argv) > 2 else 50000)
@@ -0,0 +1,359 @@
+# data_scraper/domain_scheduler.py
+"""
+Per-domain politeness scheduler for the crawler.
+
+Hammering one catalog host gets us 403/503 responses (which the site access
+audit then flags as bot protection), while a global sleep slows every host
+down. The scheduler keeps, for every urlparse(url).netloc:
+- a token bucket (sustained request rate + burst)
+- a maximum number of requests in flight
+- a "not before" deadline set from Retry-After headers
+
+Two ways to use it:
+- Direct: acquire(url) / release(url) or the slot(url) context manager, for
+  sequential callers such as probe_url() and download_real_html()
+- Queued: submit(url, payload) then next() / next_async(), used by the fetch
+  engine; next() hands out work round-robin across domains that are ready, so
+  seeds from different hosts interleave instead of queueing behind one host
+
+stats() exposes per-domain queue depth, in-flight count and wait times.
+"""
+
+import asyncio
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+from email.utils import parsedate_to_datetime
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+from urllib.parse import urlparse
+
+# Politeness defaults (per domain)
+DEFAULT_RATE_PER_SEC = 1.0     # Sustained requests per second
+DEFAULT_BURST = 2              # Bucket capacity
+DEFAULT_MAX_IN_FLIGHT = 2      # Concurrent requests
+POLL_INTERVAL_S = 0.05         # Re-check delay when a domain is at max in-flight
+
+
+def domain_of(url: str) -> str:
+    """Scheduling key of a URL (its network location)."""
+    return urlparse(url).netloc.lower()
+
+
+def interleave_by_domain(items: Iterable, key: Callable[[Any], str] = lambda x: x) -> List:
+    """
+    Reorder items round-robin across domains, keeping per-domain order.
+
+    Example: [a1, a2, a3, b1, c1] -> [a1, b1, c1, a2, a3]
+
+    Args:
+        items: Items to reorder
+        key: Function returning the URL of an item
+    """
+    queues = {}
+    for item in items:
+        queues.setdefault(domain_of(key(item)), deque()).append(item)
+
+    ordered = []
+    while queues:
+        for domain in list(queues):
+            ordered.append(queues[domain].popleft())
+            if not queues[domain]:
+                del queues[domain]
+    return ordered
+
+
+def parse_retry_after(value: Optional[str]) -> Optional[float]:
+    """
+    Parse a Retry-After header (delta-seconds or HTTP-date) into seconds.
+
+    Returns:
+        Seconds to wait (>= 0), or None if the header is missing/invalid
+    """
+    if not value:
+        return None
+    value = value.strip()
+    if value.isdigit():
+        return float(value)
+    try:
+        when = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    if when is None:
+        return None
+    return max(0.0, when.timestamp() - time.time())
+
+
+class TokenBucket:
+    """
+    Classic token bucket: `rate` tokens per second, at most `capacity` stored.
+    Not thread-safe on its own; DomainScheduler serializes access.
+    """
+
+    def __init__(self, rate: float, capacity: float):
+        if rate <= 0:
+            raise ValueError(f"rate must be > 0, got {rate}")
+        self.rate = rate
+        self.capacity = max(1.0, float(capacity))
+        self.tokens = self.capacity
+        self.updated = time.monotonic()
+
+    def _refill(self, now: float) -> None:
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+
+    def delay(self, now: float) -> float:
+        """Seconds until one token is available (0 if available now)."""
+        self._refill(now)
+        if self.tokens >= 1.0:
+            return 0.0
+        return (1.0 - self.tokens) / self.rate
+
+    def take(self, now: float) -> None:
+        self._refill(now)
+        self.tokens -= 1.0
+
+
+class _DomainState:
+    """Bucket, limits, queue and counters for one domain."""
+
+    def __init__(self, rate: float, burst: float, max_in_flight: int):
+        self.bucket = TokenBucket(rate, burst)
+        self.max_in_flight = max_in_flight
+        self.in_flight = 0
+        self.not_before = 0.0
+        self.queue = deque()        # (url, payload, enqueued_at)
+        self.waiting = 0            # Direct acquire() callers blocked
+        self.requests = 0
+        self.deferrals = 0
+        self.max_queued = 0
+        self.wait_total = 0.0
+        self.wait_max = 0.0
+
+    def delay(self, now: float) -> float:
+        """Seconds before this domain may start another request."""
+        if self.in_flight >= self.max_in_flight:
+            return POLL_INTERVAL_S
+        if now < self.not_before:
+            return self.not_before - now
+        return self.bucket.delay(now)
+
+    def grant(self, now: float, waited: float) -> None:
+        self.bucket.take(now)
+        self.in_flight += 1
+        self.requests += 1
+        self.wait_total += waited
+        self.wait_max = max(self.wait_max, waited)
+
+
+class DomainScheduler:
+    """
+    Thread-safe per-domain rate limiter and work queue.
+
+    Args:
+        rate_per_sec: Sustained request rate allowed per domain
+        burst: Token bucket capacity per domain
+        max_in_flight: Concurrent requests allowed per domain
+        overrides: Optional {netloc: {"rate_per_sec", "burst", "max_in_flight"}}
+                   for hosts that need different limits
+    """
+
+    def __init__(self, rate_per_sec: float = DEFAULT_RATE_PER_SEC,
+                 burst: float = DEFAULT_BURST,
+                 max_in_flight: int = DEFAULT_MAX_IN_FLIGHT,
+                 overrides: Optional[Dict[str, Dict]] = None):
+        if max_in_flight < 1:
+            raise ValueError(f"max_in_flight must be >= 1, got {max_in_flight}")
+        self.rate_per_sec = rate_per_sec
+        self.burst = burst
+        self.max_in_flight = max_in_flight
+        self.overrides = {k.lower(): v for k, v in (overrides or {}).items()}
+        self._domains: Dict[str, _DomainState] = {}
+        self._order: deque = deque()  # Round-robin order of domains
+        self._lock = threading.Lock()
+
+    def _state(self, domain: str) -> _DomainState:
+        state = self._domains.get(domain)
+        if state is None:
+            limits = self.overrides.get(domain, {})
+            state = _DomainState(
+                rate=limits.get("rate_per_sec", self.rate_per_sec),
+                burst=limits.get("burst", self.burst),
+                max_in_flight=limits.get("max_in_flight", self.max_in_flight),
+            )
+            self._domains[domain] = state
+            self._order.append(domain)
+        return state
+
+    # --------------------------------------------------------
+    #  Direct mode
+    # --------------------------------------------------------
+
+    def try_acquire(self, url: str) -> float:
+        """
+        Take a slot for url if its domain allows it right now.
+
+        Returns:
+            0.0 if the slot was granted, otherwise seconds to wait before retrying
+        """
+        with self._lock:
+            state = self._state(domain_of(url))
+            now = time.monotonic()
+            delay = state.delay(now)
+            if delay <= 0:
+                state.grant(now, 0.0)
+            return delay
+
+    def acquire(self, url: str) -> float:
+        """
+        Block until url's domain allows another request, then take the slot.
+
+        Returns:
+            Seconds spent waiting
+        """
+        start = time.monotonic()
+        domain = domain_of(url)
+        with self._lock:
+            self._state(domain).waiting += 1
+        try:
+            while True:
+                with self._lock:
+                    state = self._state(domain)
+                    now = time.monotonic()
+                    delay = state.delay(now)
+                    if delay <= 0:
+                        state.grant(now, now - start)
+                        return now - start
+                time.sleep(delay)
+        finally:
+            with self._lock:
+                self._state(domain).waiting -= 1
+
+    def release(self, url: str) -> None:
+        """Mark a request to url's domain as finished."""
+        with self._lock:
+            state = self._state(domain_of(url))
+            state.in_flight = max(0, state.in_flight - 1)
+
+    @contextmanager
+    def slot(self, url: str):
+        """Context manager wrapping acquire()/release()."""
+        self.acquire(url)
+        try:
+            yield
+        finally:
+            self.release(url)
+
+    def defer(self, url: str, seconds: float) -> None:
+        """Pause url's domain for `seconds` (e.g. from a Retry-After header)."""
+        with self._lock:
+            state = self._state(domain_of(url))
+            state.not_before = max(state.not_before, time.monotonic() + seconds)
+            state.deferrals += 1
+
+    # --------------------------------------------------------
+    #  Queued mode
+    # --------------------------------------------------------
+
+    def submit(self, url: str, payload: Any = None) -> None:
+        """Enqueue url (with an opaque payload) on its domain's queue."""
+        with self._lock:
+            state = self._state(domain_of(url))
+            state.queue.append((url, payload, time.monotonic()))
+            state.max_queued = max(state.max_queued, len(state.queue))
+
+    def pending(self) -> int:
+        """Number of queued (not yet dispatched) items across all domains."""
+        with self._lock:
+            return sum(len(s.queue) for s in self._domains.values())
+
+    def poll(self) -> Tuple[Optional[Tuple[str, Any]], float]:
+        """
+        Dispatch the next ready item, round-robin across domains.
+
+        Returns:
+            ((url, payload), 0.0) if an item was dispatched (its slot is taken;
+            call release(url) when done), or (None, delay) with the shortest
+            wait before any queued domain becomes ready (delay is 0.0 when
+            nothing is queued)
+        """
+        with self._lock:
+            now = time.monotonic()
+            best_delay = None
+            for _ in range(len(self._order)):
+                domain = self._order[0]
+                self._order.rotate(-1)
+                state = self._domains[domain]
+                if not state.queue:
+                    continue
+                delay = state.delay(now)
+                if delay <= 0:
+                    url, payload, enqueued_at = state.queue.popleft()
+                    state.grant(now, now - enqueued_at)
+                    return (url, payload), 0.0
+                best_delay = delay if best_delay is None else min(best_delay, delay)
+            return None, (best_delay or 0.0)
+
+    def next(self) -> Optional[Tuple[str, Any]]:
+        """Blocking poll(); returns None once every queue is empty."""
+        while True:
+            item, delay = self.poll()
+            if item is not None or delay == 0.0:
+                return item
+            time.sleep(delay)
+
+    async def next_async(self) -> Optional[Tuple[str, Any]]:
+        """Async poll(); returns None once every queue is empty."""
+        while True:
+            item, delay = self.poll()
+            if item is not None or delay == 0.0:
+                return item
+            await asyncio.sleep(delay)
+
+    # --------------------------------------------------------
+    #  Stats
+    # --------------------------------------------------------
+
+    def stats(self) -> Dict[str, Dict]:
+        """
+        Per-domain counters.
+
+        Returns:
+            {netloc: {"queued", "max_queued", "in_flight", "requests",
+                      "deferrals", "wait_total_s", "wait_avg_s", "wait_max_s"}}
+        """
+        with self._lock:
+            return {
+                domain: {
+                    "queued": len(s.queue) + s.waiting,
+                    "max_queued": s.max_queued,
+                    "in_flight": s.in_flight,
+                    "requests": s.requests,
+                    "deferrals": s.deferrals,
+                    "wait_total_s": round(s.wait_total, 3),
+                    "wait_avg_s": round(s.wait_total / s.requests, 3) if s.requests else 0.0,
+                    "wait_max_s": round(s.wait_max, 3),
+                }
+                for domain, s in self._domains.items()
+            }
+
+    def print_stats(self) -> None:
+        """Print a one-line summary per domain."""
+        for domain, s in sorted(self.stats().items()):
+            print(f"  {domain}: {s['requests']} requests, "
+                  f"wait avg {s['wait_avg_s']}s / max {s['wait_max_s']}s, "
+                  f"max queue {s['max_queued']}, {s['deferrals']} deferrals")
+
+
+def retry_after_from_error(error: Exception) -> Optional[float]:
+    """
+    Extract a Retry-After delay from an HTTP error raised by requests or urllib.
+
+    Only 429 and 503 responses are considered.
+    """
+    response = getattr(error, "response", None)
+    status = getattr(response, "status_code", None) or getattr(error, "code", None)
+    headers = getattr(response, "headers", None) or getattr(error, "headers", None)
+    if status not in (429, 503) or headers is None:
+        return None
+    return parse_retry_after(headers.get("Retry-After"))
@@ -0,0 +1,338 @@
+# data_scraper/fetch_engine.py
+"""
+Concurrent fetch engine for the ingestion pipeline.
+
+fetch_html() is a blocking call, so a seed list of a few thousand catalog
+pages spends almost all of its time waiting on the network. This module keeps
+many fetches in flight on an asyncio event loop (each blocking fetch runs in a
+dedicated thread pool) under a global concurrency limit, and hands the pages
+back to the caller while the remaining fetches continue.
+
+Architecture:
+- fetch_all(): coroutine for async callers, returns every result at once
+- iter_fetch(): synchronous generator for ingest_all(); the event loop runs in
+  a background thread so parsing/inserting overlaps with network waits
+- Results are yielded in seed order (ordered=True) or as completed
+- iter_fetch(max_buffered=N) bounds the fetched-but-unconsumed pages: when
+  the consumer falls behind, no new fetch starts (backpressure). In ordered
+  mode the results waiting behind a slow page count too: a URL is only
+  taken from the input while fewer than N + concurrency are fetched ahead
+  of the consumer (in flight included)
+- With a DomainScheduler, URLs are dispatched round-robin across hosts under
+  per-domain token buckets / in-flight limits, and Retry-After on 429/503
+  pauses the offending host (data_scraper.domain_scheduler)
+- With a RetryPolicy, transient errors (timeouts, 5xx, 429) are retried with
+  exponential backoff; a CircuitBreaker pauses a failing host
+  (data_scraper.retry_policy). Scheduled mode puts retries and requests to a
+  paused host back in the scheduler (deferring that domain), so workers keep
+  serving the other hosts; otherwise the worker sleeps in place.
+
+Each result is a tuple (index, url, html, error) where index is the position
+of the URL in the input, and exactly one of html / error is None.
+"""
+
+import asyncio
+import heapq
+import queue
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Iterable, Iterator, List, Optional, Tuple
+
+from data_scraper.domain_scheduler import DomainScheduler, retry_after_from_error
+from data_scraper.retry_policy import CircuitBreaker, RetryPolicy
+
+# Default number of requests kept in flight
+DEFAULT_CONCURRENCY = 8
+
+# Minimum number of URLs queued ahead in the scheduler (scheduled mode)
+MIN_LOOKAHEAD = 64
+
+# Poll interval of workers waiting for the consumer (ordered backpressure)
+WINDOW_POLL_S = 0.005
+
+FetchResult = Tuple[int, str, Optional[str], Optional[Exception]]
+
+_DONE = object()
+
+
+def _default_fetch() -> Callable[[str], str]:
+    """Resolve fetch_html at call time so callers/tests can swap it."""
+    from data_scraper import html_scraper
+    return html_scraper.fetch_html
+
+
+async def _run_workers(urls: Iterable[str], concurrency: int,
+                       fetch: Callable[[str], str],
+                       emit: Callable[[FetchResult], None],
+                       stop: threading.Event,
+                       scheduler: Optional[DomainScheduler] = None,
+                       retry: Optional[RetryPolicy] = None,
+                       breaker: Optional[CircuitBreaker] = None,
+                       window: Optional[threading.Semaphore] = None) -> None:
+    """
+    Drain the URL iterator with `concurrency` worker coroutines.
+
+    Workers pull the next URL only when they are free, so the input iterator
+    is consumed lazily and at most `concurrency` requests are in flight.
+    With a scheduler, a look-ahead window of URLs is queued per domain and
+    workers take whichever domain is ready next.
+
+    With a window, each URL taken from the input holds one of its slots
+    until the consumer releases it (iter_fetch(ordered=True)); URLs are
+    taken in input order, so the next result the consumer waits for always
+    has its slot.
+
+    A result is emitted once per URL: on success, or with the last error once
+    it is not retryable or retry.max_attempts is reached.
+    """
+    loop = asyncio.get_running_loop()
+    source = enumerate(urls)
+    lookahead = max(MIN_LOOKAHEAD, concurrency * 16)
+    exhausted = False
+
+    def take():
+        """Next (index, url) of the input, holding a window slot; None at the end."""
+        nonlocal exhausted
+        try:
+            return next(source)
+        except StopIteration:
+            exhausted = True
+            if window is not None:
+                window.release()
+            return None
+
+    async def admit():
+        """Wait for a window slot; False once stopped."""
+        if window is None:
+            return True
+        while not window.acquire(blocking=False):
+            if stop.is_set():
+                return False
+            await asyncio.sleep(WINDOW_POLL_S)
+        return True
+
+    def refill():
+        while not exhausted and scheduler.pending() < lookahead:
+            if window is not None and not window.acquire(blocking=False):
+                return
+            item = take()
+            if item is None:
+                return
+            index, url = item
+            scheduler.submit(url, (index, 1))
+
+    with ThreadPoolExecutor(max_workers=concurrency,
+                            thread_name_prefix="bbk-fetch") as pool:
+
+        async def attempt_one(url):
+            """One request; returns (html, error) and feeds the breaker."""
+            try:
+                html = await loop.run_in_executor(pool, fetch, url)
+            except Exception as e:
+                if breaker is not None:
+                    breaker.record_failure(url, e)
+                return None, e
+            if breaker is not None:
+                breaker.record_success(url)
+            return html, None
+
+        def finish(index, url, html, error, attempt):
+            """Emit a final result; False if the error is retried instead."""
+            if error is not None and retry is not None:
+                if retry.should_retry(error, attempt):
+                    return False
+                if attempt > 1:
+                    retry.record("exhausted")
+            elif attempt > 1:
+                retry.record("recovered")
+            emit((index, url, html, error))
+            return True
+
+        async def fetch_one(index, url):
+            attempt = 1
+            while True:
+                if breaker is not None:
+                    wait = breaker.wait(url)
+                    while wait > 0 and not stop.is_set():
+                        await asyncio.sleep(wait)
+                        wait = breaker.wait(url)
+                html, error = await attempt_one(url)
+                if finish(index, url, html, error, attempt) or stop.is_set():
+                    return
+                delay = retry.delay(attempt, error)
+                retry.record("retries", delay)
+                await asyncio.sleep(delay)
+                attempt += 1
+
+        async def worker():
+            # The event loop is single-threaded: next() never races
+            while not exhausted and await admit():
+                item = take()
+                if item is None or stop.is_set():
+                    return
+                await fetch_one(*item)
+
+        async def scheduled_worker():
+            while not stop.is_set():
+                refill()
+                item = await scheduler.next_async()
+                if item is None:
+                    if exhausted:
+                        return
+                    # Window full: wait for the consumer, then take one URL
+                    if not await admit():
+                        return
+                    item = take()
+                    if item is not None:
+                        scheduler.submit(item[1], (item[0], 1))
+                    continue
+                url, (index, attempt) = item
+                wait = breaker.wait(url) if breaker is not None else 0.0
+                if wait > 0:
+                    # Host paused: requeue and let the other domains flow
+                    scheduler.release(url)
+                    scheduler.defer(url, wait)
+                    scheduler.submit(url, (index, attempt))
+                    continue
+                try:
+                    html, error = await attempt_one(url)
+                finally:
+                    scheduler.release(url)
+                if error is None:
+                    finish(index, url, html, None, attempt)
+                    continue
+                delay = retry_after_from_error(error)
+                if finish(index, url, None, error, attempt):
+                    if delay:
+                        scheduler.defer(url, delay)
+                    continue
+                delay = retry.delay(attempt, error)
+                retry.record("retries", delay)
+                scheduler.defer(url, delay)
+                scheduler.submit(url, (index, attempt + 1))
+
+        run = worker if scheduler is None else scheduled_worker
+        await asyncio.gather(*(run() for _ in range(concurrency)))
+
+
+async def fetch_all(urls: Iterable[str], concurrency: int = DEFAULT_CONCURRENCY,
+                    fetch: Optional[Callable[[str], str]] = None,
+                    scheduler: Optional[DomainScheduler] = None,
+                    retry: Optional[RetryPolicy] = None,
+                    breaker: Optional[CircuitBreaker] = None) -> List[FetchResult]:
+    """
+    Fetch every URL concurrently and return the results in input order.
+
+    Args:
+        urls: URLs to fetch
+        concurrency: Maximum number of requests in flight
+        fetch: Blocking fetch function (default: html_scraper.fetch_html)
+        scheduler: Optional per-domain politeness scheduler
+        retry: Optional retry policy for transient errors
+        breaker: Optional per-domain circuit breaker
+
+    Returns:
+        List of (index, url, html, error) tuples sorted by index
+    """
+    if concurrency < 1:
+        raise ValueError(f"concurrency must be >= 1, got {concurrency}")
+
+    results = []
+    await _run_workers(urls, concurrency, fetch or _default_fetch(),
+                       results.append, threading.Event(), scheduler, retry, breaker)
+    results.sort(key=lambda r: r[0])
+    return results
+
+
+def iter_fetch(urls: Iterable[str], concurrency: int = DEFAULT_CONCURRENCY,
+               ordered: bool = True,
+               fetch: Optional[Callable[[str], str]] = None,
+               scheduler: Optional[DomainScheduler] = None,
+               max_buffered: Optional[int] = None,
+               retry: Optional[RetryPolicy] = None,
+               breaker: Optional[CircuitBreaker] = None) -> Iterator[FetchResult]:
+    """
+    Fetch URLs concurrently and yield results while fetches continue.
+
+    The event loop runs in a background thread; the caller consumes results
+    from the current thread (e.g. parsing and inserting into SQLite, which must
+    stay on the thread that owns the connection).
+
+    Args:
+        urls: URLs to fetch
+        concurrency: Maximum number of requests in flight
+        ordered: If True, yield in input order; otherwise as completed
+        fetch: Blocking fetch function (default: html_scraper.fetch_html)
+        scheduler: Optional per-domain politeness scheduler
+        max_buffered: Maximum completed results waiting for the consumer
+                      (None = unbounded). When full, the event loop blocks and
+                      no new fetch starts until the consumer catches up. In
+                      ordered mode, at most max_buffered + concurrency URLs
+                      are fetched ahead of the consumer, so results held
+                      behind a slow page stay bounded as well.
+        retry: Optional retry policy for transient errors
+        breaker: Optional per-domain circuit breaker
+
+    Yields:
+        (index, url, html, error) tuples
+    """
+    if concurrency < 1:
+        raise ValueError(f"concurrency must be >= 1, got {concurrency}")
+
+    fetch = fetch or _default_fetch()
+    # Ordered mode: the window bounds the queue and the reordering heap
+    window = threading.Semaphore(max_buffered + concurrency) if ordered and max_buffered else None
+    results = queue.Queue(maxsize=0 if window is not None else (max_buffered or 0))
+    stop = threading.Event()
+    failure = []
+
+    def put(item):
+        # Blocking put that gives up once the consumer has gone away
+        while True:
+            try:
+                results.put(item, timeout=0.1)
+                return
+            except queue.Full:
+                if stop.is_set():
+                    return
+
+    def run_loop():
+        try:
+            asyncio.run(_run_workers(urls, concurrency, fetch, put, stop,
+                                     scheduler, retry, breaker, window))
+        except BaseException as e:  # surface iterator errors to the consumer
+            failure.append(e)
+        finally:
+            put(_DONE)
+
+    thread = threading.Thread(target=run_loop, name="bbk-fetch-loop", daemon=True)
+    thread.start()
+
+    pending = []  # min-heap of out-of-order results (ordered mode)
+    next_index = 0
+
+    try:
+        while True:
+            item = results.get()
+            if item is _DONE:
+                break
+
+            if not ordered:
+                yield item
+                continue
+
+            heapq.heappush(pending, item)
+            while pending and pending[0][0] == next_index:
+                if window is not None:
+                    window.release()
+                yield heapq.heappop(pending)
+                next_index += 1
+
+        # Remaining results (only if indices were skipped after a stop)
+        while pending:
+            yield heapq.heappop(pending)
+
+        if failure:
+            raise failure[0]
+    finally:
+        stop.set()
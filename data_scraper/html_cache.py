@@ -0,0 +1,288 @@
+# data_scraper/html_cache.py
+"""
+Content-addressed on-disk HTML cache with conditional revalidation.
+
+Catalog pages change rarely, yet every re-run of ingest_all() or of the
+M10.4 validation re-downloaded every page. The cache keeps:
+- objects/<ab>/<sha256>.gz : gzip-compressed bodies, keyed by content hash
+  (identical pages fetched from several URLs are stored once)
+- index.db (SQLite): url -> content_hash, ETag, Last-Modified, fetched_at,
+  last_access
+
+Lookup policy (HtmlCache.fetch):
+1. Entry younger than ttl            -> served from disk, no request
+2. Stale entry                       -> conditional GET (If-None-Match /
+                                        If-Modified-Since); 304 reuses the body
+3. Miss / 200                        -> body stored, index updated
+4. Offline mode                      -> served from disk even if stale;
+                                        a miss raises CacheMiss
+
+The cache is bounded: when the stored objects exceed max_bytes, least
+recently used URLs are evicted (and unreferenced objects deleted).
+
+fetch_html() uses the cache configured with configure_cache(); the CLIs
+enable it by default.
+"""
+
+import gzip
+import hashlib
+import os
+import sqlite3
+import threading
+import time
+from typing import Dict, Optional
+
+from data_scraper.http_client import DEFAULT_TIMEOUT_S, http_get, response_text
+
+DEFAULT_CACHE_DIR = "database/html_cache"
+DEFAULT_TTL_S = 7 * 24 * 3600              # Revalidate after one week
+DEFAULT_MAX_BYTES = 512 * 1024 * 1024       # Compressed bytes kept on disk
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS entries (
+    url TEXT PRIMARY KEY,
+    content_hash TEXT NOT NULL,
+    etag TEXT,
+    last_modified TEXT,
+    fetched_at REAL NOT NULL,
+    last_access REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_entries_last_access ON entries (last_access);
+CREATE INDEX IF NOT EXISTS idx_entries_content_hash ON entries (content_hash);
+
+CREATE TABLE IF NOT EXISTS objects (
+    content_hash TEXT PRIMARY KEY,
+    size_bytes INTEGER NOT NULL
+);
+"""
+
+
+class CacheMiss(LookupError):
+    """Raised in offline mode when a URL is not in the cache."""
+
+
+class HtmlCache:
+    """
+    On-disk HTML cache (see module docstring).
+
+    Args:
+        cache_dir: Directory holding index.db and objects/
+        ttl: Seconds an entry is served without revalidation
+        max_bytes: Upper bound on compressed object bytes (LRU eviction)
+        offline: Serve only from cache, never touch the network
+    """
+
+    def __init__(self, cache_dir: str = DEFAULT_CACHE_DIR, ttl: float = DEFAULT_TTL_S,
+                 max_bytes: int = DEFAULT_MAX_BYTES, offline: bool = False):
+        self.cache_dir = cache_dir
+        self.ttl = ttl
+        self.max_bytes = max_bytes
+        self.offline = offline
+        self.stats = {"hits": 0, "revalidated": 0, "misses": 0,
+                      "stored": 0, "evicted": 0}
+
+        os.makedirs(os.path.join(cache_dir, "objects"), exist_ok=True)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(os.path.join(cache_dir, "index.db"),
+                                     check_same_thread=False)
+        self._conn.executescript(_SCHEMA)
+
+    # --------------------------------------------------------
+    #  Storage
+    # --------------------------------------------------------
+
+    def _object_path(self, content_hash: str) -> str:
+        return os.path.join(self.cache_dir, "objects", content_hash[:2], f"{content_hash}.gz")
+
+    def lookup(self, url: str) -> Optional[Dict]:
+        """Return the index entry for url, or None."""
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT content_hash, etag, last_modified, fetched_at FROM entries WHERE url = ?",
+                (url,)).fetchone()
+        if row is None:
+            return None
+        return {"content_hash": row[0], "etag": row[1],
+                "last_modified": row[2], "fetched_at": row[3]}
+
+    def is_fresh(self, entry: Dict) -> bool:
+        return time.time() - entry["fetched_at"] < self.ttl
+
+    def read(self, url: str, entry: Dict) -> Optional[str]:
+        """Load the cached body of an entry (None if the object is gone)."""
+        try:
+            with open(self._object_path(entry["content_hash"]), "rb") as f:
+                body = gzip.decompress(f.read()).decode("utf-8")
+        except (OSError, EOFError):
+            return None
+        with self._lock:
+            self._conn.execute("UPDATE entries SET last_access = ? WHERE url = ?",
+                               (time.time(), url))
+            self._conn.commit()
+        return body
+
+    def store(self, url: str, body: str, etag: Optional[str] = None,
+              last_modified: Optional[str] = None) -> str:
+        """
+        Store a body for url and evict old entries if over budget.
+
+        Returns:
+            Content hash (sha256 hex) of the body
+        """
+        data = body.encode("utf-8")
+        content_hash = hashlib.sha256(data).hexdigest()
+        path = self._object_path(content_hash)
+        if not os.path.exists(path):
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            compressed = gzip.compress(data)
+            tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+            with open(tmp_path, "wb") as f:
+                f.write(compressed)
+            os.replace(tmp_path, path)
+        else:
+            compressed = None
+
+        now = time.time()
+        with self._lock:
+            if compressed is not None:
+                self._conn.execute(
+                    "INSERT OR REPLACE INTO objects (content_hash, size_bytes) VALUES (?, ?)",
+                    (content_hash, len(compressed)))
+            self._conn.execute(
+                "INSERT OR REPLACE INTO entries "
+                "(url, content_hash, etag, last_modified, fetched_at, last_access) "
+                "VALUES (?, ?, ?, ?, ?, ?)",
+                (url, content_hash, etag, last_modified, now, now))
+            self._conn.commit()
+            self.stats["stored"] += 1
+        self.evict()
+        return content_hash
+
+    def mark_revalidated(self, url: str) -> None:
+        """Restart the TTL of an entry after a 304 Not Modified."""
+        now = time.time()
+        with self._lock:
+            self._conn.execute(
+                "UPDATE entries SET fetched_at = ?, last_access = ? WHERE url = ?",
+                (now, now, url))
+            self._conn.commit()
+
+    def total_bytes(self) -> int:
+        with self._lock:
+            return self._conn.execute(
+                "SELECT COALESCE(SUM(size_bytes), 0) FROM objects").fetchone()[0]
+
+    def evict(self) -> int:
+        """
+        Drop least recently used entries until objects fit in max_bytes.
+
+        Returns:
+            Number of URL entries evicted
+        """
+        evicted = 0
+        with self._lock:
+            total = self._conn.execute(
+                "SELECT COALESCE(SUM(size_bytes), 0) FROM objects").fetchone()[0]
+            if total <= self.max_bytes:
+                return 0
+
+            lru = self._conn.execute(
+                "SELECT url, content_hash FROM entries ORDER BY last_access").fetchall()
+            for url, content_hash in lru:
+                if total <= self.max_bytes:
+                    break
+                self._conn.execute("DELETE FROM entries WHERE url = ?", (url,))
+                evicted += 1
+                still_used = self._conn.execute(
+                    "SELECT 1 FROM entries WHERE content_hash = ? LIMIT 1",
+                    (content_hash,)).fetchone()
+                if still_used:
+                    continue
+                size = self._conn.execute(
+                    "SELECT size_bytes FROM objects WHERE content_hash = ?",
+                    (content_hash,)).fetchone()
+                self._conn.execute("DELETE FROM objects WHERE content_hash = ?", (content_hash,))
+                total -= size[0] if size else 0
+                try:
+                    os.remove(self._object_path(content_hash))
+                except OSError:
+                    pass
+            self._conn.commit()
+            self.stats["evicted"] += evicted
+        return evicted
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+    # --------------------------------------------------------
+    #  Fetch through the cache
+    # --------------------------------------------------------
+
+    def fetch(self, url: str, timeout: float = DEFAULT_TIMEOUT_S) -> str:
+        """
+        Return the HTML for url, using the cache policy in the module docstring.
+
+        Raises:
+            CacheMiss: offline mode and url not cached
+            requests.HTTPError: non-2xx response (nothing is cached)
+        """
+        entry = self.lookup(url)
+        body = self.read(url, entry) if entry else None
+
+        if body is not None and (self.offline or self.is_fresh(entry)):
+            self.stats["hits"] += 1
+            return body
+
+        if self.offline:
+            self.stats["misses"] += 1
+            raise CacheMiss(f"Offline mode: {url} not in HTML cache")
+
+        headers = {}
+        if body is not None:
+            if entry["etag"]:
+                headers["If-None-Match"] = entry["etag"]
+            if entry["last_modified"]:
+                headers["If-Modified-Since"] = entry["last_modified"]
+
+        resp = http_get(url, timeout=timeout, headers=headers or None)
+        if resp.status_code == 304 and body is not None:
+            self.mark_revalidated(url)
+            self.stats["revalidated"] += 1
+            return body
+
+        resp.raise_for_status()
+        html = response_text(resp)
+        self.stats["misses"] += 1
+        self.store(url, html, etag=resp.headers.get("ETag"),
+                   last_modified=resp.headers.get("Last-Modified"))
+        return html
+
+
+# ------------------------------------------------------------
+#  Process-wide cache used by fetch_html()
+# ------------------------------------------------------------
+
+_cache: Optional[HtmlCache] = None
+
+
+def configure_cache(cache_dir: str = DEFAULT_CACHE_DIR, ttl: float = DEFAULT_TTL_S,
+                    max_bytes: int = DEFAULT_MAX_BYTES, offline: bool = False) -> HtmlCache:
+    """Enable the HTML cache for fetch_html() (replaces any previous one)."""
+    global _cache
+    disable_cache()
+    _cache = HtmlCache(cache_dir, ttl=ttl, max_bytes=max_bytes, offline=offline)
+    return _cache
+
+
+def disable_cache() -> None:
+    """Turn the HTML cache off; fetch_html() goes straight to the network."""
+    global _cache
+    if _cache is not None:
+        _cache.close()
+    _cache = None
+
+
+def get_cache() -> Optional[HtmlCache]:
+    """Return the configured cache, or None if caching is disabled."""
+    return _cache
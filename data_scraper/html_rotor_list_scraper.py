@@ -9,15 +9,38 @@ Architecture:
 - Generic interface: parse_rotor_list_page(html, source)
 - Source-specific parsers: parse_autodoc_list(), parse_misterauto_list(), etc.
 - Returns list of RAW dicts compatible with normalize_rotor()
+- Streaming variants: iter_rotor_list_page(chunks, source) and
+  iter_autodoc_list() / iter_misterauto_list() / iter_powerstop_list()
+  consume the page as an iterable of text chunks (e.g. stream_html(), fed
+  from the HTTP response) and yield each raw rotor dict as soon as its
+  product block / table row closes. Only the block being parsed is kept in
+  memory, so peak memory does not grow with the page size.
+  stream_rotor_list(url, source) fetches and parses in one pass. The
+  ingest pipeline (database/ingest_stages.py) still parses whole pages:
+  its fetch stage, parse pool and link discovery work on complete
+  responses, and with the HTML cache on stream_html() yields one chunk.
+- Link discovery: extract_list_links(html, source, base_url) returns the
+  page's next-page links and, for sources whose product pages have a
+  parser (DBA), its product detail links, as canonical URLs
+  (canonicalize_url()) on the page's host. DBA category pages carry no
+  specs: their rotors come from the linked product pages only.
 
 **IMPORTANT:** This is a POC framework. Actual site-specific parsers require
 manual HTML analysis and selector identification. See documentation for
 instructions on analyzing target sites.
 """
 
+import html as html_lib
 import re
-from typing import List, Dict, Optional
+from typing import Callable, Dict, Iterable, Iterator, List, Optional, Tuple, Union
 from html.parser import HTMLParser
+from urllib.parse import parse_qsl, urlencode, urljoin, urlsplit, urlunsplit
+
+from data_scraper.html_scraper import stream_html
+from data_scraper.http_client import STREAM_CHUNK_SIZE
+
+# Page content: whole HTML string or an iterable of text chunks
+HtmlChunks = Union[str, Iterable[str]]
 
 
 # ============================================================
@@ -45,19 +68,60 @@ def parse_rotor_list_page(html: str, source: str) -> List[Dict]:
     Raises:
         NotImplementedError: If source parser not yet implemented
     """
+    return list(iter_rotor_list_page(html, source))
+
+
+def iter_rotor_list_page(chunks: HtmlChunks, source: str) -> Iterator[Dict]:
+    """
+    Streaming parse_rotor_list_page(): yield raw rotor dicts while the page
+    is consumed chunk by chunk.
+    
+    Args:
+        chunks: HTML string or iterable of text chunks (e.g. stream_html())
+        source: Site identifier (e.g., "autodoc", "mister-auto", "powerstop")
+    
+    Returns:
+        Iterator of raw rotor dicts, in page order
+    
+    Raises:
+        NotImplementedError: If source parser not yet implemented (raised
+        immediately, not on first iteration)
+    """
     if source == "autodoc" or source == "autodoc_list":
-        return parse_autodoc_list(html)
+        return iter_autodoc_list(chunks)
     elif source == "mister-auto" or source == "misterauto_list":
-        return parse_misterauto_list(html)
+        return iter_misterauto_list(chunks)
     elif source == "powerstop" or source == "powerstop_list":
-        return parse_powerstop_list(html)
+        return iter_powerstop_list(chunks)
+    elif source in LINK_ONLY_SOURCES:
+        # Category pages without specs: rotors come from the linked product
+        # pages (extract_list_links)
+        return iter(())
     else:
         raise NotImplementedError(
             f"List parser not implemented for source '{source}'. "
-            f"Supported sources: autodoc, mister-auto, powerstop"
+            f"Supported sources: autodoc, mister-auto, powerstop, dba (links only)"
         )
 
 
+def stream_rotor_list(url: str, source: str, timeout: float = 10,
+                      chunk_size: int = STREAM_CHUNK_SIZE) -> Iterator[Dict]:
+    """
+    Fetch a catalog page and yield its raw rotors while it downloads.
+    
+    Args:
+        url: Catalog page URL
+        source: Site identifier (selects the list parser)
+        timeout: Request timeout in seconds
+        chunk_size: Bytes read per network chunk
+    
+    Returns:
+        Iterator of raw rotor dicts
+    """
+    chunks = stream_html(url, timeout=timeout, chunk_size=chunk_size)
+    return iter_rotor_list_page(chunks, source)
+
+
 # ============================================================
 # Source-Specific Parsers (TEMPLATES - require manual analysis)
 # ============================================================
@@ -85,66 +149,78 @@ def parse_autodoc_list(html: str) -> List[Dict]:
         </div>
     </div>
     """
-    rotors = []
+    return list(iter_autodoc_list(html))
+
+
+def iter_autodoc_list(chunks: HtmlChunks) -> Iterator[Dict]:
+    """
+    Streaming parse_autodoc_list(): yield each rotor when its
+    <div class="product-item"> closes (balanced <div> nesting).
     
-    # Extract all product items
-    product_pattern = r'<div class="product-item">(.*?)</div>\s*(?=<div class="product-item">|</div>\s*</body>)'
-    products = re.findall(product_pattern, html, re.DOTALL)
+    Args:
+        chunks: HTML string or iterable of text chunks
     
-    for product_html in products:
+    Returns:
+        Iterator of raw rotor dicts
+    """
+    for product_html in _iter_blocks(chunks, AUTODOC_ITEM_START, _find_div_close):
         try:
-            rotor_raw = {}
-            
-            # Extract brand
-            brand_match = re.search(r'<span class="brand">([^<]+)</span>', product_html)
-            if brand_match:
-                rotor_raw["brand"] = clean_text(brand_match.group(1))
-            
-            # Extract part number
-            part_match = re.search(r'<span class="part-number">([^<]+)</span>', product_html)
-            if part_match:
-                rotor_raw["catalog_ref"] = clean_text(part_match.group(1))
-            
-            # Extract specs from spec rows
-            spec_rows = re.findall(r'<div class="spec-row">.*?<span class="label">([^<]+)</span>.*?<span class="value">([^<]+)</span>', product_html, re.DOTALL)
-            
-            for label, value in spec_rows:
-                label_clean = clean_text(label).lower()
-                value_clean = clean_text(value)
-                
-                if 'diameter' in label_clean:
-                    # Parse "280 mm" -> 280.0
-                    num_match = re.search(r'(\d+(?:\.\d+)?)', value_clean)
-                    if num_match:
-                        rotor_raw["outer_diameter_mm"] = float(num_match.group(1))
-                elif 'thickness' in label_clean:
-                    num_match = re.search(r'(\d+(?:\.\d+)?)', value_clean)
-                    if num_match:
-                        rotor_raw["nominal_thickness_mm"] = float(num_match.group(1))
-                elif 'height' in label_clean:
-                    num_match = re.search(r'(\d+(?:\.\d+)?)', value_clean)
-                    if num_match:
-                        rotor_raw["overall_height_mm"] = float(num_match.group(1))
-                elif 'centre hole' in label_clean or 'center hole' in label_clean:
-                    num_match = re.search(r'(\d+(?:\.\d+)?)', value_clean)
-                    if num_match:
-                        rotor_raw["center_bore_mm"] = float(num_match.group(1))
-                elif 'bolt hole' in label_clean:
-                    num_match = re.search(r'(\d+)', value_clean)
-                    if num_match:
-                        rotor_raw["bolt_hole_count"] = int(num_match.group(1))
-                elif 'type' in label_clean:
-                    rotor_raw["ventilation_type"] = value_clean.lower()
-            
-            # Only add if we have minimum required fields
-            if rotor_raw.get("brand") and rotor_raw.get("catalog_ref"):
-                rotors.append(rotor_raw)
-        
-        except Exception as e:
+            rotor_raw = _parse_autodoc_product(product_html)
+        except Exception:
             # Skip malformed products, continue processing
             continue
-    
-    return rotors
+        
+        # Only add if we have minimum required fields
+        if rotor_raw.get("brand") and rotor_raw.get("catalog_ref"):
+            yield rotor_raw
+
+
+def _parse_autodoc_product(product_html: str) -> Dict:
+    """Extract the raw rotor fields of one AutoDoc product block."""
+    rotor_raw = {}
+    
+    # Extract brand
+    brand_match = re.search(r'<span class="brand">([^<]+)</span>', product_html)
+    if brand_match:
+        rotor_raw["brand"] = clean_text(brand_match.group(1))
+    
+    # Extract part number
+    part_match = re.search(r'<span class="part-number">([^<]+)</span>', product_html)
+    if part_match:
+        rotor_raw["catalog_ref"] = clean_text(part_match.group(1))
+    
+    # Extract specs from spec rows
+    spec_rows = re.findall(r'<div class="spec-row">.*?<span class="label">([^<]+)</span>.*?<span class="value">([^<]+)</span>', product_html, re.DOTALL)
+    
+    for label, value in spec_rows:
+        label_clean = clean_text(label).lower()
+        value_clean = clean_text(value)
+    
+        if 'diameter' in label_clean:
+            # Parse "280 mm" -> 280.0
+            num_match = re.search(r'(\d+(?:\.\d+)?)', value_clean)
+            if num_match:
+                rotor_raw["outer_diameter_mm"] = float(num_match.group(1))
+        elif 'thickness' in label_clean:
+            num_match = re.search(r'(\d+(?:\.\d+)?)', value_clean)
+            if num_match:
+                rotor_raw["nominal_thickness_mm"] = float(num_match.group(1))
+        elif 'height' in label_clean:
+            num_match = re.search(r'(\d+(?:\.\d+)?)', value_clean)
+            if num_match:
+                rotor_raw["overall_height_mm"] = float(num_match.group(1))
+        elif 'centre hole' in label_clean or 'center hole' in label_clean:
+            num_match = re.search(r'(\d+(?:\.\d+)?)', value_clean)
+            if num_match:
+                rotor_raw["center_bore_mm"] = float(num_match.group(1))
+        elif 'bolt hole' in label_clean:
+            num_match = re.search(r'(\d+)', value_clean)
+            if num_match:
+                rotor_raw["bolt_hole_count"] = int(num_match.group(1))
+        elif 'type' in label_clean:
+            rotor_raw["ventilation_type"] = value_clean.lower()
+    
+    return rotor_raw
 
 
 def parse_misterauto_list(html: str) -> List[Dict]:
@@ -171,82 +247,96 @@ def parse_misterauto_list(html: str) -> List[Dict]:
     
     Column order: Marque, Référence, Diamètre, Epaisseur, Hauteur, Alésage, Trous, Type
     """
-    rotors = []
-    
-    # Use SimpleTableParser for table extraction
-    parser = SimpleTableParser()
-    parser.feed(html)
-    rows = parser.get_rows()
-    
-    if not rows:
-        return rotors
+    return list(iter_misterauto_list(html))
+
+
+def iter_misterauto_list(chunks: HtmlChunks) -> Iterator[Dict]:
+    """
+    Streaming parse_misterauto_list(): chunks are fed to SimpleTableParser
+    and each rotor is yielded when its </tr> has been read.
     
-    # Skip header row if present
-    data_rows = rows
-    if rows and any(x.lower() in ["marque", "brand", "référence"] for x in rows[0]):
-        data_rows = rows[1:]
+    Args:
+        chunks: HTML string or iterable of text chunks
     
-    for row in data_rows:
-        try:
+    Returns:
+        Iterator of raw rotor dicts
+    """
+    parser = SimpleTableParser()
+    first_row = True
+    
+    for chunk in _as_chunks(chunks):
+        parser.feed(chunk)
+        for row in parser.pop_rows():
+            # Skip header row if present
+            if first_row:
+                first_row = False
+                if any(x.lower() in ["marque", "brand", "référence"] for x in row):
+                    continue
+            
             if len(row) < 8:
                 continue  # Skip incomplete rows
             
-            rotor_raw = {}
-            
-            # Extract from table columns
-            brand = clean_text(row[0])
-            catalog_ref = clean_text(row[1])
-            diameter_str = clean_text(row[2])
-            thickness_str = clean_text(row[3])
-            height_str = clean_text(row[4])
-            center_bore_str = clean_text(row[5])
-            bolt_holes_str = clean_text(row[6])
-            type_str = clean_text(row[7])
-            
-            rotor_raw["brand"] = brand
-            rotor_raw["catalog_ref"] = catalog_ref
-            
-            # Parse numeric values
-            diameter_match = re.search(r'(\d+(?:\.\d+)?)', diameter_str)
-            if diameter_match:
-                rotor_raw["outer_diameter_mm"] = float(diameter_match.group(1))
-            
-            thickness_match = re.search(r'(\d+(?:\.\d+)?)', thickness_str)
-            if thickness_match:
-                rotor_raw["nominal_thickness_mm"] = float(thickness_match.group(1))
-            
-            height_match = re.search(r'(\d+(?:\.\d+)?)', height_str)
-            if height_match:
-                rotor_raw["overall_height_mm"] = float(height_match.group(1))
-            
-            bore_match = re.search(r'(\d+(?:\.\d+)?)', center_bore_str)
-            if bore_match:
-                rotor_raw["center_bore_mm"] = float(bore_match.group(1))
-            
-            holes_match = re.search(r'(\d+)', bolt_holes_str)
-            if holes_match:
-                rotor_raw["bolt_hole_count"] = int(holes_match.group(1))
-            
-            # Map French type to English
-            type_lower = type_str.lower()
-            if "ventilé" in type_lower or "vented" in type_lower:
-                rotor_raw["ventilation_type"] = "vented"
-            elif "percé" in type_lower or "drilled" in type_lower:
-                rotor_raw["ventilation_type"] = "drilled"
-            elif "rainuré" in type_lower or "slotted" in type_lower:
-                rotor_raw["ventilation_type"] = "slotted"
-            else:
-                rotor_raw["ventilation_type"] = "vented"
+            try:
+                rotor_raw = _parse_misterauto_row(row)
+            except Exception:
+                # Skip malformed rows, continue processing
+                continue
             
             # Only add if we have minimum required fields
-            if brand and catalog_ref:
-                rotors.append(rotor_raw)
-        
-        except Exception as e:
-            # Skip malformed rows, continue processing
-            continue
+            if rotor_raw["brand"] and rotor_raw["catalog_ref"]:
+                yield rotor_raw
+
+
+def _parse_misterauto_row(row: List[str]) -> Dict:
+    """Extract the raw rotor fields of one Mister-Auto table row."""
+    rotor_raw = {}
+    
+    # Extract from table columns
+    brand = clean_text(row[0])
+    catalog_ref = clean_text(row[1])
+    diameter_str = clean_text(row[2])
+    thickness_str = clean_text(row[3])
+    height_str = clean_text(row[4])
+    center_bore_str = clean_text(row[5])
+    bolt_holes_str = clean_text(row[6])
+    type_str = clean_text(row[7])
+    
+    rotor_raw["brand"] = brand
+    rotor_raw["catalog_ref"] = catalog_ref
+    
+    # Parse numeric values
+    diameter_match = re.search(r'(\d+(?:\.\d+)?)', diameter_str)
+    if diameter_match:
+        rotor_raw["outer_diameter_mm"] = float(diameter_match.group(1))
+    
+    thickness_match = re.search(r'(\d+(?:\.\d+)?)', thickness_str)
+    if thickness_match:
+        rotor_raw["nominal_thickness_mm"] = float(thickness_match.group(1))
+    
+    height_match = re.search(r'(\d+(?:\.\d+)?)', height_str)
+    if height_match:
+        rotor_raw["overall_height_mm"] = float(height_match.group(1))
+    
+    bore_match = re.search(r'(\d+(?:\.\d+)?)', center_bore_str)
+    if bore_match:
+        rotor_raw["center_bore_mm"] = float(bore_match.group(1))
+    
+    holes_match = re.search(r'(\d+)', bolt_holes_str)
+    if holes_match:
+        rotor_raw["bolt_hole_count"] = int(holes_match.group(1))
+    
+    # Map French type to English
+    type_lower = type_str.lower()
+    if "ventilé" in type_lower or "vented" in type_lower:
+        rotor_raw["ventilation_type"] = "vented"
+    elif "percé" in type_lower or "drilled" in type_lower:
+        rotor_raw["ventilation_type"] = "drilled"
+    elif "rainuré" in type_lower or "slotted" in type_lower:
+        rotor_raw["ventilation_type"] = "slotted"
+    else:
+        rotor_raw["ventilation_type"] = "vented"
     
-    return rotors
+    return rotor_raw
 
 
 def parse_powerstop_list(html: str) -> List[Dict]:
@@ -272,85 +362,269 @@ def parse_powerstop_list(html: str) -> List[Dict]:
         </div>
     </article>
     """
-    rotors = []
+    return list(iter_powerstop_list(html))
+
+
+def iter_powerstop_list(chunks: HtmlChunks) -> Iterator[Dict]:
+    """
+    Streaming parse_powerstop_list(): yield each rotor when its
+    <article class="rotor-card"> closes.
     
-    # Extract all rotor cards
-    card_pattern = r'<article class="rotor-card"[^>]*>(.*?)</article>'
-    cards = re.findall(card_pattern, html, re.DOTALL)
+    Args:
+        chunks: HTML string or iterable of text chunks
     
-    for card_html in cards:
+    Returns:
+        Iterator of raw rotor dicts
+    """
+    for card_html in _iter_blocks(chunks, POWERSTOP_CARD_START, _find_article_close):
         try:
-            rotor_raw = {
-                "brand": "PowerStop",  # Brand is always PowerStop
-            }
-            
-            # Extract part number
-            part_match = re.search(r'<strong>Part #:</strong>\s*([^<]+)', card_html)
-            if part_match:
-                rotor_raw["catalog_ref"] = clean_text(part_match.group(1))
-            
-            # Extract diameter (in inches with mm in parentheses)
-            diam_match = re.search(r'<strong>Rotor Diameter:</strong>\s*[\d.]+\s*in\s*\((\d+(?:\.\d+)?)\s*mm\)', card_html)
-            if diam_match:
-                rotor_raw["outer_diameter_mm"] = float(diam_match.group(1))
-            
-            # Extract thickness
-            thick_match = re.search(r'<strong>Rotor Thickness:</strong>\s*[\d.]+\s*in\s*\((\d+(?:\.\d+)?)\s*mm\)', card_html)
-            if thick_match:
-                rotor_raw["nominal_thickness_mm"] = float(thick_match.group(1))
-            
-            # Extract height
-            height_match = re.search(r'<strong>Rotor Height:</strong>\s*[\d.]+\s*in\s*\((\d+(?:\.\d+)?)\s*mm\)', card_html)
-            if height_match:
-                rotor_raw["overall_height_mm"] = float(height_match.group(1))
-            
-            # Extract center bore
-            bore_match = re.search(r'<strong>Center Bore:</strong>\s*[\d.]+\s*in\s*\((\d+(?:\.\d+)?)\s*mm\)', card_html)
-            if bore_match:
-                rotor_raw["center_bore_mm"] = float(bore_match.group(1))
-            
-            # Extract bolt pattern for hole count
-            bolt_match = re.search(r'<strong>Bolt Pattern:</strong>\s*(\d+)x', card_html)
-            if bolt_match:
-                rotor_raw["bolt_hole_count"] = int(bolt_match.group(1))
-            
-            # Extract type
-            type_match = re.search(r'<strong>Type:</strong>\s*([^<]+)', card_html)
-            if type_match:
-                type_str = clean_text(type_match.group(1)).lower()
-                if "drilled" in type_str and "slotted" in type_str:
-                    rotor_raw["ventilation_type"] = "drilled_slotted"
-                elif "drilled" in type_str:
-                    rotor_raw["ventilation_type"] = "drilled"
-                elif "slotted" in type_str:
-                    rotor_raw["ventilation_type"] = "slotted"
-                else:
-                    rotor_raw["ventilation_type"] = "vented"
-            
-            # Extract directionality
-            dir_match = re.search(r'<strong>Directional:</strong>\s*([^<]+)', card_html)
-            if dir_match:
-                dir_str = clean_text(dir_match.group(1)).lower()
-                if "yes" in dir_str:
-                    # Check for left/right in parentheses
-                    if "left" in dir_str:
-                        rotor_raw["directionality"] = "left"
-                    elif "right" in dir_str:
-                        rotor_raw["directionality"] = "right"
-                    else:
-                        rotor_raw["directionality"] = "non_directional"
-                else:
-                    rotor_raw["directionality"] = "non_directional"
-            
-            # Only add if we have minimum required fields
-            if rotor_raw.get("catalog_ref"):
-                rotors.append(rotor_raw)
-        
-        except Exception as e:
+            rotor_raw = _parse_powerstop_card(card_html)
+        except Exception:
             # Skip malformed cards, continue processing
             continue
+        
+        # Only add if we have minimum required fields
+        if rotor_raw.get("catalog_ref"):
+            yield rotor_raw
+
+
+def _parse_powerstop_card(card_html: str) -> Dict:
+    """Extract the raw rotor fields of one PowerStop rotor card."""
+    rotor_raw = {
+        "brand": "PowerStop",  # Brand is always PowerStop
+    }
+    
+    # Extract part number
+    part_match = re.search(r'<strong>Part #:</strong>\s*([^<]+)', card_html)
+    if part_match:
+        rotor_raw["catalog_ref"] = clean_text(part_match.group(1))
+    
+    # Extract diameter (in inches with mm in parentheses)
+    diam_match = re.search(r'<strong>Rotor Diameter:</strong>\s*[\d.]+\s*in\s*\((\d+(?:\.\d+)?)\s*mm\)', card_html)
+    if diam_match:
+        rotor_raw["outer_diameter_mm"] = float(diam_match.group(1))
+    
+    # Extract thickness
+    thick_match = re.search(r'<strong>Rotor Thickness:</strong>\s*[\d.]+\s*in\s*\((\d+(?:\.\d+)?)\s*mm\)', card_html)
+    if thick_match:
+        rotor_raw["nominal_thickness_mm"] = float(thick_match.group(1))
+    
+    # Extract height
+    height_match = re.search(r'<strong>Rotor Height:</strong>\s*[\d.]+\s*in\s*\((\d+(?:\.\d+)?)\s*mm\)', card_html)
+    if height_match:
+        rotor_raw["overall_height_mm"] = float(height_match.group(1))
+    
+    # Extract center bore
+    bore_match = re.search(r'<strong>Center Bore:</strong>\s*[\d.]+\s*in\s*\((\d+(?:\.\d+)?)\s*mm\)', card_html)
+    if bore_match:
+        rotor_raw["center_bore_mm"] = float(bore_match.group(1))
+    
+    # Extract bolt pattern for hole count
+    bolt_match = re.search(r'<strong>Bolt Pattern:</strong>\s*(\d+)x', card_html)
+    if bolt_match:
+        rotor_raw["bolt_hole_count"] = int(bolt_match.group(1))
+    
+    # Extract type
+    type_match = re.search(r'<strong>Type:</strong>\s*([^<]+)', card_html)
+    if type_match:
+        type_str = clean_text(type_match.group(1)).lower()
+        if "drilled" in type_str and "slotted" in type_str:
+            rotor_raw["ventilation_type"] = "drilled_slotted"
+        elif "drilled" in type_str:
+            rotor_raw["ventilation_type"] = "drilled"
+        elif "slotted" in type_str:
+            rotor_raw["ventilation_type"] = "slotted"
+        else:
+            rotor_raw["ventilation_type"] = "vented"
+    
+    # Extract directionality
+    dir_match = re.search(r'<strong>Directional:</strong>\s*([^<]+)', card_html)
+    if dir_match:
+        dir_str = clean_text(dir_match.group(1)).lower()
+        if "yes" in dir_str:
+            # Check for left/right in parentheses
+            if "left" in dir_str:
+                rotor_raw["directionality"] = "left"
+            elif "right" in dir_str:
+                rotor_raw["directionality"] = "right"
+            else:
+                rotor_raw["directionality"] = "non_directional"
+        else:
+            rotor_raw["directionality"] = "non_directional"
+    
+    return rotor_raw
+
+
+# ============================================================
+# Link Discovery (pagination, product detail pages)
+# ============================================================
+
+# List sources whose pages only link to product pages (no specs on the page)
+LINK_ONLY_SOURCES = ("dba",)
+
+# Class of the product detail links per source; only sources whose product
+# pages have a parser (parse_dba_rotor_page). The other list sites carry the
+# specs in their rows, their detail pages are not followed.
+PRODUCT_LINK_CLASSES = {
+    "dba": ("woocommerce-LoopProduct-link",),   # WooCommerce category grid
+}
+
+# Pagination link classes (rel="next" is recognized on any <a> / <link>)
+NEXT_LINK_CLASSES = ("next", "next-page", "pagination-next", "pagination__next")
+
+# Query parameters dropped by canonicalize_url() (tracking, not content)
+TRACKING_PARAMS = ("gclid", "fbclid", "msclkid", "mc_cid", "mc_eid")
+
+_LINK_TAG = re.compile(r'<(?:a|link)\b([^>]*)>', re.IGNORECASE)
+_ATTRIBUTE = re.compile(r'([a-zA-Z_:][-\w:.]*)\s*=\s*(?:"([^"]*)"|\'([^\']*)\'|([^\s"\'>]+))')
+_DEFAULT_PORTS = {"http": 80, "https": 443}
+
+
+def canonicalize_url(url: str, base_url: Optional[str] = None) -> Optional[str]:
+    """
+    Canonical form of a link, so one page is visited once whatever its
+    spelling.
+    
+    Relative links are resolved against base_url; scheme and host are
+    lowercased, default ports, fragments and tracking parameters (utm_*,
+    TRACKING_PARAMS) dropped, and the query sorted.
+    
+    Args:
+        url: Link (href value)
+        base_url: URL of the page the link was found on
+    
+    Returns:
+        Canonical absolute URL, or None for non-HTTP links (mailto:,
+        javascript:, ...)
+    """
+    url = url.strip()
+    if base_url:
+        url = urljoin(base_url, url)
+    parts = urlsplit(url)
+    scheme = parts.scheme.lower()
+    if scheme not in _DEFAULT_PORTS or not parts.hostname:
+        return None
+    host = parts.hostname.lower()
+    try:
+        port = parts.port
+    except ValueError:
+        return None
+    if port is not None and port != _DEFAULT_PORTS[scheme]:
+        host = f"{host}:{port}"
+    query = sorted((key, value) for key, value in parse_qsl(parts.query, keep_blank_values=True)
+                   if not key.lower().startswith("utm_") and key.lower() not in TRACKING_PARAMS)
+    return urlunsplit((scheme, host, parts.path or "/", urlencode(query), ""))
+
+
+def extract_list_links(html: str, source: str, base_url: str) -> List[Tuple[str, str]]:
+    """
+    Links of a catalog page to follow: next pages and product detail pages.
+    
+    Args:
+        html: Raw HTML content of the catalog page
+        source: Site identifier (selects the product link classes)
+        base_url: URL of the page (resolves relative links; only links on
+                  the same host are returned)
+    
+    Returns:
+        [(canonical_url, page_type)] in page order without duplicates,
+        page_type "list" for next pages and "product" for product pages
+    """
+    base = canonicalize_url(base_url)
+    if base is None:
+        return []
+    host = urlsplit(base).netloc
+    product_classes = set(PRODUCT_LINK_CLASSES.get(source, ()))
+    links = []
+    seen = {base}
+    for match in _LINK_TAG.finditer(html):
+        attrs = {name.lower(): html_lib.unescape(double or single or bare)
+                 for name, double, single, bare in _ATTRIBUTE.findall(match.group(1))}
+        href = attrs.get("href")
+        if not href:
+            continue
+        classes = set(attrs.get("class", "").split())
+        if "next" in attrs.get("rel", "").lower().split() or classes & set(NEXT_LINK_CLASSES):
+            page_type = "list"
+        elif classes & product_classes:
+            page_type = "product"
+        else:
+            continue
+        url = canonicalize_url(href, base)
+        if url is None or url in seen or urlsplit(url).netloc != host:
+            continue
+        seen.add(url)
+        links.append((url, page_type))
+    return links
+
+
+# ============================================================
+# Helper: Incremental block splitting
+# ============================================================
+
+AUTODOC_ITEM_START = re.compile(r'<div class="product-item">')
+POWERSTOP_CARD_START = re.compile(r'<article class="rotor-card"[^>]*>')
+_DIV_TAG = re.compile(r'<(/?)div\b[^>]*>', re.IGNORECASE)
+
+
+def _as_chunks(chunks: HtmlChunks) -> Iterable[str]:
+    """Accept a whole HTML string as a single chunk."""
+    return (chunks,) if isinstance(chunks, str) else chunks
+
+
+def _find_div_close(buffer: str, pos: int) -> Optional[int]:
+    """
+    Index of the </div> closing a <div> opened just before pos, or None if
+    the buffer ends first.
+    """
+    depth = 1
+    for match in _DIV_TAG.finditer(buffer, pos):
+        depth += -1 if match.group(1) else 1
+        if depth == 0:
+            return match.start()
+    return None
+
+
+def _find_article_close(buffer: str, pos: int) -> Optional[int]:
+    """Index of the first </article> after pos, or None if not read yet."""
+    end = buffer.find("</article>", pos)
+    return end if end >= 0 else None
+
+
+def _iter_blocks(chunks: HtmlChunks, start: "re.Pattern",
+                 find_end: Callable[[str, int], Optional[int]]) -> Iterator[str]:
+    """
+    Yield the inner HTML of each block opened by `start` as soon as
+    find_end() locates its end in the text read so far.
+    
+    Only the current (unfinished) block, or the trailing partial tag between
+    blocks, is buffered. A block still open when the input ends is dropped.
+    
+    Args:
+        chunks: HTML string or iterable of text chunks
+        start: Compiled pattern matching the block's opening tag
+        find_end: (buffer, content_start) -> index of the closing tag or None
     
-    return rotors
+    Returns:
+        Iterator of block contents (between the opening and closing tags)
+    """
+    buffer = ""
+    for chunk in _as_chunks(chunks):
+        buffer += chunk
+        pos = 0
+        while True:
+            opening = start.search(buffer, pos)
+            if opening is None:
+                # Keep a trailing tag that may be an opening tag cut in two
+                tail = buffer.rfind("<", pos)
+                buffer = buffer[tail:] if tail >= 0 and ">" not in buffer[tail:] else ""
+                break
+            end = find_end(buffer, opening.end())
+            if end is None:
+                buffer = buffer[opening.start():]
+                break
+            yield buffer[opening.end():end]
+            pos = end
 
 
 # ============================================================
@@ -366,6 +640,9 @@ class SimpleTableParser(HTMLParser):
         parser.feed(html)
         rows = parser.get_rows()  # [[cell1, cell2, ...], ...]
     
+    When fed chunk by chunk, pop_rows() hands over the rows completed so
+    far so that they are not all kept until the end of the page.
+    
     Useful for sites with simple table-based product listings.
     """
     
@@ -406,6 +683,11 @@ class SimpleTableParser(HTMLParser):
     def get_rows(self) -> List[List[str]]:
         """Return all extracted table rows."""
         return self.rows
+    
+    def pop_rows(self) -> List[List[str]]:
+        """Return the rows completed since the last call and forget them."""
+        rows, self.rows = self.rows, []
+        return rows
 
 
 # ============================================================
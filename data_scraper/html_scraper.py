@@ -1,22 +1,97 @@
 # data_scraper/html_scraper.py
 
 import re
-import requests
-from bs4 import BeautifulSoup
+from typing import Iterator
+
+from data_scraper.html_cache import get_cache
+from data_scraper.http_archive import get_archive
+from data_scraper.http_client import STREAM_CHUNK_SIZE, http_get, iter_response_text, response_text
+from data_scraper.spec_extract import LabelRules, apply_label_rules, make_soup, parse_spec_nodes
 
 # ------------------------------------------------------------
 #  Fetch
 # ------------------------------------------------------------
 
-def fetch_html(url: str) -> str:
-    resp = requests.get(url, timeout=10)
+def fetch_html(url: str, timeout: float = 10) -> str:
+    # Record/replay archive takes precedence (data_scraper/http_archive.py)
+    archive = get_archive()
+    if archive is not None:
+        resp = archive.get(url, timeout=timeout)
+        resp.raise_for_status()
+        return response_text(resp)
+    # On-disk cache with conditional revalidation, when enabled
+    # (data_scraper/html_cache.py)
+    cache = get_cache()
+    if cache is not None:
+        return cache.fetch(url, timeout=timeout)
+    # Shared keep-alive session (data_scraper/http_client.py)
+    resp = http_get(url, timeout=timeout)
     resp.raise_for_status()
-    return resp.text
+    return response_text(resp)
+
+
+def stream_html(url: str, timeout: float = 10,
+                chunk_size: int = STREAM_CHUNK_SIZE) -> Iterator[str]:
+    """
+    Like fetch_html(), but yield the page as text chunks while it downloads
+    (for the streaming list parsers, html_rotor_list_scraper.iter_*).
+
+    Archived and cached pages are already held whole and are yielded as a
+    single chunk.
+    """
+    if get_archive() is not None or get_cache() is not None:
+        yield fetch_html(url, timeout=timeout)
+        return
+    resp = http_get(url, timeout=timeout, stream=True)
+    try:
+        resp.raise_for_status()
+    except Exception:
+        resp.close()
+        raise
+    yield from iter_response_text(resp, chunk_size)
 
 # ------------------------------------------------------------
 #  Parsing — DBA Rotors
 # ------------------------------------------------------------
 
+# Label -> field rules, first match wins (data_scraper/spec_extract.py)
+# Strategy 1 (tables): check PCD/bolt circle FIRST before "diameter" alone
+DBA_TABLE_RULES = LabelRules([
+    ("pcd | bolt circle | pitch circle", "bolt_circle_mm"),
+    ("center bore | centre bore | hub bore", "center_bore_mm"),
+    ("outer diameter | diameter+!bolt+!pcd", "outer_diameter_mm"),
+    ("thickness+nominal | thickness+!hat+!overall+!rotor", "nominal_thickness_mm"),
+    ("hat height | hat-height", "hat_height_mm"),
+    ("overall height | overall-height | total height", "overall_height_mm"),
+    ("bolt hole | hole count | stud holes", "bolt_hole_count"),
+    ("ventilation | vented", "ventilation_type", str.lower),
+    ("directional", "directionality", str.lower),
+    ("weight", "rotor_weight_kg"),
+    ("mounting", "mounting_type", str.lower),
+    ("offset", "offset_mm"),
+    ("part | ref | sku | code", "ref"),
+])
+
+# Strategy 2 (definition lists)
+DBA_DL_RULES = LabelRules([
+    ("pcd | bolt circle", "bolt_circle_mm"),
+    ("diameter+!bolt", "outer_diameter_mm"),
+    ("thickness", "nominal_thickness_mm"),
+    ("hat height", "hat_height_mm"),
+    ("overall height", "overall_height_mm"),
+    ("center bore | centre bore", "center_bore_mm"),
+    ("bolt hole", "bolt_hole_count"),
+    ("part | ref", "ref"),
+])
+
+# Strategy 3 (data attributes): attribute -> field
+DBA_DATA_ATTRS = {
+    "data-diameter": "outer_diameter_mm",
+    "data-thickness": "nominal_thickness_mm",
+    "data-hat-height": "hat_height_mm",
+}
+
+
 def parse_dba_rotor_page(html: str) -> dict:
     """
     Parse a DBA rotor product page and extract rotor specifications.
@@ -27,7 +102,7 @@ def parse_dba_rotor_page(html: str) -> dict:
     Returns:
         Normalized rotor dict conforming to schema_rotor.json
     """
-    soup = BeautifulSoup(html, "html.parser")
+    nodes = parse_spec_nodes(html, DBA_DATA_ATTRS)
     raw = {}
     
     def clean_value(text: str) -> str:
@@ -42,109 +117,42 @@ def parse_dba_rotor_page(html: str) -> dict:
     
     # Strategy 1: Look for specification table (most common in product pages)
     # Typical structure: <table> with <tr><td>Label</td><td>Value</td></tr>
-    tables = soup.find_all('table')
-    for table in tables:
-        rows = table.find_all('tr')
-        for row in rows:
-            cells = row.find_all(['td', 'th'])
-            if len(cells) >= 2:
-                label = cells[0].get_text().strip().lower()
-                value = clean_value(cells[1].get_text())
-                
-                # Map common label variations to our field names
-                # Check PCD/bolt circle FIRST before checking for "diameter" alone
-                if 'pcd' in label or 'bolt circle' in label or 'pitch circle' in label:
-                    raw['bolt_circle_mm'] = value
-                elif 'center bore' in label or 'centre bore' in label or 'hub bore' in label:
-                    raw['center_bore_mm'] = value
-                elif 'outer diameter' in label or (('diameter' in label or 'rotor diameter' in label) and 'bolt' not in label and 'pcd' not in label):
-                    raw['outer_diameter_mm'] = value
-                elif 'thickness' in label and 'nominal' in label:
-                    raw['nominal_thickness_mm'] = value
-                elif 'thickness' in label and 'hat' not in label and 'overall' not in label and 'rotor' not in label:
-                    raw['nominal_thickness_mm'] = value
-                elif 'hat height' in label or 'hat-height' in label:
-                    raw['hat_height_mm'] = value
-                elif 'overall height' in label or 'overall-height' in label or 'total height' in label:
-                    raw['overall_height_mm'] = value
-                elif 'bolt hole' in label or 'hole count' in label or 'stud holes' in label:
-                    raw['bolt_hole_count'] = value
-                elif 'ventilation' in label or 'vented' in label:
-                    raw['ventilation_type'] = value.lower()
-                elif 'directional' in label:
-                    raw['directionality'] = value.lower()
-                elif 'weight' in label:
-                    raw['rotor_weight_kg'] = value
-                elif 'mounting' in label:
-                    raw['mounting_type'] = value.lower()
-                elif 'offset' in label:
-                    raw['offset_mm'] = value
-                elif 'part' in label or 'ref' in label or 'sku' in label or 'code' in label:
-                    raw['ref'] = value
+    apply_label_rules(nodes["table_rows"], DBA_TABLE_RULES, raw, clean_value)
     
     # Strategy 2: Look for definition lists (dl/dt/dd)
-    dls = soup.find_all('dl')
-    for dl in dls:
-        terms = dl.find_all('dt')
-        definitions = dl.find_all('dd')
-        for dt, dd in zip(terms, definitions):
-            label = dt.get_text().strip().lower()
-            value = clean_value(dd.get_text())
-            
-            # Check PCD first
-            if 'pcd' in label or 'bolt circle' in label:
-                raw['bolt_circle_mm'] = value
-            elif 'diameter' in label and 'bolt' not in label:
-                raw['outer_diameter_mm'] = value
-            elif 'thickness' in label:
-                raw['nominal_thickness_mm'] = value
-            elif 'hat height' in label:
-                raw['hat_height_mm'] = value
-            elif 'overall height' in label:
-                raw['overall_height_mm'] = value
-            elif 'center bore' in label or 'centre bore' in label:
-                raw['center_bore_mm'] = value
-            elif 'bolt hole' in label:
-                raw['bolt_hole_count'] = value
-            elif 'part' in label or 'ref' in label:
-                raw['ref'] = value
+    apply_label_rules(nodes["dl_pairs"], DBA_DL_RULES, raw, clean_value)
     
     # Strategy 3: Look for divs/spans with data attributes
-    spec_divs = soup.find_all(['div', 'span'], class_=lambda x: x and ('spec' in x.lower() or 'product' in x.lower()))
-    for div in spec_divs:
-        # Check for data attributes
-        if div.has_attr('data-diameter'):
-            raw['outer_diameter_mm'] = clean_value(div.get('data-diameter'))
-        if div.has_attr('data-thickness'):
-            raw['nominal_thickness_mm'] = clean_value(div.get('data-thickness'))
-        if div.has_attr('data-hat-height'):
-            raw['hat_height_mm'] = clean_value(div.get('data-hat-height'))
+    for div, classes in nodes["data_elements"]:
+        if 'spec' in classes or 'product' in classes:
+            for attr, field in DBA_DATA_ATTRS.items():
+                if div.has_attr(attr):
+                    raw[field] = clean_value(div.get(attr))
+    
+    h1 = nodes["h1"]
+    title = h1.get_text() if h1 else None
     
     # Extract product reference from title, h1, or product code
     if 'ref' not in raw:
         # Try h1 title
-        h1 = soup.find('h1')
-        if h1:
-            title = h1.get_text().strip()
+        if title is not None:
             # Look for DBA part numbers (usually format: DBA####X or DBA#####XY)
             # Find all matches and take the longest one (most specific)
-            matches = re.findall(r'DBA\s*\d+[A-Z0-9]*', title, re.IGNORECASE)
+            matches = re.findall(r'DBA\s*\d+[A-Z0-9]*', title.strip(), re.IGNORECASE)
             if matches:
                 # Take the longest match (most specific product code)
                 longest_match = max(matches, key=lambda x: len(x.replace(' ', '')))
                 raw['ref'] = longest_match.replace(' ', '')
         
         # Try product code meta or div
-        product_code = soup.find(['div', 'span'], class_=lambda x: x and 'product-code' in x.lower())
-        if product_code:
-            raw['ref'] = clean_value(product_code.get_text())
+        if nodes["product_code"] is not None:
+            raw['ref'] = clean_value(nodes["product_code"].get_text())
     
     # Set defaults for fields that might not be in HTML
     if 'ventilation_type' not in raw:
         # Try to infer from product title or description
-        title_text = soup.find('h1')
-        if title_text:
-            title_lower = title_text.get_text().lower()
+        if title is not None:
+            title_lower = title.lower()
             if 'slotted' in title_lower and 'drilled' in title_lower:
                 raw['ventilation_type'] = 'drilled_slotted'
             elif 'slotted' in title_lower:
@@ -167,7 +175,7 @@ def parse_dba_rotor_page(html: str) -> dict:
 # ------------------------------------------------------------
 
 def parse_brembo_rotor_page(html: str) -> list[dict]:
-    soup = BeautifulSoup(html, "html.parser")
+    soup = make_soup(html)
     results = []
 
     # TODO: Extract HTML table of rotor specs.
@@ -177,6 +185,38 @@ def parse_brembo_rotor_page(html: str) -> list[dict]:
 #  Parsing — EBC Pads
 # ------------------------------------------------------------
 
+# Strategy 1 (tables); "shape" labels are taken before the part/ref rule,
+# so a shape code is never mistaken for the catalog ref
+EBC_TABLE_RULES = LabelRules([
+    ("shape", "shape_id"),
+    ("length", "length_mm"),
+    ("height", "height_mm"),
+    ("thickness", "thickness_mm"),
+    ("swept area | area", "swept_area_mm2"),
+    ("backing | plate type", "backing_plate_type"),
+    ("part | ref | sku | code", "catalog_ref"),
+])
+
+# Strategy 2 (definition lists)
+EBC_DL_RULES = LabelRules([
+    ("shape", "shape_id"),
+    ("length", "length_mm"),
+    ("height", "height_mm"),
+    ("thickness", "thickness_mm"),
+    ("swept area", "swept_area_mm2"),
+    ("backing", "backing_plate_type"),
+    ("part | ref", "catalog_ref"),
+])
+
+# Strategy 3 (data attributes)
+EBC_DATA_ATTRS = {
+    "data-shape": "shape_id",
+    "data-length": "length_mm",
+    "data-height": "height_mm",
+    "data-thickness": "thickness_mm",
+}
+
+
 def parse_ebc_pad_page(html: str) -> dict:
     """
     Parse an EBC pad product page and extract pad specifications.
@@ -187,7 +227,7 @@ def parse_ebc_pad_page(html: str) -> dict:
     Returns:
         Normalized pad dict conforming to schema_pad.json
     """
-    soup = BeautifulSoup(html, "html.parser")
+    nodes = parse_spec_nodes(html, EBC_DATA_ATTRS)
     raw = {}
     
     def clean_value(text: str) -> str:
@@ -200,90 +240,36 @@ def parse_ebc_pad_page(html: str) -> dict:
         return text.strip()
     
     # Strategy 1: Look for specification table
-    tables = soup.find_all('table')
-    for table in tables:
-        rows = table.find_all('tr')
-        for row in rows:
-            cells = row.find_all(['td', 'th'])
-            if len(cells) >= 2:
-                label = cells[0].get_text().strip().lower()
-                value = clean_value(cells[1].get_text())
-                
-                # Map labels to field names
-                if 'shape' in label and 'id' in label:
-                    raw['shape_id'] = value
-                elif 'shape' in label or 'shape code' in label:
-                    raw['shape_id'] = value
-                elif 'length' in label:
-                    raw['length_mm'] = value
-                elif 'height' in label:
-                    raw['height_mm'] = value
-                elif 'thickness' in label:
-                    raw['thickness_mm'] = value
-                elif 'swept area' in label or 'area' in label:
-                    raw['swept_area_mm2'] = value
-                elif 'backing' in label or 'plate type' in label:
-                    raw['backing_plate_type'] = value
-                elif 'part' in label or 'ref' in label or 'sku' in label or 'code' in label:
-                    if 'shape' not in label:  # Don't confuse with shape_id
-                        raw['catalog_ref'] = value
+    apply_label_rules(nodes["table_rows"], EBC_TABLE_RULES, raw, clean_value)
     
     # Strategy 2: Look for definition lists
-    dls = soup.find_all('dl')
-    for dl in dls:
-        terms = dl.find_all('dt')
-        definitions = dl.find_all('dd')
-        for dt, dd in zip(terms, definitions):
-            label = dt.get_text().strip().lower()
-            value = clean_value(dd.get_text())
-            
-            if 'shape' in label:
-                raw['shape_id'] = value
-            elif 'length' in label:
-                raw['length_mm'] = value
-            elif 'height' in label:
-                raw['height_mm'] = value
-            elif 'thickness' in label:
-                raw['thickness_mm'] = value
-            elif 'swept area' in label:
-                raw['swept_area_mm2'] = value
-            elif 'backing' in label:
-                raw['backing_plate_type'] = value
-            elif 'part' in label or 'ref' in label:
-                raw['catalog_ref'] = value
+    apply_label_rules(nodes["dl_pairs"], EBC_DL_RULES, raw, clean_value)
     
     # Strategy 3: Look for data attributes
-    spec_divs = soup.find_all(['div', 'span'], class_=lambda x: x and ('spec' in x.lower() or 'pad' in x.lower()))
-    for div in spec_divs:
-        if div.has_attr('data-shape'):
-            raw['shape_id'] = clean_value(div.get('data-shape'))
-        if div.has_attr('data-length'):
-            raw['length_mm'] = clean_value(div.get('data-length'))
-        if div.has_attr('data-height'):
-            raw['height_mm'] = clean_value(div.get('data-height'))
-        if div.has_attr('data-thickness'):
-            raw['thickness_mm'] = clean_value(div.get('data-thickness'))
+    for div, classes in nodes["data_elements"]:
+        if 'spec' in classes or 'pad' in classes:
+            for attr, field in EBC_DATA_ATTRS.items():
+                if div.has_attr(attr):
+                    raw[field] = clean_value(div.get(attr))
+    
+    h1 = nodes["h1"]
+    title = h1.get_text().strip() if h1 else None
     
     # Extract catalog ref from title/h1 if not found
     if 'catalog_ref' not in raw:
-        h1 = soup.find('h1')
-        if h1:
-            title = h1.get_text().strip()
+        if title is not None:
             # Look for EBC part numbers (usually format: DP####XX or FA####XX)
             match = re.search(r'(DP|FA|EBC)\s*\d+[A-Z]*', title, re.IGNORECASE)
             if match:
                 raw['catalog_ref'] = match.group(0).replace(' ', '')
         
         # Try product code div/span
-        product_code = soup.find(['div', 'span'], class_=lambda x: x and 'product-code' in x.lower())
-        if product_code:
-            raw['catalog_ref'] = clean_value(product_code.get_text())
+        if nodes["product_code"] is not None:
+            raw['catalog_ref'] = clean_value(nodes["product_code"].get_text())
     
     # Extract shape_id from title if not found
     if 'shape_id' not in raw:
-        h1 = soup.find('h1')
-        if h1:
-            title = h1.get_text().strip()
+        if title is not None:
             # Look for shape codes (often alphanumeric like "FA123" or just numbers)
             match = re.search(r'Shape\s*:?\s*([A-Z0-9]+)', title, re.IGNORECASE)
             if match:
@@ -296,6 +282,53 @@ def parse_ebc_pad_page(html: str) -> dict:
 #  Parsing — Wheel-Size Vehicle Fitment
 # ------------------------------------------------------------
 
+# Strategy 1 (tables)
+WHEELSIZE_TABLE_RULES = LabelRules([
+    # Vehicle identification
+    ("make | manufacturer", "make"),
+    ("model", "model"),
+    ("generation", "generation"),
+    ("year from | start year", "year_from_raw"),
+    ("year to | end year", "year_to_raw"),
+    # "Years: 2016-2020" format
+    ("year+!from+!to", "years_raw"),
+    # Hub specifications
+    ("pcd | bolt pattern | bolt circle", "hub_bolt_pattern_raw"),
+    ("bolt holes | stud count | lugs", "hub_bolt_hole_count_raw"),
+    ("center bore | centre bore | hub bore", "hub_center_bore_mm_raw"),
+    # Front wheel/tire specs
+    ("front wheel width | front rim width", "front_wheel_width_in_raw"),
+    ("front wheel diameter | front rim diameter | front wheel size", "front_wheel_diameter_in_raw"),
+    ("front tire", "front_tire_dimensions_raw"),
+    # Rear wheel/tire specs
+    ("rear wheel width | rear rim width", "rear_wheel_width_in_raw"),
+    ("rear wheel diameter | rear rim diameter | rear wheel size", "rear_wheel_diameter_in_raw"),
+    ("rear tire", "rear_tire_dimensions_raw"),
+    # Rotor specifications
+    ("front rotor diameter | front disc diameter", "front_rotor_outer_diameter_mm_raw"),
+    ("front rotor thickness | front disc thickness", "front_rotor_thickness_mm_raw"),
+    ("rear rotor diameter | rear disc diameter", "rear_rotor_outer_diameter_mm_raw"),
+    ("rear rotor thickness | rear disc thickness", "rear_rotor_thickness_mm_raw"),
+])
+
+# Strategy 2 (definition lists)
+WHEELSIZE_DL_RULES = LabelRules([
+    ("make", "make"),
+    ("model", "model"),
+    ("generation", "generation"),
+    ("pcd | bolt pattern", "hub_bolt_pattern_raw"),
+    ("center bore | centre bore", "hub_center_bore_mm_raw"),
+])
+
+# Strategy 3 (data attributes)
+WHEELSIZE_DATA_ATTRS = {
+    "data-make": "make",
+    "data-model": "model",
+    "data-pcd": "hub_bolt_pattern_raw",
+    "data-bore": "hub_center_bore_mm_raw",
+}
+
+
 def parse_wheelsize_vehicle_page(html: str) -> dict:
     """
     Parse a Wheel-Size vehicle page and extract vehicle/hub/wheel specifications.
@@ -306,7 +339,7 @@ def parse_wheelsize_vehicle_page(html: str) -> dict:
     Returns:
         Raw dict with vehicle specs (not yet normalized - use normalize_vehicle in Mission 6)
     """
-    soup = BeautifulSoup(html, "html.parser")
+    nodes = parse_spec_nodes(html, WHEELSIZE_DATA_ATTRS)
     raw = {}
     
     def clean_value(text: str) -> str:
@@ -319,99 +352,20 @@ def parse_wheelsize_vehicle_page(html: str) -> dict:
         return text.strip()
     
     # Strategy 1: Look for specification tables
-    tables = soup.find_all('table')
-    for table in tables:
-        rows = table.find_all('tr')
-        for row in rows:
-            cells = row.find_all(['td', 'th'])
-            if len(cells) >= 2:
-                label = cells[0].get_text().strip().lower()
-                value = clean_value(cells[1].get_text())
-                
-                # Vehicle identification
-                if 'make' in label or 'manufacturer' in label:
-                    raw['make'] = value
-                elif 'model' in label:
-                    raw['model'] = value
-                elif 'generation' in label:
-                    raw['generation'] = value
-                elif 'year from' in label or 'start year' in label:
-                    raw['year_from_raw'] = value
-                elif 'year to' in label or 'end year' in label:
-                    raw['year_to_raw'] = value
-                elif ('year' in label or 'years' in label) and 'from' not in label and 'to' not in label:
-                    # Handle "Years: 2016-2020" format
-                    raw['years_raw'] = value
-                
-                # Hub specifications
-                elif 'pcd' in label or 'bolt pattern' in label or 'bolt circle' in label:
-                    raw['hub_bolt_pattern_raw'] = value
-                elif 'bolt holes' in label or 'stud count' in label or 'lugs' in label:
-                    raw['hub_bolt_hole_count_raw'] = value
-                elif 'center bore' in label or 'centre bore' in label or 'hub bore' in label:
-                    raw['hub_center_bore_mm_raw'] = value
-                
-                # Front wheel/tire specs
-                elif 'front wheel width' in label or 'front rim width' in label:
-                    raw['front_wheel_width_in_raw'] = value
-                elif 'front wheel diameter' in label or 'front rim diameter' in label or 'front wheel size' in label:
-                    raw['front_wheel_diameter_in_raw'] = value
-                elif 'front tire' in label:
-                    raw['front_tire_dimensions_raw'] = value
-                
-                # Rear wheel/tire specs
-                elif 'rear wheel width' in label or 'rear rim width' in label:
-                    raw['rear_wheel_width_in_raw'] = value
-                elif 'rear wheel diameter' in label or 'rear rim diameter' in label or 'rear wheel size' in label:
-                    raw['rear_wheel_diameter_in_raw'] = value
-                elif 'rear tire' in label:
-                    raw['rear_tire_dimensions_raw'] = value
-                
-                # Rotor specifications
-                elif 'front rotor diameter' in label or 'front disc diameter' in label:
-                    raw['front_rotor_outer_diameter_mm_raw'] = value
-                elif 'front rotor thickness' in label or 'front disc thickness' in label:
-                    raw['front_rotor_thickness_mm_raw'] = value
-                elif 'rear rotor diameter' in label or 'rear disc diameter' in label:
-                    raw['rear_rotor_outer_diameter_mm_raw'] = value
-                elif 'rear rotor thickness' in label or 'rear disc thickness' in label:
-                    raw['rear_rotor_thickness_mm_raw'] = value
+    apply_label_rules(nodes["table_rows"], WHEELSIZE_TABLE_RULES, raw, clean_value)
     
     # Strategy 2: Look for definition lists
-    dls = soup.find_all('dl')
-    for dl in dls:
-        terms = dl.find_all('dt')
-        definitions = dl.find_all('dd')
-        for dt, dd in zip(terms, definitions):
-            label = dt.get_text().strip().lower()
-            value = clean_value(dd.get_text())
-            
-            if 'make' in label:
-                raw['make'] = value
-            elif 'model' in label:
-                raw['model'] = value
-            elif 'generation' in label:
-                raw['generation'] = value
-            elif 'pcd' in label or 'bolt pattern' in label:
-                raw['hub_bolt_pattern_raw'] = value
-            elif 'center bore' in label or 'centre bore' in label:
-                raw['hub_center_bore_mm_raw'] = value
+    apply_label_rules(nodes["dl_pairs"], WHEELSIZE_DL_RULES, raw, clean_value)
     
-    # Strategy 3: Look for data attributes
-    spec_divs = soup.find_all(['div', 'span'], attrs=lambda x: x and any(k.startswith('data-') for k in x.keys()) if x else False)
-    for div in spec_divs:
-        if div.has_attr('data-make'):
-            raw['make'] = clean_value(div.get('data-make'))
-        if div.has_attr('data-model'):
-            raw['model'] = clean_value(div.get('data-model'))
-        if div.has_attr('data-pcd'):
-            raw['hub_bolt_pattern_raw'] = clean_value(div.get('data-pcd'))
-        if div.has_attr('data-bore'):
-            raw['hub_center_bore_mm_raw'] = clean_value(div.get('data-bore'))
+    # Strategy 3: Look for divs/spans with data attributes
+    for div, _ in nodes["data_elements"]:
+        for attr, field in WHEELSIZE_DATA_ATTRS.items():
+            if div.has_attr(attr):
+                raw[field] = clean_value(div.get(attr))
     
     # Extract make/model from title/h1 if not found
     if 'make' not in raw or 'model' not in raw:
-        h1 = soup.find('h1')
+        h1 = nodes["h1"]
         if h1:
             title = h1.get_text().strip()
             # Try to parse "Honda Civic 2016-2020" or similar formats
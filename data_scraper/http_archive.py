@@ -0,0 +1,178 @@
+# data_scraper/http_archive.py
+"""
+Record/replay archive of HTTP responses for offline re-ingestion.
+
+Testing a parser or normalizer change end to end used to mean crawling the
+live sites again. With an archive:
+- record mode: every response fetched by fetch_html() (status, headers,
+  body — error responses included) is written to the archive
+- replay mode: fetch_html() answers from the archive only, at disk speed;
+  archived 4xx/5xx responses raise the same requests.HTTPError as live
+
+Layout of an archive directory:
+- index.jsonl : one line per response
+                {"url", "status", "reason", "headers", "body", "fetched_at"}
+                (a URL recorded twice resolves to its last line)
+- bodies/<sha256>.gz : gzip-compressed raw bodies, keyed by content hash
+
+scrape_and_ingest.py exposes it as --record DIR / --replay DIR.
+"""
+
+import gzip
+import hashlib
+import json
+import os
+import threading
+import time
+from typing import Dict, Optional
+
+import requests
+from requests.structures import CaseInsensitiveDict
+
+from data_scraper.http_client import DEFAULT_TIMEOUT_S, http_get
+
+RECORD = "record"
+REPLAY = "replay"
+
+# Describe the original transfer, not the decoded body stored in the archive
+_DROPPED_HEADERS = {"content-encoding", "content-length", "transfer-encoding", "connection"}
+
+
+class ArchiveMiss(LookupError):
+    """Raised in replay mode when a URL was never recorded."""
+
+
+class HttpArchive:
+    """
+    Directory-backed response archive (see module docstring).
+
+    Args:
+        archive_dir: Archive directory (created in record mode)
+        mode: RECORD or REPLAY
+    """
+
+    def __init__(self, archive_dir: str, mode: str = REPLAY):
+        if mode not in (RECORD, REPLAY):
+            raise ValueError(f"mode must be '{RECORD}' or '{REPLAY}', got {mode!r}")
+        self.archive_dir = archive_dir
+        self.mode = mode
+        self.stats = {"recorded": 0, "replayed": 0, "missing": 0}
+        self._lock = threading.Lock()
+        self._index: Dict[str, Dict] = {}
+
+        index_path = os.path.join(archive_dir, "index.jsonl")
+        if mode == RECORD:
+            os.makedirs(os.path.join(archive_dir, "bodies"), exist_ok=True)
+        elif not os.path.isfile(index_path):
+            raise FileNotFoundError(f"No HTTP archive index at {index_path}")
+
+        if os.path.isfile(index_path):
+            with open(index_path, encoding="utf-8") as f:
+                for line in f:
+                    if line.strip():
+                        entry = json.loads(line)
+                        self._index[entry["url"]] = entry
+
+    def __len__(self) -> int:
+        return len(self._index)
+
+    def __contains__(self, url: str) -> bool:
+        return url in self._index
+
+    def _body_path(self, body_hash: str) -> str:
+        return os.path.join(self.archive_dir, "bodies", f"{body_hash}.gz")
+
+    # --------------------------------------------------------
+    #  Record
+    # --------------------------------------------------------
+
+    def record(self, url: str, resp: requests.Response) -> None:
+        """Append a response (any status) to the archive."""
+        body = resp.content
+        body_hash = hashlib.sha256(body).hexdigest()
+        path = self._body_path(body_hash)
+        if not os.path.exists(path):
+            tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+            with open(tmp_path, "wb") as f:
+                f.write(gzip.compress(body))
+            os.replace(tmp_path, path)
+
+        entry = {
+            "url": url,
+            "status": resp.status_code,
+            "reason": resp.reason,
+            "headers": {k: v for k, v in resp.headers.items()
+                        if k.lower() not in _DROPPED_HEADERS},
+            "body": body_hash,
+            "fetched_at": time.time(),
+        }
+        line = json.dumps(entry, ensure_ascii=False) + "\n"
+        with self._lock:
+            with open(os.path.join(self.archive_dir, "index.jsonl"), "a", encoding="utf-8") as f:
+                f.write(line)
+            self._index[url] = entry
+            self.stats["recorded"] += 1
+
+    # --------------------------------------------------------
+    #  Replay
+    # --------------------------------------------------------
+
+    def replay(self, url: str) -> requests.Response:
+        """
+        Rebuild the archived response for url.
+
+        Raises:
+            ArchiveMiss: url not in the archive
+        """
+        entry = self._index.get(url)
+        if entry is None:
+            with self._lock:
+                self.stats["missing"] += 1
+            raise ArchiveMiss(f"Replay mode: {url} not in HTTP archive {self.archive_dir}")
+
+        with open(self._body_path(entry["body"]), "rb") as f:
+            body = gzip.decompress(f.read())
+
+        resp = requests.Response()
+        resp.url = url
+        resp.status_code = entry["status"]
+        resp.reason = entry["reason"]
+        resp.headers = CaseInsensitiveDict(entry["headers"])
+        resp._content = body
+        resp.encoding = requests.utils.get_encoding_from_headers(resp.headers)
+        with self._lock:
+            self.stats["replayed"] += 1
+        return resp
+
+    def get(self, url: str, timeout: float = DEFAULT_TIMEOUT_S) -> requests.Response:
+        """GET through the archive: record a live response, or replay it."""
+        if self.mode == REPLAY:
+            return self.replay(url)
+        resp = http_get(url, timeout=timeout)
+        self.record(url, resp)
+        return resp
+
+
+# ------------------------------------------------------------
+#  Process-wide archive used by fetch_html()
+# ------------------------------------------------------------
+
+_archive: Optional[HttpArchive] = None
+
+
+def configure_archive(archive_dir: str, mode: str = REPLAY) -> HttpArchive:
+    """Route fetch_html() through an archive (replaces any previous one)."""
+    global _archive
+    _archive = HttpArchive(archive_dir, mode)
+    return _archive
+
+
+def disable_archive() -> None:
+    """Stop recording/replaying; fetch_html() goes back to cache/network."""
+    global _archive
+    _archive = None
+
+
+def get_archive() -> Optional[HttpArchive]:
+    """Return the configured archive, or None."""
+    return _archive
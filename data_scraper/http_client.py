@@ -0,0 +1,180 @@
+# data_scraper/http_client.py
+"""
+Shared, pooled HTTP client for every fetcher in the project.
+
+fetch_html(), probe_url() and download_real_html() used to open a fresh
+connection per URL (module-level requests.get / urllib.request.urlopen), so
+every page paid a new TCP + TLS handshake. They now share one
+requests.Session with:
+- keep-alive connection pools, sized per host (POOL_MAXSIZE connections for
+  each of up to POOL_CONNECTIONS hosts)
+- compression negotiation: gzip/deflate always, brotli/zstd when the
+  corresponding decoder package is installed (urllib3 decodes transparently)
+- shared default headers (browser User-Agent, Accept, Accept-Language)
+
+The session is created lazily and is safe to share between the fetch
+engine's worker threads.
+"""
+
+import codecs
+import threading
+from typing import Dict, Iterator, Optional
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util import make_headers
+
+# Realistic browser headers (previously hard-coded in probe_url)
+USER_AGENT = (
+    "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 "
+    "(KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36"
+)
+
+DEFAULT_HEADERS = {
+    "User-Agent": USER_AGENT,
+    "Accept": "text/html,application/xhtml+xml,application/xml;q=0.9,*/*;q=0.8",
+    "Accept-Language": "en-US,en;q=0.9",
+    # "gzip,deflate" plus "br"/"zstd" when brotli/zstandard are importable
+    "Accept-Encoding": make_headers(accept_encoding=True)["accept-encoding"],
+}
+
+# Connection pool sizing
+POOL_CONNECTIONS = 32    # Number of per-host pools kept alive
+POOL_MAXSIZE = 8         # Keep-alive connections per host
+
+DEFAULT_TIMEOUT_S = 10
+
+# Bytes read per iteration when a response body is streamed
+STREAM_CHUNK_SIZE = 64 * 1024
+
+_session: Optional[requests.Session] = None
+_session_lock = threading.Lock()
+
+
+def create_session(pool_connections: int = POOL_CONNECTIONS,
+                   pool_maxsize: int = POOL_MAXSIZE,
+                   headers: Optional[Dict[str, str]] = None) -> requests.Session:
+    """
+    Build a requests.Session with keep-alive pools and the shared headers.
+
+    Args:
+        pool_connections: Number of per-host connection pools to cache
+        pool_maxsize: Maximum keep-alive connections per host (should be at
+                      least the per-domain concurrency of the fetch engine)
+        headers: Extra/overriding default headers
+
+    Returns:
+        Configured requests.Session
+    """
+    session = requests.Session()
+    adapter = HTTPAdapter(pool_connections=pool_connections,
+                          pool_maxsize=pool_maxsize,
+                          pool_block=False)
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+    session.headers.update(DEFAULT_HEADERS)
+    if headers:
+        session.headers.update(headers)
+    return session
+
+
+def get_session() -> requests.Session:
+    """Return the process-wide shared session (created on first use)."""
+    global _session
+    if _session is None:
+        with _session_lock:
+            if _session is None:
+                _session = create_session()
+    return _session
+
+
+def configure_session(pool_connections: int = POOL_CONNECTIONS,
+                      pool_maxsize: int = POOL_MAXSIZE,
+                      headers: Optional[Dict[str, str]] = None) -> requests.Session:
+    """
+    Replace the shared session (e.g. to raise pool_maxsize for a large run).
+
+    Returns:
+        The new shared session
+    """
+    global _session
+    with _session_lock:
+        old = _session
+        _session = create_session(pool_connections, pool_maxsize, headers)
+    if old is not None:
+        old.close()
+    return _session
+
+
+def close_session() -> None:
+    """Close the shared session and drop its pooled connections."""
+    global _session
+    with _session_lock:
+        old, _session = _session, None
+    if old is not None:
+        old.close()
+
+
+def http_get(url: str, timeout: float = DEFAULT_TIMEOUT_S,
+             headers: Optional[Dict[str, str]] = None,
+             stream: bool = False) -> requests.Response:
+    """
+    GET a URL through the shared pooled session.
+
+    Args:
+        url: URL to fetch
+        timeout: Connect/read timeout in seconds
+        headers: Per-request headers merged over the shared defaults
+        stream: Defer body download (caller must read or close the response)
+
+    Returns:
+        requests.Response (status is not checked)
+    """
+    return get_session().get(url, timeout=timeout, headers=headers, stream=stream)
+
+
+def response_text(resp: requests.Response) -> str:
+    """
+    Decode a response body as text.
+
+    requests falls back to ISO-8859-1 for text/* responses without a charset,
+    which garbles UTF-8 catalog pages; decode those as UTF-8 instead.
+    """
+    if "charset" in resp.headers.get("Content-Type", "").lower():
+        return resp.text
+    return resp.content.decode("utf-8", errors="replace")
+
+
+def iter_response_text(resp: requests.Response,
+                       chunk_size: int = STREAM_CHUNK_SIZE) -> Iterator[str]:
+    """
+    Decode a streamed response body (http_get(..., stream=True)) chunk by
+    chunk, with the same charset rules as response_text().
+
+    Multi-byte characters split across network chunks are handled by an
+    incremental decoder. The response is closed once the body is consumed.
+
+    Args:
+        resp: Response opened with stream=True
+        chunk_size: Bytes read per iteration
+
+    Returns:
+        Iterator of text chunks
+    """
+    encoding = "utf-8"
+    if "charset" in resp.headers.get("Content-Type", "").lower() and resp.encoding:
+        encoding = resp.encoding
+    try:
+        decoder = codecs.getincrementaldecoder(encoding)(errors="replace")
+    except LookupError:
+        decoder = codecs.getincrementaldecoder("utf-8")(errors="replace")
+    try:
+        for data in resp.iter_content(chunk_size=chunk_size):
+            text = decoder.decode(data)
+            if text:
+                yield text
+        text = decoder.decode(b"", final=True)
+        if text:
+            yield text
+    finally:
+        resp.close()
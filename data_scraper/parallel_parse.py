@@ -0,0 +1,153 @@
+# data_scraper/parallel_parse.py
+"""
+Batch HTML parsing over a process pool.
+
+parse_dba_rotor_page(), parse_ebc_pad_page(), parse_wheelsize_vehicle_page()
+and parse_rotor_list_page() are pure functions of the HTML string, but a
+replayed crawl used to run them one page at a time in the main thread,
+bound to a single core. parse_pages() fans a batch of pages out over a
+ProcessPoolExecutor:
+- pages are grouped in chunks (one task = `chunksize` pages) so pickling and
+  scheduling overhead is paid per chunk, not per page
+- the input iterable is consumed lazily, with a bounded number of chunks in
+  flight (memory stays flat on a 10k-page replay)
+- results come back in input order (ordered=True) or as chunks complete
+
+Each page is described by (source, page_type, html). page_type is the page
+kind: "rotor" (DBA-style product page), "rotor_list" (catalog list page,
+parser selected by source; "list" is accepted as an alias), "pad" or
+"vehicle". ingest_stages.page_kind() maps a seed's group/page_type to it.
+"""
+
+import collections
+import os
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from itertools import islice
+from typing import Iterable, Iterator, List, Optional, Tuple
+
+from data_scraper.html_rotor_list_scraper import parse_rotor_list_page
+from data_scraper.html_scraper import (
+    normalize_rotor,
+    normalize_vehicle,
+    parse_dba_rotor_page,
+    parse_ebc_pad_page,
+    parse_wheelsize_vehicle_page,
+)
+from data_scraper.spec_extract import get_html_backend, set_html_backend
+
+# Pages per pool task
+DEFAULT_CHUNKSIZE = 8
+
+# Chunks kept in flight per worker process
+CHUNKS_PER_WORKER = 2
+
+PAGE_TYPES = ("rotor", "rotor_list", "pad", "vehicle")
+
+PageItem = Tuple[str, str, str]                              # (source, page_type, html)
+ParseResult = Tuple[int, List[dict], Optional[Exception]]    # (index, records, error)
+
+
+def parse_page(source: str, page_type: str, html: str) -> List[dict]:
+    """
+    Parse one page and return its normalized records.
+
+    Args:
+        source: Site identifier (selects the list parser, tags list rotors)
+        page_type: "rotor", "rotor_list" (or "list"), "pad" or "vehicle"
+        html: Page content
+
+    Returns:
+        List of normalized dicts (empty if the page yields nothing)
+
+    Raises:
+        ValueError: Unknown page_type
+    """
+    if page_type == "list":
+        page_type = "rotor_list"
+
+    if page_type == "rotor_list":
+        return [normalize_rotor(raw, source=source)
+                for raw in parse_rotor_list_page(html, source) or []]
+
+    if page_type == "rotor":
+        record = parse_dba_rotor_page(html)
+    elif page_type == "pad":
+        record = parse_ebc_pad_page(html)
+    elif page_type == "vehicle":
+        raw = parse_wheelsize_vehicle_page(html)
+        record = normalize_vehicle(raw, source="wheelsize") if raw else None
+    else:
+        raise ValueError(f"Unknown page_type {page_type!r}, expected one of {PAGE_TYPES}")
+
+    return [record] if record and isinstance(record, dict) else []
+
+
+def _parse_chunk(chunk: List[Tuple[int, PageItem]]) -> List[ParseResult]:
+    """Pool task: parse a chunk of pages, capturing errors per page."""
+    results = []
+    for index, (source, page_type, html) in chunk:
+        try:
+            results.append((index, parse_page(source, page_type, html), None))
+        except Exception as e:
+            results.append((index, [], e))
+    return results
+
+
+def _chunks(items: Iterable[PageItem], chunksize: int) -> Iterator[List[Tuple[int, PageItem]]]:
+    numbered = enumerate(items)
+    while True:
+        chunk = list(islice(numbered, chunksize))
+        if not chunk:
+            return
+        yield chunk
+
+
+def parse_pages(items: Iterable[PageItem], workers: Optional[int] = None,
+                chunksize: int = DEFAULT_CHUNKSIZE,
+                ordered: bool = True) -> Iterator[ParseResult]:
+    """
+    Parse many pages in parallel and yield their normalized records.
+
+    Args:
+        items: Iterable of (source, page_type, html)
+        workers: Worker processes (None = os.cpu_count(), 0 = parse serially
+                 in the calling process)
+        chunksize: Pages per pool task
+        ordered: Yield in input order (True) or as chunks complete (False)
+
+    Yields:
+        (index, records, error) tuples: index is the position of the page in
+        the input, records its normalized dicts, error the exception raised
+        while parsing it (records is then empty)
+    """
+    if chunksize < 1:
+        raise ValueError(f"chunksize must be >= 1, got {chunksize}")
+    if workers is None:
+        workers = os.cpu_count() or 1
+
+    if workers == 0:
+        for chunk in _chunks(items, chunksize):
+            yield from _parse_chunk(chunk)
+        return
+
+    max_in_flight = workers * CHUNKS_PER_WORKER
+    # Workers use the parent's HTML backend (data_scraper/spec_extract.py)
+    with ProcessPoolExecutor(max_workers=workers, initializer=set_html_backend,
+                             initargs=(get_html_backend(),)) as pool:
+        pending = collections.deque()
+
+        def collect(limit):
+            # Yield finished chunks until at most `limit` remain in flight
+            while len(pending) > limit:
+                if ordered:
+                    yield from pending.popleft().result()
+                    continue
+                done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    pending.remove(future)
+                    yield from future.result()
+
+        for chunk in _chunks(items, chunksize):
+            pending.append(pool.submit(_parse_chunk, chunk))
+            yield from collect(max_in_flight - 1)
+        yield from collect(0)
@@ -0,0 +1,295 @@
+# data_scraper/retry_policy.py
+"""
+Retries with exponential backoff and per-domain circuit breaking for the
+fetchers.
+
+A fetch used to fail on its first timeout or 5xx, and the seed was lost for
+the run. Two layers now sit around the fetch engine (and probe_url()):
+
+- RetryPolicy: retries transient errors (timeouts, connection errors, HTTP
+  408/425/429/500/502/503/504) up to max_attempts, sleeping
+  min(max_delay, base_delay * 2^(attempt-1)) with full jitter between
+  attempts, or the server's Retry-After when longer. Other errors (404,
+  parse errors, cache / archive misses) fail at once.
+- CircuitBreaker: counts consecutive transient failures per domain. After
+  failure_threshold of them the domain's circuit opens: its fetches wait
+  cooldown_s instead of hitting the host, then a single probe request is let
+  through (half-open). Success closes the circuit, failure opens it again.
+  Other domains are not affected; with a DomainScheduler the fetch engine
+  also defers the paused domain so its queue stops being dispatched.
+
+Both are thread-safe and shared by the fetch engine's workers; their stats
+(retries, recovered / exhausted fetches, trips) are printed by ingest_all().
+"""
+
+import random
+import socket
+import threading
+import time
+import urllib.error
+from typing import Callable, Dict, Optional, TypeVar
+
+import requests
+
+from data_scraper.domain_scheduler import domain_of, retry_after_from_error
+
+T = TypeVar("T")
+
+# HTTP statuses worth retrying (timeouts, rate limiting, server errors)
+RETRYABLE_STATUSES = (408, 425, 429, 500, 502, 503, 504)
+
+# Retry defaults
+DEFAULT_MAX_ATTEMPTS = 3       # Attempts per URL, including the first
+DEFAULT_BASE_DELAY_S = 0.5     # Backoff before the second attempt (jitter: up to)
+DEFAULT_MAX_DELAY_S = 30.0     # Cap of a single backoff / Retry-After wait
+
+# Circuit breaker defaults
+DEFAULT_FAILURE_THRESHOLD = 5  # Consecutive transient failures that open a domain
+DEFAULT_COOLDOWN_S = 60.0      # Pause of an open domain before a probe request
+
+CLOSED, OPEN, HALF_OPEN = "closed", "open", "half_open"
+
+
+def is_retryable(error: BaseException) -> bool:
+    """
+    Whether an error raised by a fetch is transient.
+
+    Returns:
+        True for timeouts, connection errors and RETRYABLE_STATUSES
+        responses (requests or urllib); False otherwise
+    """
+    if isinstance(error, requests.HTTPError):
+        response = error.response
+        return response is not None and response.status_code in RETRYABLE_STATUSES
+    if isinstance(error, (requests.Timeout, requests.ConnectionError,
+                          requests.exceptions.ChunkedEncodingError)):
+        return True
+    if isinstance(error, urllib.error.HTTPError):
+        return error.code in RETRYABLE_STATUSES
+    if isinstance(error, urllib.error.URLError):
+        return isinstance(error.reason, (OSError, socket.timeout))
+    return isinstance(error, (TimeoutError, ConnectionError, socket.timeout))
+
+
+class RetryPolicy:
+    """
+    Backoff schedule and retry counters.
+
+    Args:
+        max_attempts: Attempts per URL, including the first (1 = no retry)
+        base_delay: Backoff before the second attempt, doubled after each
+                    failed attempt
+        max_delay: Cap of one wait (backoff or Retry-After)
+        jitter: Full jitter (wait uniform in [0, backoff]) so workers that
+                failed together do not retry together
+        retryable: Error classifier (default: is_retryable)
+        seed: Random seed of the jitter (tests)
+    """
+
+    def __init__(self, max_attempts: int = DEFAULT_MAX_ATTEMPTS,
+                 base_delay: float = DEFAULT_BASE_DELAY_S,
+                 max_delay: float = DEFAULT_MAX_DELAY_S,
+                 jitter: bool = True,
+                 retryable: Callable[[BaseException], bool] = is_retryable,
+                 seed: Optional[int] = None):
+        if max_attempts < 1:
+            raise ValueError(f"max_attempts must be >= 1, got {max_attempts}")
+        if base_delay < 0 or max_delay < 0:
+            raise ValueError("base_delay and max_delay must be >= 0")
+        self.max_attempts = max_attempts
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.jitter = jitter
+        self.retryable = retryable
+        self._random = random.Random(seed)
+        self._lock = threading.Lock()
+        self.stats = {"retries": 0, "recovered": 0, "exhausted": 0, "wait_s": 0.0}
+
+    def should_retry(self, error: BaseException, attempt: int) -> bool:
+        """Whether attempt number `attempt` (1-based) failing with error is retried."""
+        return attempt < self.max_attempts and self.retryable(error)
+
+    def delay(self, attempt: int, error: Optional[BaseException] = None) -> float:
+        """
+        Seconds to wait after failed attempt number `attempt` (1-based).
+
+        The exponential backoff (with jitter), or the error's Retry-After
+        header when longer, capped at max_delay.
+        """
+        backoff = min(self.max_delay, self.base_delay * 2 ** (attempt - 1))
+        if self.jitter:
+            with self._lock:
+                backoff = self._random.uniform(0, backoff)
+        retry_after = retry_after_from_error(error) if error is not None else None
+        if retry_after:
+            backoff = max(backoff, min(self.max_delay, retry_after))
+        return backoff
+
+    def record(self, event: str, wait_s: float = 0.0) -> None:
+        """Count a "retries" / "recovered" / "exhausted" event."""
+        with self._lock:
+            self.stats[event] += 1
+            self.stats["wait_s"] += wait_s
+
+    def call(self, fn: Callable[[], T], url: str,
+             breaker: Optional["CircuitBreaker"] = None,
+             sleep: Callable[[float], None] = time.sleep) -> T:
+        """
+        Run a blocking fetch with retries (sequential callers, probe_url()).
+
+        Args:
+            fn: The fetch; its exceptions are classified and retried
+            url: URL fetched (circuit breaker domain)
+            breaker: Optional per-domain circuit breaker
+            sleep: Sleep function (tests)
+
+        Returns:
+            fn()'s result
+
+        Raises:
+            The last error once it is not retryable or attempts are exhausted
+        """
+        attempt = 1
+        while True:
+            if breaker is not None:
+                wait = breaker.wait(url)
+                while wait > 0:
+                    sleep(wait)
+                    wait = breaker.wait(url)
+            try:
+                result = fn()
+            except Exception as e:
+                if breaker is not None:
+                    breaker.record_failure(url, e)
+                if not self.should_retry(e, attempt):
+                    if attempt > 1:
+                        self.record("exhausted")
+                    raise
+                wait = self.delay(attempt, e)
+                self.record("retries", wait)
+                sleep(wait)
+                attempt += 1
+                continue
+            if breaker is not None:
+                breaker.record_success(url)
+            if attempt > 1:
+                self.record("recovered")
+            return result
+
+
+class _Circuit:
+    """Breaker state of one domain."""
+
+    def __init__(self):
+        self.state = CLOSED
+        self.failures = 0           # Consecutive transient failures
+        self.open_until = 0.0
+        self.probing = False        # Half-open probe in flight
+        self.trips = 0
+
+
+class CircuitBreaker:
+    """
+    Per-domain circuit breaker.
+
+    Args:
+        failure_threshold: Consecutive transient failures that open a domain
+        cooldown_s: Seconds an open domain is paused before a probe request
+        retryable: Failures that count (default: is_retryable; a 404 says
+                   nothing about the host's health)
+    """
+
+    def __init__(self, failure_threshold: int = DEFAULT_FAILURE_THRESHOLD,
+                 cooldown_s: float = DEFAULT_COOLDOWN_S,
+                 retryable: Callable[[BaseException], bool] = is_retryable):
+        if failure_threshold < 1:
+            raise ValueError(f"failure_threshold must be >= 1, got {failure_threshold}")
+        if cooldown_s <= 0:
+            raise ValueError(f"cooldown_s must be > 0, got {cooldown_s}")
+        self.failure_threshold = failure_threshold
+        self.cooldown_s = cooldown_s
+        self.retryable = retryable
+        self._circuits: Dict[str, _Circuit] = {}
+        self._lock = threading.Lock()
+
+    def _circuit(self, url: str) -> _Circuit:
+        domain = domain_of(url)
+        circuit = self._circuits.get(domain)
+        if circuit is None:
+            circuit = self._circuits[domain] = _Circuit()
+        return circuit
+
+    def wait(self, url: str) -> float:
+        """
+        Seconds before a request to url's domain may start (0 = go now).
+
+        When an open domain's cooldown is over, the first caller gets 0 and
+        becomes the half-open probe; the others keep waiting for its outcome.
+        """
+        with self._lock:
+            circuit = self._circuit(url)
+            if circuit.state == CLOSED:
+                return 0.0
+            now = time.monotonic()
+            if circuit.state == OPEN:
+                if now < circuit.open_until:
+                    return circuit.open_until - now
+                circuit.state = HALF_OPEN
+            if circuit.probing:
+                return min(1.0, self.cooldown_s)
+            circuit.probing = True
+            return 0.0
+
+    def state(self, url: str) -> str:
+        """Circuit state of url's domain: "closed", "open" or "half_open"."""
+        with self._lock:
+            return self._circuit(url).state
+
+    def record_success(self, url: str) -> None:
+        with self._lock:
+            circuit = self._circuit(url)
+            circuit.state = CLOSED
+            circuit.failures = 0
+            circuit.probing = False
+
+    def record_failure(self, url: str, error: BaseException) -> bool:
+        """
+        Count a failed request.
+
+        Returns:
+            True if the domain's circuit opened (tripped) on this failure
+        """
+        with self._lock:
+            circuit = self._circuit(url)
+            if not self.retryable(error):
+                # The host answered: it is up, whatever the error
+                if circuit.state == HALF_OPEN:
+                    circuit.state = CLOSED
+                circuit.failures = 0
+                circuit.probing = False
+                return False
+            circuit.failures += 1
+            if circuit.state == HALF_OPEN or (circuit.state == CLOSED
+                                              and circuit.failures >= self.failure_threshold):
+                circuit.state = OPEN
+                circuit.open_until = time.monotonic() + self.cooldown_s
+                circuit.probing = False
+                circuit.trips += 1
+                return True
+            return False
+
+    def stats(self) -> Dict[str, Dict]:
+        """
+        Per-domain state.
+
+        Returns:
+            {netloc: {"state", "failures", "trips"}} for domains that failed
+        """
+        with self._lock:
+            return {domain: {"state": c.state, "failures": c.failures, "trips": c.trips}
+                    for domain, c in self._circuits.items() if c.trips or c.failures}
+
+    def print_stats(self) -> None:
+        for domain, s in sorted(self.stats().items()):
+            print(f"  {domain}: {s['trips']} trips, state {s['state']}, "
+                  f"{s['failures']} consecutive failures")
@@ -0,0 +1,425 @@
+# data_scraper/spec_extract.py
+"""
+Shared specification extraction for the product page parsers.
+
+parse_dba_rotor_page(), parse_ebc_pad_page() and parse_wheelsize_vehicle_page()
+all read the same page elements: label/value rows of <table>s, <dt>/<dd>
+pairs of <dl>s, <div>/<span> elements carrying data-* attributes, a
+product-code element and the <h1> title. They used to walk the soup once per
+strategy (plus repeated soup.find('h1')) and run a long if/elif chain of
+substring checks on every table row.
+
+This module provides:
+- LabelRules: an ordered label -> field rule table, compiled once at import
+  by each parser; the first matching rule wins (PCD before diameter, etc.)
+  and results are memoized per label, so a repeated label costs one lookup
+- collect_spec_nodes(): a single traversal of the soup that gathers every
+  element the strategies read, in document order
+- apply_label_rules(): feeds label/value pairs through a rule table
+- parse_spec_nodes(): parses the HTML with the selected backend and returns
+  the collected nodes
+
+Backends (set_html_backend(), default "html.parser"):
+- "html.parser" / "lxml": BeautifulSoup, restricted at parse time to the
+  elements the strategies read (tables, dls, h1, div/span with data-*
+  attributes or a product-code class); everything else is never turned into
+  Tag objects
+- "selectolax": Lexbor HTML5 parser, elements selected with CSS in C and
+  exposed through the same get_text()/has_attr()/get() calls
+lxml and selectolax are optional dependencies. On well-formed pages all
+backends give the same records; on broken markup (unclosed tags, tables in
+odd places) lxml and selectolax repair the tree the HTML5 way, so results
+can differ from html.parser.
+
+Rule patterns are alternatives separated by "|"; each alternative is a list
+of substrings joined by "+" that must all appear in the lowercased label,
+where a "!" prefix means the substring must NOT appear:
+
+    "outer diameter | diameter+!bolt+!pcd"
+"""
+
+from typing import Callable, Dict, Iterable, List, Optional, Sequence, Tuple
+
+from bs4 import BeautifulSoup, SoupStrainer, Tag
+
+try:
+    from bs4.filter import ElementFilter
+except ImportError:             # bs4 < 4.13: tag-name strainer only
+    ElementFilter = None
+
+try:
+    import lxml
+except ImportError:
+    lxml = None
+
+try:
+    from selectolax.lexbor import LexborHTMLParser
+except ImportError:
+    LexborHTMLParser = None
+
+HTML_BACKENDS = ("html.parser", "lxml", "selectolax")
+DEFAULT_HTML_BACKEND = "html.parser"
+
+# Fastest first, for set_html_backend("auto")
+_AUTO_ORDER = ("selectolax", "lxml", "html.parser")
+
+# Elements read by the strategies (kept with their whole subtree)
+SPEC_TAGS = ("table", "dl", "h1", "div", "span")
+
+# Distinct labels memoized per rule table
+MAX_MEMO_LABELS = 4096
+
+# (pattern, field) or (pattern, field, transform applied to the cleaned value)
+Rule = Tuple
+
+_NO_MATCH = (None, None)
+
+
+class LabelRules:
+    """Ordered label -> field rule table, compiled once."""
+
+    def __init__(self, rules: Sequence[Rule]):
+        self.rules = []
+        for rule in rules:
+            pattern, field = rule[0], rule[1]
+            transform = rule[2] if len(rule) > 2 else None
+            self.rules.append((self._compile(pattern), field, transform))
+        self._memo = {}
+
+    @staticmethod
+    def _compile(pattern: str) -> List[Tuple[Tuple[str, ...], Tuple[str, ...]]]:
+        alternatives = []
+        for alternative in pattern.split("|"):
+            terms = [t.strip() for t in alternative.split("+")]
+            required = tuple(t for t in terms if not t.startswith("!"))
+            excluded = tuple(t[1:].strip() for t in terms if t.startswith("!"))
+            if not required or not all(required) or not all(excluded):
+                raise ValueError(f"Invalid label rule pattern: {pattern!r}")
+            alternatives.append((required, excluded))
+        return alternatives
+
+    def match(self, label: str) -> Tuple[Optional[str], Optional[Callable]]:
+        """
+        Find the field for a label.
+
+        Args:
+            label: Stripped, lowercased label text
+
+        Returns:
+            (field, transform) of the first matching rule, (None, None) if no
+            rule matches
+        """
+        hit = self._memo.get(label)
+        if hit is not None:
+            return hit
+
+        hit = _NO_MATCH
+        for alternatives, field, transform in self.rules:
+            if any(all(r in label for r in required)
+                   and not any(e in label for e in excluded)
+                   for required, excluded in alternatives):
+                hit = (field, transform)
+                break
+
+        if len(self._memo) >= MAX_MEMO_LABELS:
+            self._memo.clear()
+        self._memo[label] = hit
+        return hit
+
+
+def _class_text(tag: Tag) -> str:
+    classes = tag.get("class")
+    if not classes:
+        return ""
+    if isinstance(classes, str):
+        return classes.lower()
+    return " ".join(classes).lower()
+
+
+def collect_spec_nodes(soup, data_attrs: Optional[Iterable[str]] = None) -> Dict:
+    """
+    Gather the elements read by the parsing strategies in one traversal.
+
+    Nesting follows find_all() semantics: a <tr> belongs to every enclosing
+    <table> (a nested table's rows are seen by the outer table too), a row's
+    cells are its first two <td>/<th> descendants and a <dl>'s terms and
+    definitions are all of its <dt>/<dd> descendants.
+
+    Args:
+        soup: Parsed document (BeautifulSoup)
+        data_attrs: Attributes read by strategy 3 (None = any data-*)
+
+    Returns:
+        Dict with:
+        - table_rows: [(label_cell, value_cell)] for rows with >= 2 cells,
+          table by table in document order
+        - dl_pairs: [(dt, dd)] zipped per <dl>, in document order
+        - data_elements: [(tag, lowercased class string)] for <div>/<span>
+          elements having at least one of data_attrs
+        - product_code: first <div>/<span> whose class contains
+          "product-code", or None
+        - h1: first <h1>, or None
+    """
+    tables = []           # per table: list of row cell lists
+    dls = []              # per dl: (terms, definitions)
+    data_elements = []
+    product_code = None
+    h1 = None
+    if data_attrs is not None:
+        data_attrs = tuple(data_attrs)
+
+    # (node, (enclosing tables, enclosing rows, enclosing dls)); only tags
+    # are pushed
+    stack = [(child, ((), (), ())) for child in reversed(soup.contents)
+             if isinstance(child, Tag)]
+    pop = stack.pop
+    while stack:
+        node, context = pop()
+        name = node.name
+        if name == "div" or name == "span":
+            attrs = node.attrs
+            if attrs:
+                classes = _class_text(node)
+                if product_code is None and "product-code" in classes:
+                    product_code = node
+                if data_attrs is None:
+                    has_data = any(key.startswith("data-") for key in attrs)
+                else:
+                    has_data = any(key in attrs for key in data_attrs)
+                if has_data:
+                    data_elements.append((node, classes))
+        elif name == "table":
+            rows = []
+            tables.append(rows)
+            context = (context[0] + (rows,), context[1], context[2])
+        elif name == "tr":
+            cells = []
+            for rows in context[0]:
+                rows.append(cells)
+            context = (context[0], context[1] + (cells,), context[2])
+        elif name == "td" or name == "th":
+            for cells in context[1]:
+                if len(cells) < 2:
+                    cells.append(node)
+        elif name == "dl":
+            terms_defs = ([], [])
+            dls.append(terms_defs)
+            context = (context[0], context[1], context[2] + (terms_defs,))
+        elif name == "dt" or name == "dd":
+            slot = 0 if name == "dt" else 1
+            for terms_defs in context[2]:
+                terms_defs[slot].append(node)
+        elif name == "h1" and h1 is None:
+            h1 = node
+
+        children = node.contents
+        if children:
+            stack.extend([(child, context) for child in reversed(children)
+                          if isinstance(child, Tag)])
+
+    table_rows = [(cells[0], cells[1])
+                  for rows in tables for cells in rows if len(cells) >= 2]
+    dl_pairs = [pair for terms, definitions in dls for pair in zip(terms, definitions)]
+
+    return {
+        "table_rows": table_rows,
+        "dl_pairs": dl_pairs,
+        "data_elements": data_elements,
+        "product_code": product_code,
+        "h1": h1,
+    }
+
+
+def apply_label_rules(pairs: List[Tuple[Tag, Tag]], rules: LabelRules, raw: dict,
+                      clean_value: Callable[[str], str]) -> None:
+    """
+    Map label/value element pairs to fields of `raw`, later pairs overwriting
+    earlier ones. The value text is only extracted for matching labels.
+
+    Args:
+        pairs: (label element, value element) in document order
+        rules: Compiled rule table of the parser
+        raw: Dict updated in place
+        clean_value: Parser-specific value cleanup
+    """
+    for label_el, value_el in pairs:
+        field, transform = rules.match(label_el.get_text().strip().lower())
+        if field is None:
+            continue
+        value = clean_value(value_el.get_text())
+        raw[field] = transform(value) if transform else value
+
+
+# ------------------------------------------------------------
+#  Backends
+# ------------------------------------------------------------
+
+_backend = DEFAULT_HTML_BACKEND
+
+
+def backend_available(name: str) -> bool:
+    """True if the backend's parser library is installed."""
+    if name == "lxml":
+        return lxml is not None
+    if name == "selectolax":
+        return LexborHTMLParser is not None
+    return name == "html.parser"
+
+
+def set_html_backend(name: str) -> str:
+    """
+    Select the parser backend of the product page parsers.
+
+    Args:
+        name: "html.parser", "lxml", "selectolax" or "auto" (fastest
+              installed backend)
+
+    Returns:
+        The backend now in use
+
+    Raises:
+        ValueError: Unknown backend
+        ImportError: Backend library not installed
+    """
+    global _backend
+    if name == "auto":
+        name = next(b for b in _AUTO_ORDER if backend_available(b))
+    if name not in HTML_BACKENDS:
+        raise ValueError(f"Unknown HTML backend {name!r}, expected one of {HTML_BACKENDS} or 'auto'")
+    if not backend_available(name):
+        raise ImportError(f"HTML backend {name!r} is not installed")
+    _backend = name
+    return name
+
+
+def get_html_backend() -> str:
+    return _backend
+
+
+def _is_spec_element(name: str, attrs: dict) -> bool:
+    if name in ("table", "dl", "h1"):
+        return True
+    if name not in ("div", "span") or not attrs:
+        return False
+    classes = attrs.get("class") or ""
+    if not isinstance(classes, str):
+        classes = " ".join(classes)
+    return "product-code" in classes.lower() or any(key.startswith("data-") for key in attrs)
+
+
+if ElementFilter is not None:
+    class _SpecFilter(ElementFilter):
+        """parse_only filter: build only the elements read by the strategies."""
+
+        def allow_tag_creation(self, nsprefix, name, attrs) -> bool:
+            return _is_spec_element(name, attrs)
+
+        def allow_string_creation(self, string) -> bool:
+            # Text outside the kept elements is never read
+            return False
+
+    SPEC_FILTER = _SpecFilter()
+else:
+    SPEC_FILTER = SoupStrainer(list(SPEC_TAGS))
+
+
+def make_soup(html: str, parse_only=None, backend: Optional[str] = None) -> BeautifulSoup:
+    """
+    Build a BeautifulSoup tree with the selected backend.
+
+    Args:
+        html: Page content
+        parse_only: Optional SoupStrainer/filter restricting the tree
+        backend: Backend name (default: the configured one); "selectolax"
+                 has no BeautifulSoup tree builder and falls back to lxml
+                 when installed, html.parser otherwise
+
+    Returns:
+        BeautifulSoup document
+    """
+    backend = backend or _backend
+    if backend == "selectolax":
+        backend = "lxml" if lxml is not None else "html.parser"
+    return BeautifulSoup(html, backend, parse_only=parse_only)
+
+
+class _LexborElement:
+    """bs4-style view (get_text/has_attr/get) of a selectolax node."""
+
+    __slots__ = ("node",)
+
+    def __init__(self, node):
+        self.node = node
+
+    def get_text(self) -> str:
+        return self.node.text(deep=True)
+
+    def has_attr(self, key: str) -> bool:
+        return key in self.node.attributes
+
+    def get(self, key: str, default=None):
+        attrs = self.node.attributes
+        if key not in attrs:
+            return default
+        # Valueless attribute (<div data-x>): "" like bs4
+        return attrs[key] or ""
+
+
+def _collect_lexbor(html: str, data_attrs: Optional[Iterable[str]]) -> Dict:
+    """collect_spec_nodes() equivalent on a selectolax (Lexbor) tree."""
+    tree = LexborHTMLParser(html)
+    # bs4's get_text() skips script/style content
+    tree.strip_tags(["script", "style", "template"])
+
+    table_rows = []
+    for table in tree.css("table"):
+        for row in table.css("tr"):
+            cells = row.css("td, th")
+            if len(cells) >= 2:
+                table_rows.append((_LexborElement(cells[0]), _LexborElement(cells[1])))
+
+    dl_pairs = []
+    for dl in tree.css("dl"):
+        dl_pairs += [(_LexborElement(dt), _LexborElement(dd))
+                     for dt, dd in zip(dl.css("dt"), dl.css("dd"))]
+
+    data_elements = []
+    if data_attrs is None:
+        candidates = [node for node in tree.css("div, span")
+                      if any(key.startswith("data-") for key in node.attributes)]
+    else:
+        selector = ", ".join(f"{tag}[{attr}]" for attr in data_attrs for tag in ("div", "span"))
+        candidates = tree.css(selector) if selector else []
+    for node in candidates:
+        classes = (node.attributes.get("class") or "").lower()
+        data_elements.append((_LexborElement(node), classes))
+
+    product_code = tree.css_first('div[class*="product-code" i], span[class*="product-code" i]')
+    h1 = tree.css_first("h1")
+
+    return {
+        "table_rows": table_rows,
+        "dl_pairs": dl_pairs,
+        "data_elements": data_elements,
+        "product_code": _LexborElement(product_code) if product_code is not None else None,
+        "h1": _LexborElement(h1) if h1 is not None else None,
+    }
+
+
+def parse_spec_nodes(html: str, data_attrs: Optional[Iterable[str]] = None,
+                     backend: Optional[str] = None) -> Dict:
+    """
+    Parse a product page with the selected backend and collect its spec nodes.
+
+    Args:
+        html: Page content
+        data_attrs: Attributes read by strategy 3 (None = any data-*)
+        backend: Backend name (default: the configured one)
+
+    Returns:
+        Same dict as collect_spec_nodes()
+    """
+    backend = backend or _backend
+    if backend == "selectolax" and LexborHTMLParser is not None:
+        return _collect_lexbor(html, data_attrs)
+    return collect_spec_nodes(make_soup(html, SPEC_FILTER, backend), data_attrs)
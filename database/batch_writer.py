@@ -0,0 +1,388 @@
+# database/batch_writer.py
+"""
+Batched SQLite inserts for the ingestion pipeline.
+
+insert_rotor() / insert_pad() / insert_vehicle() used to build an INSERT
+from the record's keys and run one conn.execute() per record, inside a
+single transaction committed at the very end of ingest_all(). BatchWriter
+instead:
+
+- groups records per (table, column signature) and writes each group with
+  one executemany() call once batch_size rows are pending
+- reuses one SQL string per signature (insert_sql(), cached), so sqlite3's
+  prepared statement cache hits on every batch
+- commits every commit_interval rows written (inserted, or with upsert
+  also updated or touched): a crash loses at most the current transaction,
+  not the whole run
+
+Dedup is done by the database: tables with a natural key (NATURAL_KEYS,
+unique indexes from init.sql / database/migrations.py) are written with
+INSERT ... ON CONFLICT DO NOTHING, so a duplicate is skipped by the insert
+statement itself. Inserted and skipped rows are counted from the statement's
+row count. Other constraint violations (NOT NULL, ...) still fail: a batch
+that fails is rolled back to a savepoint and retried row by row; failing
+rows are logged and skipped.
+
+With a key_index (database/key_index.py, preloaded from the tables), records
+whose natural key is already known are dropped in add() / write() without a
+database round trip, and the keys of written rows are added to the index.
+
+Change tracking: keyed tables also store content_hash (content_hash() of the
+record), first_seen and last_seen (UTC timestamps of the write). With
+upsert=True a record whose key exists is compared by hash: a changed record
+overwrites the stored columns, content_hash and last_seen; an unchanged one
+only moves last_seen. first_seen is never rewritten. Tables created before
+the tracking columns existed (database/migrations.py, version 2) are written
+without them.
+
+Usage:
+    writer = BatchWriter(conn, batch_size=500, commit_interval=5000)
+    for record in records:
+        writer.add("rotors", record)              # buffered bulk load
+    inserted, skipped = writer.write("pads", pads)  # written now, with counts
+    writer.commit()   # flush what is pending, then commit
+"""
+
+import operator
+import sqlite3
+from datetime import datetime, timezone
+from functools import lru_cache
+from hashlib import blake2b
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+
+# Rows per executemany() call
+DEFAULT_BATCH_SIZE = 500
+
+# Rows per transaction (None = commit only when asked)
+DEFAULT_COMMIT_INTERVAL = 5000
+
+# Natural key of each table (ingestion dedup, Mission 9)
+NATURAL_KEYS = {
+    "rotors": ("brand", "catalog_ref"),
+    "pads": ("shape_id", "brand", "catalog_ref"),
+    "vehicles": ("make", "model", "year_from"),
+}
+
+
+# Change-tracking columns of keyed tables, appended to every insert
+TRACKING_COLUMNS = ("content_hash", "first_seen", "last_seen")
+
+@lru_cache(maxsize=256)
+def _canonical_fields(columns: Tuple[str, ...]) -> Tuple[str, Callable[[dict], object]]:
+    """Sorted field names of a record signature, as (repr, value getter)."""
+    names = tuple(sorted(columns))
+    return repr(names), operator.itemgetter(*names)
+
+
+def content_hash(record: dict) -> str:
+    """
+    Hash of a record's content: its non-NULL fields, key order ignored.
+    Integers hash as floats (300 == 300.0): a REAL column stores 300 as
+    300.0, an INTEGER column 5.0 as 5. The same record read back from the
+    table (without id and the tracking columns) hashes to the same value.
+    """
+    record = {k: float(v) if isinstance(v, int) else v
+              for k, v in record.items() if v is not None}
+    names, values = _canonical_fields(tuple(record))
+    return blake2b(f"{names}{values(record)!r}".encode(), digest_size=16).hexdigest()
+
+
+def utc_now() -> str:
+    return datetime.now(timezone.utc).isoformat(timespec="seconds")
+
+
+@lru_cache(maxsize=256)
+def insert_sql(table: str, columns: Tuple[str, ...], upsert: bool = False,
+               tracked: bool = True) -> str:
+    """
+    INSERT statement for a table and column signature (cached). Rows of a
+    tracked keyed table carry content_hash, then first_seen and last_seen.
+    """
+    tracked = tracked and table in NATURAL_KEYS
+    names = columns + TRACKING_COLUMNS if tracked else columns
+    placeholders = ",".join(["?"] * len(names))
+    sql = f"INSERT INTO {table} ({','.join(names)}) VALUES ({placeholders})"
+    if table not in NATURAL_KEYS:
+        return sql
+    if not upsert:
+        # Duplicate natural key -> row skipped (requires the unique index)
+        return sql + " ON CONFLICT DO NOTHING"
+    key = NATURAL_KEYS[table]
+    updates = [f"{c} = excluded.{c}" for c in columns if c not in key]
+    updates += ["content_hash = excluded.content_hash", "last_seen = excluded.last_seen"]
+    return (f"{sql} ON CONFLICT ({', '.join(key)}) DO UPDATE SET {', '.join(updates)} "
+            f"WHERE content_hash IS NOT excluded.content_hash")
+
+
+@lru_cache(maxsize=16)
+def touch_sql(table: str) -> str:
+    """UPDATE moving last_seen of a row whose key and content_hash match."""
+    key = " AND ".join(f"{c} = ?" for c in NATURAL_KEYS[table])
+    return f"UPDATE {table} SET last_seen = ? WHERE {key} AND content_hash = ?"
+
+
+@lru_cache(maxsize=256)
+def key_getter(table: str, columns: Tuple[str, ...]) -> Optional[Callable[[list], tuple]]:
+    """
+    Function extracting the natural key from a row of the given columns
+    (None if the table has no natural key; missing key columns give None).
+    """
+    if table not in NATURAL_KEYS:
+        return None
+    positions = [columns.index(c) if c in columns else None for c in NATURAL_KEYS[table]]
+    if None in positions:
+        return lambda row: tuple(row[i] if i is not None else None for i in positions)
+    return lambda row: tuple(row[i] for i in positions)
+
+
+def signature_runs(records: Iterable[dict],
+                   hashed: bool = False) -> List[Tuple[Tuple[str, ...], List[list]]]:
+    """
+    Split records into runs of consecutive records sharing the same columns,
+    as (columns, rows). Record order is kept, so the first of two duplicates
+    is the one inserted. hashed=True appends content_hash() to each row.
+    """
+    runs = []
+    for record in records:
+        columns = tuple(record)
+        if not runs or runs[-1][0] != columns:
+            runs.append((columns, []))
+        row = list(record.values())
+        if hashed:
+            row.append(content_hash(record))
+        runs[-1][1].append(row)
+    return runs
+
+
+class BatchWriter:
+    """
+    Buffer inserts per table/column signature and write them in batches.
+
+    Args:
+        conn: SQLite connection (the writer does not close it)
+        batch_size: Rows per executemany() call
+        commit_interval: Rows per transaction; None leaves commits to the
+                         caller (commit())
+        key_index: Optional KeyIndex of the keys already stored; known keys
+                   are skipped without a database round trip
+        upsert: Update rows whose key exists but whose content changed
+                (not combinable with key_index, which would drop them)
+    """
+
+    def __init__(self, conn: sqlite3.Connection, batch_size: int = DEFAULT_BATCH_SIZE,
+                 commit_interval: Optional[int] = DEFAULT_COMMIT_INTERVAL,
+                 key_index=None, upsert: bool = False):
+        if batch_size < 1:
+            raise ValueError(f"batch_size must be >= 1, got {batch_size}")
+        if commit_interval is not None and commit_interval < 1:
+            raise ValueError(f"commit_interval must be >= 1 or None, got {commit_interval}")
+        if upsert and key_index is not None:
+            raise ValueError("upsert and key_index cannot be combined")
+        self.conn = conn
+        self.batch_size = batch_size
+        self.commit_interval = commit_interval
+        self.key_index = key_index
+        self.upsert = upsert
+        self._tracked: Dict[str, bool] = {}
+
+        self._pending: Dict[Tuple[str, Tuple[str, ...]], List[list]] = {}
+        self._uncommitted = 0
+        # skipped counts duplicates left as stored (filtered: dropped by
+        # key_index), updated those rewritten by an upsert
+        self.stats = {"rows": 0, "skipped": 0, "filtered": 0, "updated": 0, "failed": 0,
+                      "batches": 0, "commits": 0}
+
+    # --------------------------------------------------------
+    #  Buffering
+    # --------------------------------------------------------
+
+    def add(self, table: str, record: dict) -> None:
+        """Queue one record; writes a batch when its group is full."""
+        if self.key_index is not None and self._known(table, record):
+            return
+        signature = (table, tuple(record))
+        rows = self._pending.setdefault(signature, [])
+        row = list(record.values())
+        if self._tracks(table):
+            row.append(content_hash(record))
+        rows.append(row)
+        if len(rows) >= self.batch_size:
+            self._write(signature, self._pending.pop(signature))
+
+    @property
+    def pending_rows(self) -> int:
+        return sum(len(rows) for rows in self._pending.values())
+
+    # --------------------------------------------------------
+    #  Writing
+    # --------------------------------------------------------
+
+    def write(self, table: str, records: Iterable[dict]) -> Tuple[int, int]:
+        """
+        Write records now (after any rows of the table still queued).
+
+        Returns:
+            (inserted, skipped) - skipped rows are duplicates (updated or
+            not) or failed rows
+        """
+        self.flush(table)
+        inserted = attempted = 0
+        if self.key_index is not None:
+            records = list(records)
+            known = len(records)
+            records = [record for record in records if not self._known(table, record)]
+            attempted += known - len(records)
+        for columns, rows in signature_runs(records, hashed=self._tracks(table)):
+            for start in range(0, len(rows), self.batch_size):
+                batch = rows[start:start + self.batch_size]
+                inserted += self._write((table, columns), batch)
+                attempted += len(batch)
+        return inserted, attempted - inserted
+
+    def flush(self, table: Optional[str] = None) -> None:
+        """Write pending rows (of one table, or all); the transaction stays open."""
+        for signature in list(self._pending):
+            if table is None or signature[0] == table:
+                self._write(signature, self._pending.pop(signature))
+
+    def commit(self) -> None:
+        """Flush, then commit the transaction."""
+        self.flush()
+        self.conn.commit()
+        self.stats["commits"] += 1
+        self._uncommitted = 0
+
+    def rollback(self) -> None:
+        """Drop pending rows and roll back the current transaction."""
+        self._pending.clear()
+        # The index may hold keys of rolled-back rows: stop trusting it
+        self.key_index = None
+        self.conn.rollback()
+        self._uncommitted = 0
+
+    def _tracks(self, table: str) -> bool:
+        """True if the table is keyed and has the change-tracking columns."""
+        tracked = self._tracked.get(table)
+        if tracked is None:
+            columns = {row[1] for row in self.conn.execute(f"PRAGMA table_info({table})")}
+            tracked = table in NATURAL_KEYS and set(TRACKING_COLUMNS) <= columns
+            if self.upsert and table in NATURAL_KEYS and not tracked:
+                raise ValueError(f"upsert needs the change-tracking columns of {table} "
+                                 "(run database/migrations.py)")
+            self._tracked[table] = tracked
+        return tracked
+
+    def _known(self, table: str, record: dict) -> bool:
+        """True (and counted as skipped) if the record's key is in key_index."""
+        known = self.key_index.keys.get(table)
+        if known is None:
+            return False
+        key = tuple(map(record.get, NATURAL_KEYS[table]))
+        if None in key or key not in known:
+            return False
+        self.stats["skipped"] += 1
+        self.stats["filtered"] += 1
+        return True
+
+    def _remember(self, signature: Tuple[str, Tuple[str, ...]], rows: List[list]) -> None:
+        """Add the keys of rows now stored (inserted or duplicate) to key_index."""
+        get_key = key_getter(*signature)
+        if get_key is None:
+            return
+        table, index = signature[0], self.key_index
+        for row in rows:
+            key = get_key(row)
+            if None not in key:
+                index.add(table, key)
+
+    def _write(self, signature: Tuple[str, Tuple[str, ...]], rows: List[list]) -> int:
+        """Write one batch; returns the number of rows inserted."""
+        table, columns = signature
+        tracked = self._tracks(table)
+        sql = insert_sql(table, columns, self.upsert and tracked, tracked)
+        conn = self.conn
+        if tracked:
+            # Same timestamp for first_seen and last_seen of the batch
+            now = utc_now()
+            params = [row + [now, now] for row in rows]
+        else:
+            params = rows
+        if not conn.in_transaction:
+            conn.execute("BEGIN")
+        conn.execute("SAVEPOINT bbk_batch")
+        if self.upsert and tracked:
+            inserted, updated, touched, failed = self._upsert(table, columns, params, sql, now)
+        else:
+            inserted = updated = touched = failed = 0
+            stored = rows
+            try:
+                inserted = conn.executemany(sql, params).rowcount
+            except sqlite3.Error:
+                # Keep the good rows of the batch, skip the failing ones
+                conn.execute("ROLLBACK TO bbk_batch")
+                inserted = 0
+                stored = []
+                for row, param in zip(rows, params):
+                    try:
+                        inserted += conn.execute(sql, param).rowcount
+                        stored.append(row)
+                    except sqlite3.Error as e:
+                        failed += 1
+                        print(f"[DB] ✗ Insert into {table} failed: {e}")
+            if self.key_index is not None:
+                self._remember(signature, stored)
+        conn.execute("RELEASE bbk_batch")
+
+        self.stats["rows"] += inserted
+        self.stats["skipped"] += len(rows) - inserted - updated - failed
+        self.stats["updated"] += updated
+        self.stats["failed"] += failed
+        self.stats["batches"] += 1
+        # Every row written counts toward the transaction, so a re-crawl
+        # of known rows (upsert updates, last_seen moves) still commits
+        self._uncommitted += inserted + updated + touched
+        if self.commit_interval is not None and self._uncommitted >= self.commit_interval:
+            conn.commit()
+            self.stats["commits"] += 1
+            self._uncommitted = 0
+        return inserted
+
+    def _upsert(self, table: str, columns: Tuple[str, ...], params: List[list],
+                sql: str, now: str) -> Tuple[int, int, int, int]:
+        """
+        Upsert one batch (inside the batch savepoint).
+
+        Unchanged rows (same key and content_hash) only get last_seen moved,
+        then the upsert inserts new keys and rewrites changed rows. New rows
+        are counted by id, since the upsert's row count includes updates.
+
+        Returns:
+            (inserted, updated, touched, failed); touched rows only had
+            last_seen moved
+        """
+        conn = self.conn
+        get_key = key_getter(table, columns)
+        touch = touch_sql(table)
+        hash_index = len(columns)
+        last_id = conn.execute(f"SELECT MAX(id) FROM {table}").fetchone()[0] or 0
+        failed = 0
+        try:
+            touched = conn.executemany(
+                touch, [[now, *get_key(p), p[hash_index]] for p in params]).rowcount
+            written = conn.executemany(sql, params).rowcount
+        except sqlite3.Error:
+            # Keep the good rows of the batch, skip the failing ones
+            conn.execute("ROLLBACK TO bbk_batch")
+            written = touched = 0
+            for p in params:
+                try:
+                    if conn.execute(touch, [now, *get_key(p), p[hash_index]]).rowcount:
+                        touched += 1
+                    else:
+                        written += conn.execute(sql, p).rowcount
+                except sqlite3.Error as e:
+                    failed += 1
+                    print(f"[DB] ✗ Upsert into {table} failed: {e}")
+        inserted = conn.execute(f"SELECT COUNT(*) FROM {table} WHERE id > ?",
+                                (last_id,)).fetchone()[0]
+        return inserted, written - inserted, touched, failed
@@ -0,0 +1,283 @@
+# database/cluster_state.py
+"""
+Persisted rotor cluster state, maintained by SQLite triggers.
+
+rotor_analysis/clustering.py rebuilds the binning clusters from every rotor
+on each run. The rotor_cluster_state table (init.sql / migration 6) instead
+holds, per cluster key, what build_clusters() accumulates: the rotor count
+and the running sums of diameter, thickness and effective offset. Triggers
+on rotors keep it current inside the writer's own transaction:
+
+- AFTER INSERT: the new rotor is added to its cluster (created if needed)
+- AFTER UPDATE of a geometry column: removed from the old cluster, added to
+  the new one (BatchWriter upserts of changed rows; unchanged rows only move
+  last_seen and do not fire it)
+- AFTER DELETE: removed from its cluster; an emptied cluster is dropped
+
+So every write path (BatchWriter inserts and upserts, migrations, manual
+deletes) updates the state, and reading the clusters is O(#clusters).
+
+The triggers make bulk inserts about 2.4x slower. A bulk load
+(ingest_jsonl()) calls suspend_cluster_state() first, then rebuilds the
+state once with install_cluster_state() at the end, or after rolling back
+when the load fails.
+
+Keys are stored as bin indices: round(x / step) with round half to even, as
+Python's round() (written with CAST, since SQLite's round() rounds half away
+from zero), and the key in mm is index * step, as in build_clusters(). The
+bin steps are literals of the trigger SQL and recorded in
+rotor_cluster_steps; install_cluster_state() rebuilds the triggers and the
+state for other steps. Centroids are sums / count: sums maintained by
+additions and subtractions can differ from a fresh build_clusters() in the
+last bits.
+
+Usage:
+    python -m database.cluster_state [db_path] [--rebuild]
+"""
+
+import os
+import sqlite3
+import sys
+from typing import Dict, List, Optional, Tuple
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(__file__)))
+
+from database.connection import connect
+
+Steps = Tuple[float, float, float]  # (diameter, thickness, offset) bin steps in mm
+
+CLUSTER_STATE_TABLE_SQL = """
+CREATE TABLE IF NOT EXISTS rotor_cluster_state (
+    diam_bin INTEGER NOT NULL,
+    thick_bin INTEGER NOT NULL,
+    offset_bin INTEGER NOT NULL,
+
+    rotor_count INTEGER NOT NULL,
+    sum_diameter REAL NOT NULL,
+    sum_thickness REAL NOT NULL,
+    sum_offset REAL NOT NULL,
+
+    PRIMARY KEY (diam_bin, thick_bin, offset_bin)
+)
+"""
+
+# Emptied clusters (deleted right away; keeps that DELETE off a table scan)
+CLUSTER_STATE_INDEX_SQL = """
+CREATE INDEX IF NOT EXISTS idx_rotor_cluster_state_empty
+ON rotor_cluster_state (rotor_count) WHERE rotor_count <= 0
+"""
+
+CLUSTER_STEPS_TABLE_SQL = """
+CREATE TABLE IF NOT EXISTS rotor_cluster_steps (
+    diam_bin_step_mm REAL NOT NULL,
+    thick_bin_step_mm REAL NOT NULL,
+    offset_bin_step_mm REAL NOT NULL
+)
+"""
+
+# Trigger names, in creation order
+TRIGGERS = ("rotor_cluster_insert", "rotor_cluster_update", "rotor_cluster_delete")
+
+# Rotor columns a cluster key depends on (UPDATE OF ...)
+GEOMETRY_COLUMNS = ("outer_diameter_mm", "nominal_thickness_mm", "offset_mm",
+                    "overall_height_mm", "hat_height_mm")
+
+
+def default_steps() -> Steps:
+    """Bin steps of rotor_analysis.clustering, read at call time."""
+    from rotor_analysis import clustering
+    return (clustering.DIAM_BIN_STEP_MM, clustering.THICK_BIN_STEP_MM,
+            clustering.OFFSET_BIN_STEP_MM)
+
+
+def key_select_sql(source: str, steps: Steps, indent: str = "") -> str:
+    """
+    SELECT of (diam_bin, thick_bin, offset_bin, d, t, o) for the rotors of
+    source with a complete key; source is a FROM item with columns d, t, o
+    (diameter, thickness, effective offset).
+
+    Each bin is round(x / step) rounding half to even: CAST truncates toward
+    zero (c) and q - c is exact, so comparing it with 0.5 decides the
+    rounding as Python's round() does.
+    """
+    bins = ",\n".join(
+        f"{indent}    c{x} + (q{x} - c{x} > 0.5) - (q{x} - c{x} < -0.5) "
+        f"+ (abs(q{x} - c{x}) = 0.5) * (c{x} % 2) AS {name}"
+        for x, name in zip("dto", ("diam_bin", "thick_bin", "offset_bin")))
+    quotients = ", ".join(f"{x} / {float(step)!r} AS q{x}" for x, step in zip("dto", steps))
+    return (f"SELECT\n{bins},\n{indent}    d, t, o\n"
+            f"{indent}FROM (SELECT *, CAST(qd AS INTEGER) AS cd, CAST(qt AS INTEGER) AS ct, "
+            f"CAST(qo AS INTEGER) AS co\n"
+            f"{indent}      FROM (SELECT d, t, o, {quotients}\n"
+            f"{indent}            FROM {source}\n"
+            f"{indent}            WHERE d IS NOT NULL AND t IS NOT NULL AND o IS NOT NULL))")
+
+
+def _row_source(prefix: str) -> str:
+    """FROM item exposing one rotor (NEW / OLD) as d, t, o."""
+    return (f"(SELECT {prefix}.outer_diameter_mm AS d, {prefix}.nominal_thickness_mm AS t, "
+            f"COALESCE({prefix}.offset_mm, {prefix}.overall_height_mm - {prefix}.hat_height_mm) "
+            f"AS o)")
+
+
+def _add_sql(prefix: str, steps: Steps) -> str:
+    return (f"    INSERT INTO rotor_cluster_state (diam_bin, thick_bin, offset_bin, rotor_count,\n"
+            f"                                     sum_diameter, sum_thickness, sum_offset)\n"
+            f"    SELECT diam_bin, thick_bin, offset_bin, 1, d, t, o\n"
+            f"    FROM ({key_select_sql(_row_source(prefix), steps, ' ' * 10)}) WHERE true\n"
+            f"    ON CONFLICT (diam_bin, thick_bin, offset_bin) DO UPDATE SET\n"
+            f"        rotor_count = rotor_count + 1,\n"
+            f"        sum_diameter = sum_diameter + excluded.sum_diameter,\n"
+            f"        sum_thickness = sum_thickness + excluded.sum_thickness,\n"
+            f"        sum_offset = sum_offset + excluded.sum_offset;\n")
+
+
+def _remove_sql(prefix: str, steps: Steps) -> str:
+    key = key_select_sql(_row_source(prefix), steps, " " * 10)
+    return (f"    UPDATE rotor_cluster_state SET\n"
+            f"        rotor_count = rotor_count - 1,\n"
+            f"        sum_diameter = sum_diameter - k.d,\n"
+            f"        sum_thickness = sum_thickness - k.t,\n"
+            f"        sum_offset = sum_offset - k.o\n"
+            f"    FROM ({key}) AS k\n"
+            f"    WHERE rotor_cluster_state.diam_bin = k.diam_bin\n"
+            f"      AND rotor_cluster_state.thick_bin = k.thick_bin\n"
+            f"      AND rotor_cluster_state.offset_bin = k.offset_bin;\n"
+            f"    DELETE FROM rotor_cluster_state WHERE rotor_count <= 0;\n")
+
+
+def trigger_sql(steps: Steps) -> List[str]:
+    """CREATE TRIGGER statements maintaining rotor_cluster_state (TRIGGERS order)."""
+    changed = "\n   OR ".join(f"OLD.{c} IS NOT NEW.{c}" for c in GEOMETRY_COLUMNS)
+    return [
+        f"CREATE TRIGGER rotor_cluster_insert AFTER INSERT ON rotors\nBEGIN\n"
+        f"{_add_sql('NEW', steps)}END",
+        f"CREATE TRIGGER rotor_cluster_update\n"
+        f"AFTER UPDATE OF {', '.join(GEOMETRY_COLUMNS)} ON rotors\n"
+        f"WHEN {changed}\nBEGIN\n"
+        f"{_remove_sql('OLD', steps)}{_add_sql('NEW', steps)}END",
+        f"CREATE TRIGGER rotor_cluster_delete AFTER DELETE ON rotors\nBEGIN\n"
+        f"{_remove_sql('OLD', steps)}END",
+    ]
+
+
+def install_cluster_state(conn: sqlite3.Connection, steps: Optional[Steps] = None) -> int:
+    """
+    Create the state tables and triggers for the given steps and rebuild
+    the state from the rotors table (one GROUP BY pass). Idempotent; the
+    caller commits.
+
+    Args:
+        steps: (diameter, thickness, offset) bin steps in mm (None = the
+               rotor_analysis.clustering constants)
+
+    Returns:
+        Number of clusters
+    """
+    steps = tuple(float(step) for step in (steps or default_steps()))
+    if any(step <= 0 for step in steps):
+        raise ValueError(f"Bin steps must be > 0, got {steps}")
+    conn.execute(CLUSTER_STATE_TABLE_SQL)
+    conn.execute(CLUSTER_STATE_INDEX_SQL)
+    conn.execute(CLUSTER_STEPS_TABLE_SQL)
+    for name in TRIGGERS:
+        conn.execute(f"DROP TRIGGER IF EXISTS {name}")
+    for sql in trigger_sql(steps):
+        conn.execute(sql)
+    conn.execute("DELETE FROM rotor_cluster_steps")
+    conn.execute("INSERT INTO rotor_cluster_steps VALUES (?, ?, ?)", steps)
+
+    conn.execute("DELETE FROM rotor_cluster_state")
+    rotors = ("(SELECT outer_diameter_mm AS d, nominal_thickness_mm AS t, "
+              "COALESCE(offset_mm, overall_height_mm - hat_height_mm) AS o FROM rotors)")
+    conn.execute(
+        f"INSERT INTO rotor_cluster_state (diam_bin, thick_bin, offset_bin, rotor_count, "
+        f"sum_diameter, sum_thickness, sum_offset) "
+        f"SELECT diam_bin, thick_bin, offset_bin, COUNT(*), SUM(d), SUM(t), SUM(o) "
+        f"FROM ({key_select_sql(rotors, steps)}) GROUP BY diam_bin, thick_bin, offset_bin")
+    return conn.execute("SELECT COUNT(*) FROM rotor_cluster_state").fetchone()[0]
+
+
+def suspend_cluster_state(conn: sqlite3.Connection) -> Optional[Steps]:
+    """
+    Drop the triggers for a bulk load; the caller rebuilds the state at the
+    end (or when the load fails) with install_cluster_state(conn, steps).
+    The state and its steps are cleared as well, so until then
+    load_cluster_state() reports the state as missing instead of stale.
+
+    Commits: the deletes run first and the DROP TRIGGERs inside their
+    transaction, so the triggers are never gone while the state looks
+    valid, whatever the load does before its own first commit.
+
+    Returns:
+        Bin steps of the suspended state (None if none was installed)
+    """
+    steps = cluster_state_steps(conn)
+    if steps is not None:
+        conn.execute("DELETE FROM rotor_cluster_steps")
+        conn.execute("DELETE FROM rotor_cluster_state")
+    for name in TRIGGERS:
+        conn.execute(f"DROP TRIGGER IF EXISTS {name}")
+    conn.commit()
+    return steps
+
+
+def cluster_state_steps(conn: sqlite3.Connection) -> Optional[Steps]:
+    """Bin steps the state was built with (None if not installed)."""
+    try:
+        row = conn.execute("SELECT * FROM rotor_cluster_steps").fetchone()
+    except sqlite3.OperationalError:
+        return None
+    return tuple(row) if row else None
+
+
+def load_cluster_state(conn: sqlite3.Connection, steps: Optional[Steps] = None) -> Dict:
+    """
+    Clusters from the persisted state, ordered by key.
+
+    Args:
+        steps: Bin steps the caller expects (None = the clustering constants)
+
+    Returns:
+        {(diam, thick, offset): {"count", "centroid"}}, as build_clusters()
+        without the members
+
+    Raises:
+        ValueError: State missing, or built with other bin steps
+    """
+    steps = tuple(float(step) for step in (steps or default_steps()))
+    stored = cluster_state_steps(conn)
+    if stored != steps:
+        raise ValueError(f"Cluster state built with steps {stored}, expected {steps} "
+                         f"(rebuild it: python -m database.cluster_state --rebuild)")
+    diam_step, thick_step, offset_step = steps
+    clusters = {}
+    for d, t, o, count, sum_d, sum_t, sum_o in conn.execute(
+            "SELECT diam_bin, thick_bin, offset_bin, rotor_count, sum_diameter, sum_thickness, "
+            "sum_offset FROM rotor_cluster_state ORDER BY diam_bin, thick_bin, offset_bin"):
+        clusters[(d * diam_step, t * thick_step, o * offset_step)] = {
+            "count": count,
+            "centroid": {
+                "outer_diameter_mm": sum_d / count,
+                "nominal_thickness_mm": sum_t / count,
+                "offset_mm": sum_o / count,
+            },
+        }
+    return clusters
+
+
+if __name__ == "__main__":
+    from database.ingest_pipeline import DB_PATH
+
+    args = [arg for arg in sys.argv[1:] if arg != "--rebuild"]
+    path = args[0] if args else DB_PATH
+    conn = connect(path, "bulk_load")
+    if "--rebuild" in sys.argv or cluster_state_steps(conn) is None:
+        clusters = install_cluster_state(conn)
+        conn.commit()
+        print(f"[DB] Cluster state rebuilt: {clusters} clusters")
+    state = load_cluster_state(conn)
+    clustered = sum(cluster["count"] for cluster in state.values())
+    largest = max((cluster["count"] for cluster in state.values()), default=0)
+    print(f"[DB] {path}: {len(state)} clusters, {clustered} rotors, largest {largest}")
+    conn.close()
@@ -0,0 +1,313 @@
+# database/frontier.py
+"""
+Durable crawl frontier: a work queue of seed URLs in SQLite, shared by
+several worker processes (or machines sharing the database file).
+
+ingest_all() reads the seed CSVs and processes every seed in one process.
+The crawl_frontier table (init.sql / migrations 4-5) instead holds one row per
+(seed_group, url) with its page type, priority and lease, and workers pull
+work from it:
+
+- add():     enqueue seeds, at any time (e.g. links discovered while
+             crawling, with their depth); URLs already in the frontier are
+             left alone
+- lease():   atomically claim up to n queued entries, highest priority
+             first, for lease_s seconds. Entries whose lease expired (worker
+             crashed or hung) are claimable again
+- ack():     mark leased entries done; only the lease owner can ack, so a
+             worker whose lease expired and was taken over does not
+             overwrite the new owner's work
+- fail():    record an error; the entry is queued again until it reached
+             max_attempts, then marked failed
+- release(): give entries back without counting an attempt
+- extend():  renew the lease of entries still being processed
+
+Every operation is a single short transaction (BEGIN IMMEDIATE for lease, so
+two workers never claim the same row). ack() and fail() can instead join
+the caller's transaction (commit=False): ingest_frontier() acks a page in
+the same commit as its records, so a page is done exactly when its rows
+are stored. A worker that dies mid-page loses only its lease; the page is
+fetched again after lease_s and its records dedup on the natural keys.
+
+Lease expiry uses wall-clock time (time.time()): workers on several
+machines need synchronized clocks, and must open the file with the
+"shared" connection profile (database/connection.py).
+
+Usage:
+    python -m database.frontier [db_path]            # entries per status
+    python -m database.frontier [db_path] requeue    # failed + done -> queued
+"""
+
+import os
+import socket
+import sqlite3
+import sys
+import time
+from typing import Dict, Iterable, List, Optional
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(__file__)))
+
+from database.batch_writer import utc_now
+
+FRONTIER_STATUSES = ("queued", "leased", "done", "failed")
+
+# Seconds a leased entry stays claimed before other workers may take it
+DEFAULT_LEASE_S = 300.0
+
+# Attempts (fetch / parse / write failures) before an entry is marked failed
+DEFAULT_MAX_ATTEMPTS = 3
+
+FRONTIER_TABLE_SQL = """
+CREATE TABLE IF NOT EXISTS crawl_frontier (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+
+    seed_group TEXT NOT NULL,
+    url TEXT NOT NULL,
+    source TEXT,
+    page_type TEXT,
+    notes TEXT,
+    priority INTEGER NOT NULL DEFAULT 0,
+    discovered_from TEXT,
+    depth INTEGER NOT NULL DEFAULT 0,
+
+    status TEXT NOT NULL DEFAULT 'queued',
+    lease_owner TEXT,
+    lease_expires REAL,
+    attempts INTEGER NOT NULL DEFAULT 0,
+    last_error TEXT,
+    added_at TEXT,
+    updated_at TEXT,
+
+    UNIQUE (seed_group, url)
+)
+"""
+
+# Lease scan: claimable entries by priority
+FRONTIER_INDEX_SQL = """
+CREATE INDEX IF NOT EXISTS idx_crawl_frontier_lease
+    ON crawl_frontier (status, priority DESC, id)
+"""
+
+_ENTRY_COLUMNS = ("id", "seed_group", "url", "source", "page_type", "notes",
+                  "priority", "depth", "attempts")
+
+
+def default_owner() -> str:
+    """Lease owner name of this process: host:pid."""
+    return f"{socket.gethostname()}:{os.getpid()}"
+
+
+class Frontier:
+    """
+    Lease/ack operations of one worker on the crawl_frontier table.
+
+    Args:
+        conn: SQLite connection (connect(path, "bulk_load"), or "shared"
+              across machines); the table must exist (migrate())
+        owner: Lease owner name (default: host:pid)
+        lease_s: Lease duration in seconds
+        max_attempts: Failures before an entry is marked failed
+
+    Entries are dicts with id, seed_group, url, source, page_type, notes,
+    priority, depth, attempts and seed, the (source, url, notes, page_type)
+    tuple used by the ingestion pipeline.
+    """
+
+    def __init__(self, conn: sqlite3.Connection, owner: Optional[str] = None,
+                 lease_s: float = DEFAULT_LEASE_S,
+                 max_attempts: int = DEFAULT_MAX_ATTEMPTS):
+        if lease_s <= 0:
+            raise ValueError(f"lease_s must be > 0, got {lease_s}")
+        if max_attempts < 1:
+            raise ValueError(f"max_attempts must be >= 1, got {max_attempts}")
+        self.conn = conn
+        self.owner = owner or default_owner()
+        self.lease_s = lease_s
+        self.max_attempts = max_attempts
+
+    # --------------------------------------------------------
+    #  Producer
+    # --------------------------------------------------------
+
+    def add(self, group: str, seeds: Iterable[tuple], priority: int = 0,
+            discovered_from: Optional[str] = None, depth: int = 0,
+            commit: bool = True) -> int:
+        """
+        Enqueue seeds; URLs already in the frontier (any status) are skipped.
+
+        Args:
+            group: "rotors", "pads" or "vehicles"
+            seeds: (source, url, notes, page_type) tuples
+            priority: Higher is leased first
+            discovered_from: URL of the page the seeds were found on
+            depth: Link depth of the seeds (0 = seed CSV)
+            commit: Commit now (False: join the caller's transaction)
+
+        Returns:
+            Number of new entries
+        """
+        now = utc_now()
+        rows = [(group, url, source, page_type, notes, priority, discovered_from, depth, now, now)
+                for source, url, notes, page_type in seeds]
+        before = self.conn.total_changes
+        self.conn.executemany(
+            "INSERT INTO crawl_frontier (seed_group, url, source, page_type, notes, priority, "
+            "discovered_from, depth, added_at, updated_at) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?) "
+            "ON CONFLICT (seed_group, url) DO NOTHING", rows)
+        added = self.conn.total_changes - before
+        if commit:
+            self.conn.commit()
+        return added
+
+    # --------------------------------------------------------
+    #  Worker
+    # --------------------------------------------------------
+
+    def lease(self, limit: int, group: Optional[str] = None) -> List[dict]:
+        """
+        Claim up to `limit` entries (queued, or leased with an expired lease).
+
+        Args:
+            limit: Maximum number of entries
+            group: Only entries of this group (None = any)
+
+        Returns:
+            The leased entries, highest priority first (empty when there is
+            nothing to claim right now)
+        """
+        if limit < 1:
+            raise ValueError(f"limit must be >= 1, got {limit}")
+        conn = self.conn
+        now = time.time()
+        where = "(status = 'queued' OR (status = 'leased' AND lease_expires < ?))"
+        params = [now]
+        if group is not None:
+            where += " AND seed_group = ?"
+            params.append(group)
+        if conn.in_transaction:
+            conn.commit()
+        # Take the write lock before reading, so no other worker claims the same rows
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            rows = conn.execute(
+                f"UPDATE crawl_frontier SET status = 'leased', lease_owner = ?, "
+                f"lease_expires = ?, updated_at = ? WHERE id IN "
+                f"(SELECT id FROM crawl_frontier WHERE {where} "
+                f"ORDER BY priority DESC, id LIMIT ?) "
+                f"RETURNING {', '.join(_ENTRY_COLUMNS)}",
+                [self.owner, now + self.lease_s, utc_now(), *params, limit]).fetchall()
+            conn.commit()
+        except BaseException:
+            conn.rollback()
+            raise
+        entries = [dict(zip(_ENTRY_COLUMNS, row)) for row in rows]
+        entries.sort(key=lambda e: (-e["priority"], e["id"]))
+        for entry in entries:
+            entry["seed"] = (entry["source"], entry["url"], entry["notes"], entry["page_type"])
+        return entries
+
+    def _update_owned(self, sql: str, params: list, entries: Iterable[dict],
+                      commit: bool) -> int:
+        """Apply an UPDATE to entries this worker still holds; returns rows changed."""
+        ids = [entry["id"] for entry in entries]
+        changed = 0
+        for entry_id in ids:
+            changed += self.conn.execute(
+                f"{sql} WHERE id = ? AND status = 'leased' AND lease_owner = ?",
+                [*params, entry_id, self.owner]).rowcount
+        if commit:
+            self.conn.commit()
+        return changed
+
+    def ack(self, entries: Iterable[dict], commit: bool = True) -> int:
+        """
+        Mark entries done.
+
+        Returns:
+            Entries acked; lower than given if a lease was lost (expired and
+            claimed by another worker)
+        """
+        return self._update_owned(
+            "UPDATE crawl_frontier SET status = 'done', lease_owner = NULL, "
+            "lease_expires = NULL, last_error = NULL, updated_at = ?",
+            [utc_now()], entries, commit)
+
+    def fail(self, entries: Iterable[dict], error: str, retry: bool = True,
+             commit: bool = True) -> int:
+        """
+        Record a failed attempt: queue the entries again, or mark them
+        failed once they reached max_attempts.
+
+        Args:
+            error: Failure message (kept in last_error)
+            retry: False marks the entries failed at once (e.g. a parse
+                   error, which fetching the page again does not fix)
+
+        Returns:
+            Entries updated (leases still held)
+        """
+        max_attempts = self.max_attempts if retry else 1
+        return self._update_owned(
+            "UPDATE crawl_frontier SET attempts = attempts + 1, "
+            "status = CASE WHEN attempts + 1 >= ? THEN 'failed' ELSE 'queued' END, "
+            "lease_owner = NULL, lease_expires = NULL, last_error = ?, updated_at = ?",
+            [max_attempts, error, utc_now()], entries, commit)
+
+    def release(self, entries: Iterable[dict], commit: bool = True) -> int:
+        """Give entries back to the queue without counting an attempt."""
+        return self._update_owned(
+            "UPDATE crawl_frontier SET status = 'queued', lease_owner = NULL, "
+            "lease_expires = NULL, updated_at = ?",
+            [utc_now()], entries, commit)
+
+    def extend(self, entries: Iterable[dict], commit: bool = True) -> int:
+        """Renew the lease of entries still being processed."""
+        return self._update_owned(
+            "UPDATE crawl_frontier SET lease_expires = ?, updated_at = ?",
+            [time.time() + self.lease_s, utc_now()], entries, commit)
+
+    # --------------------------------------------------------
+    #  Reporting
+    # --------------------------------------------------------
+
+    def outstanding(self, group: Optional[str] = None) -> int:
+        """Entries not finished yet (queued or leased, expired or not)."""
+        sql = "SELECT COUNT(*) FROM crawl_frontier WHERE status IN ('queued', 'leased')"
+        params = ()
+        if group is not None:
+            sql += " AND seed_group = ?"
+            params = (group,)
+        return self.conn.execute(sql, params).fetchone()[0]
+
+    def stats(self) -> Dict[str, int]:
+        """Entry count per status."""
+        counts = dict.fromkeys(FRONTIER_STATUSES, 0)
+        for status, count in self.conn.execute(
+                "SELECT status, COUNT(*) FROM crawl_frontier GROUP BY status"):
+            counts[status] = count
+        return counts
+
+    def requeue(self, statuses: Iterable[str] = ("failed", "done")) -> int:
+        """Queue finished entries again (a new crawl of the same URLs)."""
+        statuses = list(statuses)
+        cur = self.conn.execute(
+            f"UPDATE crawl_frontier SET status = 'queued', attempts = 0, last_error = NULL, "
+            f"updated_at = ? WHERE status IN ({', '.join('?' * len(statuses))})",
+            [utc_now(), *statuses])
+        self.conn.commit()
+        return cur.rowcount
+
+
+if __name__ == "__main__":
+    from database.connection import connect
+    from database.ingest_pipeline import DB_PATH
+    from database.migrations import migrate
+
+    path = sys.argv[1] if len(sys.argv) > 1 else DB_PATH
+    conn = connect(path, "bulk_load")
+    migrate(conn)
+    frontier = Frontier(conn)
+    if len(sys.argv) > 2 and sys.argv[2] == "requeue":
+        print(f"[FRONTIER] {frontier.requeue()} entries queued again")
+    print(f"[FRONTIER] {path}: {frontier.stats()}")
+    conn.close()
@@ -3,73 +3,186 @@
 import csv
 import json
 import os
-import sqlite3
 import sys
+import time
 from pathlib import Path
 
 # Add parent dir to path for imports
 sys.path.insert(0, os.path.dirname(os.path.dirname(__file__)))
 
-from data_scraper.html_scraper import (
-    fetch_html,
-    parse_dba_rotor_page,
-    normalize_rotor,
-    parse_ebc_pad_page,
-    normalize_pad,
-    parse_wheelsize_vehicle_page,
-    normalize_vehicle
+from data_scraper.domain_scheduler import DomainScheduler, interleave_by_domain
+from data_scraper.fetch_engine import iter_fetch
+from data_scraper.html_cache import get_cache
+from data_scraper.http_archive import get_archive
+from data_scraper.http_client import POOL_MAXSIZE, configure_session
+from data_scraper.html_scraper import fetch_html
+from data_scraper.retry_policy import CircuitBreaker, RetryPolicy
+from database.batch_writer import (
+    DEFAULT_BATCH_SIZE,
+    DEFAULT_COMMIT_INTERVAL,
+    NATURAL_KEYS,
+    BatchWriter,
+)
+from database.cluster_state import install_cluster_state, suspend_cluster_state
+from database.connection import connect
+from database.frontier import DEFAULT_LEASE_S, DEFAULT_MAX_ATTEMPTS, Frontier
+from database.jsonl_reader import read_records
+from database.link_discovery import DEFAULT_MAX_DEPTH, DEFAULT_MAX_PAGES, LinkDiscovery
+from database.key_index import DEFAULT_ERROR_RATE, KeyIndex
+from database.migrations import migrate
+from database.seed_journal import journal_summary, register_seeds
+from database.ingest_stages import (
+    DEFAULT_QUEUE_SIZE,
+    TAGS,
+    StagedIngest,
+    page_kind,
+    parse_seed_page,
+    seed_failure,
 )
 
 DB_PATH = "database/bbk.db"
 SEED_INDEX_PATH = "data_seed_url.txt"
 
-def insert_rotor(conn, rotor: dict):
-    fields = ",".join(rotor.keys())
-    placeholders = ",".join(["?"] * len(rotor))
-    sql = f"INSERT INTO rotors ({fields}) VALUES ({placeholders})"
-    conn.execute(sql, list(rotor.values()))
-
-def insert_pad(conn, pad: dict):
-    fields = ",".join(pad.keys())
-    placeholders = ",".join(["?"] * len(pad))
-    sql = f"INSERT INTO pads ({fields}) VALUES ({placeholders})"
-    conn.execute(sql, list(pad.values()))
-
-def insert_vehicle(conn, vh: dict):
-    fields = ",".join(vh.keys())
-    placeholders = ",".join(["?"] * len(vh))
-    sql = f"INSERT INTO vehicles ({fields}) VALUES ({placeholders})"
-    conn.execute(sql, list(vh.values()))
-
-def ingest_jsonl(path: str, table: str):
-    conn = sqlite3.connect(DB_PATH)
-    with open(path, "r", encoding="utf-8") as f:
-        for line in f:
-            obj = json.loads(line)
-            if table == "rotors":
-                insert_rotor(conn, obj)
-            elif table == "pads":
-                insert_pad(conn, obj)
-            elif table == "vehicles":
-                insert_vehicle(conn, obj)
-    conn.commit()
-    conn.close()
+# Invalid JSONL lines printed per file (the rest are only counted)
+MAX_REPORTED_ERRORS = 10
+
+# Frontier entries leased per batch by ingest_frontier()
+DEFAULT_LEASE_SIZE = 20
+
+# Seconds an idle frontier worker waits for leases held by other workers
+FRONTIER_POLL_S = 1.0
+
+def insert_records(conn, table: str, records: list) -> tuple:
+    """
+    Insert records, skipping those whose natural key already exists (the
+    unique index makes the INSERT itself do the dedup).
+    
+    Args:
+        conn: SQLite connection or BatchWriter
+        table: "rotors", "pads" or "vehicles"
+        records: Record dicts, in priority order (first duplicate wins)
+    
+    Returns:
+        (inserted, skipped) counts
+    """
+    if not isinstance(conn, BatchWriter):
+        # One-off writer: same statements, no automatic commit
+        conn = BatchWriter(conn, commit_interval=None)
+    return conn.write(table, records)
+
+def insert_rotor(conn, rotor: dict) -> bool:
+    return insert_records(conn, "rotors", [rotor])[0] == 1
+
+def insert_pad(conn, pad: dict) -> bool:
+    return insert_records(conn, "pads", [pad])[0] == 1
+
+def insert_vehicle(conn, vh: dict) -> bool:
+    return insert_records(conn, "vehicles", [vh])[0] == 1
+
+def ingest_jsonl(path: str, table: str, batch_size: int = DEFAULT_BATCH_SIZE,
+                 commit_interval: int | None = DEFAULT_COMMIT_INTERVAL,
+                 key_index: str | None = None,
+                 key_error_rate: float = DEFAULT_ERROR_RATE,
+                 upsert: bool = False,
+                 db_path: str | None = None,
+                 workers: int | None = 0,
+                 validate: bool = True,
+                 defer_cluster_state: bool = True) -> dict | None:
+    """
+    Load a JSONL file (one record per line) into a table.
+    
+    The file is streamed (plain, gzip or zstd), decoded with orjson when
+    installed and checked against the table's schema, optionally in worker
+    processes (database/jsonl_reader.py); invalid lines are skipped and
+    reported. Records are written with batched executemany() calls and
+    committed every commit_interval rows (database/batch_writer.py). Records
+    whose natural key is already present are skipped, or with upsert update
+    the stored row when their content changed; with key_index ("set" or
+    "bloom") the table's keys are preloaded and known records never reach
+    SQLite (database/key_index.py).
+    
+    Args:
+        db_path: Target database (None = DB_PATH)
+        workers: Decoding processes (0 = decode in this process, None =
+                 os.cpu_count())
+        validate: Check records against data_scraper/schema_<kind>.json
+        defer_cluster_state: Drop the rotor cluster state triggers during
+                             the load and rebuild the state once at the end,
+                             or from the committed rows if the load fails
+                             (database/cluster_state.py); the triggers make
+                             bulk inserts about 2.4x slower
+    
+    Returns:
+        Writer stats plus "lines" (records read) and "invalid" (lines
+        skipped), or None for an unknown table
+    """
+    if table not in NATURAL_KEYS:
+        return None
+    conn = connect(db_path or DB_PATH, "bulk_load")
+    try:
+        migrate(conn)
+        # Rebuilt at the end, or from the committed rows if the load fails
+        suspended = None
+        if defer_cluster_state and table == "rotors":
+            suspended = suspend_cluster_state(conn)
+        try:
+            index = None
+            if key_index is not None:
+                index = KeyIndex.preload(conn, mode=key_index, error_rate=key_error_rate,
+                                         tables=[table])
+            writer = BatchWriter(conn, batch_size=batch_size, commit_interval=commit_interval,
+                                 key_index=index, upsert=upsert)
+            lines = invalid = 0
+            add = writer.add
+            for line_number, record, error in read_records(path, table, workers=workers,
+                                                           validate=validate):
+                lines += 1
+                if error is not None:
+                    invalid += 1
+                    if invalid <= MAX_REPORTED_ERRORS:
+                        print(f"[DB] {path}:{line_number}: {error}")
+                    continue
+                add(table, record)
+            writer.commit()
+        except BaseException:
+            if suspended is not None:
+                conn.rollback()
+                install_cluster_state(conn, suspended)
+                conn.commit()
+            raise
+        if suspended is not None:
+            clusters = install_cluster_state(conn, suspended)
+            conn.commit()
+            print(f"[DB] Cluster state rebuilt: {clusters} clusters")
+    finally:
+        conn.close()
+    
+    if invalid:
+        print(f"[DB] {path}: {invalid}/{lines} invalid lines skipped")
+    return dict(writer.stats, lines=lines, invalid=invalid)
 
 # ------------------------------------------------------------
 #  Deduplication Helpers (Mission 9)
 # ------------------------------------------------------------
+# The ingestion writers no longer probe before inserting: the unique indexes
+# on the natural keys make insert_records() skip duplicates. These helpers
+# remain for ad-hoc checks.
 
 def rotor_exists(conn, rotor: dict) -> bool:
     """
     Check if a rotor with the same (brand, catalog_ref) already exists in DB.
     
     Args:
-        conn: SQLite connection
+        conn: SQLite connection or BatchWriter (queued rows are written
+              first)
         rotor: Rotor dict with at least 'brand' and 'catalog_ref' fields
     
     Returns:
         True if duplicate exists, False otherwise
     """
+    if isinstance(conn, BatchWriter):
+        conn.flush("rotors")
+        conn = conn.conn
     sql = """
     SELECT 1 FROM rotors
     WHERE brand = ? AND catalog_ref = ?
@@ -83,12 +196,15 @@ def pad_exists(conn, pad: dict) -> bool:
     Check if a pad with the same (shape_id, brand, catalog_ref) already exists in DB.
     
     Args:
-        conn: SQLite connection
+        conn: SQLite connection or BatchWriter
         pad: Pad dict with at least 'shape_id', 'brand', and 'catalog_ref' fields
     
     Returns:
         True if duplicate exists, False otherwise
     """
+    if isinstance(conn, BatchWriter):
+        conn.flush("pads")
+        conn = conn.conn
     sql = """
     SELECT 1 FROM pads
     WHERE shape_id = ? AND brand = ? AND catalog_ref = ?
@@ -106,12 +222,15 @@ def vehicle_exists(conn, vehicle: dict) -> bool:
     Check if a vehicle with the same (make, model, year_from) already exists in DB.
     
     Args:
-        conn: SQLite connection
+        conn: SQLite connection or BatchWriter
         vehicle: Vehicle dict with at least 'make', 'model', and 'year_from' fields
     
     Returns:
         True if duplicate exists, False otherwise
     """
+    if isinstance(conn, BatchWriter):
+        conn.flush("vehicles")
+        conn = conn.conn
     sql = """
     SELECT 1 FROM vehicles
     WHERE make = ? AND model = ? AND year_from = ?
@@ -203,39 +322,118 @@ def iter_seed_urls(kind: str):
 #  Processing Functions
 # ------------------------------------------------------------
 
-def process_rotor_seed(conn, source: str, url: str) -> int:
+def write_parsed_page(conn, parsed: dict, url: str) -> int:
     """
-    Fetch, parse, normalize and insert rotor data from a single URL.
+    Writer half of a seed: insert the records of a parsed page, skipping
+    duplicates of existing natural keys (or updating them when the writer
+    upserts and their content changed).
+    
+    Args:
+        conn: SQLite connection, or the BatchWriter of a staged run
+        parsed: Result of ingest_stages.parse_seed_page()
+        url: Page URL (for log messages)
     
     Returns:
-        int: Number of rotors inserted
+        int: Number of records inserted
     """
-    try:
-        print(f"[ROTOR] Fetching {source}: {url}")
-        html = fetch_html(url)
-        
-        # parse_dba_rotor_page returns already normalized dict
-        rotor = parse_dba_rotor_page(html)
-        
-        # Validate required fields
-        if not rotor or not isinstance(rotor, dict):
-            print(f"[ROTOR] Invalid result from parser")
+    kind = parsed["kind"]
+    if kind is None:
+        return 0
+    tag = TAGS[kind]
+    
+    for line in parsed["log"]:
+        print(line)
+    
+    if parsed["error"]:
+        error_type, message = parsed["error"]
+        if error_type == "not_implemented" and kind == "rotor_list":
+            print(f"[{tag}] ⚠ Parser not implemented: {message}")
+        else:
+            print(f"[{tag}] ✗ Error processing {url}: {message}")
+        return 0
+    
+    upsert = isinstance(conn, BatchWriter) and conn.upsert
+    updated_before = conn.stats["updated"] if upsert else 0
+    
+    if kind == "rotor_list":
+        total = parsed["extracted"]
+        if not total:
             return 0
-        
-        required_fields = ["outer_diameter_mm", "nominal_thickness_mm", "brand", "catalog_ref"]
-        if not all(rotor.get(f) for f in required_fields):
-            print(f"[ROTOR] Missing required fields")
+        try:
+            # Dedup (M9) by the rotors unique index, first rotor wins
+            inserted_count, skipped = insert_records(
+                conn, "rotors", [rotor for _, rotor in parsed["records"]])
+        except Exception as e:
+            print(f"[{tag}] ✗ Error processing {url}: {e}")
             return 0
-        
-        insert_rotor(conn, rotor)
-        print(f"[ROTOR] ✓ Inserted: {rotor.get('brand')} {rotor.get('catalog_ref')}")
+        if upsert:
+            updated = conn.stats["updated"] - updated_before
+            print(f"[{tag}] Summary: {inserted_count}/{total} rotors inserted, "
+                  f"{updated} updated, {skipped - updated} duplicates unchanged")
+        else:
+            print(f"[{tag}] Summary: {inserted_count}/{total} rotors inserted, "
+                  f"{skipped} duplicates skipped")
+        return inserted_count
+    
+    if not parsed["records"]:
+        return 0
+    _, record = parsed["records"][0]
+    
+    try:
+        # Dedup (M9) by the table's unique index
+        if kind == "rotor":
+            inserted = insert_rotor(conn, record)
+            key = f"{record.get('brand')}/{record.get('catalog_ref')}"
+        elif kind == "pad":
+            inserted = insert_pad(conn, record)
+            key = f"{record.get('shape_id')}/{record.get('brand')}/{record.get('catalog_ref')}"
+        else:
+            inserted = insert_vehicle(conn, record)
+            key = f"{record.get('make')}/{record.get('model')}/{record.get('year_from')}"
+        if not inserted:
+            if upsert and conn.stats["updated"] > updated_before:
+                print(f"[{tag}] ↻ Updated {key} (content changed)")
+            else:
+                print(f"[{tag}] ○ Duplicate {key}, skipping")
+            return 0
+        if kind == "vehicle":
+            print(f"[{tag}] ✓ Inserted: {record.get('make')} {record.get('model')} "
+                  f"({record.get('year_from')}-{record.get('year_to') or 'now'})")
+        else:
+            print(f"[{tag}] ✓ Inserted: {record.get('brand')} {record.get('catalog_ref')}")
         return 1
-        
     except Exception as e:
-        print(f"[ROTOR] ✗ Error processing {url}: {e}")
+        print(f"[{tag}] ✗ Error processing {url}: {e}")
+        return 0
+
+def _process_page(conn, group: str, source: str, url: str, page_type: str,
+                  html: str | None) -> int:
+    """Fetch (if needed), parse and write one seed inline."""
+    tag = TAGS[page_kind(group, page_type)]
+    try:
+        if html is None:
+            print(f"[{tag}] Fetching {source}: {url}")
+            html = fetch_html(url)
+    except Exception as e:
+        print(f"[{tag}] ✗ Error processing {url}: {e}")
         return 0
+    return write_parsed_page(conn, parse_seed_page(group, source, page_type, html), url)
+
+def process_rotor_seed(conn, source: str, url: str, html: str | None = None) -> int:
+    """
+    Fetch, parse, normalize and insert rotor data from a single URL.
+    A rotor whose (brand, catalog_ref) is already stored is skipped.
+    
+    Args:
+        html: Page content already fetched by the fetch engine (optional).
+              If None, the page is fetched here.
+    
+    Returns:
+        int: Number of rotors inserted
+    """
+    return _process_page(conn, "rotors", source, url, "product", html)
 
-def process_rotor_list_seed(conn, source: str, url: str) -> int:
+def process_rotor_list_seed(conn, source: str, url: str, html: str | None = None) -> int:
     """
     Fetch and parse a catalog page listing multiple rotors (M10.2).
     
@@ -246,159 +444,141 @@ def process_rotor_list_seed(conn, source: str, url: str) -> int:
         conn: SQLite connection
         source: Site identifier (used to select parser)
         url: Catalog page URL
+        html: Page content already fetched by the fetch engine (optional)
     
     Returns:
         int: Number of rotors successfully inserted
     """
-    try:
-        print(f"[ROTOR-LIST] Fetching {source}: {url}")
-        html = fetch_html(url)
-        
-        # Import list parser (late import to avoid circular dependency)
-        from data_scraper.html_rotor_list_scraper import parse_rotor_list_page
-        from data_scraper.html_scraper import normalize_rotor
-        
-        # Parse list page to get RAW rotor dicts
-        raw_rotors = parse_rotor_list_page(html, source)
-        
-        if not raw_rotors:
-            print(f"[ROTOR-LIST] No rotors extracted from page")
-            return 0
-        
-        print(f"[ROTOR-LIST] Extracted {len(raw_rotors)} rotors from page")
-        
-        # Process each rotor
-        inserted_count = 0
-        for i, raw_rotor in enumerate(raw_rotors, 1):
-            try:
-                # Normalize raw data
-                rotor = normalize_rotor(raw_rotor, source=source)
-                
-                # Validate required fields
-                required_fields = ["outer_diameter_mm", "nominal_thickness_mm",
-                                  "hat_height_mm", "overall_height_mm",
-                                  "center_bore_mm", "bolt_circle_mm",
-                                  "bolt_hole_count", "ventilation_type",
-                                  "directionality", "brand", "catalog_ref"]
-                
-                if not all(rotor.get(f) for f in required_fields):
-                    print(f"[ROTOR-LIST]   {i}/{len(raw_rotors)} Missing required fields, skipping")
-                    continue
-                
-                # Check for duplicates (M9)
-                if rotor_exists(conn, rotor):
-                    print(f"[ROTOR-LIST]   {i}/{len(raw_rotors)} ○ Duplicate {rotor.get('brand')}/{rotor.get('catalog_ref')}, skipping")
-                    continue
-                
-                # Insert into database
-                insert_rotor(conn, rotor)
-                print(f"[ROTOR-LIST]   {i}/{len(raw_rotors)} ✓ Inserted: {rotor.get('brand')} {rotor.get('catalog_ref')}")
-                inserted_count += 1
-                
-            except Exception as e:
-                print(f"[ROTOR-LIST]   {i}/{len(raw_rotors)} ✗ Error: {e}")
-                continue
-        
-        print(f"[ROTOR-LIST] Summary: {inserted_count}/{len(raw_rotors)} rotors inserted")
-        return inserted_count
-        
-    except NotImplementedError as e:
-        print(f"[ROTOR-LIST] ⚠ Parser not implemented: {e}")
-        return 0
-    except Exception as e:
-        print(f"[ROTOR-LIST] ✗ Error processing {url}: {e}")
-        return 0
+    return _process_page(conn, "rotors", source, url, "list", html)
 
-def process_pad_seed(conn, source: str, url: str) -> int:
+def process_pad_seed(conn, source: str, url: str, html: str | None = None) -> int:
     """
     Fetch, parse, normalize and insert pad data from a single URL.
     
+    Args:
+        html: Page content already fetched by the fetch engine (optional).
+              If None, the page is fetched here.
+    
     Returns:
         int: Number of pads inserted
     """
-    try:
-        print(f"[PAD] Fetching {source}: {url}")
-        html = fetch_html(url)
-        
-        # parse_ebc_pad_page returns already normalized dict
-        pad = parse_ebc_pad_page(html)
-        
-        # Validate required fields
-        if not pad or not isinstance(pad, dict):
-            print(f"[PAD] Invalid result from parser")
-            return 0
-        
-        required_fields = ["shape_id", "length_mm", "height_mm", "thickness_mm", "brand", "catalog_ref"]
-        if not all(pad.get(f) for f in required_fields):
-            print(f"[PAD] Missing required fields")
-            return 0
-        
-        # Check for duplicates (M9)
-        if pad_exists(conn, pad):
-            print(f"[PAD] ○ Duplicate {pad.get('shape_id')}/{pad.get('brand')}/{pad.get('catalog_ref')}, skipping")
-            return 0
-        
-        insert_pad(conn, pad)
-        print(f"[PAD] ✓ Inserted: {pad.get('brand')} {pad.get('catalog_ref')}")
-        return 1
-        
-    except Exception as e:
-        print(f"[PAD] ✗ Error processing {url}: {e}")
-        return 0
+    return _process_page(conn, "pads", source, url, "product", html)
 
-def process_vehicle_seed(conn, source: str, url: str) -> int:
+def process_vehicle_seed(conn, source: str, url: str, html: str | None = None) -> int:
     """
     Fetch, parse, normalize and insert vehicle data from a single URL.
     
+    Args:
+        html: Page content already fetched by the fetch engine (optional).
+              If None, the page is fetched here.
+    
     Returns:
         int: Number of vehicles inserted
     """
-    try:
-        print(f"[VEHICLE] Fetching {source}: {url}")
-        html = fetch_html(url)
-        
-        # parse_wheelsize_vehicle_page returns RAW dict
-        raw = parse_wheelsize_vehicle_page(html)
-        
-        if not raw or not isinstance(raw, dict):
-            print(f"[VEHICLE] Invalid result from parser")
-            return 0
-        
-        # Normalize
-        vehicle = normalize_vehicle(raw, source="wheelsize")
-        
-        # Validate required fields
-        required_fields = ["make", "model", "year_from", "hub_bolt_circle_mm", 
-                          "hub_bolt_hole_count", "hub_center_bore_mm"]
-        if not all(vehicle.get(f) for f in required_fields):
-            print(f"[VEHICLE] Missing required fields")
-            return 0
-        
-        # Check for duplicates (M9)
-        if vehicle_exists(conn, vehicle):
-            print(f"[VEHICLE] ○ Duplicate {vehicle.get('make')}/{vehicle.get('model')}/{vehicle.get('year_from')}, skipping")
-            return 0
-        
-        insert_vehicle(conn, vehicle)
-        print(f"[VEHICLE] ✓ Inserted: {vehicle.get('make')} {vehicle.get('model')} "
-              f"({vehicle.get('year_from')}-{vehicle.get('year_to') or 'now'})")
-        return 1
-        
-    except Exception as e:
-        print(f"[VEHICLE] ✗ Error processing {url}: {e}")
-        return 0
+    return _process_page(conn, "vehicles", source, url, "product", html)
 
 # ------------------------------------------------------------
 #  Main Ingestion Pipeline
 # ------------------------------------------------------------
 
-def ingest_all(group: str | None = None) -> None:
+def process_seed(conn, group: str, source: str, url: str, page_type: str,
+                 html: str | None = None) -> int:
+    """
+    Dispatch a seed to the processor matching its group and page_type.
+    
+    Returns:
+        int: Number of records inserted
+    """
+    if page_kind(group, page_type) is None:
+        return 0
+    return _process_page(conn, group, source, url, page_type, html)
+
+def retry_stats(retry: RetryPolicy | None, breaker: CircuitBreaker | None) -> dict:
+    """
+    Retry and circuit breaker counters of a run.
+    
+    Returns:
+        {"retries", "recovered", "exhausted", "trips"} (zeros when off)
+    """
+    counts = {"retries": 0, "recovered": 0, "exhausted": 0, "trips": 0}
+    if retry is not None:
+        for key in ("retries", "recovered", "exhausted"):
+            counts[key] = retry.stats[key]
+    if breaker is not None:
+        counts["trips"] = sum(s["trips"] for s in breaker.stats().values())
+    return counts
+
+def print_retry_stats(retry: RetryPolicy | None, breaker: CircuitBreaker | None) -> None:
+    if retry is not None:
+        r = retry.stats
+        print(f"Retries: {r['retries']} ({r['wait_s']:.1f}s backoff), "
+              f"{r['recovered']} pages recovered, {r['exhausted']} gave up")
+    if breaker is not None and breaker.stats():
+        print("Circuit breaker:")
+        breaker.print_stats()
+
+def ingest_all(group: str | None = None, concurrency: int = 1,
+               ordered: bool = True,
+               scheduler: DomainScheduler | None = None,
+               parse_workers: int | None = None,
+               queue_size: int = DEFAULT_QUEUE_SIZE,
+               batch_size: int = DEFAULT_BATCH_SIZE,
+               commit_interval: int | None = DEFAULT_COMMIT_INTERVAL,
+               key_index: str | None = None,
+               key_error_rate: float = DEFAULT_ERROR_RATE,
+               upsert: bool = False,
+               resume: bool = False,
+               max_depth: int = DEFAULT_MAX_DEPTH,
+               max_pages: int = DEFAULT_MAX_PAGES,
+               retry: RetryPolicy | None = None,
+               breaker: CircuitBreaker | None = None) -> dict | None:
     """
     Main ingestion pipeline that reads seed URLs and populates the database.
     
+    Runs as three stages connected by bounded queues (database/ingest_stages.py):
+    the concurrent fetch engine (data_scraper.fetch_engine), a process pool
+    that parses/normalizes/validates pages, and a single writer thread that
+    dedups and inserts into SQLite with batched executemany() calls
+    (database/batch_writer.py). A slow stage throttles the ones before it.
+    A DomainScheduler bounds the load per host and interleaves seeds across
+    hosts. Each seed's outcome is journaled in ingest_journal together with
+    its records (database/seed_journal.py), so an interrupted run can be
+    resumed. Links found on list pages (next pages, product pages) are
+    fetched in further rounds, one per depth level (database/link_discovery.py).
+    Transient fetch errors are retried with backoff and failing hosts paused
+    (data_scraper.retry_policy).
+    
     Args:
         group: Optional filter - one of "rotors", "pads", "vehicles".
                If None, processes all groups.
+        concurrency: Maximum number of fetches in flight (1 = sequential)
+        ordered: Process pages in seed order (True) or as completed (False)
+        scheduler: Optional per-domain politeness scheduler
+        parse_workers: Parser processes (None = DEFAULT_PARSE_WORKERS,
+                       0 = parse in the main process)
+        queue_size: Pages allowed to wait between two stages
+        batch_size: Rows per executemany() call
+        commit_interval: Rows per transaction (None = single commit at the
+                         end); an interrupted run keeps what was committed
+        key_index: Preload the stored natural keys ("set": exact, "bloom":
+                   bounded memory, may skip about key_error_rate of new
+                   records) so duplicates never reach SQLite; None = off
+        key_error_rate: False-positive rate of key_index="bloom"
+        upsert: Update stored records whose content hash changed (corrected
+                specs) instead of skipping them; unchanged records only get
+                last_seen updated. Not combinable with key_index
+        resume: Skip the seeds the journal records as inserted by earlier
+                runs (failed and unfinished seeds are processed again);
+                False marks every seed pending again
+        max_depth: Levels of list page links followed (0 = seed pages only)
+        max_pages: Pages discovered per group at most
+        retry: Optional retry policy for transient fetch errors
+        breaker: Optional per-domain circuit breaker
+    
+    Returns:
+        Stats dict {"rotors", "pads", "vehicles", "errors", "resumed",
+        "discovered", "retry", "journal", "stages"}, or None if the group
+        is invalid
     """
     print("="*60)
     print("BIGBRAKEKIT - INGESTION PIPELINE")
@@ -410,13 +590,46 @@ def ingest_all(group: str | None = None) -> None:
     
     if group and group not in valid_groups:
         print(f"[ERROR] Invalid group '{group}'. Must be one of: {valid_groups}")
-        return
+        return None
     
-    # Initialize database connection
-    conn = sqlite3.connect(DB_PATH)
+    # Size keep-alive pools so concurrent fetches to one host reuse connections
+    if concurrency > POOL_MAXSIZE:
+        configure_session(pool_maxsize=concurrency)
     
     # Track statistics
-    stats = {"rotors": 0, "pads": 0, "vehicles": 0, "errors": 0}
+    stats = {"rotors": 0, "pads": 0, "vehicles": 0, "errors": 0, "resumed": 0,
+             "discovered": 0}
+    
+    # Register every seed in the journal before the writer starts; on resume
+    # drop the seeds already inserted by an earlier run
+    seeds_by_group = {}
+    discovery_by_group = {}
+    done_by_group = {}
+    conn = connect(DB_PATH, "bulk_load")
+    try:
+        migrate(conn)
+        for current_group in groups_to_process:
+            seeds = list(iter_seed_urls(current_group))
+            discovery_by_group[current_group] = LinkDiscovery(
+                max_depth, max_pages, visited=(seed[1] for seed in seeds))
+            done = register_seeds(conn, current_group, seeds, resume=resume)
+            done_by_group[current_group] = done
+            if done:
+                seeds = [seed for seed in seeds if seed[1] not in done]
+                stats["resumed"] += len(done)
+                print(f"[JOURNAL] {current_group}: {len(done)} seeds already inserted, "
+                      f"{len(seeds)} to process")
+            seeds_by_group[current_group] = seeds
+    finally:
+        conn.close()
+    
+    # Parser pool + DB writer (owns the SQLite connection, commits every
+    # commit_interval rows, every few journaled seeds and on success)
+    stages = StagedIngest(DB_PATH, write_parsed_page, parse_workers=parse_workers,
+                          queue_size=queue_size, batch_size=batch_size,
+                          commit_interval=commit_interval, key_index=key_index,
+                          key_error_rate=key_error_rate, upsert=upsert,
+                          journal=True).start()
     
     try:
         # Process each group
@@ -425,50 +638,238 @@ def ingest_all(group: str | None = None) -> None:
             print(f"Processing {current_group.upper()}")
             print(f"{'='*60}")
             
+            seeds = seeds_by_group[current_group]
+            discovery = discovery_by_group[current_group]
+            done = done_by_group[current_group]
             group_count = 0
-            
-            for source, url, notes, page_type in iter_seed_urls(current_group):
-                if notes:
-                    print(f"\nNote: {notes}")
+            depth = 0
+            # One round per depth level: seed pages, then the pages they link to
+            while seeds:
+                if scheduler is not None:
+                    # Spread consecutive seeds over hosts (per-domain politeness)
+                    seeds = interleave_by_domain(seeds, key=lambda seed: seed[1])
+                if concurrency > 1 or scheduler is not None:
+                    print(f"[FETCH] {len(seeds)} seeds, concurrency={concurrency}")
+                
+                fetched = iter_fetch((seed[1] for seed in seeds), concurrency=concurrency,
+                                     ordered=ordered, scheduler=scheduler,
+                                     max_buffered=queue_size, retry=retry, breaker=breaker)
                 
                 # Call appropriate processor based on group and page_type (M10.2)
-                if current_group == "rotors":
-                    if page_type == "list":
-                        count = process_rotor_list_seed(conn, source, url)
-                    else:
-                        count = process_rotor_seed(conn, source, url)
-                elif current_group == "pads":
-                    count = process_pad_seed(conn, source, url)
-                elif current_group == "vehicles":
-                    count = process_vehicle_seed(conn, source, url)
-                else:
-                    count = 0
+                counts = stages.run(current_group, seeds, fetched, ordered=ordered)
+                group_count += counts["inserted"]
+                stats["errors"] += counts["errors"]
                 
-                group_count += count
-                if count == 0:
-                    stats["errors"] += 1
+                seeds = [found for seed, links in counts["links"]
+                         for found in discovery.follow(seed, links, depth)]
+                depth += 1
+                if done:
+                    # Pages discovered and inserted by the interrupted run
+                    stats["resumed"] += sum(1 for seed in seeds if seed[1] in done)
+                    seeds = [seed for seed in seeds if seed[1] not in done]
+                if seeds:
+                    print(f"\n[DISCOVER] {current_group}: {len(seeds)} linked pages "
+                          f"at depth {depth}")
+            stats["discovered"] += discovery.stats["discovered"]
             
             stats[current_group] = group_count
             print(f"\n{current_group.upper()} Summary: {group_count} inserted")
         
         # Commit all changes
-        conn.commit()
+        stages.close(commit=True)
+        stats["stages"] = stages.stats()
+        stats["retry"] = retry_stats(retry, breaker)
+        conn = connect(DB_PATH, "read_mostly")
+        try:
+            stats["journal"] = journal_summary(conn)
+        finally:
+            conn.close()
         print(f"\n{'='*60}")
         print("INGESTION COMPLETE")
         print(f"{'='*60}")
         print(f"Rotors inserted:   {stats['rotors']}")
         print(f"Pads inserted:     {stats['pads']}")
         print(f"Vehicles inserted: {stats['vehicles']}")
+        print(f"Duplicates skipped: {stats['stages']['write']['skipped']}")
+        if upsert:
+            print(f"Rows updated:      {stats['stages']['write']['updated']}")
         print(f"Errors encountered: {stats['errors']}")
+        if resume:
+            print(f"Seeds resumed (skipped): {stats['resumed']}")
+        if stats["discovered"]:
+            print(f"Linked pages discovered: {stats['discovered']}")
+        j = stats["journal"]
+        print(f"Journal: {j['inserted']} seeds inserted, {j['failed']} failed, "
+              f"{j['pending']} pending")
+        print("Pipeline stages:")
+        stages.print_stats()
+        if scheduler is not None:
+            print("Per-domain fetch stats:")
+            scheduler.print_stats()
+        print_retry_stats(retry, breaker)
+        cache = get_cache()
+        if cache is not None:
+            c = cache.stats
+            print(f"HTML cache: {c['hits']} hits, {c['revalidated']} revalidated (304), "
+                  f"{c['misses']} downloaded, {c['evicted']} evicted")
+        archive = get_archive()
+        if archive is not None:
+            a = archive.stats
+            print(f"HTTP archive ({archive.mode}): {a['recorded']} recorded, "
+                  f"{a['replayed']} replayed, {a['missing']} missing")
         print("="*60)
         
-    except Exception as e:
+        return stats
+        
+    except BaseException as e:
         print(f"\n[FATAL ERROR] {e}")
-        conn.rollback()
+        stages.close(commit=False)
         raise
+
+def ingest_frontier(group: str | None = None, concurrency: int = 1,
+                    scheduler: DomainScheduler | None = None,
+                    enqueue: bool = True,
+                    worker_id: str | None = None,
+                    lease_size: int = DEFAULT_LEASE_SIZE,
+                    lease_s: float = DEFAULT_LEASE_S,
+                    max_attempts: int = DEFAULT_MAX_ATTEMPTS,
+                    batch_size: int = DEFAULT_BATCH_SIZE,
+                    upsert: bool = False,
+                    max_depth: int = DEFAULT_MAX_DEPTH,
+                    max_pages: int = DEFAULT_MAX_PAGES,
+                    profile: str = "bulk_load",
+                    db_path: str | None = None,
+                    retry: RetryPolicy | None = None,
+                    breaker: CircuitBreaker | None = None) -> dict | None:
+    """
+    Frontier worker: lease seeds from the crawl_frontier table, fetch,
+    parse and write them, until the frontier is drained.
+    
+    Several workers (processes, or machines sharing the database file with
+    profile="shared") can run at once: each lease is atomic, so no page is
+    fetched by two workers while its lease holds (database/frontier.py).
+    A page is acked in the transaction that stores its records; fetch
+    errors queue the page again (up to max_attempts), parse errors fail it.
+    A worker that crashes loses its leases, which other workers take over
+    after lease_s seconds. Links found on list pages are added to the
+    frontier in the same transaction, with their depth
+    (database/link_discovery.py).
+    
+    Args:
+        group: Only this group's seeds (None = all groups)
+        concurrency: Maximum number of fetches in flight per worker
+        scheduler: Optional per-domain politeness scheduler
+        enqueue: First add the seed CSVs to the frontier (URLs already
+                 there are left alone, so every worker may do it)
+        worker_id: Lease owner name (None = host:pid)
+        lease_size: Seeds leased (and committed) per batch
+        lease_s: Lease duration; must exceed the time to process a batch,
+                 retry backoffs included
+        max_attempts: Leases of a seed whose fetch failed before it is
+                      marked failed (each lease may retry, see retry)
+        batch_size: Rows per executemany() call
+        upsert: Update stored records whose content hash changed
+        max_depth: Levels of list page links followed (0 = seed pages only)
+        max_pages: Pages discovered by this worker at most
+        profile: Connection profile ("shared" across machines)
+        db_path: Target database (None = DB_PATH)
+        retry: Optional retry policy for transient fetch errors
+        breaker: Optional per-domain circuit breaker
     
+    Returns:
+        Stats dict {"rotors", "pads", "vehicles", "errors", "enqueued",
+        "leased", "lost", "discovered", "retry", "frontier"}, or None if
+        the group is invalid
+    """
+    valid_groups = ["rotors", "pads", "vehicles"]
+    if group and group not in valid_groups:
+        print(f"[ERROR] Invalid group '{group}'. Must be one of: {valid_groups}")
+        return None
+    groups_to_process = valid_groups if group is None else [group]
+    
+    if concurrency > POOL_MAXSIZE:
+        configure_session(pool_maxsize=concurrency)
+    
+    stats = {"rotors": 0, "pads": 0, "vehicles": 0, "errors": 0,
+             "enqueued": 0, "leased": 0, "lost": 0, "discovered": 0}
+    # Frontier URLs are unique per group; this only saves re-adding them
+    discovery = LinkDiscovery(max_depth, max_pages)
+    conn = connect(db_path or DB_PATH, profile)
+    try:
+        migrate(conn, verbose=False)
+        frontier = Frontier(conn, owner=worker_id, lease_s=lease_s,
+                            max_attempts=max_attempts)
+        if enqueue:
+            for current_group in groups_to_process:
+                seeds = list(iter_seed_urls(current_group))
+                discovery.visit(seed[1] for seed in seeds)
+                stats["enqueued"] += frontier.add(current_group, seeds)
+        print(f"[FRONTIER] Worker {frontier.owner}: {stats['enqueued']} seeds enqueued, "
+              f"{frontier.outstanding(group)} outstanding")
+        
+        # Records and acks share the worker's transactions (one per lease)
+        writer = BatchWriter(conn, batch_size=batch_size, commit_interval=None, upsert=upsert)
+        while True:
+            entries = frontier.lease(lease_size, group)
+            if not entries:
+                if frontier.outstanding(group) == 0:
+                    break
+                # Other workers hold the rest; wait for them or their leases to expire
+                time.sleep(FRONTIER_POLL_S)
+                continue
+            stats["leased"] += len(entries)
+            
+            fetched = iter_fetch((entry["url"] for entry in entries), concurrency=concurrency,
+                                 ordered=False, scheduler=scheduler,
+                                 retry=retry, breaker=breaker)
+            try:
+                for index, url, html, error in fetched:
+                    entry = entries[index]
+                    seed = entry["seed"]
+                    parsed = None
+                    if error is not None:
+                        print(f"[FETCH] ✗ Error fetching {seed[0]}: {url}: {error}")
+                    else:
+                        parsed = parse_seed_page(entry["seed_group"], seed[0], seed[3], html, url)
+                        found = discovery.follow(seed, parsed["links"], entry["depth"])
+                        if found:
+                            stats["discovered"] += frontier.add(
+                                entry["seed_group"], found, priority=entry["priority"],
+                                discovered_from=url, depth=entry["depth"] + 1, commit=False)
+                    failure = seed_failure(seed, parsed, error)
+                    count = 0
+                    if failure is None:
+                        count = write_parsed_page(writer, parsed, url)
+                        writer.flush()
+                        held = frontier.ack([entry], commit=False)
+                    else:
+                        held = frontier.fail([entry], failure, retry=error is not None,
+                                             commit=False)
+                    stats["lost"] += 1 - held
+                    stats[entry["seed_group"]] += count
+                    if count == 0:
+                        stats["errors"] += 1
+            finally:
+                fetched.close()
+            writer.commit()
+        
+        stats["frontier"] = frontier.stats()
+        stats["retry"] = retry_stats(retry, breaker)
+    except BaseException as e:
+        print(f"\n[FATAL ERROR] {e}")
+        conn.rollback()
+        raise
     finally:
         conn.close()
+    
+    f = stats["frontier"]
+    print(f"[FRONTIER] Worker {frontier.owner}: {stats['leased']} seeds leased, "
+          f"{stats['rotors']} rotors, {stats['pads']} pads, {stats['vehicles']} vehicles inserted, "
+          f"{stats['discovered']} pages discovered, {stats['lost']} leases lost")
+    print(f"[FRONTIER] {f['done']} done, {f['failed']} failed, {f['queued']} queued, "
+          f"{f['leased']} leased")
+    print_retry_stats(retry, breaker)
+    return stats
 
 # ------------------------------------------------------------
 #  CLI Entry Point
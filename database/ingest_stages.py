@@ -0,0 +1,550 @@
+# database/ingest_stages.py
+"""
+Staged producer/consumer runtime for ingest_all().
+
+The process_*_seed() functions used to fetch -> parse -> normalize -> dedup
+-> insert inline, so BeautifulSoup parsing blocked the network and SQLite
+writes blocked both. ingest_all() now runs three stages connected by bounded
+queues:
+
+    fetch (I/O threads, fetch_engine.iter_fetch)
+      -> parse + normalize + validate (process pool, parse_seed_page)
+      -> dedup + insert (single writer thread owning the SQLite connection,
+         batched through database/batch_writer.BatchWriter)
+
+Backpressure: each hand-off is bounded by queue_size. A full writer queue
+blocks the dispatcher, which stops collecting parse results; once queue_size
+pages wait for parsing no more fetch results are consumed, and the fetch
+engine stops starting new requests (iter_fetch(max_buffered=...)).
+
+Semantics are those of the inline processors: the parse stage applies the
+same required-field validation, the writer the same natural-key dedup
+(unique indexes, database/migrations.py) and the same log lines. In ordered
+mode pages reach the writer in seed order, so "first seed wins" on
+duplicates is unchanged.
+
+The writer commits every commit_interval rows, so an interrupted run keeps
+all but its last transaction. With key_index ("set" or "bloom"), the writer
+preloads the stored natural keys (database/key_index.py) and drops known
+records before they reach SQLite. With upsert, records whose key exists but
+whose content hash changed update the stored row. With journal, the writer
+records each seed's outcome in ingest_journal (database/seed_journal.py),
+in the same transactions as the records, for resumable runs.
+
+List pages also yield the links to follow (next pages, product pages,
+extract_list_links()); run() returns them with the group's counts and
+ingest_all() fetches them in a next round (database/link_discovery.py).
+
+Pages travel whole: the streaming list parsers (stream_rotor_list(),
+data_scraper/html_rotor_list_scraper.py) are not used here, since
+iter_fetch() retries and archives complete responses, the parse pool
+receives the page as one string, and link extraction needs all of it.
+
+Per-stage counters (items, errors, busy time, throughput, queue depths) are
+printed at the end of ingest_all().
+"""
+
+import collections
+import os
+import queue
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from typing import Callable, Dict, Iterable, List, Optional
+
+from data_scraper.html_rotor_list_scraper import extract_list_links, parse_rotor_list_page
+from data_scraper.html_scraper import (
+    normalize_rotor,
+    normalize_vehicle,
+    parse_dba_rotor_page,
+    parse_ebc_pad_page,
+    parse_wheelsize_vehicle_page,
+)
+from data_scraper.spec_extract import get_html_backend, set_html_backend
+from database.batch_writer import DEFAULT_BATCH_SIZE, DEFAULT_COMMIT_INTERVAL, BatchWriter
+from database.connection import connect
+from database.key_index import DEFAULT_ERROR_RATE, KeyIndex
+from database.migrations import migrate
+from database.seed_journal import DEFAULT_JOURNAL_COMMIT_INTERVAL, SeedJournal
+
+# Pages allowed to wait between two stages
+DEFAULT_QUEUE_SIZE = 32
+
+# Parser processes (0 = parse in the dispatcher thread)
+DEFAULT_PARSE_WORKERS = min(4, os.cpu_count() or 1)
+
+# Log tag per page kind
+TAGS = {"rotor": "ROTOR", "rotor_list": "ROTOR-LIST", "pad": "PAD", "vehicle": "VEHICLE"}
+
+REQUIRED_FIELDS = {
+    "rotor": ["outer_diameter_mm", "nominal_thickness_mm", "brand", "catalog_ref"],
+    "rotor_list": ["outer_diameter_mm", "nominal_thickness_mm",
+                   "hat_height_mm", "overall_height_mm",
+                   "center_bore_mm", "bolt_circle_mm",
+                   "bolt_hole_count", "ventilation_type",
+                   "directionality", "brand", "catalog_ref"],
+    "pad": ["shape_id", "length_mm", "height_mm", "thickness_mm", "brand", "catalog_ref"],
+    "vehicle": ["make", "model", "year_from", "hub_bolt_circle_mm",
+                "hub_bolt_hole_count", "hub_center_bore_mm"],
+}
+
+_CLOSE = object()
+
+
+# ------------------------------------------------------------
+#  Parse stage (pure, runs in worker processes)
+# ------------------------------------------------------------
+
+def page_kind(group: str, page_type: str) -> Optional[str]:
+    """Map a seed's group/page_type to a page kind (None if unsupported)."""
+    if group == "rotors":
+        return "rotor_list" if page_type == "list" else "rotor"
+    if group == "pads":
+        return "pad"
+    if group == "vehicles":
+        return "vehicle"
+    return None
+
+
+def parse_seed_page(group: str, source: str, page_type: str, html: str,
+                    url: Optional[str] = None) -> dict:
+    """
+    Parse, normalize and validate one fetched page (no database access).
+
+    The page is parsed whole, also for list pages: the fetch stage hands
+    over complete responses and extract_list_links() needs the full page.
+    Peak memory therefore grows with the page size here; flat-memory
+    parsing is only available through stream_rotor_list() /
+    iter_rotor_list_page() fed from stream_html() without cache or archive.
+
+    Args:
+        group: "rotors", "pads" or "vehicles"
+        source: Site identifier (selects the list parser)
+        page_type: "product" or "list"
+        html: Page content
+        url: Page URL; list pages then also return their links
+
+    Returns:
+        dict with:
+        - kind: page kind ("rotor", "rotor_list", "pad", "vehicle") or None
+        - records: [(position, record)] that passed validation
+        - extracted: number of records found on the page
+        - log: messages produced while parsing (printed by the writer)
+        - error: None, or ("not_implemented" | "exception", message)
+        - links: [(url, page_type)] to follow (list pages with a url)
+        - cpu_s: CPU seconds spent parsing
+    """
+    start = time.process_time()
+    kind = page_kind(group, page_type)
+    parsed = {"kind": kind, "records": [], "extracted": 0, "log": [],
+              "error": None, "links": [], "cpu_s": 0.0}
+    if kind is None:
+        return parsed
+    tag = TAGS[kind]
+
+    if kind == "rotor_list" and url is not None:
+        parsed["links"] = extract_list_links(html, source, url)
+        if parsed["links"]:
+            parsed["log"].append(f"[{tag}] {len(parsed['links'])} links to follow")
+
+    try:
+        if kind == "rotor_list":
+            raw_rotors = parse_rotor_list_page(html, source)
+            if not raw_rotors:
+                parsed["log"].append(f"[{tag}] No rotors extracted from page")
+            else:
+                total = len(raw_rotors)
+                parsed["extracted"] = total
+                parsed["log"].append(f"[{tag}] Extracted {total} rotors from page")
+                for i, raw_rotor in enumerate(raw_rotors, 1):
+                    try:
+                        rotor = normalize_rotor(raw_rotor, source=source)
+                        if not all(rotor.get(f) for f in REQUIRED_FIELDS[kind]):
+                            parsed["log"].append(f"[{tag}]   {i}/{total} Missing required fields, skipping")
+                            continue
+                        parsed["records"].append((i, rotor))
+                    except Exception as e:
+                        parsed["log"].append(f"[{tag}]   {i}/{total} ✗ Error: {e}")
+        else:
+            if kind == "rotor":
+                # parse_dba_rotor_page returns already normalized dict
+                record = parse_dba_rotor_page(html)
+            elif kind == "pad":
+                # parse_ebc_pad_page returns already normalized dict
+                record = parse_ebc_pad_page(html)
+            else:
+                # parse_wheelsize_vehicle_page returns RAW dict
+                record = parse_wheelsize_vehicle_page(html)
+
+            if not record or not isinstance(record, dict):
+                parsed["log"].append(f"[{tag}] Invalid result from parser")
+            else:
+                if kind == "vehicle":
+                    record = normalize_vehicle(record, source="wheelsize")
+                parsed["extracted"] = 1
+                if not all(record.get(f) for f in REQUIRED_FIELDS[kind]):
+                    parsed["log"].append(f"[{tag}] Missing required fields")
+                else:
+                    parsed["records"].append((1, record))
+
+    except NotImplementedError as e:
+        parsed["error"] = ("not_implemented", str(e))
+    except Exception as e:
+        parsed["error"] = ("exception", str(e))
+
+    parsed["cpu_s"] = time.process_time() - start
+    return parsed
+
+
+def seed_failure(seed: tuple, parsed: Optional[dict], error) -> Optional[str]:
+    """
+    Why a seed produced no usable page, as recorded by the ingest journal
+    and the crawl frontier.
+
+    Returns:
+        "fetch: ...", "no parser for page_type ...", "parse (type): ...",
+        or None when the page was parsed
+    """
+    if error is not None:
+        return f"fetch: {error}"
+    if parsed["kind"] is None:
+        return f"no parser for page_type {seed[3]!r}"
+    if parsed["error"]:
+        return "parse ({}): {}".format(*parsed["error"])
+    return None
+
+
+def _warm_up() -> int:
+    return os.getpid()
+
+
+# ------------------------------------------------------------
+#  Stage runtime
+# ------------------------------------------------------------
+
+class StagedIngest:
+    """
+    Process pool + single writer thread shared by every group of one run.
+
+    Args:
+        db_path: SQLite database (opened by the writer thread)
+        write_page: write_page(writer, parsed, url) -> records inserted
+                    (dedup + insert + log, see ingest_pipeline.write_parsed_page);
+                    writer is the stage's BatchWriter
+        parse_workers: Parser processes (0 = parse in the dispatcher thread)
+        queue_size: Bound of each inter-stage queue
+        batch_size: Rows per executemany() call of the writer
+        commit_interval: Rows per writer transaction (None = commit on close)
+        key_index: Preload the stored natural keys ("set" or "bloom") so
+                   duplicates skip the database; None disables it
+        key_error_rate: False-positive rate of key_index="bloom"
+        upsert: Rewrite stored rows whose content changed (see BatchWriter);
+                not combinable with key_index
+        journal: Record each seed's outcome in ingest_journal
+        journal_commit_interval: Seeds per journal commit (see SeedJournal)
+
+    Usage:
+        with StagedIngest(DB_PATH, write_parsed_page) as stages:
+            counts = stages.run("rotors", seeds, iter_fetch(...))
+        # committed on success, last transaction rolled back on error
+    """
+
+    def __init__(self, db_path: str, write_page: Callable[[BatchWriter, dict, str], int],
+                 parse_workers: Optional[int] = None,
+                 queue_size: int = DEFAULT_QUEUE_SIZE,
+                 batch_size: int = DEFAULT_BATCH_SIZE,
+                 commit_interval: Optional[int] = DEFAULT_COMMIT_INTERVAL,
+                 key_index: Optional[str] = None,
+                 key_error_rate: float = DEFAULT_ERROR_RATE,
+                 upsert: bool = False,
+                 journal: bool = False,
+                 journal_commit_interval: Optional[int] = DEFAULT_JOURNAL_COMMIT_INTERVAL):
+        if queue_size < 1:
+            raise ValueError(f"queue_size must be >= 1, got {queue_size}")
+        if upsert and key_index is not None:
+            raise ValueError("upsert and key_index cannot be combined")
+        self.db_path = db_path
+        self.write_page = write_page
+        self.parse_workers = DEFAULT_PARSE_WORKERS if parse_workers is None else parse_workers
+        self.queue_size = queue_size
+        self.batch_size = batch_size
+        self.commit_interval = commit_interval
+        self.key_index = key_index
+        self.key_error_rate = key_error_rate
+        self.upsert = upsert
+        self.journal = journal
+        self.journal_commit_interval = journal_commit_interval
+
+        self._pool = None
+        self._write_q = queue.Queue(maxsize=queue_size)
+        self._writer = None
+        self._writer_error = None
+        self._lock = threading.Lock()
+        self._group = {"inserted": 0, "errors": 0}
+        self._group_name = None
+        self._journal = None
+        self._elapsed_s = 0.0
+        self.counters = {
+            "fetch": {"items": 0, "errors": 0, "busy_s": 0.0},
+            "parse": {"items": 0, "errors": 0, "busy_s": 0.0, "records": 0},
+            "write": {"items": 0, "errors": 0, "busy_s": 0.0, "inserted": 0,
+                      "skipped": 0, "filtered": 0, "updated": 0, "batches": 0, "commits": 0,
+                      "journaled": 0},
+            "max_parse_pending": 0,
+            "max_write_queue": 0,
+            "blocked_s": 0.0,
+        }
+
+    # --------------------------------------------------------
+    #  Lifecycle
+    # --------------------------------------------------------
+
+    def start(self) -> "StagedIngest":
+        if self.parse_workers > 0:
+            # Workers use the parent's HTML backend (data_scraper/spec_extract.py)
+            self._pool = ProcessPoolExecutor(max_workers=self.parse_workers,
+                                             initializer=set_html_backend,
+                                             initargs=(get_html_backend(),))
+            # Fork the workers now, before fetch threads exist
+            self._pool.submit(_warm_up).result()
+        self._writer = threading.Thread(target=self._write_loop, name="bbk-db-writer",
+                                        daemon=True)
+        self._writer.start()
+        return self
+
+    def close(self, commit: bool = True) -> None:
+        """Commit (or roll back the open transaction) and stop the writer and the parser pool."""
+        if self._writer is not None:
+            self._write_q.put((_CLOSE, commit))
+            self._writer.join()
+            self._writer = None
+        if self._pool is not None:
+            self._pool.shutdown(wait=True, cancel_futures=True)
+            self._pool = None
+        if commit and self._writer_error is not None:
+            raise self._writer_error
+
+    def __enter__(self) -> "StagedIngest":
+        return self.start()
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        self.close(commit=exc_type is None)
+
+    # --------------------------------------------------------
+    #  Writer stage
+    # --------------------------------------------------------
+
+    def _write_loop(self) -> None:
+        conn = connect(self.db_path, "bulk_load")
+        index = None
+        try:
+            migrate(conn)
+            if self.key_index is not None:
+                index = KeyIndex.preload(conn, mode=self.key_index,
+                                         error_rate=self.key_error_rate)
+                print(f"[DB] Key index preloaded: {index.describe()}")
+        except BaseException as e:
+            self._writer_error = e
+        writer = BatchWriter(conn, batch_size=self.batch_size,
+                             commit_interval=self.commit_interval, key_index=index,
+                             upsert=self.upsert)
+        if self.journal:
+            self._journal = SeedJournal(writer, commit_interval=self.journal_commit_interval)
+        try:
+            while True:
+                # Take whatever is ready as one batch
+                items = [self._write_q.get()]
+                while len(items) < self.queue_size:
+                    try:
+                        items.append(self._write_q.get_nowait())
+                    except queue.Empty:
+                        break
+                close = [item[1] for item in items if item[0] is _CLOSE]
+                pages = [item for item in items if item[0] is not _CLOSE]
+                try:
+                    if pages and self._writer_error is None:
+                        self._write_batch(writer, pages)
+                except BaseException as e:  # surfaced by run()/close()
+                    self._writer_error = e
+                finally:
+                    for _ in items:
+                        self._write_q.task_done()
+                if close:
+                    try:
+                        if close[0] and self._writer_error is None:
+                            writer.commit()
+                        else:
+                            writer.rollback()
+                    except BaseException as e:
+                        self._writer_error = e
+                        conn.rollback()
+                    return
+        finally:
+            for name in ("skipped", "filtered", "updated", "batches", "commits"):
+                self.counters["write"][name] = writer.stats[name]
+            conn.close()
+
+    def _write_batch(self, writer: BatchWriter, batch: List[tuple]) -> None:
+        start = time.perf_counter()
+        for seed, url, parsed, error in batch:
+            source, _, notes, _ = seed
+            if notes:
+                print(f"\nNote: {notes}")
+
+            if error is not None:
+                print(f"[FETCH] ✗ Error fetching {source}: {url}: {error}")
+                count = 0
+            else:
+                count = self.write_page(writer, parsed, url)
+                self.counters["write"]["items"] += 1
+                self.counters["write"]["inserted"] += count
+            if self._journal is not None:
+                self._mark(seed, parsed, error, count)
+
+            with self._lock:
+                self._group["inserted"] += count
+                if count == 0:
+                    self._group["errors"] += 1
+        self.counters["write"]["busy_s"] += time.perf_counter() - start
+
+    def _mark(self, seed: tuple, parsed: Optional[dict], error, count: int) -> None:
+        """Journal a written page: inserted, or failed with the fetch / parse error."""
+        failure = seed_failure(seed, parsed, error)
+        if failure is None:
+            self._journal.mark(self._group_name, seed, "inserted", records=count)
+        else:
+            self._journal.mark(self._group_name, seed, "failed", error=failure)
+        self.counters["write"]["journaled"] += 1
+
+    # --------------------------------------------------------
+    #  Dispatcher (fetch -> parse -> writer)
+    # --------------------------------------------------------
+
+    def run(self, group: str, seeds: List[tuple], fetched: Iterable[tuple],
+            ordered: bool = True) -> Dict[str, int]:
+        """
+        Push one group's fetch results through parse and write stages.
+
+        Args:
+            group: "rotors", "pads" or "vehicles"
+            seeds: [(source, url, notes, page_type)] indexed by fetch result index
+            fetched: (index, url, html, error) results from iter_fetch()
+            ordered: Hand pages to the writer in the order they arrive from
+                     fetch (True: keeps seed order) or as parsing completes
+
+        Returns:
+            {"inserted": n, "errors": n, "links": [(seed, links)]} for this
+            group, once every page has been written; links are those of
+            the parsed list pages (parse_seed_page())
+        """
+        with self._lock:
+            self._group = {"inserted": 0, "errors": 0}
+            # Read by the writer's journal; the previous group is fully written
+            self._group_name = group
+        counters = self.counters
+        pending = collections.deque()   # [(seed, url, future | parsed | None, error)]
+        links = []
+        start = time.perf_counter()
+
+        def to_writer(entry):
+            seed, url, job, error = entry
+            if error is None:
+                parsed = job.result() if self._pool is not None else job
+                counters["parse"]["items"] += 1
+                counters["parse"]["records"] += len(parsed["records"])
+                counters["parse"]["busy_s"] += parsed["cpu_s"]
+                if parsed["error"]:
+                    counters["parse"]["errors"] += 1
+                if parsed["links"]:
+                    links.append((seed, parsed["links"]))
+            else:
+                parsed = None
+            t0 = time.perf_counter()
+            self._write_q.put((seed, url, parsed, error))
+            counters["blocked_s"] += time.perf_counter() - t0
+            counters["max_write_queue"] = max(counters["max_write_queue"], self._write_q.qsize())
+            if self._writer_error is not None:
+                raise self._writer_error
+
+        def is_ready(entry):
+            return entry[3] is not None or self._pool is None or entry[2].done()
+
+        def drain(limit):
+            # Forward finished parses; block while more than `limit` are pending
+            if ordered:
+                while pending and (len(pending) > limit or is_ready(pending[0])):
+                    to_writer(pending.popleft())
+                return
+            while pending:
+                ready = [e for e in pending if is_ready(e)]
+                if not ready:
+                    if len(pending) <= limit:
+                        return
+                    t0 = time.perf_counter()
+                    wait([e[2] for e in pending], return_when=FIRST_COMPLETED)
+                    counters["blocked_s"] += time.perf_counter() - t0
+                    continue
+                for entry in ready:
+                    pending.remove(entry)
+                    to_writer(entry)
+
+        for index, url, html, error in fetched:
+            seed = seeds[index]
+            counters["fetch"]["items"] += 1
+            if error is not None:
+                counters["fetch"]["errors"] += 1
+                pending.append((seed, url, None, error))
+            else:
+                source, _, _, page_type = seed
+                if self._pool is not None:
+                    job = self._pool.submit(parse_seed_page, group, source, page_type, html, url)
+                else:
+                    job = parse_seed_page(group, source, page_type, html, url)
+                pending.append((seed, url, job, None))
+            counters["max_parse_pending"] = max(counters["max_parse_pending"], len(pending))
+            drain(self.queue_size - 1)
+
+        drain(0)
+        self._write_q.join()
+        elapsed = time.perf_counter() - start
+        counters["fetch"]["busy_s"] += elapsed
+        self._elapsed_s += elapsed
+        if self._writer_error is not None:
+            raise self._writer_error
+
+        with self._lock:
+            return dict(self._group, links=links)
+
+    # --------------------------------------------------------
+    #  Reporting
+    # --------------------------------------------------------
+
+    def stats(self) -> dict:
+        """Per-stage counters, with throughput over the run's wall time."""
+        elapsed = self._elapsed_s or 1e-9
+        out = {}
+        for stage in ("fetch", "parse", "write"):
+            c = dict(self.counters[stage])
+            c["items_per_s"] = round(c["items"] / elapsed, 1)
+            c["busy_s"] = round(c["busy_s"], 3)
+            out[stage] = c
+        out["elapsed_s"] = round(self._elapsed_s, 3)
+        out["parse_workers"] = self.parse_workers
+        out["max_parse_pending"] = self.counters["max_parse_pending"]
+        out["max_write_queue"] = self.counters["max_write_queue"]
+        out["blocked_s"] = round(self.counters["blocked_s"], 3)
+        return out
+
+    def print_stats(self) -> None:
+        s = self.stats()
+        print(f"  {'Stage':<7} {'Items':>6} {'Errors':>6} {'Busy s':>8} {'Items/s':>8}")
+        for stage in ("fetch", "parse", "write"):
+            c = s[stage]
+            print(f"  {stage:<7} {c['items']:>6} {c['errors']:>6} {c['busy_s']:>8.3f} {c['items_per_s']:>8.1f}")
+        print(f"  Parse workers: {s['parse_workers']}, records parsed: {s['parse']['records']}, "
+              f"inserted: {s['write']['inserted']}, updated: {s['write']['updated']}, "
+              f"duplicates skipped: {s['write']['skipped']} "
+              f"({s['write']['filtered']} by key index, {s['write']['batches']} batches, "
+              f"{s['write']['commits']} commits)")
+        print(f"  Backpressure: max {s['max_parse_pending']} pages awaiting parse, "
+              f"max {s['max_write_queue']} awaiting write, dispatcher blocked {s['blocked_s']:.3f}s")
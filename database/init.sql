@@ -3,6 +3,10 @@
 DROP TABLE IF EXISTS rotors;
 DROP TABLE IF EXISTS pads;
 DROP TABLE IF EXISTS vehicles;
+DROP TABLE IF EXISTS ingest_journal;
+DROP TABLE IF EXISTS crawl_frontier;
+DROP TABLE IF EXISTS rotor_cluster_state;
+DROP TABLE IF EXISTS rotor_cluster_steps;
 
 -- ------------------------------------------------------------
 --  Rotors
@@ -28,9 +32,17 @@ CREATE TABLE rotors (
     pad_swept_area_mm2 REAL,
 
     brand TEXT NOT NULL,
-    catalog_ref TEXT NOT NULL
+    catalog_ref TEXT NOT NULL,
+
+    -- Change tracking (database/batch_writer.py)
+    content_hash TEXT,
+    first_seen TEXT,
+    last_seen TEXT
 );
 
+-- Natural key: one row per (brand, catalog_ref)
+CREATE UNIQUE INDEX idx_rotors_natural_key ON rotors (brand, catalog_ref);
+
 -- ------------------------------------------------------------
 --  Pads
 -- ------------------------------------------------------------
@@ -47,9 +59,17 @@ CREATE TABLE pads (
     backing_plate_type TEXT,
 
     brand TEXT NOT NULL,
-    catalog_ref TEXT NOT NULL
+    catalog_ref TEXT NOT NULL,
+
+    -- Change tracking (database/batch_writer.py)
+    content_hash TEXT,
+    first_seen TEXT,
+    last_seen TEXT
 );
 
+-- Natural key: one row per (shape_id, brand, catalog_ref)
+CREATE UNIQUE INDEX idx_pads_natural_key ON pads (shape_id, brand, catalog_ref);
+
 -- ------------------------------------------------------------
 --  Vehicles
 -- ------------------------------------------------------------
@@ -73,5 +93,188 @@ CREATE TABLE vehicles (
     max_rotor_diameter_mm REAL,
     wheel_inner_barrel_clearance_mm REAL,
     rotor_thickness_min_mm REAL,
-    rotor_thickness_max_mm REAL
+    rotor_thickness_max_mm REAL,
+
+    -- Change tracking (database/batch_writer.py)
+    content_hash TEXT,
+    first_seen TEXT,
+    last_seen TEXT
 );
+
+-- Natural key: one row per (make, model, year_from)
+CREATE UNIQUE INDEX idx_vehicles_natural_key ON vehicles (make, model, year_from);
+
+-- ------------------------------------------------------------
+--  Ingest journal (database/seed_journal.py)
+-- ------------------------------------------------------------
+
+-- One row per seed URL: pending / inserted / failed, for --resume
+CREATE TABLE ingest_journal (
+    seed_group TEXT NOT NULL,
+    url TEXT NOT NULL,
+    source TEXT,
+    page_type TEXT,
+
+    status TEXT NOT NULL DEFAULT 'pending',
+    attempts INTEGER NOT NULL DEFAULT 0,
+    records INTEGER,
+    last_error TEXT,
+    updated_at TEXT,
+
+    PRIMARY KEY (seed_group, url)
+);
+
+-- ------------------------------------------------------------
+--  Crawl frontier (database/frontier.py)
+-- ------------------------------------------------------------
+
+-- One row per queued URL: queued / leased / done / failed, for --frontier workers
+CREATE TABLE crawl_frontier (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+
+    seed_group TEXT NOT NULL,
+    url TEXT NOT NULL,
+    source TEXT,
+    page_type TEXT,
+    notes TEXT,
+    priority INTEGER NOT NULL DEFAULT 0,
+    discovered_from TEXT,
+    depth INTEGER NOT NULL DEFAULT 0,
+
+    status TEXT NOT NULL DEFAULT 'queued',
+    lease_owner TEXT,
+    lease_expires REAL,
+    attempts INTEGER NOT NULL DEFAULT 0,
+    last_error TEXT,
+    added_at TEXT,
+    updated_at TEXT,
+
+    UNIQUE (seed_group, url)
+);
+
+-- Lease scan: claimable entries by priority
+CREATE INDEX idx_crawl_frontier_lease ON crawl_frontier (status, priority DESC, id);
+
+-- ------------------------------------------------------------
+--  Rotor cluster state (database/cluster_state.py)
+-- ------------------------------------------------------------
+
+-- Per cluster key (bin indices): rotor count and running sums, for O(#clusters)
+-- cluster queries (rotor_analysis/clustering.py load_cluster_summary())
+CREATE TABLE rotor_cluster_state (
+    diam_bin INTEGER NOT NULL,
+    thick_bin INTEGER NOT NULL,
+    offset_bin INTEGER NOT NULL,
+
+    rotor_count INTEGER NOT NULL,
+    sum_diameter REAL NOT NULL,
+    sum_thickness REAL NOT NULL,
+    sum_offset REAL NOT NULL,
+
+    PRIMARY KEY (diam_bin, thick_bin, offset_bin)
+);
+
+-- Emptied clusters (deleted right away by the triggers)
+CREATE INDEX idx_rotor_cluster_state_empty
+ON rotor_cluster_state (rotor_count) WHERE rotor_count <= 0;
+
+-- Bin steps (mm) of the triggers below: install_cluster_state() rewrites both
+CREATE TABLE rotor_cluster_steps (
+    diam_bin_step_mm REAL NOT NULL,
+    thick_bin_step_mm REAL NOT NULL,
+    offset_bin_step_mm REAL NOT NULL
+);
+INSERT INTO rotor_cluster_steps VALUES (5.0, 0.5, 2.0);
+
+-- Generated by trigger_sql((5.0, 0.5, 2.0)): keep the state in step with every
+-- insert, geometry update and delete of rotors
+CREATE TRIGGER rotor_cluster_insert AFTER INSERT ON rotors
+BEGIN
+    INSERT INTO rotor_cluster_state (diam_bin, thick_bin, offset_bin, rotor_count,
+                                     sum_diameter, sum_thickness, sum_offset)
+    SELECT diam_bin, thick_bin, offset_bin, 1, d, t, o
+    FROM (SELECT
+              cd + (qd - cd > 0.5) - (qd - cd < -0.5) + (abs(qd - cd) = 0.5) * (cd % 2) AS diam_bin,
+              ct + (qt - ct > 0.5) - (qt - ct < -0.5) + (abs(qt - ct) = 0.5) * (ct % 2) AS thick_bin,
+              co + (qo - co > 0.5) - (qo - co < -0.5) + (abs(qo - co) = 0.5) * (co % 2) AS offset_bin,
+              d, t, o
+          FROM (SELECT *, CAST(qd AS INTEGER) AS cd, CAST(qt AS INTEGER) AS ct, CAST(qo AS INTEGER) AS co
+                FROM (SELECT d, t, o, d / 5.0 AS qd, t / 0.5 AS qt, o / 2.0 AS qo
+                      FROM (SELECT NEW.outer_diameter_mm AS d, NEW.nominal_thickness_mm AS t, COALESCE(NEW.offset_mm, NEW.overall_height_mm - NEW.hat_height_mm) AS o)
+                      WHERE d IS NOT NULL AND t IS NOT NULL AND o IS NOT NULL))) WHERE true
+    ON CONFLICT (diam_bin, thick_bin, offset_bin) DO UPDATE SET
+        rotor_count = rotor_count + 1,
+        sum_diameter = sum_diameter + excluded.sum_diameter,
+        sum_thickness = sum_thickness + excluded.sum_thickness,
+        sum_offset = sum_offset + excluded.sum_offset;
+END;
+
+CREATE TRIGGER rotor_cluster_update
+AFTER UPDATE OF outer_diameter_mm, nominal_thickness_mm, offset_mm, overall_height_mm, hat_height_mm ON rotors
+WHEN OLD.outer_diameter_mm IS NOT NEW.outer_diameter_mm
+   OR OLD.nominal_thickness_mm IS NOT NEW.nominal_thickness_mm
+   OR OLD.offset_mm IS NOT NEW.offset_mm
+   OR OLD.overall_height_mm IS NOT NEW.overall_height_mm
+   OR OLD.hat_height_mm IS NOT NEW.hat_height_mm
+BEGIN
+    UPDATE rotor_cluster_state SET
+        rotor_count = rotor_count - 1,
+        sum_diameter = sum_diameter - k.d,
+        sum_thickness = sum_thickness - k.t,
+        sum_offset = sum_offset - k.o
+    FROM (SELECT
+              cd + (qd - cd > 0.5) - (qd - cd < -0.5) + (abs(qd - cd) = 0.5) * (cd % 2) AS diam_bin,
+              ct + (qt - ct > 0.5) - (qt - ct < -0.5) + (abs(qt - ct) = 0.5) * (ct % 2) AS thick_bin,
+              co + (qo - co > 0.5) - (qo - co < -0.5) + (abs(qo - co) = 0.5) * (co % 2) AS offset_bin,
+              d, t, o
+          FROM (SELECT *, CAST(qd AS INTEGER) AS cd, CAST(qt AS INTEGER) AS ct, CAST(qo AS INTEGER) AS co
+                FROM (SELECT d, t, o, d / 5.0 AS qd, t / 0.5 AS qt, o / 2.0 AS qo
+                      FROM (SELECT OLD.outer_diameter_mm AS d, OLD.nominal_thickness_mm AS t, COALESCE(OLD.offset_mm, OLD.overall_height_mm - OLD.hat_height_mm) AS o)
+                      WHERE d IS NOT NULL AND t IS NOT NULL AND o IS NOT NULL))) AS k
+    WHERE rotor_cluster_state.diam_bin = k.diam_bin
+      AND rotor_cluster_state.thick_bin = k.thick_bin
+      AND rotor_cluster_state.offset_bin = k.offset_bin;
+    DELETE FROM rotor_cluster_state WHERE rotor_count <= 0;
+    INSERT INTO rotor_cluster_state (diam_bin, thick_bin, offset_bin, rotor_count,
+                                     sum_diameter, sum_thickness, sum_offset)
+    SELECT diam_bin, thick_bin, offset_bin, 1, d, t, o
+    FROM (SELECT
+              cd + (qd - cd > 0.5) - (qd - cd < -0.5) + (abs(qd - cd) = 0.5) * (cd % 2) AS diam_bin,
+              ct + (qt - ct > 0.5) - (qt - ct < -0.5) + (abs(qt - ct) = 0.5) * (ct % 2) AS thick_bin,
+              co + (qo - co > 0.5) - (qo - co < -0.5) + (abs(qo - co) = 0.5) * (co % 2) AS offset_bin,
+              d, t, o
+          FROM (SELECT *, CAST(qd AS INTEGER) AS cd, CAST(qt AS INTEGER) AS ct, CAST(qo AS INTEGER) AS co
+                FROM (SELECT d, t, o, d / 5.0 AS qd, t / 0.5 AS qt, o / 2.0 AS qo
+                      FROM (SELECT NEW.outer_diameter_mm AS d, NEW.nominal_thickness_mm AS t, COALESCE(NEW.offset_mm, NEW.overall_height_mm - NEW.hat_height_mm) AS o)
+                      WHERE d IS NOT NULL AND t IS NOT NULL AND o IS NOT NULL))) WHERE true
+    ON CONFLICT (diam_bin, thick_bin, offset_bin) DO UPDATE SET
+        rotor_count = rotor_count + 1,
+        sum_diameter = sum_diameter + excluded.sum_diameter,
+        sum_thickness = sum_thickness + excluded.sum_thickness,
+        sum_offset = sum_offset + excluded.sum_offset;
+END;
+
+CREATE TRIGGER rotor_cluster_delete AFTER DELETE ON rotors
+BEGIN
+    UPDATE rotor_cluster_state SET
+        rotor_count = rotor_count - 1,
+        sum_diameter = sum_diameter - k.d,
+        sum_thickness = sum_thickness - k.t,
+        sum_offset = sum_offset - k.o
+    FROM (SELECT
+              cd + (qd - cd > 0.5) - (qd - cd < -0.5) + (abs(qd - cd) = 0.5) * (cd % 2) AS diam_bin,
+              ct + (qt - ct > 0.5) - (qt - ct < -0.5) + (abs(qt - ct) = 0.5) * (ct % 2) AS thick_bin,
+              co + (qo - co > 0.5) - (qo - co < -0.5) + (abs(qo - co) = 0.5) * (co % 2) AS offset_bin,
+              d, t, o
+          FROM (SELECT *, CAST(qd AS INTEGER) AS cd, CAST(qt AS INTEGER) AS ct, CAST(qo AS INTEGER) AS co
+                FROM (SELECT d, t, o, d / 5.0 AS qd, t / 0.5 AS qt, o / 2.0 AS qo
+                      FROM (SELECT OLD.outer_diameter_mm AS d, OLD.nominal_thickness_mm AS t, COALESCE(OLD.offset_mm, OLD.overall_height_mm - OLD.hat_height_mm) AS o)
+                      WHERE d IS NOT NULL AND t IS NOT NULL AND o IS NOT NULL))) AS k
+    WHERE rotor_cluster_state.diam_bin = k.diam_bin
+      AND rotor_cluster_state.thick_bin = k.thick_bin
+      AND rotor_cluster_state.offset_bin = k.offset_bin;
+    DELETE FROM rotor_cluster_state WHERE rotor_count <= 0;
+END;
+
+-- Schema version (database/migrations.py)
+PRAGMA user_version = 7;
@@ -0,0 +1,245 @@
+# database/jsonl_reader.py
+"""
+Streaming JSONL record reader for ingest_jsonl().
+
+read_records() turns a JSONL export (one record per line) into validated
+record dicts without loading the file in memory:
+- input may be plain, gzip or zstd compressed (detected from the first
+  bytes, not the file name); zstd needs the `zstandard` package
+- lines are decoded with orjson when it is installed, json otherwise
+- each record is checked against data_scraper/schema_<kind>.json (required
+  fields, types, enums, no unknown fields), compiled once per table
+- lines are handled in chunks; with workers > 0 the chunks are decoded and
+  validated in a ProcessPoolExecutor, with a bounded number of chunks in
+  flight, and results come back in file order
+
+A line that is not valid JSON or fails validation is yielded with its error
+and no record; blank lines are ignored.
+"""
+
+import collections
+import gzip
+import io
+import json
+import os
+from concurrent.futures import ProcessPoolExecutor
+from functools import lru_cache
+from itertools import islice
+from typing import BinaryIO, Dict, Iterator, List, Optional, Tuple
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
+SCHEMA_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+                          "data_scraper")
+
+# data_scraper/schema_<kind>.json per table
+SCHEMA_FILES = {
+    "rotors": "schema_rotor.json",
+    "pads": "schema_pad.json",
+    "vehicles": "schema_vehicle.json",
+}
+
+# Lines per chunk (one pool task)
+DEFAULT_CHUNK_LINES = 2000
+
+# Chunks kept in flight per worker process
+CHUNKS_PER_WORKER = 2
+
+GZIP_MAGIC = b"\x1f\x8b"
+ZSTD_MAGIC = b"\x28\xb5\x2f\xfd"
+
+ReadResult = Tuple[int, Optional[dict], Optional[Exception]]    # (line number, record, error)
+
+# JSON Schema type -> Python types of decoded values (bool is not a number)
+_TYPES = {
+    "number": (int, float),
+    "integer": (int,),
+    "string": (str,),
+    "null": (type(None),),
+}
+
+# ------------------------------------------------------------
+#  Input
+# ------------------------------------------------------------
+
+def open_jsonl(path: str) -> BinaryIO:
+    """
+    Open a JSONL file for binary line iteration, decompressing if needed.
+
+    Raises:
+        ImportError: zstd input and `zstandard` not installed
+    """
+    with open(path, "rb") as f:
+        magic = f.read(4)
+    if magic.startswith(GZIP_MAGIC):
+        return gzip.open(path, "rb")
+    if magic == ZSTD_MAGIC:
+        if zstandard is None:
+            raise ImportError(f"{path} is zstd-compressed: install the 'zstandard' package")
+        raw = open(path, "rb")
+        return io.BufferedReader(zstandard.ZstdDecompressor().stream_reader(raw, closefd=True))
+    return open(path, "rb")
+
+
+def loads(line: bytes):
+    """Decode one JSON document (orjson when installed)."""
+    if orjson is not None:
+        return orjson.loads(line)
+    return json.loads(line)
+
+# ------------------------------------------------------------
+#  Schema validation
+# ------------------------------------------------------------
+
+class RecordSchema:
+    """
+    A table's JSON Schema, compiled for fast per-record checks.
+
+    Records of one export share a handful of shapes, so the outcome of the
+    field/type checks is cached per (field names, value types) signature;
+    only enum values are checked on every record.
+    """
+
+    def __init__(self, schema: dict):
+        self.required = frozenset(schema.get("required", ()))
+        self.types: Dict[str, frozenset] = {}
+        self.enums: Dict[str, frozenset] = {}
+        for name, spec in schema["properties"].items():
+            kinds = spec["type"] if isinstance(spec["type"], list) else [spec["type"]]
+            self.types[name] = frozenset(t for kind in kinds for t in _TYPES[kind])
+            if "enum" in spec:
+                self.enums[name] = frozenset(spec["enum"])
+        self._signatures: Dict[tuple, Optional[str]] = {}
+
+    def _check_signature(self, record: dict) -> Optional[str]:
+        missing = self.required - record.keys()
+        if missing:
+            return f"missing required fields {sorted(missing)}"
+        for name, value in record.items():
+            types = self.types.get(name)
+            if types is None:
+                return f"unknown field {name!r}"
+            if type(value) not in types:
+                return f"{name}: unexpected {type(value).__name__} {value!r}"
+        return None
+
+    def validate(self, record) -> dict:
+        """
+        Check a decoded record.
+
+        Returns:
+            The record
+
+        Raises:
+            ValueError: Not an object, missing required field, unknown field,
+                        wrong type or value outside the enum
+        """
+        if type(record) is not dict:
+            raise ValueError(f"expected a JSON object, got {type(record).__name__}")
+        signature = (tuple(record), tuple(map(type, record.values())))
+        try:
+            error = self._signatures[signature]
+        except KeyError:
+            error = self._signatures[signature] = self._check_signature(record)
+        if error is not None:
+            # Re-run the checks so the message names this record's values
+            raise ValueError(self._check_signature(record))
+        for name, enum in self.enums.items():
+            value = record.get(name)
+            if value is not None and value not in enum:
+                raise ValueError(f"{name}: {value!r} not in {sorted(v for v in enum if v is not None)}")
+        return record
+
+
+@lru_cache(maxsize=None)
+def compile_schema(table: str) -> RecordSchema:
+    """Load and compile a table's JSON Schema (once per process)."""
+    with open(os.path.join(SCHEMA_DIR, SCHEMA_FILES[table]), "r", encoding="utf-8") as f:
+        return RecordSchema(json.load(f))
+
+
+def validate_record(table: str, record) -> dict:
+    """Check a decoded record against the table's schema (see RecordSchema.validate)."""
+    return compile_schema(table).validate(record)
+
+# ------------------------------------------------------------
+#  Decoding
+# ------------------------------------------------------------
+
+def _decode_chunk(table: str, validate: bool, first_line: int,
+                  lines: List[bytes]) -> List[ReadResult]:
+    """Pool task: decode (and validate) a chunk of lines, capturing errors per line."""
+    check = compile_schema(table).validate if validate else None
+    results = []
+    for number, line in enumerate(lines, first_line):
+        if not line.strip():
+            continue
+        try:
+            record = loads(line)
+            if check is not None:
+                check(record)
+            results.append((number, record, None))
+        except ValueError as e:         # json / orjson decode errors included
+            results.append((number, None, e))
+    return results
+
+
+def _chunks(f: BinaryIO, chunk_lines: int) -> Iterator[Tuple[int, List[bytes]]]:
+    first_line = 1
+    while True:
+        lines = list(islice(f, chunk_lines))
+        if not lines:
+            return
+        yield first_line, lines
+        first_line += len(lines)
+
+
+def read_records(path: str, table: str, workers: int = 0, validate: bool = True,
+                 chunk_lines: int = DEFAULT_CHUNK_LINES) -> Iterator[ReadResult]:
+    """
+    Stream the records of a JSONL file, in file order.
+
+    Args:
+        path: JSONL file (plain, gzip or zstd)
+        table: "rotors", "pads" or "vehicles" (selects the schema)
+        workers: Worker processes decoding chunks (0 = decode in the calling
+                 process, None = os.cpu_count())
+        validate: Check each record against the table's schema
+        chunk_lines: Lines per chunk
+
+    Yields:
+        (line number, record, error) tuples: record is None when the line
+        failed to decode or validate, error is then the exception
+    """
+    if table not in SCHEMA_FILES:
+        raise ValueError(f"Unknown table {table!r}, expected one of {list(SCHEMA_FILES)}")
+    if chunk_lines < 1:
+        raise ValueError(f"chunk_lines must be >= 1, got {chunk_lines}")
+    if workers is None:
+        workers = os.cpu_count() or 1
+    if validate:
+        compile_schema(table)           # schema errors surface before any work
+
+    with open_jsonl(path) as f:
+        if workers == 0:
+            for first_line, lines in _chunks(f, chunk_lines):
+                yield from _decode_chunk(table, validate, first_line, lines)
+            return
+
+        max_in_flight = workers * CHUNKS_PER_WORKER
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            pending = collections.deque()
+            for first_line, lines in _chunks(f, chunk_lines):
+                pending.append(pool.submit(_decode_chunk, table, validate, first_line, lines))
+                while len(pending) >= max_in_flight:
+                    yield from pending.popleft().result()
+            while pending:
+                yield from pending.popleft().result()
@@ -0,0 +1,156 @@
+# database/key_index.py
+"""
+In-memory index of the natural keys already stored, consulted by
+BatchWriter before a record reaches SQLite.
+
+Even with the unique indexes (database/migrations.py), every duplicate costs
+an INSERT ... ON CONFLICT DO NOTHING round trip. Re-ingesting a catalog that
+has barely changed is mostly duplicates. KeyIndex.preload() reads the keys of
+each table once at the start of a run; the writer then drops known keys
+without touching the database, and records the keys of the rows it writes.
+
+Two modes:
+- "set":   exact. A Python set of key tuples. Needs memory proportional to
+           the table, roughly 200 bytes per key.
+- "bloom": approximate, a fixed-size BloomFilter (about 1.8 bytes per key at
+           error_rate=0.001). A known key is never written twice. A new key
+           may be taken for a known one with probability error_rate; that
+           record is skipped. A later run without the filter (or with
+           mode="set") picks it up.
+
+Keys containing NULL are never indexed: the unique indexes do not treat
+NULLs as equal, and such rows fail the NOT NULL constraints anyway.
+
+Usage:
+    index = KeyIndex.preload(conn, mode="bloom", error_rate=0.001)
+    writer = BatchWriter(conn, key_index=index)
+"""
+
+import math
+import sqlite3
+from typing import Dict, Hashable, Iterable, Optional, Tuple
+
+from database.batch_writer import NATURAL_KEYS
+
+KEY_INDEX_MODES = ("set", "bloom")
+
+# False-positive rate of "bloom" mode
+DEFAULT_ERROR_RATE = 0.001
+
+# Bloom filters are sized for twice the preloaded keys, and at least this
+# many, so that the keys inserted during the run keep the rate near
+# error_rate
+MIN_BLOOM_CAPACITY = 100_000
+
+
+class BloomFilter:
+    """
+    Fixed-size Bloom filter over hashable keys.
+
+    Bit positions come from the key's hash() split into two 32-bit halves
+    (double hashing), so the filter is only meaningful inside the process
+    that built it.
+
+    Args:
+        capacity: Expected number of keys
+        error_rate: False-positive rate at capacity
+    """
+
+    def __init__(self, capacity: int, error_rate: float = DEFAULT_ERROR_RATE):
+        if not 0 < error_rate < 1:
+            raise ValueError(f"error_rate must be in (0, 1), got {error_rate}")
+        capacity = max(capacity, 1)
+        self.bits = max(8, int(-capacity * math.log(error_rate) / math.log(2) ** 2))
+        self.hashes = max(1, round(self.bits / capacity * math.log(2)))
+        self._array = bytearray((self.bits + 7) // 8)
+        self.count = 0
+
+    def add(self, key: Hashable) -> None:
+        h = hash(key)
+        h1, h2 = h & 0xFFFFFFFF, ((h >> 32) & 0xFFFFFFFF) | 1
+        array, bits = self._array, self.bits
+        for i in range(self.hashes):
+            pos = (h1 + i * h2) % bits
+            array[pos >> 3] |= 1 << (pos & 7)
+        self.count += 1
+
+    def __contains__(self, key: Hashable) -> bool:
+        # Same positions as add(), inlined: this is the writer's hot path
+        h = hash(key)
+        h1, h2 = h & 0xFFFFFFFF, ((h >> 32) & 0xFFFFFFFF) | 1
+        array, bits = self._array, self.bits
+        for i in range(self.hashes):
+            pos = (h1 + i * h2) % bits
+            if not array[pos >> 3] & (1 << (pos & 7)):
+                return False
+        return True
+
+    @property
+    def size_bytes(self) -> int:
+        return len(self._array)
+
+
+class KeyIndex:
+    """
+    Natural keys known per table (set or BloomFilter).
+
+    Args:
+        keys: {table: set | BloomFilter}; tables without an entry are not
+              filtered
+        mode: "set" or "bloom" (informational)
+    """
+
+    def __init__(self, keys: Dict[str, object], mode: str = "set"):
+        self.keys = keys
+        self.mode = mode
+
+    @classmethod
+    def preload(cls, conn: sqlite3.Connection, mode: str = "set",
+                error_rate: float = DEFAULT_ERROR_RATE,
+                tables: Optional[Iterable[str]] = None) -> "KeyIndex":
+        """
+        Read the natural keys stored in each table.
+
+        Args:
+            conn: SQLite connection
+            mode: "set" (exact) or "bloom" (approximate, bounded memory)
+            error_rate: False-positive rate of "bloom" mode
+            tables: Tables to index (default: every table of NATURAL_KEYS)
+        """
+        if mode not in KEY_INDEX_MODES:
+            raise ValueError(f"mode must be one of {KEY_INDEX_MODES}, got {mode!r}")
+        keys = {}
+        for table in (NATURAL_KEYS if tables is None else tables):
+            columns = NATURAL_KEYS[table]
+            not_null = " AND ".join(f"{c} IS NOT NULL" for c in columns)
+            sql = f"SELECT {', '.join(columns)} FROM {table} WHERE {not_null}"
+            if mode == "set":
+                keys[table] = set(conn.execute(sql))
+            else:
+                rows = conn.execute(f"SELECT COUNT(*) FROM {table}").fetchone()[0]
+                bloom = BloomFilter(max(2 * rows, MIN_BLOOM_CAPACITY), error_rate)
+                for key in conn.execute(sql):
+                    bloom.add(key)
+                keys[table] = bloom
+        return cls(keys, mode)
+
+    def __contains__(self, item: Tuple[str, tuple]) -> bool:
+        """(table, key) in index"""
+        table, key = item
+        known = self.keys.get(table)
+        return known is not None and key in known
+
+    def add(self, table: str, key: tuple) -> None:
+        known = self.keys.get(table)
+        if known is not None:
+            known.add(key)
+
+    def __len__(self) -> int:
+        return sum(len(k) if isinstance(k, set) else k.count for k in self.keys.values())
+
+    def describe(self) -> str:
+        """One-line summary for logs."""
+        if self.mode == "set":
+            return f"{len(self)} keys (exact set)"
+        size = sum(k.size_bytes for k in self.keys.values())
+        return f"{len(self)} keys (bloom filter, {size / 1e6:.1f} MB)"
@@ -0,0 +1,87 @@
+# database/link_discovery.py
+"""
+Links followed from catalog list pages (pagination, product pages).
+
+The list parsers return the links of each page (next pages and, for DBA,
+product pages, data_scraper.html_rotor_list_scraper.extract_list_links()).
+LinkDiscovery decides which become new seeds:
+- depth: seed CSV pages are depth 0, pages found on them depth 1, ...;
+  links found on pages at max_depth are not followed
+- budget: at most max_pages pages are discovered per run
+- dedup: a page is followed once, whatever its spelling
+  (canonicalize_url()); the seed CSV URLs count as visited
+
+New seeds keep the source and notes of the page they were found on, with
+the page_type of the link ("list" for next pages, "product" for product
+pages). ingest_all() fetches them in rounds, one per depth level;
+ingest_frontier() adds them to the crawl frontier (database/frontier.py).
+"""
+
+from typing import Iterable, List, Tuple
+
+from data_scraper.html_rotor_list_scraper import canonicalize_url
+
+# Levels of links followed from the seed pages (0 = none)
+DEFAULT_MAX_DEPTH = 3
+
+# Pages discovered per run at most
+DEFAULT_MAX_PAGES = 1000
+
+
+class LinkDiscovery:
+    """
+    Visited pages and limits of one run's link following.
+
+    Args:
+        max_depth: Depth of the deepest pages followed (0 = follow nothing)
+        max_pages: Pages discovered at most
+        visited: URLs already known (the seed CSV URLs)
+    """
+
+    def __init__(self, max_depth: int = DEFAULT_MAX_DEPTH,
+                 max_pages: int = DEFAULT_MAX_PAGES, visited: Iterable[str] = ()):
+        if max_depth < 0:
+            raise ValueError(f"max_depth must be >= 0, got {max_depth}")
+        if max_pages < 0:
+            raise ValueError(f"max_pages must be >= 0, got {max_pages}")
+        self.max_depth = max_depth
+        self.max_pages = max_pages
+        self.visited = set()
+        self.stats = {"discovered": 0, "known": 0, "too_deep": 0, "over_budget": 0}
+        self.visit(visited)
+
+    def visit(self, urls: Iterable[str]) -> None:
+        """Mark URLs as known (never returned by follow())."""
+        for url in urls:
+            self.visited.add(canonicalize_url(url) or url)
+
+    def follow(self, seed: tuple, links: List[Tuple[str, str]], depth: int) -> List[tuple]:
+        """
+        New seeds for the links found on one page.
+
+        Args:
+            seed: (source, url, notes, page_type) of the page
+            links: [(url, page_type)] found on it
+            depth: Depth of the page
+
+        Returns:
+            (source, url, notes, page_type) seeds of the links to follow, at
+            depth + 1
+        """
+        if depth >= self.max_depth:
+            self.stats["too_deep"] += len(links)
+            return []
+        source, _, notes, _ = seed
+        seeds = []
+        for url, page_type in links:
+            url = canonicalize_url(url) or url
+            if url in self.visited:
+                self.stats["known"] += 1
+                continue
+            if self.stats["discovered"] >= self.max_pages:
+                self.stats["over_budget"] += 1
+                continue
+            self.visited.add(url)
+            self.stats["discovered"] += 1
+            seeds.append((source, url, notes, page_type))
+        return seeds
@@ -0,0 +1,196 @@
+# database/migrations.py
+"""
+Schema migrations for existing databases.
+
+database/init.sql creates a fresh database with the current schema. A
+database created by an earlier version of init.sql is brought up to date
+by migrate(), which applies each step of MIGRATIONS whose version is above
+the database's PRAGMA user_version, then records the new version. Steps are
+idempotent, so running them on a database created by the current init.sql
+only sets the version.
+
+Versions:
+1. Unique natural keys (rotors: brand + catalog_ref, pads: shape_id + brand +
+   catalog_ref, vehicles: make + model + year_from). Existing duplicates are
+   removed first, keeping the earliest row (lowest id), which is the row the
+   previous SELECT-probe dedup would have kept.
+2. Change tracking columns content_hash, first_seen, last_seen on the keyed
+   tables (database/batch_writer.py). content_hash is backfilled from the
+   stored columns; the timestamps of existing rows are unknown and stay
+   NULL until an upsert sees the row again (last_seen only).
+3. ingest_journal table: per-seed status of ingest_all() runs, used by
+   scrape_and_ingest.py --resume (database/seed_journal.py).
+4. crawl_frontier table: durable work queue leased by ingest_frontier()
+   workers, used by scrape_and_ingest.py --frontier (database/frontier.py).
+5. crawl_frontier.depth: link depth of discovered pages, limited by
+   --max-depth (database/link_discovery.py). Existing entries get depth 0.
+6. rotor_cluster_state / rotor_cluster_steps tables and the triggers on
+   rotors maintaining them (database/cluster_state.py). The state is built
+   from the existing rotors.
+7. content_hash rehashed: integers now hash as floats (300 == 300.0), so
+   the hashes of rows with integer fields (bolt_hole_count, year_from...)
+   are recomputed from the stored columns.
+
+Usage:
+    python -m database.migrations [db_path]
+"""
+
+import os
+import sqlite3
+import sys
+from typing import Callable, Dict, List, Tuple
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(__file__)))
+
+from database.batch_writer import NATURAL_KEYS, TRACKING_COLUMNS, content_hash
+from database.cluster_state import install_cluster_state
+from database.connection import connect
+from database.frontier import FRONTIER_INDEX_SQL, FRONTIER_TABLE_SQL
+from database.seed_journal import JOURNAL_TABLE_SQL
+
+# Unique index backing each table's natural key (also created by init.sql)
+UNIQUE_INDEXES = {
+    "rotors": "idx_rotors_natural_key",
+    "pads": "idx_pads_natural_key",
+    "vehicles": "idx_vehicles_natural_key",
+}
+
+
+# ------------------------------------------------------------
+#  Steps
+# ------------------------------------------------------------
+
+def _unique_natural_keys(conn: sqlite3.Connection) -> Dict[str, int]:
+    """Drop duplicate natural keys (keep lowest id) and add the unique indexes."""
+    removed = {}
+    for table, index in UNIQUE_INDEXES.items():
+        columns = ", ".join(NATURAL_KEYS[table])
+        cur = conn.execute(
+            f"DELETE FROM {table} WHERE id NOT IN "
+            f"(SELECT MIN(id) FROM {table} GROUP BY {columns})")
+        removed[table] = cur.rowcount
+        conn.execute(f"CREATE UNIQUE INDEX IF NOT EXISTS {index} ON {table} ({columns})")
+    return removed
+
+
+def _hash_rows(conn: sqlite3.Connection, table: str, where: str = "") -> int:
+    """Set content_hash of a table's rows from their stored columns."""
+    cur = conn.execute(f"SELECT * FROM {table} {where}")
+    names = [d[0] for d in cur.description]
+    content = [i for i, name in enumerate(names)
+               if name != "id" and name not in TRACKING_COLUMNS]
+    id_index = names.index("id")
+    updates = [(content_hash({names[i]: row[i] for i in content}), row[id_index])
+               for row in cur]
+    conn.executemany(f"UPDATE {table} SET content_hash = ? WHERE id = ?", updates)
+    return len(updates)
+
+
+def _content_tracking(conn: sqlite3.Connection) -> Dict[str, int]:
+    """Add the change-tracking columns and hash the rows that have none."""
+    hashed = {}
+    for table in NATURAL_KEYS:
+        existing = {row[1] for row in conn.execute(f"PRAGMA table_info({table})")}
+        for column in TRACKING_COLUMNS:
+            if column not in existing:
+                conn.execute(f"ALTER TABLE {table} ADD COLUMN {column} TEXT")
+        hashed[table] = _hash_rows(conn, table, "WHERE content_hash IS NULL")
+    return hashed
+
+
+def _seed_journal(conn: sqlite3.Connection) -> Dict[str, int]:
+    """Create the ingest journal table (empty: earlier runs were not journaled)."""
+    existed = conn.execute("SELECT COUNT(*) FROM sqlite_master "
+                           "WHERE type = 'table' AND name = 'ingest_journal'").fetchone()[0]
+    conn.execute(JOURNAL_TABLE_SQL)
+    return {"ingest_journal": 0 if existed else 1}
+
+
+def _crawl_frontier(conn: sqlite3.Connection) -> Dict[str, int]:
+    """Create the crawl frontier table and its lease index (empty)."""
+    existed = conn.execute("SELECT COUNT(*) FROM sqlite_master "
+                           "WHERE type = 'table' AND name = 'crawl_frontier'").fetchone()[0]
+    conn.execute(FRONTIER_TABLE_SQL)
+    conn.execute(FRONTIER_INDEX_SQL)
+    return {"crawl_frontier": 0 if existed else 1}
+
+
+def _frontier_depth(conn: sqlite3.Connection) -> Dict[str, int]:
+    """Add the link depth column to the crawl frontier."""
+    existing = {row[1] for row in conn.execute("PRAGMA table_info(crawl_frontier)")}
+    if "depth" in existing:
+        return {"crawl_frontier": 0}
+    conn.execute("ALTER TABLE crawl_frontier ADD COLUMN depth INTEGER NOT NULL DEFAULT 0")
+    return {"crawl_frontier": 1}
+
+
+def _cluster_state(conn: sqlite3.Connection) -> Dict[str, int]:
+    """Create the cluster state and its triggers, built from the stored rotors."""
+    return {"rotor_cluster_state": install_cluster_state(conn)}
+
+
+def _rehash_content(conn: sqlite3.Connection) -> Dict[str, int]:
+    """Recompute every content_hash (integers hash as floats)."""
+    return {table: _hash_rows(conn, table) for table in NATURAL_KEYS}
+
+
+# (version, description, step); step(conn) returns a summary dict
+MIGRATIONS: List[Tuple[int, str, Callable[[sqlite3.Connection], dict]]] = [
+    (1, "unique natural keys", _unique_natural_keys),
+    (2, "content hash and first/last seen", _content_tracking),
+    (3, "ingest journal", _seed_journal),
+    (4, "crawl frontier", _crawl_frontier),
+    (5, "crawl frontier depth", _frontier_depth),
+    (6, "rotor cluster state", _cluster_state),
+    (7, "content hash of integer fields", _rehash_content),
+]
+
+SCHEMA_VERSION = MIGRATIONS[-1][0]
+
+
+# ------------------------------------------------------------
+#  Runner
+# ------------------------------------------------------------
+
+def schema_version(conn: sqlite3.Connection) -> int:
+    return conn.execute("PRAGMA user_version").fetchone()[0]
+
+
+def migrate(conn: sqlite3.Connection, verbose: bool = True) -> Dict[int, dict]:
+    """
+    Apply pending migrations, each in its own transaction.
+
+    Args:
+        conn: SQLite connection (no transaction should be open)
+        verbose: Print one line per applied step
+
+    Returns:
+        {version: step summary} for the steps applied (empty if up to date)
+    """
+    applied = {}
+    current = schema_version(conn)
+    for version, description, step in MIGRATIONS:
+        if version <= current:
+            continue
+        try:
+            summary = step(conn)
+            conn.execute(f"PRAGMA user_version = {version}")
+            conn.commit()
+        except BaseException:
+            conn.rollback()
+            raise
+        applied[version] = summary
+        if verbose:
+            print(f"[DB] Migration {version} ({description}): {summary}")
+    return applied
+
+
+if __name__ == "__main__":
+    from database.ingest_pipeline import DB_PATH
+
+    path = sys.argv[1] if len(sys.argv) > 1 else DB_PATH
+    conn = connect(path, "bulk_load")
+    before = schema_version(conn)
+    migrate(conn)
+    print(f"[DB] {path}: schema version {before} -> {schema_version(conn)}")
+    conn.close()
@@ -0,0 +1,150 @@
+# database/seed_journal.py
+"""
+Per-seed checkpoint journal of ingest_all() runs.
+
+The ingest_journal table (created by init.sql / migration 3) holds one row
+per (seed_group, url):
+- status: "pending" (registered, not processed yet), "inserted" (page
+  written, records = rows inserted, possibly 0 when every record was a
+  duplicate) or "failed" (fetch or parse error, see last_error)
+- attempts: times the seed was processed, over all runs
+- updated_at: UTC time of the last change
+
+The journal is written by the ingest writer on its own connection, inside
+the transactions that insert the records: a seed is marked "inserted" only
+in the commit that stores its rows, so after a crash or Ctrl-C the journal
+and the tables agree: the seeds of the rolled-back transaction keep their
+previous status and are processed again. Fetch and parse happen in memory,
+so a seed interrupted there is likewise still "pending". SeedJournal commits every commit_interval
+seeds, on top of the writer's own row-count commits.
+
+With resume, register_seeds() leaves the stored status alone and returns
+the seeds already "inserted", which ingest_all() skips; failed and pending
+seeds are processed again.
+"""
+
+import sqlite3
+from typing import Dict, Iterable, Optional, Set
+
+from database.batch_writer import BatchWriter, utc_now
+
+JOURNAL_STATUSES = ("pending", "inserted", "failed")
+
+# Seeds marked per journal commit
+DEFAULT_JOURNAL_COMMIT_INTERVAL = 20
+
+JOURNAL_TABLE_SQL = """
+CREATE TABLE IF NOT EXISTS ingest_journal (
+    seed_group TEXT NOT NULL,
+    url TEXT NOT NULL,
+    source TEXT,
+    page_type TEXT,
+
+    status TEXT NOT NULL DEFAULT 'pending',
+    attempts INTEGER NOT NULL DEFAULT 0,
+    records INTEGER,
+    last_error TEXT,
+    updated_at TEXT,
+
+    PRIMARY KEY (seed_group, url)
+)
+"""
+
+
+def register_seeds(conn: sqlite3.Connection, group: str, seeds: Iterable[tuple],
+                   resume: bool = False) -> Set[str]:
+    """
+    Record a group's seeds in the journal and commit.
+
+    Args:
+        conn: SQLite connection (no other writer transaction open)
+        group: "rotors", "pads" or "vehicles"
+        seeds: (source, url, notes, page_type) tuples
+        resume: Keep the status of seeds already journaled (True) or mark
+                every seed "pending" again (False, a fresh run)
+
+    Returns:
+        URLs of the group already "inserted" (empty unless resume)
+    """
+    now = utc_now()
+    rows = [(group, url, source, page_type, now) for source, url, _, page_type in seeds]
+    if resume:
+        conflict = "NOTHING"
+    else:
+        conflict = "UPDATE SET status = 'pending', updated_at = excluded.updated_at"
+    conn.executemany(
+        "INSERT INTO ingest_journal (seed_group, url, source, page_type, updated_at) "
+        f"VALUES (?, ?, ?, ?, ?) ON CONFLICT (seed_group, url) DO {conflict}", rows)
+    conn.commit()
+    if not resume:
+        return set()
+    return {row[0] for row in conn.execute(
+        "SELECT url FROM ingest_journal WHERE seed_group = ? AND status = 'inserted'", (group,))}
+
+
+def journal_summary(conn: sqlite3.Connection, group: Optional[str] = None) -> Dict[str, int]:
+    """Seed count per status (of one group, or all)."""
+    counts = dict.fromkeys(JOURNAL_STATUSES, 0)
+    sql = "SELECT status, COUNT(*) FROM ingest_journal"
+    params = ()
+    if group is not None:
+        sql += " WHERE seed_group = ?"
+        params = (group,)
+    for status, count in conn.execute(sql + " GROUP BY status", params):
+        counts[status] = count
+    return counts
+
+
+class SeedJournal:
+    """
+    Journal updates of the ingest writer, committed with the records.
+
+    Args:
+        writer: The BatchWriter whose connection and transactions the
+                journal shares
+        commit_interval: Seeds marked per commit (None = commit only with
+                         the writer's own commits)
+    """
+
+    def __init__(self, writer: BatchWriter,
+                 commit_interval: Optional[int] = DEFAULT_JOURNAL_COMMIT_INTERVAL):
+        if commit_interval is not None and commit_interval < 1:
+            raise ValueError(f"commit_interval must be >= 1 or None, got {commit_interval}")
+        self.writer = writer
+        self.commit_interval = commit_interval
+        self._uncommitted = 0
+        self.stats = dict.fromkeys(JOURNAL_STATUSES[1:], 0)
+
+    def mark(self, group: str, seed: tuple, status: str, records: Optional[int] = None,
+             error: Optional[str] = None) -> None:
+        """
+        Record the outcome of one processed seed.
+
+        Args:
+            group: Seed group
+            seed: (source, url, notes, page_type)
+            status: "inserted" or "failed" (see JOURNAL_STATUSES)
+            records: Rows inserted from the page
+            error: Failure message
+        """
+        if status not in JOURNAL_STATUSES:
+            raise ValueError(f"Unknown journal status {status!r}, expected one of {JOURNAL_STATUSES}")
+        source, url, _, page_type = seed
+        writer = self.writer
+        # Rows still queued by the writer go into the same transaction first
+        writer.flush()
+        writer.conn.execute(
+            "INSERT INTO ingest_journal (seed_group, url, source, page_type, status, attempts, "
+            "records, last_error, updated_at) VALUES (?, ?, ?, ?, ?, 1, ?, ?, ?) "
+            "ON CONFLICT (seed_group, url) DO UPDATE SET status = excluded.status, "
+            "attempts = attempts + 1, records = excluded.records, "
+            "last_error = excluded.last_error, updated_at = excluded.updated_at",
+            (group, url, source, page_type, status, records, error, utc_now()))
+        self.stats[status] = self.stats.get(status, 0) + 1
+        self._uncommitted += 1
+        if self.commit_interval is not None and self._uncommitted >= self.commit_interval:
+            self.commit()
+
+    def commit(self) -> None:
+        self.writer.commit()
+        self._uncommitted = 0
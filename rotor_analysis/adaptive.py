@@ -0,0 +1,420 @@
+# rotor_analysis/adaptive.py
+"""
+Adaptive clustering methods for rotors: DBSCAN and mini-batch k-means.
+
+Binning (rotor_analysis/clustering.py) cuts the geometry on fixed bin
+edges, so two near-identical rotors on either side of an edge (282.4 and
+282.6 mm with a 5 mm step) land in different clusters. These methods group
+rotors by distance instead, in the scaled space
+(diameter, thickness, effective offset) / scales: with the bin steps as
+scales (the default), a distance of 1 is one bin step in every dimension.
+
+- dbscan: density clusters. A rotor with at least min_samples rotors
+  (itself included) within eps is a core rotor; core rotors within eps of
+  each other share a cluster; a non-core rotor within eps of a core rotor
+  joins that rotor's cluster (one of them, deterministically, if several),
+  the others are noise. Neighbours are found on a grid of cubes of side eps / sqrt(3):
+  rotors in the same cube are within eps of each other, so a cube holding
+  min_samples rotors is all core without any distance computation, core
+  cubes are connected as a whole, and distances are only computed between
+  rotors of nearby cubes (in vectorized blocks of PAIR_BLOCK pairs). Cost
+  grows with n times the local density, never with n^2.
+- kmeans: mini-batch k-means (Sculley 2010). k-means++ seeding on a sample,
+  then max_iter batches of batch_size rotors pull their nearest center by
+  a per-center learning rate of 1 / rotors seen; the rotors are finally
+  assigned to their nearest center in blocks. Memory is O(n + k).
+
+Both return the build_clusters() structure keyed by cluster number (in order
+of each cluster's first rotor), so clusters_to_json_serializable() writes
+the run_clustering() JSON, without the bin "key". numpy is required.
+"""
+
+import math
+import os
+import sys
+from typing import Dict, Optional, Tuple
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(__file__)))
+
+from rotor_analysis.columnar import (
+    Steps,
+    _default_steps,
+    _require_numpy,
+    assemble_clusters,
+    complete_rows,
+    np,
+    rank_by_first,
+)
+
+# DBSCAN neighbourhood radius, in scaled units (bin steps)
+DBSCAN_EPS = 0.5
+
+# Rotors (itself included) within eps making a core rotor
+DBSCAN_MIN_SAMPLES = 3
+
+# Number of k-means clusters (15-25 master rotor families, M11)
+KMEANS_CLUSTERS = 20
+
+# Rotors per mini-batch, and batches
+KMEANS_BATCH_SIZE = 1024
+KMEANS_MAX_ITER = 300
+
+# Stop when the centers moved less than this (squared, scaled units) in a batch
+KMEANS_TOL = 1e-6
+
+KMEANS_SEED = 0
+
+# Point pairs per vectorized distance block (DBSCAN), rows per assignment
+# block (k-means)
+PAIR_BLOCK = 1_000_000
+ASSIGN_BLOCK = 65536
+
+# Grids up to this many cubes index them with a dense table (int32, 64 MiB),
+# larger ones by binary search of the sorted cube codes
+DENSE_GRID_CELLS = 1 << 24
+
+
+def scaled_points(columns: Dict, scales: Optional[Steps] = None):
+    """
+    Complete rotors as points of the scaled geometry space.
+
+    Returns:
+        (kept, geometry, points): complete_rows() indices and geometry, and
+        an (n, 3) array of diameter / thickness / offset over the scales
+    """
+    _require_numpy()
+    kept, diameter, thickness, offset = complete_rows(columns)
+    scales = np.asarray(scales or _default_steps(), dtype=np.float64)
+    if scales.shape != (3,) or (scales <= 0).any():
+        raise ValueError(f"scales must be 3 positive values, got {scales.tolist()}")
+    points = np.column_stack((diameter, thickness, offset)) / scales
+    return kept, (diameter, thickness, offset), points
+
+
+# ------------------------------------------------------------
+#  DBSCAN on a grid
+# ------------------------------------------------------------
+
+def _cell_offsets(reach: int, spans: "np.ndarray", side: float, eps: float) -> "np.ndarray":
+    """Code deltas of the cells within eps of a cell (itself excluded), nearest first."""
+    steps = np.arange(-reach, reach + 1)
+    grid = np.stack(np.meshgrid(steps, steps, steps, indexing="ij"), -1).reshape(-1, 3)
+    gap = np.maximum(np.abs(grid) - 1, 0) * side
+    grid = grid[((gap ** 2).sum(1) <= eps ** 2) & (np.abs(grid).sum(1) > 0)]
+    grid = grid[np.argsort((grid ** 2).sum(1), kind="stable")]
+    return (grid[:, 0] * spans[1] + grid[:, 1]) * spans[2] + grid[:, 2]
+
+
+def _cell_lookup(codes: "np.ndarray", grid_cells: int):
+    """Function mapping cube codes to their index in codes (-1 if empty)."""
+    if grid_cells <= DENSE_GRID_CELLS:
+        table = np.full(grid_cells, -1, dtype=np.int32)
+        table[codes] = np.arange(codes.size, dtype=np.int32)
+        return lambda target: table[target]
+
+    def search(target):
+        found = np.searchsorted(codes, target)
+        found[found == codes.size] = 0
+        return np.where(codes[found] == target, found, -1)
+    return search
+
+
+def _cell_pairs(codes: "np.ndarray", lookup, cells: "np.ndarray", deltas: "np.ndarray"):
+    """Yield (cells, neighbour cells) index arrays of the given cells, one per code delta."""
+    cell_codes = codes[cells]
+    for delta in deltas.tolist():
+        found = lookup(cell_codes + delta)
+        hit = found >= 0
+        yield cells[hit], found[hit].astype(np.int64)
+
+
+def _point_pairs(a, b, start_a, count_a, start_b, count_b):
+    """
+    Yield (i, j) point index arrays of every point of cell a[k] with every
+    point of cell b[k], at most about PAIR_BLOCK pairs at a time.
+    """
+    sizes = count_a[a] * count_b[b]
+    keep = sizes > 0
+    a, b, sizes = a[keep], b[keep], sizes[keep]
+    bounds = np.cumsum(sizes)
+    first = 0
+    while first < a.size:
+        last = int(np.searchsorted(bounds, bounds[first] - sizes[first] + PAIR_BLOCK, "right"))
+        last = max(last, first + 1)
+        block = slice(first, last)
+        block_sizes = sizes[block]
+        owner = np.repeat(np.arange(block_sizes.size), block_sizes)
+        local = np.arange(owner.size) - np.repeat(np.cumsum(block_sizes) - block_sizes, block_sizes)
+        width = count_b[b[block]][owner]
+        yield (start_a[a[block]][owner] + local // width,
+               start_b[b[block]][owner] + local % width)
+        first = last
+
+
+def _within(left, right, i, j, eps: float) -> "np.ndarray":
+    """Whether left[i] and right[j] are within eps, per pair."""
+    return ((left[i] - right[j]) ** 2).sum(1) <= eps * eps
+
+
+def _merge_components(labels: "np.ndarray", a: "np.ndarray", b: "np.ndarray") -> "np.ndarray":
+    """
+    Connected components after adding edges a[k] - b[k]; labels is the root
+    of each node (np.arange() for no edges), and so is the result.
+    """
+    while True:
+        la, lb = labels[a], labels[b]
+        if (la == lb).all():
+            return labels
+        # Hook each root to the smallest root it touches, then compress paths
+        np.minimum.at(labels, np.maximum(la, lb), np.minimum(la, lb))
+        while True:
+            parents = labels[labels]
+            if (parents == labels).all():
+                break
+            labels = parents
+
+
+def grid_dbscan(points: "np.ndarray", eps: float = DBSCAN_EPS,
+                min_samples: int = DBSCAN_MIN_SAMPLES) -> "np.ndarray":
+    """
+    DBSCAN labels of (n, 3) points: cluster ids >= 0 (arbitrary order), -1
+    for noise.
+    """
+    _require_numpy()
+    if eps <= 0 or min_samples < 1:
+        raise ValueError(f"eps must be > 0 and min_samples >= 1, got {eps}, {min_samples}")
+    n = len(points)
+    labels = np.full(n, -1, dtype=np.int64)
+    if n == 0:
+        return labels
+
+    # Cubes of side eps / sqrt(3): any two points of a cube are within eps
+    side = eps / math.sqrt(3)
+    cells = np.floor(points / side).astype(np.int64)
+    reach = 2  # ceil(sqrt(3)) cubes
+    cells -= cells.min(axis=0) - reach
+    spans = cells.max(axis=0) + reach + 1
+    grid_cells = float(np.prod(spans.astype(np.float64)))
+    if grid_cells >= 2.0 ** 62:
+        raise ValueError(f"eps={eps} too small for the range of the data")
+    point_codes = (cells[:, 0] * spans[1] + cells[:, 1]) * spans[2] + cells[:, 2]
+    order = np.argsort(point_codes, kind="stable")
+    sorted_points = points[order]
+    codes, start, count = np.unique(point_codes[order], return_index=True, return_counts=True)
+    deltas = _cell_offsets(reach, spans, side, eps)
+    forward = deltas[deltas > 0]  # Each pair of cubes once
+    lookup = _cell_lookup(codes, int(grid_cells))
+    all_cells = np.arange(codes.size)
+    dense = count >= min_samples
+    cell_of = np.repeat(all_cells, count)
+
+    # 1. Core points: a dense cube is all core; points of sparse cubes count
+    #    their neighbours in the nearby cubes, nearest first, until every
+    #    point of the cube is core
+    neighbours = count[cell_of].copy()
+    counting = ~dense[cell_of]
+    done = dense.copy()
+    for a, b in _cell_pairs(codes, lookup, all_cells, forward):
+        keep = ~(done[a] & done[b])
+        for i, j in _point_pairs(a[keep], b[keep], start, count, start, count):
+            hit = _within(sorted_points, sorted_points, i, j, eps)
+            neighbours += np.bincount(i[hit & counting[i]], minlength=n)
+            neighbours += np.bincount(j[hit & counting[j]], minlength=n)
+        counting &= neighbours < min_samples
+        done = np.bincount(cell_of, weights=counting, minlength=codes.size) == 0
+    core = neighbours >= min_samples
+
+    # 2. Core cubes connected by a core pair within eps
+    core_count = np.bincount(cell_of[core], minlength=codes.size)
+    core_start = np.cumsum(core_count) - core_count
+    core_points = sorted_points[core]
+    core_cells = cell_of[core]
+    # (nearest cubes first; cube pairs already connected are skipped)
+    component = all_cells.copy()
+    for a, b in _cell_pairs(codes, lookup, np.flatnonzero(core_count), forward):
+        keep = component[a] != component[b]
+        a, b = a[keep], b[keep]
+        linked = []
+        for i, j in _point_pairs(a, b, core_start, core_count, core_start, core_count):
+            hit = _within(core_points, core_points, i, j, eps)
+            linked.append(np.unique(core_cells[i[hit]]))
+        if linked:
+            linked = np.unique(np.concatenate(linked))
+            component = _merge_components(component, linked, b[np.searchsorted(a, linked)])
+    sorted_labels = np.where(core, component[cell_of], -1)
+
+    # 3. Border points: cluster of a core point within eps (a core point in
+    #    the same cube always is; else the lowest component label)
+    border = ~core
+    own = border & (core_count[cell_of] > 0)
+    sorted_labels[own] = component[cell_of[own]]
+    border &= ~own
+    if border.any():
+        border_count = np.bincount(cell_of[border], minlength=codes.size)
+        border_start = np.cumsum(border_count) - border_count
+        border_points = sorted_points[border]
+        found = np.full(border_points.shape[0], np.iinfo(np.int64).max)
+        for a, b in _cell_pairs(codes, lookup, np.flatnonzero(border_count), deltas):
+            for i, j in _point_pairs(a, b, border_start, border_count, core_start, core_count):
+                hit = _within(border_points, core_points, i, j, eps)
+                np.minimum.at(found, i[hit], component[core_cells[j[hit]]])
+        joined = found != np.iinfo(np.int64).max
+        border_labels = np.where(joined, found, -1)
+        sorted_labels[np.flatnonzero(border)] = border_labels
+
+    labels[order] = sorted_labels
+    return labels
+
+
+# ------------------------------------------------------------
+#  Mini-batch k-means
+# ------------------------------------------------------------
+
+def _nearest(points: "np.ndarray", centers: "np.ndarray") -> "np.ndarray":
+    """Index of the nearest center of each point, ASSIGN_BLOCK points at a time."""
+    nearest = np.empty(len(points), dtype=np.int64)
+    for first in range(0, len(points), ASSIGN_BLOCK):
+        block = points[first:first + ASSIGN_BLOCK]
+        distances = ((block[:, None, :] - centers[None, :, :]) ** 2).sum(2)
+        nearest[first:first + ASSIGN_BLOCK] = distances.argmin(1)
+    return nearest
+
+
+def _kmeans_plus_plus(sample: "np.ndarray", k: int, rng) -> "np.ndarray":
+    centers = [sample[rng.integers(len(sample))]]
+    closest = ((sample - centers[0]) ** 2).sum(1)
+    for _ in range(1, k):
+        total = closest.sum()
+        if total == 0:
+            break  # Fewer distinct points than k
+        centers.append(sample[rng.choice(len(sample), p=closest / total)])
+        closest = np.minimum(closest, ((sample - centers[-1]) ** 2).sum(1))
+    return np.array(centers)
+
+
+def minibatch_kmeans(points: "np.ndarray", n_clusters: int = KMEANS_CLUSTERS,
+                     batch_size: int = KMEANS_BATCH_SIZE, max_iter: int = KMEANS_MAX_ITER,
+                     seed: int = KMEANS_SEED) -> Tuple["np.ndarray", "np.ndarray"]:
+    """
+    Mini-batch k-means of (n, 3) points.
+
+    Returns:
+        (nearest center index per point, centers); fewer than n_clusters
+        centers if the points have fewer distinct values
+    """
+    _require_numpy()
+    if n_clusters < 1 or batch_size < 1 or max_iter < 0:
+        raise ValueError(f"n_clusters and batch_size must be >= 1 and max_iter >= 0, "
+                         f"got {n_clusters}, {batch_size}, {max_iter}")
+    n = len(points)
+    if n == 0:
+        return np.empty(0, dtype=np.int64), np.empty((0, 3))
+    rng = np.random.default_rng(seed)
+    sample = points[rng.choice(n, min(n, max(10 * n_clusters, 3 * batch_size)), replace=False)]
+    centers = _kmeans_plus_plus(sample, n_clusters, rng)
+    k = len(centers)
+    seen = np.zeros(k)
+    for _ in range(max_iter):
+        batch = points[rng.integers(0, n, batch_size)]
+        nearest = _nearest(batch, centers)
+        batch_count = np.bincount(nearest, minlength=k)
+        sums = np.column_stack([np.bincount(nearest, weights=batch[:, d], minlength=k)
+                                for d in range(3)])
+        seen += batch_count
+        moved = batch_count > 0
+        # Each of the batch's points moves its center by 1 / (points seen)
+        step = (sums[moved] - batch_count[moved, None] * centers[moved]) / seen[moved, None]
+        centers[moved] += step
+        if (step ** 2).sum() < KMEANS_TOL:
+            break
+    return _nearest(points, centers), centers
+
+
+# ------------------------------------------------------------
+#  Clusters
+# ------------------------------------------------------------
+
+def _clusters_from_labels(columns: Dict, kept, geometry, labels) -> Dict:
+    clustered = labels >= 0
+    if not clustered.any():
+        return {}
+    cluster_ids, _, counts = rank_by_first(labels[clustered])
+    geometry = tuple(values[clustered] for values in geometry)
+    return assemble_clusters(columns, kept[clustered], geometry, cluster_ids, counts,
+                             range(counts.size))
+
+
+def build_clusters_dbscan(columns: Dict, eps: float = DBSCAN_EPS,
+                          min_samples: int = DBSCAN_MIN_SAMPLES,
+                          scales: Optional[Steps] = None) -> Dict:
+    """
+    DBSCAN clusters of rotor columns (noise rotors are left out).
+
+    Args:
+        columns: Rotor columns (load_rotor_columns(), columns_from_rotors())
+        eps: Neighbourhood radius in scaled units
+        min_samples: Rotors within eps (itself included) making a core rotor
+        scales: (diameter, thickness, offset) scale in mm (None = bin steps)
+
+    Returns:
+        {cluster number: {"members", "count", "centroid"}}
+    """
+    kept, geometry, points = scaled_points(columns, scales)
+    return _clusters_from_labels(columns, kept, geometry, grid_dbscan(points, eps, min_samples))
+
+
+def build_clusters_kmeans(columns: Dict, n_clusters: int = KMEANS_CLUSTERS,
+                          batch_size: int = KMEANS_BATCH_SIZE, max_iter: int = KMEANS_MAX_ITER,
+                          seed: int = KMEANS_SEED, scales: Optional[Steps] = None) -> Dict:
+    """
+    Mini-batch k-means clusters of rotor columns (empty clusters dropped;
+    centroids are the means of the members, not the final centers).
+
+    Returns:
+        {cluster number: {"members", "count", "centroid"}}
+    """
+    kept, geometry, points = scaled_points(columns, scales)
+    labels, _ = minibatch_kmeans(points, n_clusters, batch_size, max_iter, seed)
+    return _clusters_from_labels(columns, kept, geometry, labels)
+
+
+# Parameters of each method, with their defaults (options of run_clustering())
+METHOD_DEFAULTS = {
+    "dbscan": {"eps": DBSCAN_EPS, "min_samples": DBSCAN_MIN_SAMPLES, "scales": None},
+    "kmeans": {"n_clusters": KMEANS_CLUSTERS, "batch_size": KMEANS_BATCH_SIZE,
+               "max_iter": KMEANS_MAX_ITER, "seed": KMEANS_SEED, "scales": None},
+}
+
+BUILDERS = {"dbscan": build_clusters_dbscan, "kmeans": build_clusters_kmeans}
+
+
+def method_params(method: str, options: Optional[Dict] = None) -> Dict:
+    """
+    Parameters of a method: its defaults updated by options, scales resolved.
+
+    Raises:
+        ValueError: Unknown method or option
+    """
+    if method not in METHOD_DEFAULTS:
+        raise ValueError(f"Unknown adaptive method {method!r}, expected one of "
+                         f"{tuple(METHOD_DEFAULTS)}")
+    options = dict(options or {})
+    unknown = sorted(set(options) - set(METHOD_DEFAULTS[method]))
+    if unknown:
+        raise ValueError(f"Unknown {method} options {unknown}, expected some of "
+                         f"{sorted(METHOD_DEFAULTS[method])}")
+    params = {**METHOD_DEFAULTS[method], **options}
+    params["scales"] = tuple(float(scale) for scale in (params["scales"] or _default_steps()))
+    return params
+
+
+def build_clusters_adaptive(columns: Dict, method: str, options: Optional[Dict] = None
+                            ) -> Tuple[Dict, Dict]:
+    """
+    Clusters of rotor columns by an adaptive method.
+
+    Returns:
+        (clusters, method_params() used)
+    """
+    params = method_params(method, options)
+    return BUILDERS[method](columns, **params), params
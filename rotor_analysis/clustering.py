@@ -5,13 +5,32 @@ Rotor clustering module for BigBrakeKit (Mission 10).
 Performs preliminary geometric clustering of rotors from the database using binning strategy.
 Groups rotors by (outer_diameter, nominal_thickness, offset) for master rotor selection (M11).
 
-This is a V1 implementation using simple binning, not k-means or advanced clustering.
+The default method is simple binning. rotor_analysis/adaptive.py adds
+distance-based methods, selected by run_clustering(method=...): "dbscan"
+(density clusters, noise left out) and "kmeans" (mini-batch k-means). They
+use the numpy loader and write the same JSON, with their parameters in meta.
+
+Two engines produce the same clusters:
+- "python": build_clusters() over rotor dicts (no dependency)
+- "numpy": rotor_analysis.columnar, the geometry as arrays with vectorized
+  binning and grouping; much faster on large catalogs, needs numpy
+
+Cluster counts and centroids are also persisted in SQLite and kept current
+by triggers as rotors are written (database/cluster_state.py):
+load_cluster_summary() / export_cluster_summary() read them without
+scanning the rotors. rotor_analysis/sweep.py compares bin steps in parallel.
 """
 
 import json
 import os
-import sqlite3
-from typing import Optional
+import sys
+from typing import Dict, Iterable, Iterator, Optional, Sequence
+
+# Add parent dir to path for imports
+sys.path.insert(0, os.path.dirname(os.path.dirname(__file__)))
+
+from database.cluster_state import load_cluster_state
+from database.connection import connect
 
 # Constants
 DB_PATH = "database/bbk.db"
@@ -21,6 +40,121 @@ DIAM_BIN_STEP_MM = 5.0        # Group rotors within 5mm diameter range
 THICK_BIN_STEP_MM = 0.5       # Group rotors within 0.5mm thickness range
 OFFSET_BIN_STEP_MM = 2.0      # Group rotors within 2mm offset range
 
+# Clustering engines ("auto" = numpy when installed)
+CLUSTER_ENGINES = ("python", "numpy")
+
+# Clustering methods (dbscan / kmeans: rotor_analysis/adaptive.py, numpy only)
+CLUSTER_METHODS = ("binning", "dbscan", "kmeans")
+
+# Columns of the rotors table readable by the loaders
+ROTOR_COLUMNS = (
+    "outer_diameter_mm", "nominal_thickness_mm", "hat_height_mm", "overall_height_mm",
+    "offset_mm", "center_bore_mm", "bolt_circle_mm", "bolt_hole_count", "ventilation_type",
+    "directionality", "rotor_weight_kg", "mounting_type", "brand", "catalog_ref",
+)
+TEXT_COLUMNS = ("ventilation_type", "directionality", "mounting_type", "brand", "catalog_ref")
+
+# Columns the clustering reads (projection of the streaming loader)
+CLUSTER_COLUMNS = ("outer_diameter_mm", "nominal_thickness_mm", "offset_mm",
+                   "overall_height_mm", "hat_height_mm", "brand", "catalog_ref")
+
+# Rows per fetchmany() chunk of the streaming loader
+DEFAULT_CHUNK_SIZE = 10000
+
+ROW_FORMATS = ("dict", "tuple", "numpy")
+
+
+def _rotor_query(columns: Sequence[str], brands: Optional[Iterable[str]],
+                 min_diameter_mm: Optional[float],
+                 max_diameter_mm: Optional[float]) -> tuple[str, list]:
+    """SELECT of the projected columns with the optional filters."""
+    unknown = [name for name in columns if name not in ROTOR_COLUMNS]
+    if unknown or not columns:
+        raise ValueError(f"Unknown rotor columns {unknown}, expected some of {ROTOR_COLUMNS}")
+    where, params = [], []
+    if brands is not None:
+        brands = [brands] if isinstance(brands, str) else list(brands)
+        where.append(f"brand IN ({', '.join('?' * len(brands))})")
+        params.extend(brands)
+    if min_diameter_mm is not None:
+        where.append("outer_diameter_mm >= ?")
+        params.append(min_diameter_mm)
+    if max_diameter_mm is not None:
+        where.append("outer_diameter_mm <= ?")
+        params.append(max_diameter_mm)
+    sql = f"SELECT {', '.join(columns)} FROM rotors"
+    if where:
+        sql += " WHERE " + " AND ".join(where)
+    # Table order whatever index the planner picks (cluster member order)
+    return sql + " ORDER BY id", params
+
+
+def iter_rotor_chunks(db_path: str = DB_PATH, columns: Optional[Sequence[str]] = None,
+                      chunk_size: int = DEFAULT_CHUNK_SIZE,
+                      brands: Optional[Iterable[str]] = None,
+                      min_diameter_mm: Optional[float] = None,
+                      max_diameter_mm: Optional[float] = None,
+                      row_format: str = "dict") -> Iterator:
+    """
+    Stream rotors from SQLite, chunk_size rows at a time.
+    
+    Only one chunk is held in memory (cursor.fetchmany()), so a caller that
+    keeps less than the rows (e.g. cluster sums) stays bounded by chunk_size.
+    
+    Args:
+        db_path: Path to SQLite database file
+        columns: Columns to read (None = ROTOR_COLUMNS)
+        chunk_size: Rows per chunk
+        brands: Only these brands (a name or a list of names)
+        min_diameter_mm / max_diameter_mm: Outer diameter range (inclusive)
+        row_format: "dict" (list of dicts), "tuple" (list of tuples in
+                    column order) or "numpy" (structured array: REAL and
+                    INTEGER columns as float64 with NaN for NULL, text
+                    columns as objects; needs numpy)
+    
+    Yields:
+        One chunk per fetchmany() call (never empty)
+    """
+    if chunk_size < 1:
+        raise ValueError(f"chunk_size must be >= 1, got {chunk_size}")
+    if row_format not in ROW_FORMATS:
+        raise ValueError(f"Unknown row_format {row_format!r}, expected one of {ROW_FORMATS}")
+    columns = tuple(columns or ROTOR_COLUMNS)
+    sql, params = _rotor_query(columns, brands, min_diameter_mm, max_diameter_mm)
+    if row_format == "numpy":
+        from rotor_analysis.columnar import structured_rows
+    
+    conn = connect(db_path, "read_mostly")
+    try:
+        cursor = conn.execute(sql, params)
+        while True:
+            rows = cursor.fetchmany(chunk_size)
+            if not rows:
+                return
+            if row_format == "dict":
+                yield [dict(zip(columns, row)) for row in rows]
+            elif row_format == "tuple":
+                yield rows
+            else:
+                yield structured_rows(rows, columns)
+    finally:
+        conn.close()
+
+
+def iter_rotors(db_path: str = DB_PATH, columns: Optional[Sequence[str]] = None,
+                chunk_size: int = DEFAULT_CHUNK_SIZE, row_format: str = "dict",
+                **filters) -> Iterator:
+    """
+    Stream rotors one row at a time (dicts or tuples), read chunk by chunk.
+    
+    Args:
+        filters: brands, min_diameter_mm, max_diameter_mm (iter_rotor_chunks())
+    """
+    if row_format == "numpy":
+        raise ValueError("iter_rotors() yields single rows; use iter_rotor_chunks() for arrays")
+    for chunk in iter_rotor_chunks(db_path, columns, chunk_size, row_format=row_format, **filters):
+        yield from chunk
+
 
 def load_rotors_from_db(db_path: str = DB_PATH) -> list[dict]:
     """
@@ -32,33 +166,7 @@ def load_rotors_from_db(db_path: str = DB_PATH) -> list[dict]:
     Returns:
         List of rotor dicts with all columns from the rotors table
     """
-    conn = sqlite3.connect(db_path)
-    conn.row_factory = sqlite3.Row  # Enable column access by name
-    
-    try:
-        cursor = conn.execute("""
-            SELECT 
-                outer_diameter_mm,
-                nominal_thickness_mm,
-                hat_height_mm,
-                overall_height_mm,
-                offset_mm,
-                center_bore_mm,
-                bolt_circle_mm,
-                bolt_hole_count,
-                ventilation_type,
-                directionality,
-                rotor_weight_kg,
-                mounting_type,
-                brand,
-                catalog_ref
-            FROM rotors
-        """)
-        
-        rotors = [dict(row) for row in cursor.fetchall()]
-        return rotors
-    finally:
-        conn.close()
+    return list(iter_rotors(db_path))
 
 
 def effective_offset_mm(rotor: dict) -> Optional[float]:
@@ -141,7 +249,7 @@ def compute_cluster_key(rotor: dict) -> Optional[tuple[float, float, float]]:
     return (diam_bin, thick_bin, offset_bin)
 
 
-def build_clusters(rotors: list[dict]) -> dict:
+def build_clusters(rotors: Iterable[dict]) -> dict:
     """
     Build clusters from rotor list using geometric binning.
     
@@ -151,7 +259,7 @@ def build_clusters(rotors: list[dict]) -> dict:
     3. Calculate centroid (mean) for each cluster
     
     Args:
-        rotors: List of rotor dicts from database
+        rotors: Rotor dicts from database (a list, or iter_rotors() to stream)
     
     Returns:
         Dict mapping cluster_key → cluster data:
@@ -214,50 +322,80 @@ def build_clusters(rotors: list[dict]) -> dict:
     return clusters
 
 
-def clusters_to_json_serializable(clusters: dict) -> dict:
+def clusters_to_json_serializable(clusters: dict, meta: Optional[Dict] = None) -> dict:
     """
     Convert clusters dict to JSON-serializable format.
     
     Transforms tuple keys into structured objects with metadata.
     
     Args:
-        clusters: Clusters dict from build_clusters()
+        clusters: Clusters dict from build_clusters() (or
+                  load_cluster_summary(): no members; or an adaptive method:
+                  cluster number keys, written without "key")
+        meta: Meta info replacing the bin steps (adaptive methods)
     
     Returns:
         JSON-serializable dict with meta info and cluster list
     """
-    output = {
-        "meta": {
+    if meta is None:
+        meta = {
             "diam_bin_step_mm": DIAM_BIN_STEP_MM,
             "thick_bin_step_mm": THICK_BIN_STEP_MM,
             "offset_bin_step_mm": OFFSET_BIN_STEP_MM,
-            "cluster_count": len(clusters),
-        },
+        }
+    output = {
+        "meta": {**meta, "cluster_count": len(clusters)},
         "clusters": [],
     }
     
     # Convert each cluster to JSON-friendly format
     for idx, (key, cluster) in enumerate(clusters.items()):
-        diam_bin, thick_bin, offset_bin = key
-        
-        cluster_obj = {
-            "cluster_id": idx,
-            "key": {
+        cluster_obj = {"cluster_id": idx}
+        if isinstance(key, tuple):
+            diam_bin, thick_bin, offset_bin = key
+            cluster_obj["key"] = {
                 "outer_diameter_mm": diam_bin,
                 "nominal_thickness_mm": thick_bin,
                 "offset_mm": offset_bin,
-            },
-            "centroid": cluster["centroid"],
-            "count": cluster["count"],
-            "members": cluster["members"],
-        }
+            }
+        cluster_obj["centroid"] = cluster["centroid"]
+        cluster_obj["count"] = cluster["count"]
+        if "members" in cluster:
+            cluster_obj["members"] = cluster["members"]
         
         output["clusters"].append(cluster_obj)
     
     return output
 
 
-def run_clustering(db_path: str = DB_PATH, output_path: str = "rotor_analysis/rotor_clusters.json") -> None:
+def resolve_engine(engine: str) -> str:
+    """
+    Pick the clustering engine.
+    
+    Args:
+        engine: "python", "numpy" or "auto" (numpy when installed)
+    
+    Raises:
+        ValueError: Unknown engine
+        ImportError: numpy requested but not installed
+    """
+    from rotor_analysis.columnar import numpy_available
+    if engine == "auto":
+        return "numpy" if numpy_available() else "python"
+    if engine not in CLUSTER_ENGINES:
+        raise ValueError(f"Unknown clustering engine {engine!r}, expected one of "
+                         f"{CLUSTER_ENGINES} or 'auto'")
+    if engine == "numpy" and not numpy_available():
+        raise ImportError("Clustering engine 'numpy' needs numpy (pip install numpy)")
+    return engine
+
+
+def run_clustering(db_path: str = DB_PATH, output_path: str = "rotor_analysis/rotor_clusters.json",
+                   engine: str = "auto", chunk_size: int = DEFAULT_CHUNK_SIZE,
+                   brands: Optional[Iterable[str]] = None,
+                   min_diameter_mm: Optional[float] = None,
+                   max_diameter_mm: Optional[float] = None, method: str = "binning",
+                   options: Optional[Dict] = None) -> None:
     """
     Main function to run complete clustering pipeline.
     
@@ -267,34 +405,88 @@ def run_clustering(db_path: str = DB_PATH, output_path: str = "rotor_analysis/ro
     3. Convert to JSON format
     4. Write to output file
     
+    Rotors are streamed from SQLite chunk_size rows at a time, reading only
+    CLUSTER_COLUMNS: the python engine folds each chunk into the clusters,
+    the numpy engine into compact column arrays.
+    
     Args:
         db_path: Path to SQLite database
         output_path: Path for output JSON file
+        engine: "python", "numpy" or "auto" (numpy when installed); both
+                write the same clusters
+        chunk_size: Rows per fetchmany() chunk
+        brands / min_diameter_mm / max_diameter_mm: Only cluster these
+                rotors (iter_rotor_chunks())
+        method: "binning", "dbscan" or "kmeans" (the adaptive methods
+                always use the numpy engine)
+        options: Parameters of an adaptive method (adaptive.METHOD_DEFAULTS)
+    
+    Raises:
+        ValueError: Unknown engine, method or option
+        ImportError: numpy needed but not installed
     """
+    if method not in CLUSTER_METHODS:
+        raise ValueError(f"Unknown clustering method {method!r}, expected one of "
+                         f"{CLUSTER_METHODS}")
+    if method != "binning":
+        from rotor_analysis.adaptive import method_params
+        params = method_params(method, options)  # Fail before loading
+        engine = resolve_engine("numpy")
+    elif options:
+        raise ValueError(f"Binning takes no options, got {sorted(options)}")
+    else:
+        engine = resolve_engine(engine)
+    filters = {"brands": brands, "min_diameter_mm": min_diameter_mm,
+               "max_diameter_mm": max_diameter_mm}
     print("="*60)
     print("ROTOR CLUSTERING ANALYSIS (M10)")
     print("="*60)
     
-    # Step 1: Load rotors
-    print(f"\n[1/4] Loading rotors from {db_path}...")
-    rotors = load_rotors_from_db(db_path)
-    print(f"      Loaded {len(rotors)} rotors")
+    # Step 1: Load rotors (the python engine streams them into step 2)
+    print(f"\n[1/4] Loading rotors from {db_path} (chunks of {chunk_size})...")
+    if engine == "numpy":
+        from rotor_analysis.columnar import build_clusters_columnar, load_rotor_columns
+        rotors = load_rotor_columns(db_path, chunk_size, **filters)
+        print(f"      Loaded {len(rotors['catalog_ref'])} rotors")
     
     # Step 2: Build clusters
-    print(f"\n[2/4] Building clusters (binning strategy)...")
-    print(f"      Diameter bins: {DIAM_BIN_STEP_MM}mm")
-    print(f"      Thickness bins: {THICK_BIN_STEP_MM}mm")
-    print(f"      Offset bins: {OFFSET_BIN_STEP_MM}mm")
-    clusters = build_clusters(rotors)
+    meta = None
+    if method != "binning":
+        from rotor_analysis.adaptive import build_clusters_adaptive
+        print(f"\n[2/4] Building clusters ({method})...")
+        print("      " + ", ".join(f"{name}={value}" for name, value in params.items()))
+        clusters, params = build_clusters_adaptive(rotors, method, params)
+        meta = {"method": method, **params, "scales": list(params["scales"])}
+    else:
+        print(f"\n[2/4] Building clusters (binning strategy, {engine} engine)...")
+        print(f"      Diameter bins: {DIAM_BIN_STEP_MM}mm")
+        print(f"      Thickness bins: {THICK_BIN_STEP_MM}mm")
+        print(f"      Offset bins: {OFFSET_BIN_STEP_MM}mm")
+    if engine == "numpy":
+        if method == "binning":
+            clusters = build_clusters_columnar(rotors)
+        total = len(rotors["catalog_ref"])
+        del rotors  # The cluster members hold what the JSON needs
+    else:
+        loaded = [0]
+        def counted(rows):
+            for row in rows:
+                loaded[0] += 1
+                yield row
+        clusters = build_clusters(counted(iter_rotors(db_path, CLUSTER_COLUMNS, chunk_size,
+                                                      **filters)))
+        total = loaded[0]
+        print(f"      Streamed {total} rotors")
     print(f"      Created {len(clusters)} clusters")
     
     # Step 3: Convert to JSON
     print(f"\n[3/4] Converting to JSON format...")
-    data = clusters_to_json_serializable(clusters)
+    data = clusters_to_json_serializable(clusters, meta)
     
-    # Count total rotors in clusters (some may be skipped if incomplete)
+    # Count total rotors in clusters (some may be skipped if incomplete, or
+    # left out as DBSCAN noise)
     total_clustered = sum(c["count"] for c in data["clusters"])
-    print(f"      {total_clustered} rotors clustered ({len(rotors) - total_clustered} skipped)")
+    print(f"      {total_clustered} rotors clustered ({total - total_clustered} skipped)")
     
     # Step 4: Write output
     print(f"\n[4/4] Writing output to {output_path}...")
@@ -309,13 +501,68 @@ def run_clustering(db_path: str = DB_PATH, output_path: str = "rotor_analysis/ro
     print("\n" + "="*60)
     print("CLUSTERING COMPLETE")
     print("="*60)
-    print(f"Total rotors:     {len(rotors)}")
+    print(f"Total rotors:     {total}")
     print(f"Clustered:        {total_clustered}")
-    print(f"Skipped:          {len(rotors) - total_clustered}")
+    print(f"Skipped:          {total - total_clustered}")
     print(f"Clusters created: {len(clusters)}")
     print(f"Output file:      {output_path}")
     print("="*60)
 
 
+def load_cluster_summary(db_path: str = DB_PATH) -> dict:
+    """
+    Clusters from the persisted cluster state (database/cluster_state.py),
+    kept current by triggers as rotors are written: O(#clusters), no rotor
+    is read.
+    
+    Returns:
+        Dict mapping cluster_key → {"count", "centroid"} (no members),
+        ordered by key
+    
+    Raises:
+        ValueError: State missing or built with other bin steps
+    """
+    conn = connect(db_path, "read_mostly")
+    try:
+        return load_cluster_state(conn)
+    finally:
+        conn.close()
+
+
+def export_cluster_summary(db_path: str = DB_PATH,
+                           output_path: str = "rotor_analysis/rotor_cluster_summary.json") -> dict:
+    """
+    Write the clusters of the persisted state as JSON (run_clustering()
+    format without members).
+    
+    Returns:
+        The JSON-serializable dict written
+    """
+    data = clusters_to_json_serializable(load_cluster_summary(db_path))
+    os.makedirs(os.path.dirname(output_path), exist_ok=True)
+    with open(output_path, "w", encoding="utf-8") as f:
+        json.dump(data, f, ensure_ascii=False, indent=2)
+    clustered = sum(c["count"] for c in data["clusters"])
+    print(f"Cluster summary: {data['meta']['cluster_count']} clusters, "
+          f"{clustered} rotors -> {output_path}")
+    return data
+
+
 if __name__ == "__main__":
-    run_clustering()
+    # Simple CLI: python rotor_analysis/clustering.py [python|numpy|auto] [chunk_size]
+    #             python rotor_analysis/clustering.py dbscan|kmeans [chunk_size]
+    #             python rotor_analysis/clustering.py summary   (persisted state)
+    #             python rotor_analysis/clustering.py sweep [options]   (rotor_analysis/sweep.py)
+    if len(sys.argv) > 1 and sys.argv[1] == "summary":
+        export_cluster_summary()
+        sys.exit(0)
+    if len(sys.argv) > 1 and sys.argv[1] == "sweep":
+        from rotor_analysis.sweep import main
+        main(sys.argv[2:])
+        sys.exit(0)
+    choice = sys.argv[1] if len(sys.argv) > 1 else "auto"
+    chunk_size = int(sys.argv[2]) if len(sys.argv) > 2 else DEFAULT_CHUNK_SIZE
+    if choice in CLUSTER_METHODS:
+        run_clustering(method=choice, chunk_size=chunk_size)
+    else:
+        run_clustering(engine=choice, chunk_size=chunk_size)
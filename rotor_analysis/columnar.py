@@ -0,0 +1,280 @@
+# rotor_analysis/columnar.py
+"""
+Columnar (NumPy) engine for the rotor binning clusters.
+
+build_clusters() walks a list of rotor dicts: one dict per SQLite row,
+effective_offset_mm() twice and bin_value() three times per rotor, and a
+dict lookup per rotor to accumulate the sums. This engine loads the rotor
+geometry as float64 arrays instead (NULL -> NaN) and does the same work with
+array operations:
+- effective offsets: offset_mm where set, else overall - hat height
+- bin keys: round(x / step) * step per dimension (round half to even, as
+  Python's round())
+- grouping: the three bin indices packed into one int64 code and
+  np.unique'd (a 1-D sort, much faster than np.unique(axis=0) on the key
+  rows); clusters are numbered in order of their first rotor, like the
+  insertion order of build_clusters()
+- centroids: np.bincount sums divided by the counts; the sums add the same
+  values in the same order, so they are bit-identical
+
+build_clusters_columnar() returns the structure of build_clusters(), so
+clusters_to_json_serializable() output is the same byte for byte, except
+that member dimensions are always floats (as SQLite REAL columns return
+them). numpy is an optional dependency: run_clustering(engine="auto") uses
+this engine only when it is installed.
+"""
+
+import os
+import sys
+from typing import Dict, Iterable, Optional, Tuple
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(__file__)))
+
+from rotor_analysis import clustering
+from rotor_analysis.clustering import (
+    CLUSTER_COLUMNS,
+    DEFAULT_CHUNK_SIZE,
+    TEXT_COLUMNS,
+    iter_rotor_chunks,
+)
+
+# Geometry columns, loaded as float64 arrays (NULL -> NaN)
+GEOMETRY_COLUMNS = tuple(name for name in CLUSTER_COLUMNS if name not in TEXT_COLUMNS)
+
+# Identity columns, kept as Python lists (cluster members)
+LABEL_COLUMNS = tuple(name for name in CLUSTER_COLUMNS if name in TEXT_COLUMNS)
+
+Steps = Tuple[float, float, float]  # (diameter, thickness, offset) bin steps in mm
+
+
+def numpy_available() -> bool:
+    return np is not None
+
+
+def _require_numpy() -> None:
+    if np is None:
+        raise ImportError("The numpy clustering engine needs numpy (pip install numpy)")
+
+
+def _default_steps() -> Steps:
+    """Bin steps of rotor_analysis.clustering, read at call time."""
+    return (clustering.DIAM_BIN_STEP_MM, clustering.THICK_BIN_STEP_MM,
+            clustering.OFFSET_BIN_STEP_MM)
+
+
+def columns_from_rows(rows: Iterable[tuple]) -> Dict:
+    """
+    Build rotor columns from CLUSTER_COLUMNS-ordered row tuples.
+
+    Returns:
+        {column: float64 array} for GEOMETRY_COLUMNS and {column: list} for
+        LABEL_COLUMNS
+    """
+    _require_numpy()
+    transposed = list(zip(*rows)) or [()] * len(CLUSTER_COLUMNS)
+    columns = {}
+    for name, values in zip(CLUSTER_COLUMNS, transposed):
+        if name in GEOMETRY_COLUMNS:
+            # None -> NaN
+            columns[name] = np.array(values, dtype=np.float64).reshape(-1)
+        else:
+            columns[name] = list(values)
+    return columns
+
+
+def columns_from_rotors(rotors: Iterable[dict]) -> Dict:
+    """Build rotor columns from rotor dicts (missing keys are NULL)."""
+    return columns_from_rows(tuple(rotor.get(name) for name in CLUSTER_COLUMNS)
+                             for rotor in rotors)
+
+
+def structured_rows(rows: list, columns: Tuple[str, ...]) -> "np.ndarray":
+    """
+    Row tuples as a structured array (iter_rotor_chunks(row_format="numpy")).
+
+    Text columns are object fields, the others float64 (NULL -> NaN).
+    """
+    _require_numpy()
+    dtype = [(name, object if name in TEXT_COLUMNS else np.float64) for name in columns]
+    array = np.empty(len(rows), dtype=dtype)
+    for name, values in zip(columns, zip(*rows)):
+        array[name] = values
+    return array
+
+
+def load_rotor_columns(db_path: Optional[str] = None, chunk_size: int = DEFAULT_CHUNK_SIZE,
+                       **filters) -> Dict:
+    """
+    Load the rotors' clustering columns from SQLite as arrays.
+
+    Reads only CLUSTER_COLUMNS, chunk_size rows at a time; each chunk is a
+    structured array whose fields are moved to the column arrays, so no
+    per-rotor Python row outlives its chunk.
+
+    Args:
+        db_path: Path to SQLite database file (None = clustering.DB_PATH)
+        chunk_size: Rows per chunk
+        filters: brands, min_diameter_mm, max_diameter_mm (iter_rotor_chunks())
+    """
+    _require_numpy()
+    parts = {name: [] for name in GEOMETRY_COLUMNS}
+    labels = {name: [] for name in LABEL_COLUMNS}
+    for chunk in iter_rotor_chunks(db_path or clustering.DB_PATH, CLUSTER_COLUMNS, chunk_size,
+                                   row_format="numpy", **filters):
+        for name in GEOMETRY_COLUMNS:
+            parts[name].append(chunk[name].copy())
+        for name in LABEL_COLUMNS:
+            labels[name].extend(chunk[name].tolist())
+    columns = {name: np.concatenate(arrays) if arrays else np.empty(0, dtype=np.float64)
+               for name, arrays in parts.items()}
+    columns.update(labels)
+    return columns
+
+
+def effective_offsets(columns: Dict) -> "np.ndarray":
+    """Vectorized effective_offset_mm(): NaN where it cannot be determined."""
+    offset = columns["offset_mm"]
+    return np.where(np.isnan(offset),
+                    columns["overall_height_mm"] - columns["hat_height_mm"], offset)
+
+
+def bin_values(x: "np.ndarray", step: float) -> "np.ndarray":
+    """Vectorized bin_value() (+ 0.0 turns -0.0 into 0.0, as Python's round())."""
+    return np.round(x / step) * step + 0.0
+
+
+def bin_indices(diameter: "np.ndarray", thickness: "np.ndarray", offset: "np.ndarray",
+                steps: Steps) -> "np.ndarray":
+    """(n, 3) int64 bin indices, round(x / step) per dimension."""
+    diam_step, thick_step, offset_step = steps
+    return np.column_stack((np.round(diameter / diam_step), np.round(thickness / thick_step),
+                            np.round(offset / offset_step))).astype(np.int64)
+
+
+def _bin_codes(bins: "np.ndarray") -> "np.ndarray":
+    """
+    One int64 code per key row (mixed radix over the per-column bin ranges).
+
+    Falls back to the rows themselves when the ranges do not fit in int64
+    (absurd dimensions); np.unique(axis=0) then groups them.
+    """
+    lowest = bins.min(axis=0)
+    spans = bins.max(axis=0) - lowest + 1
+    if float(np.prod(spans.astype(np.float64))) >= 2.0 ** 62:
+        return bins
+    shifted = bins - lowest
+    return (shifted[:, 0] * spans[1] + shifted[:, 1]) * spans[2] + shifted[:, 2]
+
+
+def complete_rows(columns: Dict) -> Tuple["np.ndarray", "np.ndarray", "np.ndarray", "np.ndarray"]:
+    """
+    Rotors with a complete cluster geometry.
+
+    Returns:
+        (kept row indices, diameter, thickness, effective offset) of those rows
+    """
+    diameter = columns["outer_diameter_mm"]
+    thickness = columns["nominal_thickness_mm"]
+    offset = effective_offsets(columns)
+    kept = np.flatnonzero(~(np.isnan(diameter) | np.isnan(thickness) | np.isnan(offset)))
+    return kept, diameter[kept], thickness[kept], offset[kept]
+
+
+def rank_by_first(labels: "np.ndarray") -> Tuple["np.ndarray", "np.ndarray", "np.ndarray"]:
+    """
+    Renumber labels (one per row, int array or rows of ints) 0..k-1 in order
+    of their first row, like the insertion order of build_clusters().
+
+    Returns:
+        (cluster id per row, first row of each cluster, cluster sizes)
+    """
+    _, first, inverse, counts = np.unique(
+        labels, axis=0 if labels.ndim > 1 else None,
+        return_index=True, return_inverse=True, return_counts=True)
+    order = np.argsort(first, kind="stable")
+    rank = np.empty_like(order)
+    rank[order] = np.arange(order.size)
+    return rank[inverse.reshape(-1)], first[order], counts[order]
+
+
+def assemble_clusters(columns: Dict, kept: "np.ndarray", geometry: Tuple, cluster_ids: "np.ndarray",
+                      counts: "np.ndarray", keys: Iterable) -> Dict:
+    """
+    Clusters in the build_clusters() structure from a cluster id per row.
+
+    Args:
+        columns: Rotor columns (brand / catalog_ref of the members)
+        kept: Row index in columns of each clustered rotor
+        geometry: (diameter, thickness, effective offset) of the kept rows
+        cluster_ids / counts: rank_by_first() of the kept rows
+        keys: One dict key per cluster, in cluster id order
+
+    Returns:
+        {key: {"members", "count", "centroid"}}; centroids are bincount sums
+        in row order divided by the counts
+    """
+    diameter, thickness, offset = geometry
+    cluster_count = counts.size
+    sums = [np.bincount(cluster_ids, weights=values, minlength=cluster_count)
+            for values in (diameter, thickness, offset)]
+    centroids = zip(*((total / counts).tolist() for total in sums))
+
+    # Members grouped by cluster, rotor order kept within a cluster
+    by_cluster = np.argsort(cluster_ids, kind="stable")
+    brands, refs = columns["brand"], columns["catalog_ref"]
+    members = [{"brand": brands[i], "catalog_ref": refs[i], "outer_diameter_mm": d,
+                "nominal_thickness_mm": t, "offset_mm": o}
+               for i, d, t, o in zip(kept[by_cluster].tolist(), diameter[by_cluster].tolist(),
+                                     thickness[by_cluster].tolist(), offset[by_cluster].tolist())]
+
+    clusters = {}
+    start = 0
+    for key, count, (mean_d, mean_t, mean_o) in zip(keys, counts.tolist(), centroids):
+        clusters[key] = {
+            "members": members[start:start + count],
+            "count": count,
+            "centroid": {
+                "outer_diameter_mm": mean_d,
+                "nominal_thickness_mm": mean_t,
+                "offset_mm": mean_o,
+            },
+        }
+        start += count
+    return clusters
+
+
+def build_clusters_columnar(columns: Dict, steps: Optional[Steps] = None) -> Dict:
+    """
+    Build clusters from rotor columns using geometric binning.
+
+    Same output as clustering.build_clusters() for the same rotors.
+
+    Args:
+        columns: Rotor columns (load_rotor_columns(), columns_from_rotors())
+        steps: (diameter, thickness, offset) bin steps in mm (None = the
+               clustering module constants)
+
+    Returns:
+        Dict mapping cluster_key -> {"members", "count", "centroid"}
+    """
+    _require_numpy()
+    diam_step, thick_step, offset_step = steps = steps or _default_steps()
+    # Skip rotors with incomplete geometry
+    kept, diameter, thickness, offset = complete_rows(columns)
+    if kept.size == 0:
+        return {}
+    bins = bin_indices(diameter, thickness, offset, steps)
+
+    # Cluster ids in order of first appearance
+    cluster_ids, first, counts = rank_by_first(_bin_codes(bins))
+
+    keys = np.column_stack((bin_values(diameter[first], diam_step),
+                            bin_values(thickness[first], thick_step),
+                            bin_values(offset[first], offset_step)))
+    return assemble_clusters(columns, kept, (diameter, thickness, offset), cluster_ids, counts,
+                             map(tuple, keys.tolist()))
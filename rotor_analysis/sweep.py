@@ -0,0 +1,224 @@
+# rotor_analysis/sweep.py
+"""
+Parallel sweep of the binning steps (rotor_analysis/clustering.py).
+
+DIAM_BIN_STEP_MM, THICK_BIN_STEP_MM and OFFSET_BIN_STEP_MM decide how many
+clusters the binning makes and how many rotors the largest ones hold, which
+is what the choice of the 15-25 master rotor families (M11) rests on.
+sweep_bin_steps() evaluates a grid of (diameter, thickness, offset) steps
+without editing them:
+- the rotors are loaded once (load_rotor_columns()), and the geometry of the
+  complete ones copied into a SharedMemory block as a (3, n) float64 array
+- a ProcessPoolExecutor evaluates one setting per task; workers map the
+  block at start (no per-task pickling of the rotors)
+- per setting: bin indices, int64 codes and np.unique counts, as
+  build_clusters_columnar() groups them, but no members or centroids
+
+Each result gives the cluster count, the largest cluster, the share of the
+clustered rotors in the MASTER_FAMILIES largest clusters, and the rotors
+skipped for incomplete geometry (the same for every setting).
+
+Usage:
+    python rotor_analysis/sweep.py [--db PATH] [--diam 2.5,5,10] [--thick 0.5,1]
+                                   [--offset 2,5] [--workers N]
+"""
+
+import argparse
+import itertools
+import os
+import sys
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import shared_memory
+from typing import Dict, Iterable, List, Optional, Sequence
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(__file__)))
+
+from rotor_analysis.clustering import DB_PATH, DEFAULT_CHUNK_SIZE
+from rotor_analysis.columnar import (
+    Steps,
+    _bin_codes,
+    _require_numpy,
+    bin_indices,
+    complete_rows,
+    load_rotor_columns,
+    np,
+)
+
+# Default grid (mm): around the clustering constants (5.0, 0.5, 2.0)
+SWEEP_DIAM_STEPS_MM = (2.5, 5.0, 10.0, 20.0)
+SWEEP_THICK_STEPS_MM = (0.5, 1.0, 2.0)
+SWEEP_OFFSET_STEPS_MM = (2.0, 5.0, 10.0)
+
+# Largest clusters whose coverage is reported (upper end of the 15-25 master
+# rotor families of M11)
+MASTER_FAMILIES = 25
+
+# Geometry in the workers: {"block": SharedMemory, "geometry": (3, n) array}
+_shared = {}
+
+
+def step_grid(diam_steps: Sequence[float] = SWEEP_DIAM_STEPS_MM,
+              thick_steps: Sequence[float] = SWEEP_THICK_STEPS_MM,
+              offset_steps: Sequence[float] = SWEEP_OFFSET_STEPS_MM) -> List[Steps]:
+    """
+    Every (diameter, thickness, offset) combination of the steps.
+
+    Raises:
+        ValueError: Empty list or step <= 0
+    """
+    steps = [tuple(float(step) for step in values)
+             for values in (diam_steps, thick_steps, offset_steps)]
+    if not all(steps) or any(step <= 0 for values in steps for step in values):
+        raise ValueError(f"Bin steps must be non-empty lists of values > 0, got {steps}")
+    return list(itertools.product(*steps))
+
+
+def evaluate_steps(geometry: "np.ndarray", steps: Steps, skipped: int = 0) -> Dict:
+    """
+    Binning statistics of one setting.
+
+    Args:
+        geometry: (3, n) diameter / thickness / effective offset of the
+                  complete rotors
+        steps: (diameter, thickness, offset) bin steps in mm
+        skipped: Rotors left out for incomplete geometry (reported as is)
+
+    Returns:
+        {"steps", "cluster_count", "largest", "top_coverage", "skipped"};
+        top_coverage is the share of the clustered rotors in the
+        MASTER_FAMILIES largest clusters (0.0 without rotors)
+    """
+    if geometry.shape[1] == 0:
+        counts = np.empty(0, dtype=np.int64)
+    else:
+        codes = _bin_codes(bin_indices(*geometry, steps))
+        counts = np.unique(codes, axis=0 if codes.ndim > 1 else None, return_counts=True)[1]
+    counts = np.sort(counts)[::-1]
+    clustered = int(counts.sum())
+    return {
+        "steps": tuple(steps),
+        "cluster_count": int(counts.size),
+        "largest": int(counts[0]) if counts.size else 0,
+        "top_coverage": int(counts[:MASTER_FAMILIES].sum()) / clustered if clustered else 0.0,
+        "skipped": skipped,
+    }
+
+
+def _attach(name: str, rotors: int) -> None:
+    """Worker initializer: map the shared geometry block."""
+    block = shared_memory.SharedMemory(name=name)
+    _shared["block"] = block
+    _shared["geometry"] = np.ndarray((3, rotors), dtype=np.float64, buffer=block.buf)
+
+
+def _evaluate_shared(steps: Steps, skipped: int) -> Dict:
+    return evaluate_steps(_shared["geometry"], steps, skipped)
+
+
+def sweep_bin_steps(db_path: str = DB_PATH, grid: Optional[Iterable[Steps]] = None,
+                    workers: Optional[int] = None, chunk_size: int = DEFAULT_CHUNK_SIZE,
+                    **filters) -> List[Dict]:
+    """
+    Evaluate the binning for each setting of a step grid, in parallel.
+
+    Args:
+        db_path: Path to SQLite database
+        grid: (diameter, thickness, offset) steps to evaluate (None = step_grid())
+        workers: Worker processes (None = os.cpu_count(), 0 = evaluate serially
+                 in the calling process)
+        chunk_size: Rows per fetchmany() chunk of the loader
+        filters: brands / min_diameter_mm / max_diameter_mm (iter_rotor_chunks())
+
+    Returns:
+        evaluate_steps() results, in grid order
+    """
+    _require_numpy()
+    grid = step_grid() if grid is None else list(grid)
+    for steps in grid:
+        if len(steps) != 3 or any(step <= 0 for step in steps):
+            raise ValueError(f"Bin steps must be 3 values > 0, got {steps}")
+    if workers is None:
+        workers = os.cpu_count() or 1
+
+    columns = load_rotor_columns(db_path, chunk_size, **filters)
+    total = len(columns["catalog_ref"])
+    kept, diameter, thickness, offset = complete_rows(columns)
+    del columns
+    skipped = total - kept.size
+
+    if workers == 0:
+        geometry = np.vstack((diameter, thickness, offset))
+        return [evaluate_steps(geometry, steps, skipped) for steps in grid]
+
+    block = shared_memory.SharedMemory(create=True, size=max(3 * kept.size * 8, 1))
+    geometry = None
+    try:
+        geometry = np.ndarray((3, kept.size), dtype=np.float64, buffer=block.buf)
+        geometry[:] = (diameter, thickness, offset)
+        del diameter, thickness, offset
+        with ProcessPoolExecutor(max_workers=min(workers, max(len(grid), 1)),
+                                 initializer=_attach, initargs=(block.name, kept.size)) as pool:
+            return list(pool.map(_evaluate_shared, grid, itertools.repeat(skipped)))
+    finally:
+        del geometry  # Release the buffer before closing the block
+        block.close()
+        block.unlink()
+
+
+def format_sweep_table(results: List[Dict]) -> str:
+    """One line per setting: steps, clusters, largest, top coverage, skipped."""
+    lines = [f"{'Diam mm':>8} {'Thick mm':>9} {'Offset mm':>10} {'Clusters':>9} "
+             f"{'Largest':>8} {f'Top {MASTER_FAMILIES} %':>9} {'Skipped':>8}"]
+    for result in results:
+        diam, thick, offset = result["steps"]
+        lines.append(f"{diam:>8g} {thick:>9g} {offset:>10g} {result['cluster_count']:>9} "
+                     f"{result['largest']:>8} {100 * result['top_coverage']:>9.1f} "
+                     f"{result['skipped']:>8}")
+    return "\n".join(lines)
+
+
+def _steps_list(text: str) -> List[float]:
+    try:
+        return [float(value) for value in text.split(",") if value.strip()]
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"expected comma-separated mm values, got {text!r}")
+
+
+def parse_args(argv=None):
+    """
+    Parse command-line arguments.
+
+    Args:
+        argv: List of argument strings (for testing). If None, uses sys.argv[1:].
+
+    Returns:
+        argparse.Namespace with parsed arguments.
+    """
+    parser = argparse.ArgumentParser(
+        description="BigBrakeKit - Sweep the rotor binning steps")
+    parser.add_argument("--db", default=DB_PATH, help=f"SQLite database (default: {DB_PATH})")
+    parser.add_argument("--diam", type=_steps_list, default=list(SWEEP_DIAM_STEPS_MM),
+                        help="Diameter steps in mm, comma-separated (default: "
+                             f"{','.join(map(str, SWEEP_DIAM_STEPS_MM))})")
+    parser.add_argument("--thick", type=_steps_list, default=list(SWEEP_THICK_STEPS_MM),
+                        help="Thickness steps in mm (default: "
+                             f"{','.join(map(str, SWEEP_THICK_STEPS_MM))})")
+    parser.add_argument("--offset", type=_steps_list, default=list(SWEEP_OFFSET_STEPS_MM),
+                        help="Offset steps in mm (default: "
+                             f"{','.join(map(str, SWEEP_OFFSET_STEPS_MM))})")
+    parser.add_argument("--workers", type=int, default=None,
+                        help="Worker processes (default: CPU count, 0 = no pool)")
+    return parser.parse_args(argv)
+
+
+def main(argv=None) -> List[Dict]:
+    args = parse_args(argv)
+    grid = step_grid(args.diam, args.thick, args.offset)
+    print(f"Sweeping {len(grid)} bin step settings over {args.db}...")
+    results = sweep_bin_steps(args.db, grid, workers=args.workers)
+    print(format_sweep_table(results))
+    return results
+
+
+if __name__ == "__main__":
+    main()
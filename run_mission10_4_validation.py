@@ -10,17 +10,14 @@ import json
 import os
 import sys
 
-# For HTTP requests
-try:
-    import urllib.request
-    from urllib.error import URLError, HTTPError
-except ImportError:
-    print("ERROR: urllib not available")
-    sys.exit(1)
+import requests
 
 # Add current dir to path for imports
 sys.path.insert(0, '.')
 
+from data_scraper.domain_scheduler import DomainScheduler, retry_after_from_error
+from data_scraper.html_cache import configure_cache
+from data_scraper.html_scraper import fetch_html
 from data_scraper.html_rotor_list_scraper import parse_rotor_list_page
 
 
@@ -47,8 +44,16 @@ def load_list_seeds():
     return seeds
 
 
-def download_real_html(seeds):
-    """Download real HTML from each seed URL."""
+def download_real_html(seeds, scheduler=None):
+    """
+    Download real HTML from each seed URL.
+    
+    Requests go through a per-domain politeness scheduler (default:
+    DomainScheduler()) so several seeds on one host are spaced out.
+    """
+    if scheduler is None:
+        scheduler = DomainScheduler()
+    
     target_dir = "tests/fixtures_real/rotor_lists"
     os.makedirs(target_dir, exist_ok=True)
     
@@ -72,34 +77,33 @@ def download_real_html(seeds):
         
         print(f"\n  [{source}] Fetching {url}")
         
+        scheduler.acquire(url)
         try:
-            # Create request with User-Agent to avoid bot blocking
-            req = urllib.request.Request(
-                url,
-                headers={
-                    'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'
-                }
-            )
-            
-            with urllib.request.urlopen(req, timeout=20) as response:
-                html_content = response.read().decode('utf-8', errors='replace')
+            # Shared pooled session + HTML cache when configured
+            html_content = fetch_html(url, timeout=20)
             
             with open(html_path, "w", encoding="utf-8") as f:
                 f.write(html_content)
             
             print(f"    -> Saved to {html_path} ({len(html_content)} bytes)")
             
-        except (URLError, HTTPError) as e:
+        except requests.RequestException as e:
             result["status"] = "error"
             result["error"] = repr(e)
             print(f"    -> ERROR: {e}")
+            retry_after = retry_after_from_error(e)
+            if retry_after:
+                scheduler.defer(url, retry_after)
         except Exception as e:
             result["status"] = "error"
             result["error"] = repr(e)
             print(f"    -> ERROR: {e}")
+        finally:
+            scheduler.release(url)
         
         download_results.append(result)
     
+    scheduler.print_stats()
     return download_results
 
 
@@ -344,7 +348,8 @@ def main():
     # Step 1: Load seeds
     seeds = load_list_seeds()
     
-    # Step 2: Download HTML
+    # Step 2: Download HTML (re-runs revalidate against the HTML cache)
+    configure_cache()
     download_results = download_real_html(seeds)
     
     # Step 3: Parse HTML
@@ -11,11 +11,41 @@ Usage:
     python scrape_and_ingest.py --only rotors      # Rotors only
     python scrape_and_ingest.py --only pads        # Pads only
     python scrape_and_ingest.py --only vehicles    # Vehicles only
+    python scrape_and_ingest.py --concurrency 16   # Keep 16 fetches in flight
+    python scrape_and_ingest.py --concurrency 16 --domain-rate 2   # Max 2 req/s per host
+    python scrape_and_ingest.py --offline          # Re-run from the HTML cache only
+    python scrape_and_ingest.py --record crawl/    # Archive every response
+    python scrape_and_ingest.py --replay crawl/    # Re-ingest offline from the archive
+    python scrape_and_ingest.py --html-backend auto   # Fastest installed HTML parser
+    python scrape_and_ingest.py --commit-interval 1000 # Commit every 1000 rows
+    python scrape_and_ingest.py --key-index set    # Skip known keys without SQLite
+    python scrape_and_ingest.py --upsert           # Update records whose specs changed
+    python scrape_and_ingest.py --resume           # Skip seeds inserted by an interrupted run
+    python scrape_and_ingest.py --frontier         # Frontier worker (run several at once)
+    python scrape_and_ingest.py --max-depth 0      # Seed pages only, no pagination links
+    python scrape_and_ingest.py --max-attempts 5   # Retry transient fetch errors 4 times
 """
 
 import argparse
 import sys
-from database.ingest_pipeline import ingest_all
+from data_scraper.domain_scheduler import DomainScheduler
+from data_scraper.html_cache import DEFAULT_CACHE_DIR, DEFAULT_TTL_S, configure_cache, disable_cache
+from data_scraper.http_archive import RECORD, REPLAY, configure_archive, disable_archive
+from data_scraper.retry_policy import (
+    DEFAULT_BASE_DELAY_S,
+    DEFAULT_COOLDOWN_S,
+    DEFAULT_FAILURE_THRESHOLD,
+    DEFAULT_MAX_ATTEMPTS,
+    CircuitBreaker,
+    RetryPolicy,
+)
+from data_scraper.spec_extract import DEFAULT_HTML_BACKEND, HTML_BACKENDS, set_html_backend
+from database.frontier import DEFAULT_LEASE_S
+from database.ingest_pipeline import DEFAULT_LEASE_SIZE, ingest_all, ingest_frontier
+from database.batch_writer import DEFAULT_BATCH_SIZE, DEFAULT_COMMIT_INTERVAL
+from database.ingest_stages import DEFAULT_PARSE_WORKERS
+from database.link_discovery import DEFAULT_MAX_DEPTH, DEFAULT_MAX_PAGES
+from database.key_index import DEFAULT_ERROR_RATE, KEY_INDEX_MODES
 
 
 def parse_args(argv=None):
@@ -37,6 +67,18 @@ Examples:
   %(prog)s --only rotors        Ingest rotors only
   %(prog)s --only pads          Ingest pads only
   %(prog)s --only vehicles      Ingest vehicles only
+  %(prog)s --concurrency 16     Fetch up to 16 pages concurrently
+  %(prog)s --concurrency 16 --domain-rate 2 --domain-max-in-flight 2
+                                Same, but at most 2 req/s and 2 in flight per host
+  %(prog)s --cache-ttl 0        Revalidate every cached page (conditional GET)
+  %(prog)s --offline            Use cached pages only, no network
+  %(prog)s --record crawl/      Archive every fetched response (status, headers, body)
+  %(prog)s --replay crawl/      Re-run ingestion offline from that archive
+  %(prog)s --resume             Continue an interrupted run (skip seeds already inserted)
+  %(prog)s --frontier & %(prog)s --frontier
+                                Two workers sharing the seeds through the crawl frontier
+  %(prog)s --max-attempts 1 --breaker-threshold 0
+                                No retries, no circuit breaker
         """
     )
     
@@ -48,7 +90,233 @@ Examples:
         help="Specify which data group to ingest (default: all)"
     )
     
-    return parser.parse_args(argv)
+    parser.add_argument(
+        "--concurrency",
+        type=int,
+        default=1,
+        help="Maximum number of page fetches in flight (default: 1, sequential)"
+    )
+    
+    parser.add_argument(
+        "--as-completed",
+        action="store_true",
+        help="Process pages as they arrive instead of in seed order"
+    )
+    
+    parser.add_argument(
+        "--parse-workers",
+        type=int,
+        default=None,
+        help="Processes parsing pages in parallel with fetching "
+             f"(default: {DEFAULT_PARSE_WORKERS}, 0 = parse in the main process)"
+    )
+    
+    parser.add_argument(
+        "--batch-size",
+        type=int,
+        default=DEFAULT_BATCH_SIZE,
+        help=f"Rows per batched INSERT (default: {DEFAULT_BATCH_SIZE})"
+    )
+    
+    parser.add_argument(
+        "--commit-interval",
+        type=int,
+        default=DEFAULT_COMMIT_INTERVAL,
+        help="Commit every N inserted rows, so an interrupted run keeps its "
+             f"progress (default: {DEFAULT_COMMIT_INTERVAL}, 0 = single commit at the end)"
+    )
+    
+    parser.add_argument(
+        "--key-index",
+        choices=KEY_INDEX_MODES,
+        default=None,
+        help="Preload the natural keys already stored so duplicates are skipped "
+             "without a database round trip: set = exact, bloom = bounded memory, "
+             "may skip --key-error-rate of new records (default: off)"
+    )
+    
+    parser.add_argument(
+        "--key-error-rate",
+        type=float,
+        default=DEFAULT_ERROR_RATE,
+        help=f"False-positive rate of --key-index bloom (default: {DEFAULT_ERROR_RATE})"
+    )
+    
+    parser.add_argument(
+        "--upsert",
+        action="store_true",
+        help="Update stored records whose content changed (content hash) instead "
+             "of skipping them; unchanged records only get last_seen updated"
+    )
+    
+    parser.add_argument(
+        "--resume",
+        action="store_true",
+        help="Skip the seeds the ingest journal records as inserted by an earlier "
+             "(interrupted) run; failed and unfinished seeds are retried"
+    )
+    
+    parser.add_argument(
+        "--max-depth",
+        type=int,
+        default=DEFAULT_MAX_DEPTH,
+        help="Levels of links followed from list pages (next pages, product pages) "
+             f"(default: {DEFAULT_MAX_DEPTH}, 0 = seed pages only)"
+    )
+    
+    parser.add_argument(
+        "--max-pages",
+        type=int,
+        default=DEFAULT_MAX_PAGES,
+        help=f"Linked pages discovered per group at most (default: {DEFAULT_MAX_PAGES})"
+    )
+    
+    parser.add_argument(
+        "--frontier",
+        action="store_true",
+        help="Run as a crawl frontier worker: enqueue the seeds (once), then lease, "
+             "fetch and ingest them until the frontier is drained; several workers "
+             "may share the database"
+    )
+    
+    parser.add_argument(
+        "--worker-id",
+        default=None,
+        help="Lease owner name of this --frontier worker (default: host:pid)"
+    )
+    
+    parser.add_argument(
+        "--lease-size",
+        type=int,
+        default=DEFAULT_LEASE_SIZE,
+        help=f"Seeds leased per batch by a --frontier worker (default: {DEFAULT_LEASE_SIZE})"
+    )
+    
+    parser.add_argument(
+        "--lease-seconds",
+        type=float,
+        default=DEFAULT_LEASE_S,
+        help="Seconds before the leased seeds of a stalled --frontier worker go to "
+             f"other workers (default: {DEFAULT_LEASE_S:g})"
+    )
+    
+    parser.add_argument(
+        "--shared-db",
+        action="store_true",
+        help="Open the database with the \"shared\" profile (rollback journal), for "
+             "--frontier workers on several machines sharing the database file"
+    )
+    
+    parser.add_argument(
+        "--domain-rate",
+        type=float,
+        default=None,
+        help="Per-domain politeness: sustained requests per second per host "
+             "(enables the per-domain scheduler)"
+    )
+    
+    parser.add_argument(
+        "--domain-max-in-flight",
+        type=int,
+        default=None,
+        help="Per-domain politeness: concurrent requests per host "
+             "(enables the per-domain scheduler)"
+    )
+    
+    parser.add_argument(
+        "--max-attempts",
+        type=int,
+        default=DEFAULT_MAX_ATTEMPTS,
+        help="Fetch attempts per page: timeouts, 429 and 5xx responses are retried "
+             f"with exponential backoff (default: {DEFAULT_MAX_ATTEMPTS}, 1 = no retry)"
+    )
+    
+    parser.add_argument(
+        "--retry-base-delay",
+        type=float,
+        default=DEFAULT_BASE_DELAY_S,
+        help="Backoff before the first retry in seconds, doubled after each "
+             f"failed attempt, with jitter (default: {DEFAULT_BASE_DELAY_S:g})"
+    )
+    
+    parser.add_argument(
+        "--breaker-threshold",
+        type=int,
+        default=DEFAULT_FAILURE_THRESHOLD,
+        help="Consecutive transient failures that pause a host (circuit breaker) "
+             f"(default: {DEFAULT_FAILURE_THRESHOLD}, 0 = off)"
+    )
+    
+    parser.add_argument(
+        "--breaker-cooldown",
+        type=float,
+        default=DEFAULT_COOLDOWN_S,
+        help="Seconds a paused host waits before a probe request "
+             f"(default: {DEFAULT_COOLDOWN_S:g})"
+    )
+    
+    parser.add_argument(
+        "--cache-dir",
+        type=str,
+        default=DEFAULT_CACHE_DIR,
+        help=f"On-disk HTML cache directory (default: {DEFAULT_CACHE_DIR})"
+    )
+    
+    parser.add_argument(
+        "--cache-ttl",
+        type=float,
+        default=DEFAULT_TTL_S,
+        help="Seconds a cached page is reused before revalidation "
+             f"(default: {DEFAULT_TTL_S})"
+    )
+    
+    cache_mode = parser.add_mutually_exclusive_group()
+    cache_mode.add_argument(
+        "--no-cache",
+        action="store_true",
+        help="Disable the HTML cache (always download)"
+    )
+    cache_mode.add_argument(
+        "--offline",
+        action="store_true",
+        help="Serve pages from the HTML cache only; uncached pages fail"
+    )
+    
+    parser.add_argument(
+        "--html-backend",
+        choices=HTML_BACKENDS + ("auto",),
+        default=DEFAULT_HTML_BACKEND,
+        help="Parser for product pages: lxml and selectolax are faster optional "
+             "dependencies, auto picks the fastest installed "
+             f"(default: {DEFAULT_HTML_BACKEND})"
+    )
+    
+    archive_mode = parser.add_mutually_exclusive_group()
+    archive_mode.add_argument(
+        "--record",
+        metavar="DIR",
+        default=None,
+        help="Archive every fetched response to DIR (bypasses the HTML cache)"
+    )
+    archive_mode.add_argument(
+        "--replay",
+        metavar="DIR",
+        default=None,
+        help="Serve every fetch from the archive in DIR, fully offline"
+    )
+    
+    args = parser.parse_args(argv)
+    if args.upsert and args.key_index:
+        parser.error("--upsert cannot be combined with --key-index")
+    if args.max_depth < 0 or args.max_pages < 0:
+        parser.error("--max-depth and --max-pages must be >= 0")
+    if args.frontier and (args.resume or args.key_index):
+        parser.error("--frontier cannot be combined with --resume or --key-index")
+    if args.max_attempts < 1 or args.retry_base_delay < 0:
+        parser.error("--max-attempts must be >= 1 and --retry-base-delay >= 0")
+    if args.breaker_threshold < 0 or args.breaker_cooldown <= 0:
+        parser.error("--breaker-threshold must be >= 0 and --breaker-cooldown > 0")
+    return args
 
 
 def main(argv=None):
@@ -68,9 +336,72 @@ def main(argv=None):
     else:
         group_param = args.only
     
+    # Per-domain politeness scheduler (only when limits are requested)
+    scheduler = None
+    if args.domain_rate is not None or args.domain_max_in_flight is not None:
+        limits = {}
+        if args.domain_rate is not None:
+            limits["rate_per_sec"] = args.domain_rate
+        if args.domain_max_in_flight is not None:
+            limits["max_in_flight"] = args.domain_max_in_flight
+        scheduler = DomainScheduler(**limits)
+    
+    # Retries with backoff and per-domain circuit breaking of transient errors
+    retry = None
+    if args.max_attempts > 1:
+        retry = RetryPolicy(max_attempts=args.max_attempts, base_delay=args.retry_base_delay)
+    breaker = None
+    if args.breaker_threshold:
+        breaker = CircuitBreaker(failure_threshold=args.breaker_threshold,
+                                 cooldown_s=args.breaker_cooldown)
+    
+    # HTML parser backend of the product page parsers
+    try:
+        backend = set_html_backend(args.html_backend)
+    except ImportError as e:
+        print(f"[CLI] {e}")
+        sys.exit(2)
+    if backend != DEFAULT_HTML_BACKEND:
+        print(f"[CLI] HTML backend: {backend}")
+    
+    # Record/replay archive, or the on-disk HTML cache, used by fetch_html()
+    if args.record or args.replay:
+        disable_cache()
+        if args.replay:
+            archive = configure_archive(args.replay, REPLAY)
+            print(f"[CLI] Replaying {len(archive)} archived responses from {args.replay}")
+            # Disk reads: politeness limits and retries do not apply
+            scheduler = retry = breaker = None
+        else:
+            configure_archive(args.record, RECORD)
+            print(f"[CLI] Recording responses to {args.record}")
+    else:
+        disable_archive()
+        if args.no_cache:
+            disable_cache()
+        else:
+            configure_cache(args.cache_dir, ttl=args.cache_ttl, offline=args.offline)
+    
     # Call ingestion pipeline
     print(f"[CLI] Starting ingestion for: {args.only}")
-    ingest_all(group=group_param)
+    if args.frontier:
+        ingest_frontier(group=group_param, concurrency=args.concurrency,
+                        scheduler=scheduler, worker_id=args.worker_id,
+                        lease_size=args.lease_size, lease_s=args.lease_seconds,
+                        batch_size=args.batch_size, upsert=args.upsert,
+                        max_depth=args.max_depth, max_pages=args.max_pages,
+                        profile="shared" if args.shared_db else "bulk_load",
+                        retry=retry, breaker=breaker)
+        print(f"[CLI] Ingestion complete")
+        return
+    ingest_all(group=group_param, concurrency=args.concurrency,
+               ordered=not args.as_completed, scheduler=scheduler,
+               parse_workers=args.parse_workers, batch_size=args.batch_size,
+               commit_interval=args.commit_interval or None,
+               key_index=args.key_index, key_error_rate=args.key_error_rate,
+               upsert=args.upsert, resume=args.resume,
+               max_depth=args.max_depth, max_pages=args.max_pages,
+               retry=retry, breaker=breaker)
     print(f"[CLI] Ingestion complete")
 
 
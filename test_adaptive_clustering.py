@@ -0,0 +1,282 @@
+"""
+Test suite for the adaptive clustering methods (rotor_analysis/adaptive.py).
+Checks the grid DBSCAN against a brute-force DBSCAN (same core rotors, same
+core clusters, same noise, border rotors next to a core rotor of their
+cluster), mini-batch k-means on separated families, and run_clustering(method=...)
+JSON output. Skipped when numpy is not installed, except the option checks.
+"""
+
+import json
+import os
+import sqlite3
+import sys
+import tempfile
+sys.path.insert(0, '.')
+
+from rotor_analysis import columnar
+from rotor_analysis.clustering import run_clustering
+from rotor_analysis.columnar import columns_from_rotors, numpy_available
+
+print("="*60)
+print("ADAPTIVE CLUSTERING TESTS")
+print("="*60)
+
+
+def report(number: int, checks: list) -> tuple:
+    passed = sum(1 for check, _ in checks if check)
+    failed = len(checks) - passed
+    for check, message in checks:
+        status = "[PASS]" if check else "[FAIL]"
+        print(f"{status} {message}")
+    if failed == 0:
+        print(f"\n[PASS] Test {number} PASSED ({passed}/{passed} checks)")
+    else:
+        print(f"\n[FAIL] Test {number} FAILED ({passed}/{passed+failed} checks)")
+    return passed, failed
+
+
+def raises(error: type, function, *args, **kwargs) -> bool:
+    try:
+        function(*args, **kwargs)
+    except error:
+        return True
+    return False
+
+
+def brute_dbscan(points, eps: float, min_samples: int) -> tuple:
+    """O(n^2) DBSCAN: (core mask, core cluster per rotor (-1 if not core), neighbour matrix)."""
+    import numpy as np
+    near = ((points[:, None, :] - points[None, :, :]) ** 2).sum(2) <= eps * eps
+    core = near.sum(1) >= min_samples
+    labels = np.full(len(points), -1)
+    cluster = 0
+    for i in np.flatnonzero(core):
+        if labels[i] >= 0:
+            continue
+        labels[i] = cluster
+        stack = [i]
+        while stack:
+            for j in np.flatnonzero(near[stack.pop()] & core):
+                if labels[j] < 0:
+                    labels[j] = cluster
+                    stack.append(j)
+        cluster += 1
+    return core, labels, near
+
+
+def matches_brute(points, eps: float, min_samples: int) -> bool:
+    from rotor_analysis.adaptive import grid_dbscan
+    labels = grid_dbscan(points, eps, min_samples)
+    core, expected, near = brute_dbscan(points, eps, min_samples)
+    # Core clusters: a one-to-one relabelling
+    pairs = set(zip(expected[core].tolist(), labels[core].tolist()))
+    if len({a for a, _ in pairs}) != len(pairs) or len({b for _, b in pairs}) != len(pairs):
+        return False
+    # Border rotors: clustered iff a core rotor is within eps, with one of them
+    for i in (~core).nonzero()[0]:
+        neighbours = (near[i] & core).nonzero()[0]
+        if labels[i] == -1:
+            if neighbours.size:
+                return False
+        elif labels[i] not in labels[neighbours]:
+            return False
+    return True
+
+
+def rotor(ref: str, diameter: float, thickness: float, offset, brand: str = "A") -> dict:
+    return {"brand": brand, "catalog_ref": ref, "outer_diameter_mm": diameter,
+            "nominal_thickness_mm": thickness, "offset_mm": offset,
+            "hat_height_mm": 40.0, "overall_height_mm": 80.0}
+
+
+results_summary = []
+
+# ============================================================
+# Test 1: Methods and options
+# ============================================================
+print("\n[TEST 1] Method and option validation")
+print("-" * 60)
+
+checks1 = [
+    (raises(ValueError, run_clustering, "unused.db", method="hdbscan"), "Unknown method -> ValueError"),
+    (raises(ValueError, run_clustering, "unused.db", method="binning", options={"eps": 1}),
+     "Options with binning -> ValueError"),
+]
+if numpy_available():
+    from rotor_analysis.adaptive import METHOD_DEFAULTS, method_params
+    params1 = method_params("dbscan", {"eps": 0.8})
+    checks1 += [
+        (raises(ValueError, run_clustering, "unused.db", method="kmeans", options={"eps": 1}),
+         "Option of another method -> ValueError (before loading)"),
+        (params1 == {"eps": 0.8, "min_samples": METHOD_DEFAULTS["dbscan"]["min_samples"],
+                     "scales": (5.0, 0.5, 2.0)},
+         "Defaults merged, scales = bin steps"),
+    ]
+saved_np = columnar.np
+columnar.np = None
+checks1.append((raises(ImportError, run_clustering, "unused.db", method="dbscan"),
+                "dbscan without numpy -> ImportError"))
+columnar.np = saved_np
+results_summary.append(report(1, checks1))
+
+if not numpy_available():
+    print("\n[SKIP] numpy not installed: adaptive method tests skipped")
+else:
+    import numpy as np
+
+    from rotor_analysis import adaptive
+    from rotor_analysis.adaptive import (
+        build_clusters_dbscan,
+        build_clusters_kmeans,
+        grid_dbscan,
+        minibatch_kmeans,
+    )
+
+    # ============================================================
+    # Test 2: Grid DBSCAN == brute-force DBSCAN
+    # ============================================================
+    print("\n[TEST 2] grid_dbscan() against a brute-force DBSCAN")
+    print("-" * 60)
+
+    rng = np.random.default_rng(11)
+    cases2 = []
+    for case in range(40):
+        centers = rng.uniform(-10, 10, (int(rng.integers(1, 6)), 3))
+        points = centers[rng.integers(0, len(centers), int(rng.integers(1, 300)))]
+        # Rounded like catalog values: duplicates and points on cube faces
+        points = np.round(points + rng.normal(0, rng.uniform(0.2, 2.0), points.shape), 1)
+        cases2.append((points, float(rng.choice([0.3, 0.5, 1.0])), int(rng.integers(1, 6))))
+    agree2 = sum(matches_brute(*case) for case in cases2)
+    saved_block, saved_grid = adaptive.PAIR_BLOCK, adaptive.DENSE_GRID_CELLS
+    adaptive.PAIR_BLOCK, adaptive.DENSE_GRID_CELLS = 7, 0
+    small_blocks2 = all(matches_brute(*case) for case in cases2[:10])
+    adaptive.PAIR_BLOCK, adaptive.DENSE_GRID_CELLS = saved_block, saved_grid
+    line2 = np.column_stack((np.arange(0, 50, 0.4), np.zeros(125), np.zeros(125)))
+
+    checks2 = [
+        (agree2 == len(cases2), f"Same clustering on {agree2}/{len(cases2)} random sets"),
+        (small_blocks2, "Same with tiny pair blocks and a searched cube index"),
+        (len(set(grid_dbscan(line2, 0.5, 3).tolist())) == 1,
+         "A chain of rotors 0.4 apart is one cluster"),
+        ((grid_dbscan(np.array([[0.0, 0, 0], [5.0, 0, 0]]), 0.5, 2) == -1).all(),
+         "Isolated rotors are noise"),
+        (grid_dbscan(np.empty((0, 3))).size == 0, "No rotors"),
+        (raises(ValueError, grid_dbscan, line2, 0.0, 3), "eps <= 0 -> ValueError"),
+    ]
+    results_summary.append(report(2, checks2))
+
+    # ============================================================
+    # Test 3: DBSCAN clusters of rotors
+    # ============================================================
+    print("\n[TEST 3] build_clusters_dbscan() on rotor columns")
+    print("-" * 60)
+
+    rotors3 = [
+        # 282.4 / 282.6 mm straddle a 5 mm bin edge (282.5)
+        rotor("F1", 282.4, 22.0, 45.0), rotor("F2", 282.6, 22.0, 45.0),
+        rotor("F3", 283.0, 22.1, 45.5),
+        rotor("R1", 330.0, 28.0, 52.0, "B"), rotor("R2", 330.0, 28.0, 52.0, "B"),
+        rotor("R3", 331.0, 28.0, 52.0, "B"),
+        rotor("X1", 400.0, 36.0, 60.0),                       # Far from everything
+        rotor("I1", 300.0, None, 45.0),                       # Incomplete
+    ]
+    clusters3 = build_clusters_dbscan(columns_from_rotors(rotors3))
+    refs3 = [[m["catalog_ref"] for m in c["members"]] for c in clusters3.values()]
+
+    checks3 = [
+        (list(clusters3) == [0, 1], f"Two clusters numbered by first rotor ({list(clusters3)})"),
+        (refs3 == [["F1", "F2", "F3"], ["R1", "R2", "R3"]],
+         "Bin-edge rotors together, outlier and incomplete rotor left out"),
+        (clusters3[1]["centroid"]["outer_diameter_mm"] == (330.0 + 330.0 + 331.0) / 3,
+         "Centroid is the mean of the members"),
+        (clusters3[0]["members"][0] == {"brand": "A", "catalog_ref": "F1",
+                                        "outer_diameter_mm": 282.4, "nominal_thickness_mm": 22.0,
+                                        "offset_mm": 45.0},
+         "Members in the build_clusters() format"),
+        (len(build_clusters_dbscan(columns_from_rotors(rotors3), min_samples=4)) == 0,
+         "min_samples above the family sizes -> all noise"),
+        (build_clusters_dbscan(columns_from_rotors([])) == {}, "No rotors -> no clusters"),
+    ]
+    results_summary.append(report(3, checks3))
+
+    # ============================================================
+    # Test 4: Mini-batch k-means
+    # ============================================================
+    print("\n[TEST 4] minibatch_kmeans() / build_clusters_kmeans()")
+    print("-" * 60)
+
+    rng = np.random.default_rng(5)
+    centers4 = np.array([[56.0, 44.0, 22.0], [66.0, 56.0, 26.0], [72.0, 64.0, 30.0]])
+    points4 = np.concatenate([c + rng.normal(0, 0.3, (2000, 3)) for c in centers4])
+    labels4, found4 = minibatch_kmeans(points4, 3, batch_size=256, max_iter=100)
+    truth4 = np.repeat(np.arange(3), 2000)
+    pure4 = all(len(set(labels4[truth4 == k].tolist())) == 1 for k in range(3))
+    error4 = np.abs(np.sort(found4, axis=0) - np.sort(centers4, axis=0)).max()
+    rotors4 = [rotor(str(i), 300.0 + (i % 2) * 40, 28.0, 50.0) for i in range(10)]
+    clusters4 = build_clusters_kmeans(columns_from_rotors(rotors4), n_clusters=5)
+
+    checks4 = [
+        (pure4 and len(set(labels4.tolist())) == 3, "Separated families recovered"),
+        (error4 < 0.1, f"Centers within 0.1 of the family centers (max error {error4:.3f})"),
+        ((minibatch_kmeans(points4, 3, 256, 100)[0] == labels4).all(), "Deterministic for a seed"),
+        (len(clusters4) == 2 and sum(c["count"] for c in clusters4.values()) == 10,
+         "Fewer distinct rotors than n_clusters -> one cluster per value"),
+        (raises(ValueError, minibatch_kmeans, points4, 0), "n_clusters < 1 -> ValueError"),
+    ]
+    results_summary.append(report(4, checks4))
+
+    # ============================================================
+    # Test 5: run_clustering(method=...)
+    # ============================================================
+    print("\n[TEST 5] run_clustering(method=...) on a database")
+    print("-" * 60)
+
+    directory5 = tempfile.mkdtemp()
+    db5 = os.path.join(directory5, "rotors.db")
+    conn = sqlite3.connect(db5)
+    with open("database/init.sql", "r", encoding="utf-8") as f:
+        conn.executescript(f.read())
+    conn.executemany(
+        "INSERT INTO rotors (outer_diameter_mm, nominal_thickness_mm, hat_height_mm, "
+        "overall_height_mm, center_bore_mm, bolt_circle_mm, bolt_hole_count, ventilation_type, "
+        "directionality, offset_mm, brand, catalog_ref) "
+        "VALUES (?, ?, 40, 80, 66.6, 112, 5, 'vented', 'non_directional', ?, ?, ?)",
+        [(r["outer_diameter_mm"], r["nominal_thickness_mm"], r["offset_mm"], r["brand"],
+          r["catalog_ref"]) for r in rotors3 if r["nominal_thickness_mm"] is not None])
+    conn.commit()
+    conn.close()
+    outputs5 = {}
+    for method, options in (("dbscan", None), ("kmeans", {"n_clusters": 2})):
+        path = os.path.join(directory5, f"{method}.json")
+        run_clustering(db5, path, method=method, options=options)
+        with open(path, "r", encoding="utf-8") as f:
+            outputs5[method] = json.load(f)
+    for name in os.listdir(directory5):
+        os.remove(os.path.join(directory5, name))
+    os.rmdir(directory5)
+    dbscan5, kmeans5 = outputs5["dbscan"], outputs5["kmeans"]
+
+    checks5 = [
+        (dbscan5["meta"] == {"method": "dbscan", "eps": 0.5, "min_samples": 3,
+                             "scales": [5.0, 0.5, 2.0], "cluster_count": 2},
+         "DBSCAN parameters in meta"),
+        ([c["count"] for c in dbscan5["clusters"]] == [3, 3], "Noise rotor not written"),
+        (all("key" not in c and set(c) == {"cluster_id", "centroid", "count", "members"}
+             for c in dbscan5["clusters"]),
+         "Clusters without bin key"),
+        (kmeans5["meta"]["method"] == "kmeans" and kmeans5["meta"]["n_clusters"] == 2
+         and sum(c["count"] for c in kmeans5["clusters"]) == 7,
+         "k-means clusters every complete rotor"),
+    ]
+    results_summary.append(report(5, checks5))
+
+# ============================================================
+# Summary
+# ============================================================
+total_passed = sum(p for p, _ in results_summary)
+total_failed = sum(f for _, f in results_summary)
+
+print("\n" + "="*60)
+print("ALL TESTS COMPLETED")
+print(f"Total: {total_passed} PASSED, {total_failed} FAILED")
+print("="*60)
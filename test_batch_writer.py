@@ -0,0 +1,217 @@
+"""
+Test suite for batched inserts (database/batch_writer.py).
+Covers grouping per column signature, the commit interval, row-by-row
+fallback on a failing batch, dedup against queued rows and the batched
+ingest_jsonl() / staged writer.
+"""
+
+import json
+import os
+import sqlite3
+import sys
+import tempfile
+sys.path.insert(0, '.')
+
+from database import ingest_pipeline
+from database.batch_writer import BatchWriter, insert_sql
+from database.ingest_pipeline import ingest_jsonl, rotor_exists, write_parsed_page
+from database.ingest_stages import StagedIngest
+
+print("="*60)
+print("BATCHED INSERT TESTS")
+print("="*60)
+
+
+def report(number: int, checks: list) -> tuple:
+    passed = sum(1 for check, _ in checks if check)
+    failed = len(checks) - passed
+    for check, message in checks:
+        status = "[PASS]" if check else "[FAIL]"
+        print(f"{status} {message}")
+    if failed == 0:
+        print(f"\n[PASS] Test {number} PASSED ({passed}/{passed} checks)")
+    else:
+        print(f"\n[FAIL] Test {number} FAILED ({passed}/{passed+failed} checks)")
+    return passed, failed
+
+
+def new_db() -> str:
+    fd, path = tempfile.mkstemp(suffix=".db")
+    os.close(fd)
+    conn = sqlite3.connect(path)
+    with open("database/init.sql", "r", encoding="utf-8") as f:
+        conn.executescript(f.read())
+    conn.close()
+    return path
+
+
+def count(db_path: str, table: str) -> int:
+    conn = sqlite3.connect(db_path)
+    n = conn.execute(f"SELECT COUNT(*) FROM {table}").fetchone()[0]
+    conn.close()
+    return n
+
+
+def rotor(i: int, **extra) -> dict:
+    record = {
+        "outer_diameter_mm": 300.0 + i % 50, "nominal_thickness_mm": 28.0,
+        "hat_height_mm": 45.0, "overall_height_mm": 52.0, "center_bore_mm": 64.1,
+        "bolt_circle_mm": 114.3, "bolt_hole_count": 5, "ventilation_type": "vented",
+        "directionality": "non_directional", "brand": "DBA", "catalog_ref": f"DBA{i:05d}",
+    }
+    record.update(extra)
+    return record
+
+
+results_summary = []
+
+# ============================================================
+# Test 1: Grouping per column signature
+# ============================================================
+print("\n[TEST 1] Records grouped per table and column signature")
+print("-" * 60)
+
+db1 = new_db()
+conn1 = sqlite3.connect(db1)
+writer1 = BatchWriter(conn1, batch_size=4, commit_interval=None)
+for i in range(10):
+    writer1.add("rotors", rotor(i) if i % 2 else rotor(i, offset_mm=40.0))
+pending1 = writer1.pending_rows
+writer1.commit()
+offsets1 = conn1.execute("SELECT COUNT(*) FROM rotors WHERE offset_mm = 40.0").fetchone()[0]
+conn1.close()
+
+checks1 = [
+    (pending1 == 2, "Full groups written as they fill (8 of 10 rows written)"),
+    (count(db1, "rotors") == 10 and offsets1 == 5, "Both signatures written"),
+    (writer1.stats["batches"] == 4 and writer1.stats["rows"] == 10, "2 full + 2 partial batches"),
+    (insert_sql("rotors", ("brand", "catalog_ref")) is insert_sql("rotors", ("brand", "catalog_ref")),
+     "SQL string reused per signature"),
+]
+results_summary.append(report(1, checks1))
+
+# ============================================================
+# Test 2: Commit interval
+# ============================================================
+print("\n[TEST 2] Crash loses at most the open transaction")
+print("-" * 60)
+
+db2 = new_db()
+conn2 = sqlite3.connect(db2)
+writer2 = BatchWriter(conn2, batch_size=5, commit_interval=10)
+for i in range(23):
+    writer2.add("rotors", rotor(i))
+committed2 = count(db2, "rotors")
+writer2.rollback()   # "crash": pending and uncommitted rows are lost
+conn2.close()
+
+checks2 = [
+    (committed2 == 20, f"20 of 23 rows committed before the crash ({committed2})"),
+    (count(db2, "rotors") == 20 and writer2.stats["commits"] == 2, "Committed rows survive the rollback"),
+]
+results_summary.append(report(2, checks2))
+
+# ============================================================
+# Test 3: Failing row in a batch
+# ============================================================
+print("\n[TEST 3] Failing batch retried row by row")
+print("-" * 60)
+
+db3 = new_db()
+conn3 = sqlite3.connect(db3)
+writer3 = BatchWriter(conn3, batch_size=10, commit_interval=None)
+for i in range(10):
+    writer3.add("rotors", rotor(i, brand=None) if i == 6 else rotor(i))
+writer3.commit()
+conn3.close()
+
+checks3 = [
+    (count(db3, "rotors") == 9, "9 valid rows kept"),
+    (writer3.stats["failed"] == 1 and writer3.stats["rows"] == 9, "NOT NULL violation counted"),
+]
+results_summary.append(report(3, checks3))
+
+# ============================================================
+# Test 4: Dedup of queued and written rows
+# ============================================================
+print("\n[TEST 4] *_exists() and write_parsed_page() with a BatchWriter")
+print("-" * 60)
+
+db4 = new_db()
+conn4 = sqlite3.connect(db4)
+writer4 = BatchWriter(conn4, batch_size=100)
+writer4.add("rotors", rotor(1))
+queued4 = rotor_exists(writer4, rotor(1)) and not rotor_exists(writer4, rotor(2))
+parsed4 = {"kind": "rotor_list", "extracted": 3, "log": [], "error": None,
+           "records": [(1, rotor(2)), (2, rotor(2)), (3, rotor(1))]}
+inserted4 = write_parsed_page(writer4, parsed4, "http://autodoc.test/list")
+writer4.commit()
+flushed4 = rotor_exists(writer4, rotor(1))
+conn4.close()
+
+checks4 = [
+    (queued4, "Queued rows flushed before the lookup"),
+    (inserted4 == 1 and count(db4, "rotors") == 2, "Duplicates within and across pages skipped"),
+    (flushed4, "Written row found in the database"),
+]
+results_summary.append(report(4, checks4))
+
+# ============================================================
+# Test 5: ingest_jsonl() and the staged writer
+# ============================================================
+print("\n[TEST 5] Batched ingest_jsonl() and StagedIngest")
+print("-" * 60)
+
+db5 = new_db()
+fd, jsonl5 = tempfile.mkstemp(suffix=".jsonl")
+with os.fdopen(fd, "w", encoding="utf-8") as f:
+    for i in range(1200):
+        f.write(json.dumps(rotor(i)) + "\n")
+saved_db_path = ingest_pipeline.DB_PATH
+ingest_pipeline.DB_PATH = db5
+try:
+    ingest_jsonl(jsonl5, "rotors", batch_size=100, commit_interval=500)
+finally:
+    ingest_pipeline.DB_PATH = saved_db_path
+
+
+def failing_write(writer, parsed, url):
+    page = int(url.rsplit("/", 1)[1])
+    if page == 3:
+        raise sqlite3.OperationalError("disk I/O error")
+    for j in range(10):
+        writer.add("rotors", rotor(page * 10 + j))
+    return 10
+
+
+db5b = new_db()
+seeds5 = [("autodoc", f"http://autodoc.test/{i}", "", "list") for i in range(5)]
+try:
+    with StagedIngest(db5b, failing_write, parse_workers=0, batch_size=10,
+                      commit_interval=10) as stages5:
+        stages5.run("rotors", seeds5, [(i, s[1], "<html></html>", None) for i, s in enumerate(seeds5)])
+    error5 = None
+except sqlite3.OperationalError as e:
+    error5 = e
+
+checks5 = [
+    (count(db5, "rotors") == 1200, "1200 JSONL rows loaded"),
+    (error5 is not None, "Writer error raised"),
+    (count(db5b, "rotors") == 30, "Pages committed before the failure kept"),
+]
+results_summary.append(report(5, checks5))
+
+os.remove(jsonl5)
+for path in (db1, db2, db3, db4, db5, db5b):
+    os.remove(path)
+
+# ============================================================
+# Summary
+# ============================================================
+total_passed = sum(p for p, _ in results_summary)
+total_failed = sum(f for _, f in results_summary)
+
+print("\n" + "="*60)
+print("ALL TESTS COMPLETED")
+print(f"Total: {total_passed} PASSED, {total_failed} FAILED")
+print("="*60)
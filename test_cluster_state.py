@@ -0,0 +1,409 @@
+"""
+Test suite for the persisted rotor cluster state (database/cluster_state.py).
+Covers the SQL binning against Python's round(), the triggers following
+BatchWriter inserts, upserts and deletes, migration 6 and other bin steps,
+export_cluster_summary() matching run_clustering(), and the triggers
+suspended during ingest_jsonl() bulk loads.
+"""
+
+import json
+import math
+import os
+import random
+import re
+import sqlite3
+import sys
+import tempfile
+sys.path.insert(0, '.')
+
+from database import ingest_pipeline
+from database.batch_writer import BatchWriter
+from database.cluster_state import (
+    TRIGGERS,
+    cluster_state_steps,
+    install_cluster_state,
+    key_select_sql,
+    load_cluster_state,
+    suspend_cluster_state,
+    trigger_sql,
+)
+from database.migrations import SCHEMA_VERSION, migrate, schema_version
+from rotor_analysis.clustering import (
+    bin_value,
+    build_clusters,
+    export_cluster_summary,
+    run_clustering,
+)
+
+print("="*60)
+print("ROTOR CLUSTER STATE TESTS")
+print("="*60)
+
+
+def report(number: int, checks: list) -> tuple:
+    passed = sum(1 for check, _ in checks if check)
+    failed = len(checks) - passed
+    for check, message in checks:
+        status = "[PASS]" if check else "[FAIL]"
+        print(f"{status} {message}")
+    if failed == 0:
+        print(f"\n[PASS] Test {number} PASSED ({passed}/{passed} checks)")
+    else:
+        print(f"\n[FAIL] Test {number} FAILED ({passed}/{passed+failed} checks)")
+    return passed, failed
+
+
+def create_test_db(sql_filter=None) -> sqlite3.Connection:
+    conn = sqlite3.connect(":memory:")
+    with open("database/init.sql", "r", encoding="utf-8") as f:
+        sql = f.read()
+    conn.executescript(sql_filter(sql) if sql_filter else sql)
+    return conn
+
+
+def rotor(i: int, rnd: random.Random, **extra) -> dict:
+    hat = round(rnd.uniform(5.0, 60.0), 1)
+    record = {
+        # Half-bin values (282.5 / 5.0 = 56.5) round half to even
+        "outer_diameter_mm": rnd.choice([282.5, 287.5, round(rnd.uniform(250.0, 380.0), 1)]),
+        "nominal_thickness_mm": rnd.choice([22.25, round(rnd.uniform(18.0, 34.0), 2)]),
+        "hat_height_mm": hat, "overall_height_mm": round(hat + rnd.uniform(-8.0, 12.0), 1),
+        "center_bore_mm": 64.1, "bolt_circle_mm": 114.3, "bolt_hole_count": 5,
+        "ventilation_type": "vented", "directionality": "non_directional",
+        "brand": f"BRAND{i % 4}", "catalog_ref": f"REF{i:05d}",
+    }
+    if i % 3 == 0:
+        record["offset_mm"] = round(rnd.uniform(-3.0, 60.0), 1)
+    record.update(extra)
+    return record
+
+
+def rotors_of(conn) -> list:
+    names = ("outer_diameter_mm", "nominal_thickness_mm", "offset_mm", "overall_height_mm",
+             "hat_height_mm")
+    return [dict(zip(names, row)) for row in
+            conn.execute(f"SELECT {', '.join(names)} FROM rotors ORDER BY id")]
+
+
+def summary_of(clusters: dict) -> dict:
+    return {key: (c["count"], c["centroid"]) for key, c in clusters.items()}
+
+
+def close(a: dict, b: dict) -> bool:
+    """Same keys and counts, centroids equal to rounding."""
+    return a.keys() == b.keys() and all(
+        a[k][0] == b[k][0] and all(math.isclose(a[k][1][f], b[k][1][f], rel_tol=1e-12, abs_tol=1e-9)
+                                   for f in a[k][1]) for k in a)
+
+
+def normalized(sql: str) -> str:
+    return re.sub(r"\s+", " ", sql).strip()
+
+
+results_summary = []
+
+# ============================================================
+# Test 1: SQL binning == bin_value()
+# ============================================================
+print("\n[TEST 1] Bin indices in SQL - round half to even")
+print("-" * 60)
+
+values1 = [282.5, 287.5, 22.25, 22.75, -3.0, -5.0, -1.0, 1.0, 0.0, -0.0, 0.4, -0.4,
+           0.49999999999999994, 2.5000000000000004, 1e-300, 1234.5678]
+rnd1 = random.Random(1)
+values1 += [round(rnd1.uniform(-100, 400), rnd1.choice([1, 2, 3])) for _ in range(3000)]
+conn1 = sqlite3.connect(":memory:")
+conn1.execute("CREATE TABLE v (x REAL)")
+conn1.executemany("INSERT INTO v VALUES (?)", [(x,) for x in values1])
+mismatches1 = []
+for step in (5.0, 0.5, 2.0, 0.1):
+    sql = key_select_sql(f"(SELECT x AS d, x AS t, x AS o FROM v)", (step, step, step))
+    for (index, _, _, d, _, _) in conn1.execute(sql):
+        if index * step != bin_value(d, step) or round(d / step) != index:
+            mismatches1.append((d, step, index))
+null1 = conn1.execute(key_select_sql("(SELECT NULL AS d, 1.0 AS t, 1.0 AS o)",
+                                     (5.0, 0.5, 2.0))).fetchall()
+
+checks1 = [
+    (not mismatches1, f"{len(values1)} values x 4 steps binned as round() ({mismatches1[:3]})"),
+    (null1 == [], "Incomplete key -> no row"),
+]
+results_summary.append(report(1, checks1))
+
+# ============================================================
+# Test 2: Inserts maintain the state
+# ============================================================
+print("\n[TEST 2] BatchWriter inserts -> state == build_clusters()")
+print("-" * 60)
+
+conn2 = create_test_db()
+rnd2 = random.Random(2)
+writer2 = BatchWriter(conn2, batch_size=97)
+for i in range(2000):
+    writer2.add("rotors", rotor(i, rnd2))
+writer2.commit()
+duplicates2 = writer2.write("rotors", [rotor(5, random.Random(99))])
+expected2 = build_clusters(rotors_of(conn2))
+state2 = load_cluster_state(conn2)
+triggers2 = [normalized(row[0]) for row in conn2.execute(
+    "SELECT sql FROM sqlite_master WHERE type = 'trigger' ORDER BY name")]
+
+checks2 = [
+    (summary_of(state2) == summary_of(dict(sorted(expected2.items()))),
+     f"Same keys, counts and centroids, bit for bit ({len(state2)} clusters)"),
+    (duplicates2 == (0, 1) and sum(c["count"] for c in state2.values()) == 2000,
+     "Skipped duplicates not counted"),
+    (list(state2) == sorted(state2), "Clusters ordered by key"),
+    (sorted(triggers2) == sorted(normalized(sql) for sql in trigger_sql((5.0, 0.5, 2.0))),
+     "init.sql triggers are trigger_sql() of the clustering steps"),
+]
+results_summary.append(report(2, checks2))
+
+# ============================================================
+# Test 3: Upserts, updates and deletes
+# ============================================================
+print("\n[TEST 3] Changed rows move between clusters, deletes empty them")
+print("-" * 60)
+
+upsert3 = BatchWriter(conn2, upsert=True)
+rnd3 = random.Random(3)
+# 300 rotors re-scraped with new geometry
+changed3 = [rotor(i, rnd3) for i in range(300)]
+upsert3.write("rotors", changed3)
+before_touch3 = summary_of(load_cluster_state(conn2))
+# Non-geometry update: trigger not fired
+conn2.execute("UPDATE rotors SET bolt_hole_count = 6 WHERE id <= 500")
+untouched3 = summary_of(load_cluster_state(conn2)) == before_touch3
+conn2.execute("UPDATE rotors SET offset_mm = NULL WHERE id BETWEEN 600 AND 700")
+conn2.execute("DELETE FROM rotors WHERE brand = 'BRAND1'")
+conn2.commit()
+state3 = summary_of(load_cluster_state(conn2))
+expected3 = summary_of(dict(sorted(build_clusters(rotors_of(conn2)).items())))
+fresh3 = create_test_db()
+install_cluster_state(fresh3)
+conn2.execute("DELETE FROM rotors")
+empty3 = conn2.execute("SELECT COUNT(*) FROM rotor_cluster_state").fetchone()[0]
+
+checks3 = [
+    (upsert3.stats["updated"] == 300 and before_touch3 != summary_of(state2),
+     "Upserted geometry moved rotors between clusters"),
+    (untouched3, "Non-geometry update leaves the state alone"),
+    (close(state3, expected3), f"State == build_clusters() after upserts, updates and deletes "
+                               f"({len(state3)} clusters)"),
+    (all(count > 0 for count, _ in state3.values()), "Emptied clusters dropped"),
+    (empty3 == 0 and load_cluster_state(fresh3) == {}, "Empty table -> empty state"),
+]
+results_summary.append(report(3, checks3))
+
+# ============================================================
+# Test 4: Migration 6 and other bin steps
+# ============================================================
+print("\n[TEST 4] migrate() builds the state; install_cluster_state(steps)")
+print("-" * 60)
+
+
+def legacy_schema(sql: str) -> str:
+    # Schema version 5: no cluster state, no triggers
+    sql = sql[:sql.index("-- ------------------------------------------------------------\n"
+                         "--  Rotor cluster state")]
+    return sql + "PRAGMA user_version = 5;"
+
+
+conn4 = create_test_db(legacy_schema)
+rnd4 = random.Random(4)
+BatchWriter(conn4).write("rotors", [rotor(i, rnd4) for i in range(800)])
+conn4.commit()
+applied4 = migrate(conn4, verbose=False)
+migrated4 = summary_of(load_cluster_state(conn4))
+expected4 = summary_of(dict(sorted(build_clusters(rotors_of(conn4)).items())))
+coarse4 = install_cluster_state(conn4, (10.0, 1.0, 5.0))
+try:
+    load_cluster_state(conn4)
+    mismatch4 = False
+except ValueError:
+    mismatch4 = True
+BatchWriter(conn4).write("rotors", [rotor(i, rnd4) for i in range(800, 900)])
+coarse_state4 = load_cluster_state(conn4, (10.0, 1.0, 5.0))
+import rotor_analysis.clustering as clustering
+saved4 = (clustering.DIAM_BIN_STEP_MM, clustering.THICK_BIN_STEP_MM, clustering.OFFSET_BIN_STEP_MM)
+clustering.DIAM_BIN_STEP_MM, clustering.THICK_BIN_STEP_MM, clustering.OFFSET_BIN_STEP_MM = 10.0, 1.0, 5.0
+coarse_expected4 = summary_of(dict(sorted(build_clusters(rotors_of(conn4)).items())))
+clustering.DIAM_BIN_STEP_MM, clustering.THICK_BIN_STEP_MM, clustering.OFFSET_BIN_STEP_MM = saved4
+# init.sql run again over the populated database: fresh state, triggers kept
+with open("database/init.sql", "r", encoding="utf-8") as f:
+    conn4.executescript(f.read())
+BatchWriter(conn4).write("rotors", [rotor(i, rnd4) for i in range(50)])
+reinit4 = summary_of(load_cluster_state(conn4))
+
+checks4 = [
+    (applied4[6] == {"rotor_cluster_state": len(expected4)}
+     and schema_version(conn4) == SCHEMA_VERSION, f"Migration 6 applied: {applied4}"),
+    (close(migrated4, expected4), "State built from the existing rotors"),
+    (mismatch4, "Reading with other steps than the stored ones -> ValueError"),
+    (coarse4 < len(expected4) and close(summary_of(coarse_state4), coarse_expected4),
+     f"Rebuilt for coarser steps, triggers follow ({coarse4} -> {len(coarse_state4)} clusters)"),
+    (migrate(conn4, verbose=False) == {}, "Up-to-date database untouched"),
+    (close(reinit4, summary_of(dict(sorted(build_clusters(rotors_of(conn4)).items()))))
+     and sum(count for count, _ in reinit4.values()) == 50,
+     "init.sql re-run: state recreated, triggers follow new rotors"),
+]
+results_summary.append(report(4, checks4))
+
+# ============================================================
+# Test 5: Summary export
+# ============================================================
+print("\n[TEST 5] export_cluster_summary() vs run_clustering()")
+print("-" * 60)
+
+directory5 = tempfile.mkdtemp()
+db5 = os.path.join(directory5, "rotors.db")
+conn5 = sqlite3.connect(db5)
+with open("database/init.sql", "r", encoding="utf-8") as f:
+    conn5.executescript(f.read())
+rnd5 = random.Random(5)
+BatchWriter(conn5).write("rotors", [rotor(i, rnd5) for i in range(1500)])
+conn5.commit()
+conn5.close()
+summary5 = export_cluster_summary(db5, os.path.join(directory5, "summary.json"))
+run_clustering(db5, os.path.join(directory5, "full.json"), engine="python")
+with open(os.path.join(directory5, "full.json"), "r", encoding="utf-8") as f:
+    full5 = json.load(f)
+with open(os.path.join(directory5, "summary.json"), "r", encoding="utf-8") as f:
+    written5 = json.load(f)
+for name in os.listdir(directory5):
+    os.remove(os.path.join(directory5, name))
+os.rmdir(directory5)
+
+
+def by_key(data: dict) -> dict:
+    return {tuple(c["key"].values()): (c["count"], c["centroid"]) for c in data["clusters"]}
+
+
+checks5 = [
+    (written5 == summary5 and summary5["meta"] == full5["meta"], "Same meta as run_clustering()"),
+    (by_key(summary5) == by_key(full5), "Same keys, counts and centroids"),
+    (all("members" not in c for c in summary5["clusters"]), "No members in the summary"),
+]
+results_summary.append(report(5, checks5))
+
+# ============================================================
+# Test 6: Triggers suspended during bulk loads
+# ============================================================
+print("\n[TEST 6] suspend_cluster_state() / ingest_jsonl() rebuild")
+print("-" * 60)
+
+
+def triggers_of(conn) -> list:
+    return sorted(row[0] for row in conn.execute(
+        "SELECT name FROM sqlite_master WHERE type = 'trigger'"))
+
+
+conn6 = create_test_db()
+rnd6 = random.Random(6)
+BatchWriter(conn6).write("rotors", [rotor(i, rnd6) for i in range(300)])
+steps6 = suspend_cluster_state(conn6)
+BatchWriter(conn6).write("rotors", [rotor(i, rnd6) for i in range(300, 400)])
+suspended6 = (triggers_of(conn6), cluster_state_steps(conn6),
+              conn6.execute("SELECT COUNT(*) FROM rotor_cluster_state").fetchone()[0])
+try:
+    load_cluster_state(conn6)
+    missing6 = False
+except ValueError:
+    missing6 = True
+install_cluster_state(conn6, steps6)
+resumed6 = summary_of(load_cluster_state(conn6))
+expected6 = summary_of(dict(sorted(build_clusters(rotors_of(conn6)).items())))
+conn6.close()
+
+directory6 = tempfile.mkdtemp()
+db6 = os.path.join(directory6, "rotors.db")
+conn6 = sqlite3.connect(db6)
+with open("database/init.sql", "r", encoding="utf-8") as f:
+    conn6.executescript(f.read())
+BatchWriter(conn6).write("rotors", [rotor(i, rnd6) for i in range(200)])
+conn6.commit()
+conn6.close()
+jsonl6 = os.path.join(directory6, "rotors.jsonl")
+with open(jsonl6, "w", encoding="utf-8") as f:
+    for i in range(200, 700):
+        f.write(json.dumps(rotor(i, rnd6)) + "\n")
+ingest6 = ingest_pipeline.ingest_jsonl(jsonl6, "rotors", db_path=db6, validate=False)
+conn6 = sqlite3.connect(db6)
+loaded6 = summary_of(load_cluster_state(conn6))
+loaded_expected6 = summary_of(dict(sorted(build_clusters(rotors_of(conn6)).items())))
+triggers6 = triggers_of(conn6)
+conn6.close()
+with open(jsonl6, "w", encoding="utf-8") as f:
+    for i in range(700, 750):
+        f.write(json.dumps(rotor(i, rnd6)) + "\n")
+ingest_pipeline.ingest_jsonl(jsonl6, "rotors", db_path=db6, validate=False,
+                             defer_cluster_state=False)
+conn6 = sqlite3.connect(db6)
+kept6 = summary_of(load_cluster_state(conn6))
+kept_expected6 = summary_of(dict(sorted(build_clusters(rotors_of(conn6)).items())))
+conn6.close()
+
+
+def interrupted_load(first: int, stop_after: int, commit_interval: int) -> tuple:
+    """ingest_jsonl() interrupted (Ctrl-C) after stop_after records, then
+    100 rotors written by BatchWriter: (triggers, state count, rotors, state
+    vs build_clusters())."""
+    def records(*args, **kwargs):
+        for i in range(first, first + stop_after):
+            yield i, rotor(i, rnd6), None
+        raise KeyboardInterrupt
+
+    saved = ingest_pipeline.read_records
+    ingest_pipeline.read_records = records
+    try:
+        ingest_pipeline.ingest_jsonl(jsonl6, "rotors", db_path=db6, batch_size=4,
+                                     commit_interval=commit_interval)
+        interrupted = False
+    except KeyboardInterrupt:
+        interrupted = True
+    finally:
+        ingest_pipeline.read_records = saved
+    conn = sqlite3.connect(db6)
+    BatchWriter(conn).write("rotors", [rotor(i, rnd6) for i in range(first + 1000, first + 1100)])
+    conn.commit()
+    state = summary_of(load_cluster_state(conn))
+    expected = summary_of(dict(sorted(build_clusters(rotors_of(conn)).items())))
+    result = (interrupted and triggers_of(conn) == sorted(TRIGGERS),
+              sum(count for count, _ in state.values()),
+              conn.execute("SELECT COUNT(*) FROM rotors").fetchone()[0], close(state, expected))
+    conn.close()
+    return result
+
+
+before_commit6 = interrupted_load(2000, 10, commit_interval=None)
+after_commit6 = interrupted_load(5000, 30, commit_interval=8)
+for name in os.listdir(directory6):
+    os.remove(os.path.join(directory6, name))
+os.rmdir(directory6)
+
+checks6 = [
+    (suspended6 == ([], None, 0) and missing6,
+     "Suspended: no triggers, state reported missing rather than stale"),
+    (close(resumed6, expected6), "install_cluster_state() rebuilds it, rows written meanwhile included"),
+    (ingest6["rows"] == 500 and close(loaded6, loaded_expected6)
+     and sum(count for count, _ in loaded6.values()) == 700,
+     "ingest_jsonl(): state rebuilt after the load"),
+    (triggers6 == sorted(TRIGGERS), "Triggers back after the load"),
+    (close(kept6, kept_expected6), "defer_cluster_state=False: triggers kept during the load"),
+    (before_commit6 == (True, 850, 850, True),
+     f"Interrupted before the first commit: triggers and state restored {before_commit6}"),
+    (after_commit6[0] and after_commit6[3] and 950 < after_commit6[1] == after_commit6[2] < 980,
+     f"Interrupted after a commit: committed rows in the rebuilt state {after_commit6}"),
+]
+results_summary.append(report(6, checks6))
+
+# ============================================================
+# Summary
+# ============================================================
+total_passed = sum(p for p, _ in results_summary)
+total_failed = sum(f for _, f in results_summary)
+
+print("\n" + "="*60)
+print("ALL TESTS COMPLETED")
+print(f"Total: {total_passed} PASSED, {total_failed} FAILED")
+print("="*60)
@@ -0,0 +1,194 @@
+"""
+Test suite for the bin step sweep (rotor_analysis/sweep.py). Checks the
+step grid and CLI parsing, that each setting's statistics match the
+clusters of build_clusters_columnar() with the same steps, and that
+sweep_bin_steps() gives the same table with and without worker processes,
+releasing its shared memory block. Skipped when numpy is not installed,
+except the grid checks.
+"""
+
+import contextlib
+import io
+import os
+import random
+import sqlite3
+import sys
+import tempfile
+sys.path.insert(0, '.')
+
+from rotor_analysis.columnar import numpy_available
+from rotor_analysis.sweep import (
+    MASTER_FAMILIES,
+    SWEEP_DIAM_STEPS_MM,
+    SWEEP_OFFSET_STEPS_MM,
+    SWEEP_THICK_STEPS_MM,
+    parse_args,
+    step_grid,
+)
+
+print("="*60)
+print("CLUSTER BIN STEP SWEEP TESTS")
+print("="*60)
+
+
+def report(number: int, checks: list) -> tuple:
+    passed = sum(1 for check, _ in checks if check)
+    failed = len(checks) - passed
+    for check, message in checks:
+        status = "[PASS]" if check else "[FAIL]"
+        print(f"{status} {message}")
+    if failed == 0:
+        print(f"\n[PASS] Test {number} PASSED ({passed}/{passed} checks)")
+    else:
+        print(f"\n[FAIL] Test {number} FAILED ({passed}/{passed+failed} checks)")
+    return passed, failed
+
+
+def raises(error: type, function, *args, **kwargs) -> bool:
+    try:
+        function(*args, **kwargs)
+    except error:
+        return True
+    return False
+
+
+def random_rotors(count: int, seed: int) -> list:
+    rnd = random.Random(seed)
+    rotors = []
+    for i in range(count):
+        hat = round(rnd.uniform(5.0, 60.0), 1)
+        rotors.append({
+            "brand": f"BRAND{i % 4}",
+            "catalog_ref": f"REF{i:05d}",
+            "outer_diameter_mm": rnd.choice([282.5, round(rnd.uniform(250.0, 380.0), 1)]),
+            "nominal_thickness_mm": round(rnd.uniform(18.0, 34.0), 1),
+            "hat_height_mm": hat,
+            "overall_height_mm": round(hat + rnd.uniform(-8.0, 12.0), 1),
+            "offset_mm": round(rnd.uniform(-3.0, 60.0), 1) if i % 3 == 0 else None,
+        })
+    return rotors
+
+
+results_summary = []
+
+# ============================================================
+# Test 1: Step grid and arguments
+# ============================================================
+print("\n[TEST 1] step_grid() / parse_args()")
+print("-" * 60)
+
+grid1 = step_grid((5, 10), (0.5,), (2, 4))
+args1 = parse_args(["--diam", "5,7.5", "--thick", "1", "--workers", "0", "--db", "x.db"])
+defaults1 = parse_args([])
+
+checks1 = [
+    (grid1 == [(5.0, 0.5, 2.0), (5.0, 0.5, 4.0), (10.0, 0.5, 2.0), (10.0, 0.5, 4.0)],
+     "Every combination, diameter outermost"),
+    (len(step_grid()) == len(SWEEP_DIAM_STEPS_MM) * len(SWEEP_THICK_STEPS_MM)
+     * len(SWEEP_OFFSET_STEPS_MM), f"Default grid ({len(step_grid())} settings)"),
+    (raises(ValueError, step_grid, (5,), (), (2,)), "Empty step list -> ValueError"),
+    (raises(ValueError, step_grid, (5,), (0.0,), (2,)), "Step <= 0 -> ValueError"),
+    (args1.diam == [5.0, 7.5] and args1.thick == [1.0] and args1.workers == 0
+     and args1.db == "x.db", "Comma-separated steps parsed"),
+    (defaults1.offset == list(SWEEP_OFFSET_STEPS_MM) and defaults1.workers is None,
+     "Defaults"),
+]
+results_summary.append(report(1, checks1))
+
+if not numpy_available():
+    print("\n[SKIP] numpy not installed: sweep tests skipped")
+else:
+    import numpy as np
+
+    from rotor_analysis.columnar import build_clusters_columnar, columns_from_rotors, complete_rows
+    from rotor_analysis.sweep import evaluate_steps, format_sweep_table, main, sweep_bin_steps
+
+    # ============================================================
+    # Test 2: Statistics == build_clusters_columnar()
+    # ============================================================
+    print("\n[TEST 2] evaluate_steps() against build_clusters_columnar()")
+    print("-" * 60)
+
+    rotors2 = random_rotors(2000, seed=9)
+    rotors2[5]["hat_height_mm"] = None      # Incomplete
+    columns2 = columns_from_rotors(rotors2)
+    _, diameter2, thickness2, offset2 = complete_rows(columns2)
+    geometry2 = np.vstack((diameter2, thickness2, offset2))
+    agree2 = []
+    for steps in step_grid((2.5, 5.0, 20.0), (0.5, 2.0), (2.0, 10.0)):
+        counts = sorted((c["count"] for c in build_clusters_columnar(columns2, steps).values()),
+                        reverse=True)
+        result = evaluate_steps(geometry2, steps, skipped=1)
+        agree2.append(result == {"steps": steps, "cluster_count": len(counts),
+                                 "largest": counts[0], "skipped": 1,
+                                 "top_coverage": sum(counts[:MASTER_FAMILIES]) / sum(counts)})
+    empty2 = evaluate_steps(np.empty((3, 0)), (5.0, 0.5, 2.0), skipped=3)
+
+    checks2 = [
+        (all(agree2), f"Same cluster count, largest and coverage ({sum(agree2)}/{len(agree2)})"),
+        (empty2 == {"steps": (5.0, 0.5, 2.0), "cluster_count": 0, "largest": 0,
+                    "top_coverage": 0.0, "skipped": 3}, "No complete rotors"),
+    ]
+    results_summary.append(report(2, checks2))
+
+    # ============================================================
+    # Test 3: sweep_bin_steps() on a database
+    # ============================================================
+    print("\n[TEST 3] sweep_bin_steps() with and without workers")
+    print("-" * 60)
+
+    directory3 = tempfile.mkdtemp()
+    db3 = os.path.join(directory3, "rotors.db")
+    conn = sqlite3.connect(db3)
+    with open("database/init.sql", "r", encoding="utf-8") as f:
+        conn.executescript(f.read())
+    rotors3 = random_rotors(1500, seed=4)
+    conn.executemany(
+        "INSERT INTO rotors (outer_diameter_mm, nominal_thickness_mm, hat_height_mm, "
+        "overall_height_mm, center_bore_mm, bolt_circle_mm, bolt_hole_count, ventilation_type, "
+        "directionality, offset_mm, brand, catalog_ref) "
+        "VALUES (?, ?, ?, ?, 66.6, 112, 5, 'vented', 'non_directional', ?, ?, ?)",
+        [(r["outer_diameter_mm"], r["nominal_thickness_mm"], r["hat_height_mm"],
+          r["overall_height_mm"], r["offset_mm"], r["brand"], r["catalog_ref"]) for r in rotors3])
+    conn.commit()
+    conn.close()
+    grid3 = step_grid((5.0, 10.0), (0.5, 1.0), (2.0, 5.0))
+    shm_before3 = set(os.listdir("/dev/shm")) if os.path.isdir("/dev/shm") else set()
+    serial3 = sweep_bin_steps(db3, grid3, workers=0)
+    pooled3 = sweep_bin_steps(db3, grid3, workers=2)
+    shm_after3 = set(os.listdir("/dev/shm")) if os.path.isdir("/dev/shm") else set()
+    brand3 = sweep_bin_steps(db3, grid3[:1], workers=0, brands=["BRAND1"])
+    expected3 = evaluate_steps(np.vstack(complete_rows(columns_from_rotors(rotors3))[1:]),
+                               grid3[0])
+    output3 = io.StringIO()
+    with contextlib.redirect_stdout(output3):
+        main(["--db", db3, "--diam", "5,10", "--thick", "0.5", "--offset", "2",
+              "--workers", "0"])
+    table3 = output3.getvalue().splitlines()
+    for name in os.listdir(directory3):
+        os.remove(os.path.join(directory3, name))
+    os.rmdir(directory3)
+
+    checks3 = [
+        (pooled3 == serial3, "Pool and serial sweeps agree"),
+        ([r["steps"] for r in pooled3] == grid3, "Results in grid order"),
+        (serial3[0] == expected3, "Same statistics as the in-memory rotors"),
+        (sum(r["cluster_count"] for r in brand3) < serial3[0]["cluster_count"]
+         and brand3[0]["largest"] <= serial3[0]["largest"], "Loader filters applied"),
+        (shm_after3 == shm_before3, "Shared memory block released"),
+        (len(table3) == 4 and table3[1].split()[:3] == ["Diam", "mm", "Thick"],
+         "CLI prints a header and one line per setting"),
+        (format_sweep_table(serial3).count("\n") == len(grid3), "Table of the whole grid"),
+    ]
+    results_summary.append(report(3, checks3))
+
+# ============================================================
+# Summary
+# ============================================================
+total_passed = sum(p for p, _ in results_summary)
+total_failed = sum(f for _, f in results_summary)
+
+print("\n" + "="*60)
+print("ALL TESTS COMPLETED")
+print(f"Total: {total_passed} PASSED, {total_failed} FAILED")
+print("="*60)
@@ -0,0 +1,205 @@
+"""
+Test suite for the columnar (NumPy) clustering engine
+(rotor_analysis/columnar.py). Checks that it builds the same clusters and
+the same JSON as build_clusters(), on random catalogs with bin-edge values,
+negative offsets and incomplete rotors, and that run_clustering() selects
+the engine. The equivalence tests are skipped when numpy is not installed.
+"""
+
+import json
+import os
+import random
+import sqlite3
+import sys
+import tempfile
+sys.path.insert(0, '.')
+
+from rotor_analysis import clustering, columnar
+from rotor_analysis.clustering import (
+    build_clusters,
+    clusters_to_json_serializable,
+    resolve_engine,
+    run_clustering,
+)
+from rotor_analysis.columnar import build_clusters_columnar, columns_from_rotors, numpy_available
+
+print("="*60)
+print("COLUMNAR CLUSTERING ENGINE TESTS")
+print("="*60)
+
+
+def report(number: int, checks: list) -> tuple:
+    passed = sum(1 for check, _ in checks if check)
+    failed = len(checks) - passed
+    for check, message in checks:
+        status = "[PASS]" if check else "[FAIL]"
+        print(f"{status} {message}")
+    if failed == 0:
+        print(f"\n[PASS] Test {number} PASSED ({passed}/{passed} checks)")
+    else:
+        print(f"\n[FAIL] Test {number} FAILED ({passed}/{passed+failed} checks)")
+    return passed, failed
+
+
+def random_rotors(count: int, seed: int) -> list:
+    rnd = random.Random(seed)
+    rotors = []
+    for i in range(count):
+        hat = round(rnd.uniform(5.0, 60.0), 1)
+        rotor = {
+            "brand": f"BRAND{i % 5}",
+            "catalog_ref": f"REF{i:05d}",
+            # Half-bin values (282.5 / 5.0 = 56.5) round half to even
+            "outer_diameter_mm": rnd.choice([282.5, 287.5, round(rnd.uniform(250.0, 380.0), 1)]),
+            "nominal_thickness_mm": rnd.choice([22.25, round(rnd.uniform(18.0, 34.0), 2)]),
+            "hat_height_mm": hat,
+            "overall_height_mm": round(hat + rnd.uniform(-8.0, 12.0), 1),
+            "offset_mm": round(rnd.uniform(-3.0, 60.0), 1) if i % 3 == 0 else None,
+        }
+        if i % 40 == 0:
+            rotor["nominal_thickness_mm"] = None
+        if i % 55 == 0:
+            rotor["hat_height_mm"] = None
+        rotors.append(rotor)
+    return rotors
+
+
+def as_json(clusters: dict) -> str:
+    return json.dumps(clusters_to_json_serializable(clusters))
+
+
+results_summary = []
+
+# ============================================================
+# Test 1: Engine selection
+# ============================================================
+print("\n[TEST 1] resolve_engine()")
+print("-" * 60)
+
+try:
+    resolve_engine("sklearn")
+    unknown1 = False
+except ValueError:
+    unknown1 = True
+saved_np = columnar.np
+columnar.np = None
+try:
+    resolve_engine("numpy")
+    missing1 = False
+except ImportError:
+    missing1 = True
+auto_without1 = resolve_engine("auto")
+columnar.np = saved_np
+
+checks1 = [
+    (unknown1, "Unknown engine -> ValueError"),
+    (missing1, "numpy engine without numpy -> ImportError"),
+    (auto_without1 == "python", "auto falls back to the python engine"),
+    (resolve_engine("auto") == ("numpy" if numpy_available() else "python"),
+     f"auto picks numpy when installed (installed: {numpy_available()})"),
+]
+results_summary.append(report(1, checks1))
+
+if not numpy_available():
+    print("\n[SKIP] numpy not installed: engine equivalence tests skipped")
+else:
+    # ============================================================
+    # Test 2: Same clusters as build_clusters()
+    # ============================================================
+    print("\n[TEST 2] build_clusters_columnar() == build_clusters()")
+    print("-" * 60)
+
+    rotors2 = random_rotors(3000, seed=7)
+    expected2 = build_clusters(rotors2)
+    actual2 = build_clusters_columnar(columns_from_rotors(rotors2))
+    steps2 = (10.0, 1.0, 5.0)
+    saved_steps = (clustering.DIAM_BIN_STEP_MM, clustering.THICK_BIN_STEP_MM,
+                   clustering.OFFSET_BIN_STEP_MM)
+    clustering.DIAM_BIN_STEP_MM, clustering.THICK_BIN_STEP_MM, clustering.OFFSET_BIN_STEP_MM = steps2
+    coarse_expected2 = build_clusters(rotors2)
+    clustering.DIAM_BIN_STEP_MM, clustering.THICK_BIN_STEP_MM, clustering.OFFSET_BIN_STEP_MM = saved_steps
+    coarse2 = build_clusters_columnar(columns_from_rotors(rotors2), steps=steps2)
+    negative2 = [key for key in actual2 if key[2] < 0]
+
+    checks2 = [
+        (list(actual2) == list(expected2), f"Same keys in the same order ({len(actual2)} clusters)"),
+        (as_json(actual2) == as_json(expected2), "Same JSON (members, counts, centroids)"),
+        (sum(c["count"] for c in actual2.values()) == sum(c["count"] for c in expected2.values()),
+         "Same incomplete rotors skipped"),
+        (as_json(coarse2) == as_json(coarse_expected2) and len(coarse2) < len(actual2),
+         "Custom bin steps"),
+        (bool(negative2) and all(str(value) != "-0.0" for key in actual2 for value in key),
+         "Negative offsets binned, no -0.0 keys"),
+    ]
+    results_summary.append(report(2, checks2))
+
+    # ============================================================
+    # Test 3: Edge cases
+    # ============================================================
+    print("\n[TEST 3] Empty and incomplete catalogs")
+    print("-" * 60)
+
+    incomplete3 = [{"brand": "X", "catalog_ref": "1", "outer_diameter_mm": 300.0}]
+    single3 = build_clusters_columnar(columns_from_rotors(
+        [{"brand": "A", "catalog_ref": "1", "outer_diameter_mm": 300,
+          "nominal_thickness_mm": 28, "offset_mm": 45}]))
+
+    checks3 = [
+        (build_clusters_columnar(columns_from_rotors([])) == {}, "No rotors -> no clusters"),
+        (build_clusters_columnar(columns_from_rotors(incomplete3)) == {}, "Only incomplete rotors"),
+        (single3 == {(300.0, 28.0, 44.0): {
+            "members": [{"brand": "A", "catalog_ref": "1", "outer_diameter_mm": 300.0,
+                         "nominal_thickness_mm": 28.0, "offset_mm": 45.0}],
+            "count": 1,
+            "centroid": {"outer_diameter_mm": 300.0, "nominal_thickness_mm": 28.0, "offset_mm": 45.0}}},
+         "Single rotor cluster"),
+    ]
+    results_summary.append(report(3, checks3))
+
+    # ============================================================
+    # Test 4: run_clustering() with both engines
+    # ============================================================
+    print("\n[TEST 4] run_clustering(engine=...) on a database")
+    print("-" * 60)
+
+    directory4 = tempfile.mkdtemp()
+    db4 = os.path.join(directory4, "rotors.db")
+    conn = sqlite3.connect(db4)
+    with open("database/init.sql", "r", encoding="utf-8") as f:
+        conn.executescript(f.read())
+    conn.executemany(
+        "INSERT INTO rotors (outer_diameter_mm, nominal_thickness_mm, hat_height_mm, "
+        "overall_height_mm, center_bore_mm, bolt_circle_mm, bolt_hole_count, ventilation_type, "
+        "directionality, offset_mm, brand, catalog_ref) "
+        "VALUES (?, ?, ?, ?, 66.6, 112, 5, 'vented', 'non_directional', ?, ?, ?)",
+        [(r["outer_diameter_mm"], r["nominal_thickness_mm"] or 20, r["hat_height_mm"] or 30,
+          r["overall_height_mm"], r["offset_mm"], r["brand"], r["catalog_ref"])
+         for r in random_rotors(500, seed=3)])
+    conn.commit()
+    conn.close()
+    outputs4 = {}
+    for engine in ("python", "numpy"):
+        path = os.path.join(directory4, f"{engine}.json")
+        run_clustering(db4, path, engine=engine)
+        with open(path, "r", encoding="utf-8") as f:
+            outputs4[engine] = f.read()
+    for name in os.listdir(directory4):
+        os.remove(os.path.join(directory4, name))
+    os.rmdir(directory4)
+
+    checks4 = [
+        (outputs4["python"] == outputs4["numpy"], "Both engines write the same file"),
+        (json.loads(outputs4["numpy"])["meta"]["cluster_count"] > 0, "Clusters written"),
+    ]
+    results_summary.append(report(4, checks4))
+
+# ============================================================
+# Summary
+# ============================================================
+total_passed = sum(p for p, _ in results_summary)
+total_failed = sum(f for _, f in results_summary)
+
+print("\n" + "="*60)
+print("ALL TESTS COMPLETED")
+print(f"Total: {total_passed} PASSED, {total_failed} FAILED")
+print("="*60)
@@ -0,0 +1,189 @@
+"""
+Test suite for the SQLite connection factory (database/connection.py).
+Covers the pragma profiles, WAL concurrency between the ingest writer and
+readers, and the callers that now open their databases through connect().
+"""
+
+import json
+import os
+import sqlite3
+import sys
+import tempfile
+sys.path.insert(0, '.')
+
+from database import ingest_pipeline
+from database.batch_writer import BatchWriter
+from database.connection import PROFILES, connect
+from rotor_analysis.clustering import load_rotors_from_db
+
+print("="*60)
+print("SQLITE CONNECTION FACTORY TESTS")
+print("="*60)
+
+
+def report(number: int, checks: list) -> tuple:
+    passed = sum(1 for check, _ in checks if check)
+    failed = len(checks) - passed
+    for check, message in checks:
+        status = "[PASS]" if check else "[FAIL]"
+        print(f"{status} {message}")
+    if failed == 0:
+        print(f"\n[PASS] Test {number} PASSED ({passed}/{passed} checks)")
+    else:
+        print(f"\n[FAIL] Test {number} FAILED ({passed}/{passed+failed} checks)")
+    return passed, failed
+
+
+def new_db(profile: str) -> str:
+    fd, path = tempfile.mkstemp(suffix=".db")
+    os.close(fd)
+    conn = connect(path, profile)
+    with open("database/init.sql", "r", encoding="utf-8") as f:
+        conn.executescript(f.read())
+    conn.close()
+    return path
+
+
+def remove_db(path: str) -> None:
+    for suffix in ("", "-wal", "-shm"):
+        if os.path.exists(path + suffix):
+            os.remove(path + suffix)
+
+
+def pragma(conn, name: str):
+    return conn.execute(f"PRAGMA {name}").fetchone()[0]
+
+
+def rotor(i: int) -> dict:
+    return {
+        "outer_diameter_mm": 300.0 + i % 50, "nominal_thickness_mm": 28.0,
+        "hat_height_mm": 45.0, "overall_height_mm": 52.0, "center_bore_mm": 64.1,
+        "bolt_circle_mm": 114.3, "bolt_hole_count": 5, "ventilation_type": "vented",
+        "directionality": "non_directional", "brand": "DBA", "catalog_ref": f"DBA{i:05d}",
+    }
+
+
+results_summary = []
+
+# ============================================================
+# Test 1: Profiles
+# ============================================================
+print("\n[TEST 1] Pragma profiles")
+print("-" * 60)
+
+db1 = new_db("default")
+bulk1 = connect(db1, "bulk_load")
+read1 = connect(db1, "read_mostly")
+plain1 = connect(db1, "default")
+memory1 = connect(":memory:", "bulk_load")
+rollback1 = new_db("default")
+reader1 = connect(rollback1, "read_mostly")
+try:
+    connect(":memory:", "turbo")
+    error1 = False
+except ValueError:
+    error1 = True
+
+checks1 = [
+    (pragma(bulk1, "journal_mode") == "wal" and pragma(bulk1, "synchronous") == 1,
+     "bulk_load: WAL, synchronous=NORMAL"),
+    (pragma(bulk1, "cache_size") == PROFILES["bulk_load"]["cache_size"]
+     and pragma(bulk1, "temp_store") == 2 and pragma(bulk1, "wal_autocheckpoint") == 10000,
+     "bulk_load: cache, temp store, checkpoints"),
+    (pragma(read1, "mmap_size") == PROFILES["read_mostly"]["mmap_size"]
+     and pragma(read1, "cache_size") == PROFILES["read_mostly"]["cache_size"], "read_mostly: mmap, cache"),
+    (pragma(plain1, "journal_mode") == "wal" and pragma(plain1, "synchronous") == 2,
+     "WAL stored in the file, default pragmas otherwise"),
+    (pragma(reader1, "journal_mode") == "delete" and pragma(reader1, "synchronous") == 2,
+     "read_mostly leaves a rollback-journal database as it is"),
+    (pragma(memory1, "journal_mode") == "memory" and error1, "In-memory database; unknown profile rejected"),
+]
+for conn in (bulk1, read1, plain1, memory1, reader1):
+    conn.close()
+remove_db(rollback1)
+results_summary.append(report(1, checks1))
+
+# ============================================================
+# Test 2: Readers alongside the writer
+# ============================================================
+print("\n[TEST 2] Readers run concurrently with the ingest writer")
+print("-" * 60)
+
+
+def commit_with_open_reader(profile: str) -> tuple:
+    """Writer commits while a reader holds a read transaction."""
+    path = new_db(profile)
+    writer = connect(path, profile, timeout=0.2)
+    BatchWriter(writer).write("rotors", [rotor(0)])
+    writer.commit()
+    reader = connect(path, profile, timeout=0.2, isolation_level=None)
+    reader.execute("BEGIN")
+    before = reader.execute("SELECT COUNT(*) FROM rotors").fetchone()[0]
+    BatchWriter(writer).write("rotors", [rotor(1), rotor(2)])
+    try:
+        writer.commit()
+        committed = True
+    except sqlite3.OperationalError:
+        committed = False
+        writer.rollback()
+    during = reader.execute("SELECT COUNT(*) FROM rotors").fetchone()[0]
+    reader.execute("COMMIT")
+    after = reader.execute("SELECT COUNT(*) FROM rotors").fetchone()[0]
+    writer.close()
+    reader.close()
+    remove_db(path)
+    return committed, before, during, after
+
+
+wal2 = commit_with_open_reader("bulk_load")
+journal2 = commit_with_open_reader("default")
+
+checks2 = [
+    (wal2[0], "WAL: writer commits while a reader is open"),
+    (wal2[1:] == (1, 1, 3), f"Reader sees a stable snapshot, then the new rows {wal2[1:]}"),
+    (not journal2[0], "Rollback journal (default profile): commit blocked by the reader"),
+]
+results_summary.append(report(2, checks2))
+
+# ============================================================
+# Test 3: Callers
+# ============================================================
+print("\n[TEST 3] ingest_jsonl() and load_rotors_from_db() through connect()")
+print("-" * 60)
+
+db3 = new_db("default")
+fd, jsonl3 = tempfile.mkstemp(suffix=".jsonl")
+with os.fdopen(fd, "w", encoding="utf-8") as f:
+    for i in range(40):
+        f.write(json.dumps(rotor(i)) + "\n")
+saved_db_path = ingest_pipeline.DB_PATH
+ingest_pipeline.DB_PATH = db3
+try:
+    ingest_pipeline.ingest_jsonl(jsonl3, "rotors")
+finally:
+    ingest_pipeline.DB_PATH = saved_db_path
+conn3 = sqlite3.connect(db3)
+journal3 = pragma(conn3, "journal_mode")
+conn3.close()
+rotors3 = load_rotors_from_db(db3)
+
+checks3 = [
+    (journal3 == "wal", "Database left in WAL mode by the bulk load"),
+    (len(rotors3) == 40 and rotors3[0]["catalog_ref"] == "DBA00000", "Clustering loader reads it"),
+]
+results_summary.append(report(3, checks3))
+
+os.remove(jsonl3)
+for path in (db1, db3):
+    remove_db(path)
+
+# ============================================================
+# Summary
+# ============================================================
+total_passed = sum(p for p, _ in results_summary)
+total_failed = sum(f for _, f in results_summary)
+
+print("\n" + "="*60)
+print("ALL TESTS COMPLETED")
+print(f"Total: {total_passed} PASSED, {total_failed} FAILED")
+print("="*60)
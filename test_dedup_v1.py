@@ -10,13 +10,16 @@ import sqlite3
 sys.path.insert(0, '.')
 
 from database.ingest_pipeline import (
+    insert_records,
     insert_rotor,
     insert_pad,
     insert_vehicle,
+    process_rotor_seed,
     rotor_exists,
     pad_exists,
     vehicle_exists
 )
+from database.migrations import SCHEMA_VERSION, migrate, schema_version
 
 print("="*60)
 print("MISSION 9 - DEDUPLICATION V1 TESTS")
@@ -285,11 +288,101 @@ else:
 conn.close()
 
 
+# ============================================================
+# Test 5: Dedup inside the INSERT (unique indexes)
+# ============================================================
+print("\n[TEST 5] insert_records() - duplicates skipped by the unique index")
+print("-" * 60)
+
+conn = create_test_db()
+
+rotor5 = dict(rotor1, catalog_ref="DBA5000")
+counts5 = insert_records(conn, "rotors", [rotor1, rotor5, dict(rotor1, outer_diameter_mm=999.0)])
+again5 = insert_records(conn, "rotors", [rotor1, dict(rotor2)])
+diameter5 = conn.execute("SELECT outer_diameter_mm FROM rotors WHERE catalog_ref = 'DBA2000'").fetchone()[0]
+
+with open("tests/fixtures/product_pages/dba_rotor_01.html", "r", encoding="utf-8") as f:
+    dba_html = f.read()
+seed5 = [process_rotor_seed(conn, "dba", "http://dba.test/rotor", html=dba_html) for _ in range(2)]
+product_rows5 = conn.execute("SELECT COUNT(*) FROM rotors WHERE catalog_ref = 'DBA42134S'").fetchone()[0]
+
+checks5 = [
+    (counts5 == (2, 1), f"(inserted, skipped) = {counts5}"),
+    (again5 == (1, 1), "Existing key skipped, new key inserted"),
+    (diameter5 == 300.0, "First record of a key wins"),
+    (seed5 == [1, 0] and product_rows5 == 1, "process_rotor_seed() no longer inserts duplicates"),
+]
+
+passed5 = sum(1 for check, _ in checks5 if check)
+failed5 = len(checks5) - passed5
+
+for check, message in checks5:
+    status = "[PASS]" if check else "[FAIL]"
+    print(f"{status} {message}")
+
+if failed5 == 0:
+    print(f"\n[PASS] Test 5 PASSED ({passed5}/{passed5} checks)")
+else:
+    print(f"\n[FAIL] Test 5 FAILED ({passed5}/{passed5+failed5} checks)")
+
+conn.close()
+
+
+# ============================================================
+# Test 6: Migration of a database without unique keys
+# ============================================================
+print("\n[TEST 6] migrate() - dedup existing rows and build the indexes")
+print("-" * 60)
+
+conn = sqlite3.connect(":memory:")
+with open("database/init.sql", "r", encoding="utf-8") as f:
+    # Schema as created before the unique indexes existed
+    legacy_sql = "\n".join(line for line in f.read().splitlines()
+                           if not line.startswith(("CREATE UNIQUE INDEX", "PRAGMA user_version")))
+conn.executescript(legacy_sql)
+for rotor in (rotor1, rotor2, dict(rotor1, outer_diameter_mm=999.0), rotor1):
+    conn.execute(f"INSERT INTO rotors ({','.join(rotor)}) VALUES ({','.join('?' * len(rotor))})",
+                 list(rotor.values()))
+for vehicle in (vehicle1, vehicle1):
+    conn.execute(f"INSERT INTO vehicles ({','.join(vehicle)}) VALUES ({','.join('?' * len(vehicle))})",
+                 list(vehicle.values()))
+conn.commit()
+
+version_before6 = schema_version(conn)
+applied6 = migrate(conn)
+rows6 = conn.execute("SELECT catalog_ref, outer_diameter_mm FROM rotors ORDER BY id").fetchall()
+indexes6 = {row[1] for row in conn.execute("PRAGMA index_list(rotors)")}
+insert6 = insert_records(conn, "rotors", [rotor1])
+
+checks6 = [
+    (version_before6 == 0 and schema_version(conn) == SCHEMA_VERSION, "Schema version recorded"),
+    (applied6[1] == {"rotors": 2, "pads": 0, "vehicles": 1}, f"Duplicates removed: {applied6[1]}"),
+    (rows6 == [("DBA2000", 300.0), ("DBA3000", 320.0)], "Earliest row of each key kept"),
+    ("idx_rotors_natural_key" in indexes6 and insert6 == (0, 1), "Unique index enforced"),
+    (migrate(conn) == {} and schema_version(create_test_db()) == SCHEMA_VERSION,
+     "Up-to-date and fresh databases untouched"),
+]
+
+passed6 = sum(1 for check, _ in checks6 if check)
+failed6 = len(checks6) - passed6
+
+for check, message in checks6:
+    status = "[PASS]" if check else "[FAIL]"
+    print(f"{status} {message}")
+
+if failed6 == 0:
+    print(f"\n[PASS] Test 6 PASSED ({passed6}/{passed6} checks)")
+else:
+    print(f"\n[FAIL] Test 6 FAILED ({passed6}/{passed6+failed6} checks)")
+
+conn.close()
+
+
 # ============================================================
 # Summary
 # ============================================================
-total_passed = passed1 + passed2 + passed3 + passed4
-total_failed = failed1 + failed2 + failed3 + failed4
+total_passed = passed1 + passed2 + passed3 + passed4 + passed5 + passed6
+total_failed = failed1 + failed2 + failed3 + failed4 + failed5 + failed6
 
 print("\n" + "="*60)
 print("ALL TESTS COMPLETED")
@@ -302,6 +395,7 @@ if total_failed == 0:
     print("  - Rotors: (brand, catalog_ref)")
     print("  - Pads: (shape_id, brand, catalog_ref)")
     print("  - Vehicles: (make, model, year_from)")
+    print("  - Enforced by unique indexes, duplicates skipped by the INSERT")
     print("\nPipeline is now idempotent for duplicate seed URLs.")
 else:
     print(f"\n[FAIL] {total_failed} test(s) failed")
@@ -0,0 +1,232 @@
+"""
+Test suite for the per-domain politeness scheduler (data_scraper/domain_scheduler.py).
+Covers token buckets, in-flight limits, domain interleaving and Retry-After,
+using a local stand-in HTTP server (no network).
+"""
+
+import os
+import sys
+import threading
+import time
+from email.utils import formatdate
+sys.path.insert(0, '.')
+
+from data_scraper.domain_scheduler import (
+    DomainScheduler,
+    domain_of,
+    interleave_by_domain,
+    parse_retry_after,
+)
+from data_scraper.fetch_engine import iter_fetch
+from data_scraper.html_scraper import fetch_html
+from tools.site_access_audit import probe_url
+from tests.local_server import LocalServer
+
+print("="*60)
+print("DOMAIN SCHEDULER TESTS")
+print("="*60)
+
+
+def report(number: int, checks: list) -> tuple:
+    passed = sum(1 for check, _ in checks if check)
+    failed = len(checks) - passed
+    for check, message in checks:
+        status = "[PASS]" if check else "[FAIL]"
+        print(f"{status} {message}")
+    if failed == 0:
+        print(f"\n[PASS] Test {number} PASSED ({passed}/{passed} checks)")
+    else:
+        print(f"\n[FAIL] Test {number} FAILED ({passed}/{passed+failed} checks)")
+    return passed, failed
+
+
+results_summary = []
+
+# ============================================================
+# Test 1: Helpers
+# ============================================================
+print("\n[TEST 1] domain_of(), interleave_by_domain(), parse_retry_after()")
+print("-" * 60)
+
+seeds1 = ["http://a.com/1", "http://a.com/2", "http://a.com/3", "http://b.com/1", "http://c.com/1"]
+future_date = formatdate(time.time() + 30, usegmt=True)
+
+checks1 = [
+    (domain_of("https://WWW.Example.com:8080/x?y") == "www.example.com:8080", "netloc used as domain key"),
+    (interleave_by_domain(seeds1) == ["http://a.com/1", "http://b.com/1", "http://c.com/1",
+                                      "http://a.com/2", "http://a.com/3"], "Round-robin across domains"),
+    (parse_retry_after("5") == 5.0, "Retry-After delta-seconds"),
+    (25 < (parse_retry_after(future_date) or 0) <= 30, "Retry-After HTTP-date"),
+    (parse_retry_after("soon") is None and parse_retry_after(None) is None, "Invalid Retry-After ignored"),
+]
+results_summary.append(report(1, checks1))
+
+# ============================================================
+# Test 2: Token bucket and in-flight limit (direct mode)
+# ============================================================
+print("\n[TEST 2] try_acquire() - burst, rate and max in flight")
+print("-" * 60)
+
+sched2 = DomainScheduler(rate_per_sec=10.0, burst=2, max_in_flight=5)
+grants = [sched2.try_acquire("http://a.com/x") for _ in range(3)]
+other = sched2.try_acquire("http://b.com/x")
+
+sched2b = DomainScheduler(rate_per_sec=1000.0, burst=10, max_in_flight=2)
+sched2b.try_acquire("http://a.com/1")
+sched2b.try_acquire("http://a.com/2")
+blocked = sched2b.try_acquire("http://a.com/3")
+sched2b.release("http://a.com/1")
+after_release = sched2b.try_acquire("http://a.com/3")
+
+print(f"Delays: {grants}, other domain: {other}")
+
+checks2 = [
+    (grants[0] == 0.0 and grants[1] == 0.0, "Burst of 2 granted immediately"),
+    (0.05 < grants[2] <= 0.1, "Third request must wait ~1/rate"),
+    (other == 0.0, "Other domain unaffected"),
+    (blocked > 0.0, "Max in flight blocks third request"),
+    (after_release == 0.0, "Release frees a slot"),
+]
+results_summary.append(report(2, checks2))
+
+# ============================================================
+# Test 3: Engine + scheduler - per-domain limit, cross-domain overlap
+# ============================================================
+print("\n[TEST 3] iter_fetch(scheduler=...) - interleaving and in-flight bounds")
+print("-" * 60)
+
+server = LocalServer(os.path.join("tests", "fixtures"), delay=0.05).start()
+port = server.base_url.rsplit(":", 1)[1]
+page = "rotor_lists/autodoc_list_01.html"
+urls_a = [f"http://127.0.0.1:{port}/{page}?a={i}" for i in range(4)]
+urls_b = [f"http://localhost:{port}/{page}?b={i}" for i in range(4)]
+
+lock = threading.Lock()
+in_flight = {}
+max_in_flight = {}
+total_in_flight = 0
+max_total = 0
+start_order = []
+
+
+def tracking_fetch(url):
+    global total_in_flight, max_total
+    domain = domain_of(url)
+    with lock:
+        start_order.append(domain)
+        in_flight[domain] = in_flight.get(domain, 0) + 1
+        max_in_flight[domain] = max(max_in_flight.get(domain, 0), in_flight[domain])
+        total_in_flight += 1
+        max_total = max(max_total, total_in_flight)
+    try:
+        return fetch_html(url)
+    finally:
+        with lock:
+            in_flight[domain] -= 1
+            total_in_flight -= 1
+
+
+sched3 = DomainScheduler(rate_per_sec=1000.0, burst=10, max_in_flight=1)
+results3 = list(iter_fetch(urls_a + urls_b, concurrency=4, fetch=tracking_fetch,
+                           scheduler=sched3))
+stats3 = sched3.stats()
+print(f"Start order: {start_order}")
+print(f"Max in flight per domain: {max_in_flight}, overall: {max_total}")
+
+checks3 = [
+    (len(results3) == 8 and all(r[3] is None for r in results3), "All 8 URLs fetched"),
+    ([r[0] for r in results3] == list(range(8)), "Results still yielded in seed order"),
+    (all(v == 1 for v in max_in_flight.values()), "Never more than 1 in flight per domain"),
+    (max_total == 2, "Both domains fetched in parallel"),
+    (start_order[0] != start_order[1], "Seeds interleaved across domains"),
+    (all(s["requests"] == 4 and s["queued"] == 0 for s in stats3.values()), "Stats: 4 requests per domain, queues drained"),
+    (all(s["max_queued"] >= 3 for s in stats3.values()), "Stats: queue depth recorded"),
+]
+results_summary.append(report(3, checks3))
+
+# ============================================================
+# Test 4: Token bucket spacing through the engine
+# ============================================================
+print("\n[TEST 4] Per-domain rate limit bounds request rate")
+print("-" * 60)
+
+sched4 = DomainScheduler(rate_per_sec=20.0, burst=1, max_in_flight=4)
+start4 = time.perf_counter()
+results4 = list(iter_fetch(urls_a[:1] * 6, concurrency=4, scheduler=sched4))
+elapsed4 = time.perf_counter() - start4
+stats4 = sched4.stats()[domain_of(urls_a[0])]
+print(f"Elapsed: {elapsed4:.2f}s, stats: {stats4}")
+
+checks4 = [
+    (len(results4) == 6, "6 results returned"),
+    (elapsed4 >= 0.25, "6 requests at 20 req/s take >= 5 intervals"),
+    (stats4["wait_max_s"] > 0, "Wait time recorded"),
+]
+results_summary.append(report(4, checks4))
+
+# ============================================================
+# Test 5: Retry-After pauses the domain
+# ============================================================
+print("\n[TEST 5] 429 + Retry-After defers the domain")
+print("-" * 60)
+
+server.script(f"/{page}?retry=0", 429, {"Retry-After": "1"})
+sched5 = DomainScheduler(rate_per_sec=1000.0, burst=10, max_in_flight=1)
+timings = {}
+
+
+def timed_fetch(url):
+    timings[url] = time.perf_counter()
+    return fetch_html(url)
+
+
+urls5 = [f"http://127.0.0.1:{port}/{page}?retry={i}" for i in range(2)]
+start5 = time.perf_counter()
+results5 = list(iter_fetch(urls5, concurrency=2, fetch=timed_fetch, scheduler=sched5))
+gap5 = timings[urls5[1]] - start5
+stats5 = sched5.stats()[domain_of(urls5[0])]
+print(f"Second request started after {gap5:.2f}s, stats: {stats5}")
+
+checks5 = [
+    (results5[0][3] is not None and "429" in str(results5[0][3]), "First request reports 429"),
+    (results5[1][3] is None, "Second request succeeds"),
+    (gap5 >= 0.9, "Second request waited for Retry-After"),
+    (stats5["deferrals"] == 1, "Deferral counted in stats"),
+]
+results_summary.append(report(5, checks5))
+
+# ============================================================
+# Test 6: probe_url() under the scheduler
+# ============================================================
+print("\n[TEST 6] probe_url(scheduler=...) - 503 + Retry-After")
+print("-" * 60)
+
+server.script("/busy.html", 503, {"Retry-After": "7"})
+sched6 = DomainScheduler()
+seed_ok = {"kind": "rotor", "source": "autodoc", "url": urls_a[0], "page_type": "list"}
+seed_busy = {"kind": "rotor", "source": "autodoc", "url": server.url("busy.html"), "page_type": "list"}
+result_ok = probe_url(seed_ok, scheduler=sched6)
+result_busy = probe_url(seed_busy, scheduler=sched6)
+stats6 = sched6.stats()[domain_of(urls_a[0])]
+print(f"Stats: {stats6}")
+
+checks6 = [
+    (result_ok["status_code"] == 200, "Probe succeeds through scheduler"),
+    (result_busy["status_code"] == 503 and result_busy["suspected_bot_protection"], "503 flagged"),
+    (stats6["requests"] == 2 and stats6["in_flight"] == 0, "Slots acquired and released"),
+    (stats6["deferrals"] == 1 and sched6.try_acquire(urls_a[0]) > 5, "Domain paused by Retry-After"),
+]
+results_summary.append(report(6, checks6))
+
+server.stop()
+
+# ============================================================
+# Summary
+# ============================================================
+total_passed = sum(p for p, _ in results_summary)
+total_failed = sum(f for _, f in results_summary)
+
+print("\n" + "="*60)
+print("ALL TESTS COMPLETED")
+print(f"Total: {total_passed} PASSED, {total_failed} FAILED")
+print("="*60)
@@ -0,0 +1,260 @@
+"""
+Test suite for the concurrent fetch engine (data_scraper/fetch_engine.py).
+Runs against a local stand-in HTTP server serving tests/fixtures, no network.
+"""
+
+import asyncio
+import os
+import sqlite3
+import sys
+import tempfile
+import threading
+import time
+sys.path.insert(0, '.')
+
+from data_scraper.fetch_engine import fetch_all, iter_fetch
+from data_scraper.html_scraper import fetch_html
+from data_scraper.html_rotor_list_scraper import parse_rotor_list_page
+import database.ingest_pipeline as ingest_pipeline
+from tests.local_server import LocalServer
+
+print("="*60)
+print("FETCH ENGINE TESTS")
+print("="*60)
+
+FIXTURES_DIR = os.path.join("tests", "fixtures")
+LIST_PAGES = [
+    ("autodoc", "rotor_lists/autodoc_list_01.html"),
+    ("mister-auto", "rotor_lists/misterauto_list_01.html"),
+    ("powerstop", "rotor_lists/powerstop_list_01.html"),
+]
+
+
+def read_fixture(path: str) -> str:
+    with open(os.path.join(FIXTURES_DIR, path), "r", encoding="utf-8") as f:
+        return f.read()
+
+
+def report(number: int, checks: list) -> tuple:
+    passed = sum(1 for check, _ in checks if check)
+    failed = len(checks) - passed
+    for check, message in checks:
+        status = "[PASS]" if check else "[FAIL]"
+        print(f"{status} {message}")
+    if failed == 0:
+        print(f"\n[PASS] Test {number} PASSED ({passed}/{passed} checks)")
+    else:
+        print(f"\n[FAIL] Test {number} FAILED ({passed}/{passed+failed} checks)")
+    return passed, failed
+
+
+server = LocalServer(FIXTURES_DIR).start()
+urls = [server.url(path) for _, path in LIST_PAGES]
+results_summary = []
+
+# ============================================================
+# Test 1: Ordered results match fixtures
+# ============================================================
+print("\n[TEST 1] iter_fetch(ordered=True) - seed order preserved")
+print("-" * 60)
+
+results1 = list(iter_fetch(urls * 3, concurrency=4, ordered=True))
+expected1 = [read_fixture(path) for _, path in LIST_PAGES] * 3
+
+checks1 = [
+    (len(results1) == 9, "9 results returned"),
+    ([r[0] for r in results1] == list(range(9)), "Indices in seed order"),
+    (all(r[3] is None for r in results1), "No errors"),
+    ([r[2] for r in results1] == expected1, "Bodies match fixture files"),
+]
+results_summary.append(report(1, checks1))
+
+# ============================================================
+# Test 2: As-completed mode
+# ============================================================
+print("\n[TEST 2] iter_fetch(ordered=False) - results as completed")
+print("-" * 60)
+
+
+def slow_first_fetch(url):
+    """Delay the first fixture so later URLs complete before it."""
+    if url == urls[0]:
+        time.sleep(0.3)
+    return fetch_html(url)
+
+
+results2 = list(iter_fetch(urls, concurrency=3, ordered=False, fetch=slow_first_fetch))
+order2 = [r[0] for r in results2]
+print(f"Completion order: {order2}")
+
+checks2 = [
+    (sorted(order2) == [0, 1, 2], "All indices yielded exactly once"),
+    (order2[-1] == 0, "Slow first URL yielded last"),
+]
+results_summary.append(report(2, checks2))
+
+# ============================================================
+# Test 3: Global concurrency limit
+# ============================================================
+print("\n[TEST 3] Concurrency limit respected")
+print("-" * 60)
+
+in_flight = 0
+max_in_flight = 0
+lock = threading.Lock()
+
+
+def tracking_fetch(url):
+    global in_flight, max_in_flight
+    with lock:
+        in_flight += 1
+        max_in_flight = max(max_in_flight, in_flight)
+    try:
+        time.sleep(0.05)
+        return fetch_html(url)
+    finally:
+        with lock:
+            in_flight -= 1
+
+
+start3 = time.perf_counter()
+results3 = list(iter_fetch(urls * 4, concurrency=3, fetch=tracking_fetch))
+elapsed3 = time.perf_counter() - start3
+print(f"Max in flight: {max_in_flight}, elapsed: {elapsed3:.2f}s")
+
+checks3 = [
+    (len(results3) == 12, "12 results returned"),
+    (max_in_flight <= 3, "Never more than 3 requests in flight"),
+    (max_in_flight > 1, "Requests actually overlapped"),
+    (elapsed3 < 12 * 0.05, "Faster than sequential fetching"),
+]
+results_summary.append(report(3, checks3))
+
+# ============================================================
+# Test 4: Errors are reported per URL
+# ============================================================
+print("\n[TEST 4] Fetch errors returned, not raised")
+print("-" * 60)
+
+results4 = list(iter_fetch([urls[0], server.url("missing.html")], concurrency=2))
+
+checks4 = [
+    (results4[0][3] is None and results4[0][2], "Valid URL fetched"),
+    (results4[1][2] is None, "Missing URL has no body"),
+    (results4[1][3] is not None and "404" in str(results4[1][3]), "Missing URL carries 404 error"),
+]
+results_summary.append(report(4, checks4))
+
+# ============================================================
+# Test 5: Async API + parsing the fetched pages
+# ============================================================
+print("\n[TEST 5] fetch_all() coroutine feeds list parsers")
+print("-" * 60)
+
+results5 = asyncio.run(fetch_all(urls, concurrency=3))
+rotor_counts = [len(parse_rotor_list_page(r[2], source))
+                for r, (source, _) in zip(results5, LIST_PAGES)]
+print(f"Rotors per page: {rotor_counts}")
+
+checks5 = [
+    ([r[0] for r in results5] == [0, 1, 2], "Results sorted by index"),
+    (rotor_counts == [6, 8, 7], "Parsers extract 6/8/7 rotors"),
+]
+results_summary.append(report(5, checks5))
+
+# ============================================================
+# Test 6: ingest_all with concurrent fetching
+# ============================================================
+print("\n[TEST 6] ingest_all(concurrency=4) end to end")
+print("-" * 60)
+
+tmp_dir = tempfile.mkdtemp()
+db_path = os.path.join(tmp_dir, "bbk_test.db")
+conn = sqlite3.connect(db_path)
+with open("database/init.sql", "r", encoding="utf-8") as f:
+    conn.executescript(f.read())
+conn.close()
+
+seeds = [(source, url, "", "list") for (source, _), url in zip(LIST_PAGES, urls)]
+seeds.append(("dba", server.url("product_pages/dba_rotor_01.html"), "", "product"))
+
+original_db_path = ingest_pipeline.DB_PATH
+original_iter_seed_urls = ingest_pipeline.iter_seed_urls
+ingest_pipeline.DB_PATH = db_path
+ingest_pipeline.iter_seed_urls = lambda kind: iter(seeds if kind == "rotors" else [])
+server.request_log.clear()
+
+try:
+    stats6 = ingest_pipeline.ingest_all(group="rotors", concurrency=4)
+finally:
+    ingest_pipeline.DB_PATH = original_db_path
+    ingest_pipeline.iter_seed_urls = original_iter_seed_urls
+
+conn = sqlite3.connect(db_path)
+refs6 = [row[0] for row in conn.execute("SELECT catalog_ref FROM rotors")]
+conn.close()
+
+checks6 = [
+    (len(server.request_log) == 4, "Every seed fetched once"),
+    (stats6 is not None and stats6["rotors"] == 1, "Product page rotor inserted"),
+    (refs6 == ["DBA42134S"], "Inserted rotor has expected catalog_ref"),
+]
+results_summary.append(report(6, checks6))
+
+# ============================================================
+# Test 7: Ordered backpressure behind a slow page
+# ============================================================
+print("\n[TEST 7] iter_fetch(ordered=True, max_buffered=2) - slow first page")
+print("-" * 60)
+
+from data_scraper.domain_scheduler import DomainScheduler
+
+
+def ahead_of_slow_first(scheduler=None) -> tuple:
+    """Pages fetched when the first (slow) result reaches the consumer, and results."""
+    completed = []
+    lock7 = threading.Lock()
+
+    def fetch(url):
+        if url.endswith("/0"):
+            time.sleep(0.3)
+        with lock7:
+            completed.append(url)
+        return url
+
+    ahead = None
+    got = []
+    for index, url, html, error in iter_fetch(
+            [f"http://host{i % 3}.test/{i}" for i in range(200)], concurrency=4,
+            fetch=fetch, scheduler=scheduler, max_buffered=2):
+        if ahead is None:
+            with lock7:
+                ahead = len(completed)
+        got.append(index)
+    return ahead, got
+
+
+ahead7, got7 = ahead_of_slow_first()
+scheduled_ahead7, scheduled_got7 = ahead_of_slow_first(
+    DomainScheduler(rate_per_sec=1000, burst=1000, max_in_flight=4))
+print(f"Pages fetched before the first result: {ahead7} (scheduled: {scheduled_ahead7})")
+
+checks7 = [
+    (got7 == list(range(200)) and scheduled_got7 == list(range(200)), "All results, in order"),
+    (ahead7 <= 2 + 4, "At most max_buffered + concurrency pages fetched ahead"),
+    (scheduled_ahead7 <= 2 + 4, "Same with a domain scheduler"),
+]
+results_summary.append(report(7, checks7))
+
+server.stop()
+
+# ============================================================
+# Summary
+# ============================================================
+total_passed = sum(p for p, _ in results_summary)
+total_failed = sum(f for _, f in results_summary)
+
+print("\n" + "="*60)
+print("ALL TESTS COMPLETED")
+print(f"Total: {total_passed} PASSED, {total_failed} FAILED")
+print("="*60)
@@ -0,0 +1,261 @@
+"""
+Test suite for the crawl frontier (database/frontier.py).
+Covers lease/ack/fail semantics, lease expiry and lost leases, concurrent
+leasing from several processes, and ingest_frontier() workers sharing one
+database against the local fixture server.
+"""
+
+import multiprocessing
+import os
+import sqlite3
+import sys
+import tempfile
+import time
+sys.path.insert(0, '.')
+
+from database import ingest_pipeline
+from database.connection import connect
+from database.frontier import Frontier
+from tests.local_server import LocalServer
+
+print("="*60)
+print("CRAWL FRONTIER TESTS")
+print("="*60)
+
+
+def report(number: int, checks: list) -> tuple:
+    passed = sum(1 for check, _ in checks if check)
+    failed = len(checks) - passed
+    for check, message in checks:
+        status = "[PASS]" if check else "[FAIL]"
+        print(f"{status} {message}")
+    if failed == 0:
+        print(f"\n[PASS] Test {number} PASSED ({passed}/{passed} checks)")
+    else:
+        print(f"\n[FAIL] Test {number} FAILED ({passed}/{passed+failed} checks)")
+    return passed, failed
+
+
+def new_db() -> str:
+    fd, path = tempfile.mkstemp(suffix=".db")
+    os.close(fd)
+    conn = sqlite3.connect(path)
+    with open("database/init.sql", "r", encoding="utf-8") as f:
+        conn.executescript(f.read())
+    conn.close()
+    return path
+
+
+def remove_db(path: str) -> None:
+    for suffix in ("", "-wal", "-shm"):
+        if os.path.exists(path + suffix):
+            os.remove(path + suffix)
+
+
+def seeds(prefix: str, count: int) -> list:
+    return [("dba", f"http://dba.test/{prefix}{i}", "", "product") for i in range(count)]
+
+
+def names(entries: list) -> list:
+    return [entry["url"].rsplit("/", 1)[-1] for entry in entries]
+
+
+results_summary = []
+
+# ============================================================
+# Test 1: Lease / ack / fail
+# ============================================================
+print("\n[TEST 1] add(), lease(), ack(), fail(), release()")
+print("-" * 60)
+
+db1 = new_db()
+conn = connect(db1, "bulk_load")
+a1 = Frontier(conn, owner="a", max_attempts=2)
+b1 = Frontier(conn, owner="b")
+added1 = a1.add("rotors", seeds("p", 4))
+readded1 = a1.add("rotors", seeds("p", 5))
+urgent1 = a1.add("pads", seeds("u", 1), priority=5)
+first1 = a1.lease(3)
+second1 = b1.lease(10, group="rotors")
+stale1 = b1.ack(first1)
+acked1 = a1.ack(first1[:2])
+failed1 = a1.fail(first1[2:], "fetch: HTTP 503")
+retry1 = a1.lease(10)
+a1.fail(retry1, "fetch: HTTP 503")
+parse1 = b1.fail(second1[:1], "parse (exception): boom", retry=False)
+b1.release(second1[1:])
+found1 = a1.add("rotors", seeds("q", 1), discovered_from="http://dba.test/p0")
+rest1 = a1.lease(10)
+discovered1 = conn.execute("SELECT discovered_from FROM crawl_frontier "
+                           "WHERE url = 'http://dba.test/q0'").fetchone()[0]
+final1 = {url.rsplit("/", 1)[-1]: (status, attempts, error) for url, status, attempts, error in
+          conn.execute("SELECT url, status, attempts, last_error FROM crawl_frontier")}
+stats1 = a1.stats()
+conn.close()
+
+checks1 = [
+    (added1 == 4 and readded1 == 1 and urgent1 == 1, "Known URLs skipped on add"),
+    (names(first1) == ["u0", "p0", "p1"] and first1[0]["seed"] == ("dba", "http://dba.test/u0", "", "product"),
+     f"Highest priority first, then insertion order: {names(first1)}"),
+    (names(second1) == ["p2", "p3", "p4"], "Second worker gets only unleased entries"),
+    (stale1 == 0 and acked1 == 2, "Ack by another worker ignored"),
+    (failed1 == 1 and names(retry1) == ["p1"] and final1["p1"] == ("failed", 2, "fetch: HTTP 503"),
+     "Fetch failure requeued, failed after max_attempts"),
+    (parse1 == 1 and final1["p2"][:2] == ("failed", 1), "retry=False fails at once"),
+    (names(rest1) == ["p3", "p4", "q0"] and final1["p3"][1] == 0, "Released entries leased again, no attempt counted"),
+    (discovered1 == "http://dba.test/p0", "Discovered URL enqueued at runtime"),
+    (stats1 == {"queued": 0, "leased": 3, "done": 2, "failed": 2}, f"Stats: {stats1}"),
+]
+results_summary.append(report(1, checks1))
+remove_db(db1)
+
+# ============================================================
+# Test 2: Lease expiry
+# ============================================================
+print("\n[TEST 2] Expired leases - takeover and lost acks")
+print("-" * 60)
+
+db2 = new_db()
+conn = connect(db2, "bulk_load")
+slow2 = Frontier(conn, owner="slow", lease_s=0.05)
+fast2 = Frontier(conn, owner="fast", lease_s=60)
+slow2.add("rotors", seeds("p", 2))
+held2 = slow2.lease(2)
+none2 = fast2.lease(2)
+extended2 = slow2.extend(held2[:1])
+time.sleep(0.1)
+taken2 = fast2.lease(2)
+lost2 = slow2.ack(held2)
+acked2 = fast2.ack(taken2)
+outstanding2 = fast2.outstanding()
+try:
+    Frontier(conn, lease_s=0)
+    invalid2 = False
+except ValueError:
+    invalid2 = True
+conn.close()
+
+checks2 = [
+    (none2 == [] and extended2 == 1, "Live leases not claimable"),
+    (names(taken2) == ["p0", "p1"], "Expired leases taken over by another worker"),
+    (lost2 == 0 and acked2 == 2 and outstanding2 == 0, "Previous owner's late ack rejected"),
+    (invalid2, "lease_s <= 0 rejected"),
+]
+results_summary.append(report(2, checks2))
+remove_db(db2)
+
+# ============================================================
+# Test 3: Concurrent leasing from several processes
+# ============================================================
+print("\n[TEST 3] 4 processes leasing from one database file")
+print("-" * 60)
+
+
+def lease_all(db_path: str, owner: str, results) -> None:
+    conn = connect(db_path, "bulk_load")
+    frontier = Frontier(conn, owner=owner)
+    leased = []
+    while True:
+        entries = frontier.lease(3)
+        if not entries:
+            break
+        leased.extend(entry["id"] for entry in entries)
+        frontier.ack(entries)
+    conn.close()
+    results.put((owner, leased))
+
+
+db3 = new_db()
+conn = connect(db3, "bulk_load")
+Frontier(conn).add("rotors", seeds("p", 200))
+conn.close()
+results3 = multiprocessing.Queue()
+workers3 = [multiprocessing.Process(target=lease_all, args=(db3, f"w{i}", results3))
+            for i in range(4)]
+for worker in workers3:
+    worker.start()
+leased3 = dict(results3.get(timeout=60) for _ in workers3)
+for worker in workers3:
+    worker.join()
+all3 = [entry_id for ids in leased3.values() for entry_id in ids]
+conn = sqlite3.connect(db3)
+done3 = conn.execute("SELECT COUNT(*) FROM crawl_frontier WHERE status = 'done'").fetchone()[0]
+conn.close()
+
+checks3 = [
+    (len(all3) == 200 and len(set(all3)) == 200, f"Each entry leased exactly once ({len(all3)} leases)"),
+    (done3 == 200, "Every entry done"),
+]
+results_summary.append(report(3, checks3))
+remove_db(db3)
+
+# ============================================================
+# Test 4: ingest_frontier() workers
+# ============================================================
+print("\n[TEST 4] 2 ingest_frontier() worker processes against the local server")
+print("-" * 60)
+
+with open(os.path.join("tests", "fixtures", "product_pages", "dba_rotor_01.html"),
+          encoding="utf-8") as f:
+    ROTOR_HTML = f.read()
+
+site4 = tempfile.mkdtemp()
+for i in range(6):
+    with open(os.path.join(site4, f"p{i}.html"), "w", encoding="utf-8") as f:
+        f.write(ROTOR_HTML.replace("DBA42134S", f"DBA4213{i}S"))
+server = LocalServer(site4).start()
+db4 = new_db()
+conn = connect(db4, "bulk_load")
+Frontier(conn).add("rotors", [("dba", server.url(f"p{i}.html"), "", "product") for i in range(6)]
+                   + [("dba", server.url("missing.html"), "", "product")])
+conn.close()
+
+
+def run_worker(db_path: str, owner: str) -> None:
+    ingest_pipeline.ingest_frontier(group="rotors", enqueue=False, worker_id=owner,
+                                    lease_size=2, max_attempts=2, db_path=db_path)
+
+
+try:
+    workers4 = [multiprocessing.Process(target=run_worker, args=(db4, f"w{i}")) for i in range(2)]
+    for worker in workers4:
+        worker.start()
+    for worker in workers4:
+        worker.join(timeout=60)
+    requests4 = sorted(server.request_log)
+finally:
+    server.stop()
+conn = sqlite3.connect(db4)
+rotors4 = conn.execute("SELECT COUNT(*) FROM rotors").fetchone()[0]
+owners4 = {row[0] for row in conn.execute("SELECT DISTINCT lease_owner FROM crawl_frontier")}
+status4 = dict(conn.execute("SELECT status, COUNT(*) FROM crawl_frontier GROUP BY status").fetchall())
+missing4 = conn.execute("SELECT attempts, last_error FROM crawl_frontier "
+                        "WHERE url LIKE '%missing.html'").fetchone()
+conn.close()
+idle4 = ingest_pipeline.ingest_frontier(group="rotors", db_path=db4, enqueue=False)
+
+checks4 = [
+    (all(worker.exitcode == 0 for worker in workers4), "Workers exit cleanly once drained"),
+    (requests4 == ["/missing.html"] * 2 + [f"/p{i}.html" for i in range(6)],
+     f"Every page fetched once, the 404 once per attempt: {requests4}"),
+    (rotors4 == 6 and status4 == {"done": 6, "failed": 1}, f"6 rotors stored, frontier {status4}"),
+    (missing4[0] == 2 and "404" in missing4[1], "Failed page keeps its last error"),
+    (owners4 == {None}, "No lease left behind"),
+    (idle4["leased"] == 0 and idle4["frontier"]["done"] == 6, "Drained frontier: nothing to lease"),
+]
+results_summary.append(report(4, checks4))
+remove_db(db4)
+for name in os.listdir(site4):
+    os.remove(os.path.join(site4, name))
+os.rmdir(site4)
+
+# ============================================================
+# Summary
+# ============================================================
+total_passed = sum(p for p, _ in results_summary)
+total_failed = sum(f for _, f in results_summary)
+
+print("\n" + "="*60)
+print("ALL TESTS COMPLETED")
+print(f"Total: {total_passed} PASSED, {total_failed} FAILED")
+print("="*60)
@@ -0,0 +1,185 @@
+"""
+Test suite for the selectable HTML parser backends (data_scraper/spec_extract.py).
+Covers backend selection, the spec-element parse filter, identical records
+across installed backends and backend propagation to parser processes.
+Checks for optional backends pass trivially when lxml/selectolax are missing.
+"""
+
+import os
+import sys
+sys.path.insert(0, '.')
+
+from data_scraper import spec_extract
+from data_scraper.html_scraper import (
+    parse_dba_rotor_page,
+    parse_ebc_pad_page,
+    parse_wheelsize_vehicle_page,
+)
+from data_scraper.parallel_parse import parse_pages
+from data_scraper.spec_extract import (
+    SPEC_FILTER,
+    backend_available,
+    get_html_backend,
+    make_soup,
+    parse_spec_nodes,
+    set_html_backend,
+)
+
+print("="*60)
+print("HTML BACKEND TESTS")
+print("="*60)
+
+
+def report(number: int, checks: list) -> tuple:
+    passed = sum(1 for check, _ in checks if check)
+    failed = len(checks) - passed
+    for check, message in checks:
+        status = "[PASS]" if check else "[FAIL]"
+        print(f"{status} {message}")
+    if failed == 0:
+        print(f"\n[PASS] Test {number} PASSED ({passed}/{passed} checks)")
+    else:
+        print(f"\n[FAIL] Test {number} FAILED ({passed}/{passed+failed} checks)")
+    return passed, failed
+
+
+def fixture(path: str) -> str:
+    with open(os.path.join("tests", "fixtures", path), encoding="utf-8") as f:
+        return f.read()
+
+
+INSTALLED = [b for b in spec_extract.HTML_BACKENDS if backend_available(b)]
+HAS_HTML5 = "selectolax" in INSTALLED or "lxml" in INSTALLED
+print(f"Installed backends: {INSTALLED}")
+
+PAGES = [
+    fixture("product_pages/dba_rotor_01.html"),
+    """
+<html><head><script>var spec = "<td>PCD</td>";</script></head><body>
+    <nav><div class="menu"><a href="/">Rotors</a></div></nav>
+    <h1>EBC Yellowstuff Performance Pad FA256R &amp; kit</h1>
+    <table class="product-specifications">
+        <tr><th>Shape Code</th><td>256</td></tr>
+        <tr><td>Pad Length</td><td>120.0mm</td></tr>
+        <tr><td>Make</td><td>BMW <b>E90</b></td></tr>
+    </table>
+    <dl><dt>Thickness</dt><dd>17.5mm</dd><dt>Model</dt><dd>3 Series</dd></dl>
+    <div class="spec-block" data-diameter="330mm" data-hat-height data-pcd="5x120"></div>
+    <p>Part code: <span class="Product-Code">FA256R</span></p>
+</body></html>
+""",
+]
+
+PARSERS = [parse_dba_rotor_page, parse_ebc_pad_page, parse_wheelsize_vehicle_page]
+
+results_summary = []
+
+# ============================================================
+# Test 1: Backend selection
+# ============================================================
+print("\n[TEST 1] set_html_backend() / get_html_backend()")
+print("-" * 60)
+
+default1 = get_html_backend()
+try:
+    set_html_backend("html5lib")
+    unknown1 = False
+except ValueError:
+    unknown1 = True
+
+saved_lexbor, saved_lxml = spec_extract.LexborHTMLParser, spec_extract.lxml
+spec_extract.LexborHTMLParser, spec_extract.lxml = None, None
+try:
+    set_html_backend("selectolax")
+    missing1 = False
+except ImportError:
+    missing1 = True
+auto_without1 = set_html_backend("auto")
+spec_extract.LexborHTMLParser, spec_extract.lxml = saved_lexbor, saved_lxml
+auto1 = set_html_backend("auto")
+set_html_backend("html.parser")
+
+checks1 = [
+    (default1 == "html.parser", "html.parser is the default"),
+    (unknown1, "Unknown backend -> ValueError"),
+    (missing1, "Backend not installed -> ImportError"),
+    (auto_without1 == "html.parser", "auto falls back to html.parser"),
+    (auto1 == INSTALLED[-1], f"auto picks the fastest installed backend ({auto1})"),
+]
+results_summary.append(report(1, checks1))
+
+# ============================================================
+# Test 2: Parse filter
+# ============================================================
+print("\n[TEST 2] SPEC_FILTER builds only the spec elements")
+print("-" * 60)
+
+soup2 = make_soup(PAGES[1], SPEC_FILTER)
+names2 = {tag.name for tag in soup2.find_all(True)}
+nodes2 = parse_spec_nodes(PAGES[1], ["data-diameter"])
+
+checks2 = [
+    ("nav" not in names2 and "script" not in names2 and "p" not in names2, "Non-spec elements skipped"),
+    ({"table", "dl", "h1", "span"} <= names2, "Tables, dls, h1 and product-code span kept"),
+    (len(soup2.find_all("div")) == 1, "Only the div with data-* attributes kept"),
+    (len(nodes2["table_rows"]) == 3 and len(nodes2["dl_pairs"]) == 2, "All rows and pairs collected"),
+]
+results_summary.append(report(2, checks2))
+
+# ============================================================
+# Test 3: Same records on every installed backend
+# ============================================================
+print("\n[TEST 3] Records identical across backends")
+print("-" * 60)
+
+expected3 = [[parse(page) for parse in PARSERS] for page in PAGES]
+checks3 = []
+for backend in INSTALLED:
+    set_html_backend(backend)
+    checks3.append(([[parse(page) for parse in PARSERS] for page in PAGES] == expected3,
+                    f"{backend}: same records as html.parser"))
+set_html_backend("html.parser")
+
+checks3 += [
+    (expected3[0][0]["catalog_ref"] == "DBA42134S", "DBA fixture parsed"),
+    (expected3[1][1]["catalog_ref"] == "FA256R" and expected3[1][1]["thickness_mm"] == 17.5,
+     "Product-code span and dl read"),
+    (expected3[1][0]["outer_diameter_mm"] == 330 and expected3[1][0]["hat_height_mm"] is None,
+     "data-* attributes read, valueless attribute -> empty"),
+    (expected3[1][2]["make"] == "BMW E90" and expected3[1][2]["hub_bolt_hole_count_raw"] == "5",
+     "Nested markup text and vehicle data-pcd"),
+]
+results_summary.append(report(3, checks3))
+
+# ============================================================
+# Test 4: Backend used by parser processes
+# ============================================================
+print("\n[TEST 4] parse_pages() workers inherit the backend")
+print("-" * 60)
+
+# Unclosed <dd>: html.parser nests the next terms in it, HTML5 parsers close it
+html4 = "<html><body><h1>DBA 42134</h1><dl><dt>Diameter</dt><dd>300mm<dt>Thickness</dt><dd>20mm</dl></body></html>"
+html5_backend = "selectolax" if "selectolax" in INSTALLED else "lxml"
+if HAS_HTML5:
+    set_html_backend(html5_backend)
+pool4 = list(parse_pages([("dba", "rotor", html4)] * 2, workers=1))
+set_html_backend("html.parser")
+serial4 = list(parse_pages([("dba", "rotor", html4)], workers=0))
+
+checks4 = [
+    (serial4[0][1][0]["outer_diameter_mm"] is None, "html.parser keeps the nested dd"),
+    (not HAS_HTML5 or pool4[0][1][0]["outer_diameter_mm"] == 300,
+     f"Worker process parsed with {html5_backend if HAS_HTML5 else 'n/a (not installed)'}"),
+]
+results_summary.append(report(4, checks4))
+
+# ============================================================
+# Summary
+# ============================================================
+total_passed = sum(p for p, _ in results_summary)
+total_failed = sum(f for _, f in results_summary)
+
+print("\n" + "="*60)
+print("ALL TESTS COMPLETED")
+print(f"Total: {total_passed} PASSED, {total_failed} FAILED")
+print("="*60)
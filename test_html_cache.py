@@ -0,0 +1,213 @@
+"""
+Test suite for the on-disk HTML cache (data_scraper/html_cache.py).
+Covers hits, conditional revalidation (Last-Modified / ETag), content
+addressing, LRU eviction, offline mode and the fetch_html() integration,
+against a local stand-in HTTP server (no network).
+"""
+
+import glob
+import os
+import sys
+import tempfile
+sys.path.insert(0, '.')
+
+import requests
+
+from data_scraper import html_cache
+from data_scraper.html_cache import CacheMiss, HtmlCache
+from data_scraper.html_scraper import fetch_html
+from tests.local_server import LocalServer
+
+print("="*60)
+print("HTML CACHE TESTS")
+print("="*60)
+
+
+def report(number: int, checks: list) -> tuple:
+    passed = sum(1 for check, _ in checks if check)
+    failed = len(checks) - passed
+    for check, message in checks:
+        status = "[PASS]" if check else "[FAIL]"
+        print(f"{status} {message}")
+    if failed == 0:
+        print(f"\n[PASS] Test {number} PASSED ({passed}/{passed} checks)")
+    else:
+        print(f"\n[FAIL] Test {number} FAILED ({passed}/{passed+failed} checks)")
+    return passed, failed
+
+
+results_summary = []
+server = LocalServer(os.path.join("tests", "fixtures")).start()
+page = "rotor_lists/autodoc_list_01.html"
+page_url = server.url(page)
+with open(os.path.join("tests", "fixtures", page), encoding="utf-8") as f:
+    page_html = f.read()
+
+# ============================================================
+# Test 1: Miss then hit
+# ============================================================
+print("\n[TEST 1] Fresh entries are served from disk")
+print("-" * 60)
+
+dir1 = tempfile.mkdtemp()
+cache1 = HtmlCache(dir1)
+server.request_log.clear()
+first1 = cache1.fetch(page_url)
+second1 = cache1.fetch(page_url)
+print(f"Requests: {len(server.request_log)}, stats: {cache1.stats}")
+
+checks1 = [
+    (first1 == page_html and second1 == page_html, "Body identical to the page"),
+    (len(server.request_log) == 1, "Second fetch made no request"),
+    (cache1.stats["misses"] == 1 and cache1.stats["hits"] == 1, "Stats: 1 miss, 1 hit"),
+    (len(glob.glob(os.path.join(dir1, "objects", "*", "*.gz"))) == 1, "Body stored gzip-compressed"),
+]
+results_summary.append(report(1, checks1))
+
+# ============================================================
+# Test 2: Stale entry revalidated with If-Modified-Since
+# ============================================================
+print("\n[TEST 2] Stale entry -> conditional GET -> 304")
+print("-" * 60)
+
+cache2 = HtmlCache(tempfile.mkdtemp(), ttl=0)
+cache2.fetch(page_url)
+server.headers_log.clear()
+body2 = cache2.fetch(page_url)
+headers2 = server.headers_log[-1]
+print(f"Conditional headers: If-Modified-Since={headers2.get('If-Modified-Since')}")
+
+checks2 = [
+    ("If-Modified-Since" in headers2, "Last-Modified sent back as If-Modified-Since"),
+    (body2 == page_html, "304 reuses the cached body"),
+    (cache2.stats["revalidated"] == 1 and cache2.stats["stored"] == 1, "Stats: 1 revalidation, nothing re-stored"),
+]
+results_summary.append(report(2, checks2))
+
+# ============================================================
+# Test 3: ETag revalidation and content change
+# ============================================================
+print("\n[TEST 3] ETag -> If-None-Match, changed page replaces entry")
+print("-" * 60)
+
+html_type = {"Content-Type": "text/html; charset=utf-8"}
+server.script("/etag.html", 200, {**html_type, "ETag": '"v1"'}, "<p>v1 é</p>".encode("utf-8"))
+server.script("/etag.html", 304, {"ETag": '"v1"'})
+server.script("/etag.html", 200, {**html_type, "ETag": '"v2"'}, b"<p>v2</p>")
+cache3 = HtmlCache(tempfile.mkdtemp(), ttl=0)
+etag_url = server.url("etag.html")
+server.headers_log.clear()
+bodies3 = [cache3.fetch(etag_url) for _ in range(3)]
+print(f"Bodies: {bodies3}")
+
+checks3 = [
+    (server.headers_log[1].get("If-None-Match") == '"v1"', "ETag sent back as If-None-Match"),
+    (bodies3 == ["<p>v1 é</p>", "<p>v1 é</p>", "<p>v2</p>"], "304 reuses body, 200 replaces it"),
+    (server.headers_log[2].get("If-None-Match") == '"v1"', "Revalidated entry keeps its ETag"),
+    (cache3.lookup(etag_url)["etag"] == '"v2"', "New ETag recorded"),
+]
+results_summary.append(report(3, checks3))
+
+# ============================================================
+# Test 4: Content addressing and error responses
+# ============================================================
+print("\n[TEST 4] Identical bodies stored once; errors not cached")
+print("-" * 60)
+
+dir4 = tempfile.mkdtemp()
+cache4 = HtmlCache(dir4)
+cache4.fetch(page_url + "?a=1")
+cache4.fetch(page_url + "?a=2")
+try:
+    cache4.fetch(server.url("missing.html"))
+    error4 = None
+except requests.HTTPError as e:
+    error4 = e
+
+checks4 = [
+    (len(glob.glob(os.path.join(dir4, "objects", "*", "*.gz"))) == 1, "Two URLs, one stored object"),
+    (cache4.lookup(page_url + "?a=1")["content_hash"] == cache4.lookup(page_url + "?a=2")["content_hash"], "Both URLs map to the same hash"),
+    (error4 is not None and error4.response.status_code == 404, "HTTP errors still raised"),
+    (cache4.lookup(server.url("missing.html")) is None, "Error responses not cached"),
+]
+results_summary.append(report(4, checks4))
+
+# ============================================================
+# Test 5: LRU eviction under the size budget
+# ============================================================
+print("\n[TEST 5] max_bytes bound evicts least recently used pages")
+print("-" * 60)
+
+cache5 = HtmlCache(tempfile.mkdtemp())
+bodies5 = {f"http://example.com/{i}": os.urandom(600).hex() for i in range(4)}
+for url, body in list(bodies5.items())[:3]:
+    cache5.store(url, body)
+size_one = cache5.total_bytes() // 3
+cache5.max_bytes = size_one * 3 + size_one // 2
+cache5.read("http://example.com/0", cache5.lookup("http://example.com/0"))  # most recent now
+cache5.store("http://example.com/3", bodies5["http://example.com/3"])
+remaining5 = [url for url in bodies5 if cache5.lookup(url)]
+print(f"Remaining: {remaining5}, bytes: {cache5.total_bytes()} / {cache5.max_bytes}")
+
+checks5 = [
+    (remaining5 == ["http://example.com/0", "http://example.com/2", "http://example.com/3"], "Least recently used entry evicted"),
+    (cache5.total_bytes() <= cache5.max_bytes, "Cache back under max_bytes"),
+    (cache5.stats["evicted"] == 1, "Eviction counted"),
+]
+results_summary.append(report(5, checks5))
+
+# ============================================================
+# Test 6: Offline mode (cache persisted on disk)
+# ============================================================
+print("\n[TEST 6] Offline mode serves only from disk")
+print("-" * 60)
+
+cache1.close()
+offline6 = HtmlCache(dir1, ttl=0, offline=True)
+server.request_log.clear()
+body6 = offline6.fetch(page_url)
+try:
+    offline6.fetch(server.url("rotor_lists/misterauto_list_01.html"))
+    missed6 = False
+except CacheMiss:
+    missed6 = True
+
+checks6 = [
+    (body6 == page_html, "Stale entry served from a reopened cache"),
+    (missed6, "Uncached URL raises CacheMiss"),
+    (server.request_log == [], "No network requests in offline mode"),
+]
+results_summary.append(report(6, checks6))
+
+# ============================================================
+# Test 7: fetch_html() uses the configured cache
+# ============================================================
+print("\n[TEST 7] configure_cache() / disable_cache() and fetch_html()")
+print("-" * 60)
+
+html_cache.configure_cache(tempfile.mkdtemp())
+server.request_log.clear()
+cached7 = [fetch_html(page_url) for _ in range(3)]
+requests_cached7 = len(server.request_log)
+html_cache.disable_cache()
+fetch_html(page_url)
+
+checks7 = [
+    (all(p == page_html for p in cached7), "Pages returned through the cache"),
+    (requests_cached7 == 1, "3 fetch_html() calls, 1 request"),
+    (len(server.request_log) == 2 and html_cache.get_cache() is None, "Disabled cache goes to the network"),
+]
+results_summary.append(report(7, checks7))
+
+server.stop()
+
+# ============================================================
+# Summary
+# ============================================================
+total_passed = sum(p for p, _ in results_summary)
+total_failed = sum(f for _, f in results_summary)
+
+print("\n" + "="*60)
+print("ALL TESTS COMPLETED")
+print(f"Total: {total_passed} PASSED, {total_failed} FAILED")
+print("="*60)
@@ -0,0 +1,174 @@
+"""
+Test suite for the record/replay HTTP archive (data_scraper/http_archive.py).
+Records responses from a local stand-in HTTP server, stops the server, then
+replays them offline through fetch_html() and the ingestion processors.
+"""
+
+import os
+import sqlite3
+import sys
+import tempfile
+sys.path.insert(0, '.')
+
+import requests
+
+from data_scraper import http_archive
+from data_scraper.http_archive import ArchiveMiss, HttpArchive
+from data_scraper.domain_scheduler import retry_after_from_error
+from data_scraper.fetch_engine import iter_fetch
+from data_scraper.html_scraper import fetch_html
+from database.ingest_pipeline import process_rotor_seed
+from tests.local_server import LocalServer
+
+print("="*60)
+print("HTTP ARCHIVE (RECORD/REPLAY) TESTS")
+print("="*60)
+
+
+def report(number: int, checks: list) -> tuple:
+    passed = sum(1 for check, _ in checks if check)
+    failed = len(checks) - passed
+    for check, message in checks:
+        status = "[PASS]" if check else "[FAIL]"
+        print(f"{status} {message}")
+    if failed == 0:
+        print(f"\n[PASS] Test {number} PASSED ({passed}/{passed} checks)")
+    else:
+        print(f"\n[FAIL] Test {number} FAILED ({passed}/{passed+failed} checks)")
+    return passed, failed
+
+
+def fixture(path: str) -> str:
+    with open(os.path.join("tests", "fixtures", path), encoding="utf-8") as f:
+        return f.read()
+
+
+results_summary = []
+archive_dir = tempfile.mkdtemp()
+server = LocalServer(os.path.join("tests", "fixtures")).start()
+list_pages = ["rotor_lists/autodoc_list_01.html", "rotor_lists/misterauto_list_01.html",
+              "rotor_lists/powerstop_list_01.html"]
+list_urls = [server.url(p) for p in list_pages]
+rotor_url = server.url("product_pages/dba_rotor_01.html")
+busy_url = server.url("busy.html")
+server.script("/busy.html", 429, {"Retry-After": "3"}, b"slow down")
+
+# ============================================================
+# Test 1: Record mode archives every response
+# ============================================================
+print("\n[TEST 1] Record mode - live fetches written to the archive")
+print("-" * 60)
+
+http_archive.configure_archive(archive_dir, http_archive.RECORD)
+recorded1 = list(iter_fetch(list_urls + [rotor_url, busy_url], concurrency=3))
+stats1 = dict(http_archive.get_archive().stats)
+http_archive.disable_archive()
+server.stop()
+print(f"Stats: {stats1}")
+
+checks1 = [
+    (all(r[3] is None for r in recorded1[:4]), "Pages fetched live while recording"),
+    (recorded1[4][3] is not None and "429" in str(recorded1[4][3]), "Error still raised while recording"),
+    (stats1["recorded"] == 5, "All 5 responses recorded (errors included)"),
+    (os.path.isfile(os.path.join(archive_dir, "index.jsonl")), "index.jsonl written"),
+]
+results_summary.append(report(1, checks1))
+
+# ============================================================
+# Test 2: Replay with the server stopped
+# ============================================================
+print("\n[TEST 2] Replay mode - same pages, no network")
+print("-" * 60)
+
+archive2 = http_archive.configure_archive(archive_dir, http_archive.REPLAY)
+replayed2 = list(iter_fetch(list_urls, concurrency=3))
+
+checks2 = [
+    (len(archive2) == 5, "Archive reopened with 5 URLs"),
+    (all(r[3] is None for r in replayed2), "Every page replayed with the server down"),
+    ([r[2] for r in replayed2] == [fixture(p) for p in list_pages], "Bodies identical to the originals"),
+    (archive2.stats["replayed"] == 3, "Replays counted"),
+]
+results_summary.append(report(2, checks2))
+
+# ============================================================
+# Test 3: Status and headers replayed
+# ============================================================
+print("\n[TEST 3] Archived errors replay as HTTPError")
+print("-" * 60)
+
+try:
+    fetch_html(busy_url)
+    error3 = None
+except requests.HTTPError as e:
+    error3 = e
+response3 = archive2.replay(rotor_url)
+print(f"Replayed error: {error3}")
+
+checks3 = [
+    (error3 is not None and error3.response.status_code == 429, "429 replayed as HTTPError"),
+    (retry_after_from_error(error3) == 3.0, "Retry-After header replayed"),
+    (response3.headers.get("Content-Type") == "text/html; charset=utf-8", "Headers replayed"),
+    ("Content-Length" not in response3.headers, "Transfer headers dropped"),
+]
+results_summary.append(report(3, checks3))
+
+# ============================================================
+# Test 4: Unrecorded URL
+# ============================================================
+print("\n[TEST 4] Unrecorded URL -> ArchiveMiss")
+print("-" * 60)
+
+try:
+    fetch_html("http://example.com/never-recorded.html")
+    missed4 = False
+except ArchiveMiss:
+    missed4 = True
+
+try:
+    HttpArchive(tempfile.mkdtemp(), http_archive.REPLAY)
+    empty4 = False
+except FileNotFoundError:
+    empty4 = True
+
+checks4 = [
+    (missed4, "Missing URL raises ArchiveMiss"),
+    (archive2.stats["missing"] == 1, "Miss counted"),
+    (empty4, "Replay of a directory without an archive refused"),
+]
+results_summary.append(report(4, checks4))
+
+# ============================================================
+# Test 5: Re-ingest offline
+# ============================================================
+print("\n[TEST 5] process_rotor_seed() from the archive")
+print("-" * 60)
+
+db_fd, db_path = tempfile.mkstemp(suffix=".db")
+os.close(db_fd)
+conn = sqlite3.connect(db_path)
+with open(os.path.join("database", "init.sql"), encoding="utf-8") as f:
+    conn.executescript(f.read())
+inserted5 = process_rotor_seed(conn, "dba", rotor_url)
+row5 = conn.execute("SELECT brand, catalog_ref FROM rotors").fetchone()
+conn.close()
+os.remove(db_path)
+http_archive.disable_archive()
+print(f"Inserted: {inserted5}, row: {row5}")
+
+checks5 = [
+    (inserted5 == 1, "Rotor ingested from the archive"),
+    (row5 is not None and row5[1] == "DBA42134S", "Parsed fields match the recorded page"),
+]
+results_summary.append(report(5, checks5))
+
+# ============================================================
+# Summary
+# ============================================================
+total_passed = sum(p for p, _ in results_summary)
+total_failed = sum(f for _, f in results_summary)
+
+print("\n" + "="*60)
+print("ALL TESTS COMPLETED")
+print(f"Total: {total_passed} PASSED, {total_failed} FAILED")
+print("="*60)
@@ -0,0 +1,135 @@
+"""
+Test suite for the shared pooled HTTP client (data_scraper/http_client.py).
+Checks connection reuse, shared headers and that every fetcher uses the pool,
+against a local stand-in HTTP server (no network).
+"""
+
+import os
+import sys
+import tempfile
+sys.path.insert(0, '.')
+
+from data_scraper import http_client
+from data_scraper.html_scraper import fetch_html
+from data_scraper.fetch_engine import iter_fetch
+from tools.site_access_audit import probe_url
+from tests.local_server import LocalServer
+import run_mission10_4_validation
+
+print("="*60)
+print("HTTP CLIENT (CONNECTION POOLING) TESTS")
+print("="*60)
+
+
+def report(number: int, checks: list) -> tuple:
+    passed = sum(1 for check, _ in checks if check)
+    failed = len(checks) - passed
+    for check, message in checks:
+        status = "[PASS]" if check else "[FAIL]"
+        print(f"{status} {message}")
+    if failed == 0:
+        print(f"\n[PASS] Test {number} PASSED ({passed}/{passed} checks)")
+    else:
+        print(f"\n[FAIL] Test {number} FAILED ({passed}/{passed+failed} checks)")
+    return passed, failed
+
+
+results_summary = []
+server = LocalServer(os.path.join("tests", "fixtures")).start()
+page_url = server.url("rotor_lists/autodoc_list_01.html")
+
+# ============================================================
+# Test 1: Sequential fetches reuse one connection
+# ============================================================
+print("\n[TEST 1] fetch_html() reuses a keep-alive connection")
+print("-" * 60)
+
+http_client.close_session()
+server.connections.clear()
+pages1 = [fetch_html(page_url) for _ in range(10)]
+print(f"Requests: 10, TCP connections: {len(server.connections)}")
+
+checks1 = [
+    (all(p == pages1[0] for p in pages1) and "product-item" in pages1[0], "Pages fetched"),
+    (len(server.connections) == 1, "10 sequential requests over 1 connection"),
+]
+results_summary.append(report(1, checks1))
+
+# ============================================================
+# Test 2: Shared headers and compression negotiation
+# ============================================================
+print("\n[TEST 2] Shared headers sent on every request")
+print("-" * 60)
+
+headers2 = server.headers_log[-1]
+print(f"Headers: {headers2}")
+
+checks2 = [
+    (headers2.get("User-Agent") == http_client.USER_AGENT, "Browser User-Agent sent"),
+    ("gzip" in headers2.get("Accept-Encoding", ""), "gzip negotiated"),
+    ("text/html" in headers2.get("Accept", ""), "Accept header sent"),
+    (headers2.get("Connection", "").lower() == "keep-alive", "Keep-alive requested"),
+]
+results_summary.append(report(2, checks2))
+
+# ============================================================
+# Test 3: Concurrent fetches bounded by the per-host pool
+# ============================================================
+print("\n[TEST 3] Concurrent engine reuses pooled connections")
+print("-" * 60)
+
+http_client.configure_session(pool_maxsize=4)
+server.connections.clear()
+results3 = list(iter_fetch([page_url] * 40, concurrency=4))
+print(f"Requests: 40, TCP connections: {len(server.connections)}")
+
+checks3 = [
+    (all(r[3] is None for r in results3), "All 40 fetches succeeded"),
+    (len(server.connections) <= 4, "At most pool_maxsize connections opened"),
+]
+results_summary.append(report(3, checks3))
+
+# ============================================================
+# Test 4: probe_url() and download_real_html() share the pool
+# ============================================================
+print("\n[TEST 4] probe_url() / download_real_html() use the shared session")
+print("-" * 60)
+
+server.connections.clear()
+seed = {"kind": "rotor", "source": "autodoc", "url": page_url, "page_type": "list"}
+probe4 = [probe_url(seed) for _ in range(3)]
+
+original_cwd = os.getcwd()
+os.chdir(tempfile.mkdtemp())
+try:
+    download4 = run_mission10_4_validation.download_real_html(
+        [{"source": "autodoc_list", "url": page_url}])
+finally:
+    os.chdir(original_cwd)
+connections4 = len(server.connections)
+print(f"Requests: 4, TCP connections: {connections4}")
+
+missing4 = probe_url({**seed, "url": server.url("missing.html")})
+
+checks4 = [
+    (all(p["status_code"] == 200 for p in probe4), "Probes succeed"),
+    (missing4["status_code"] == 404 and missing4["error"].startswith("HTTP 404"), "HTTP errors still reported"),
+    (download4[0]["status"] == "ok", "download_real_html succeeds"),
+    (server.headers_log[-1].get("User-Agent") == http_client.USER_AGENT, "Shared User-Agent used"),
+    (connections4 == 1, "Probes and download reuse one connection"),
+]
+results_summary.append(report(4, checks4))
+
+http_client.close_session()
+server.stop()
+
+# ============================================================
+# Summary
+# ============================================================
+total_passed = sum(p for p, _ in results_summary)
+total_failed = sum(f for _, f in results_summary)
+
+print("\n" + "="*60)
+print("ALL TESTS COMPLETED")
+print(f"Total: {total_passed} PASSED, {total_failed} FAILED")
+print("="*60)
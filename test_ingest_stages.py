@@ -0,0 +1,266 @@
+"""
+Test suite for the staged ingestion runtime (database/ingest_stages.py).
+Covers the pure parse stage, equivalence with the inline processors,
+dedup/validation semantics, backpressure and writer failure handling.
+"""
+
+import os
+import sqlite3
+import sys
+import tempfile
+import threading
+import time
+sys.path.insert(0, '.')
+
+from data_scraper.fetch_engine import iter_fetch
+from database.ingest_pipeline import process_seed, write_parsed_page
+from database.ingest_stages import StagedIngest, parse_seed_page
+
+print("="*60)
+print("STAGED INGESTION PIPELINE TESTS")
+print("="*60)
+
+
+def report(number: int, checks: list) -> tuple:
+    passed = sum(1 for check, _ in checks if check)
+    failed = len(checks) - passed
+    for check, message in checks:
+        status = "[PASS]" if check else "[FAIL]"
+        print(f"{status} {message}")
+    if failed == 0:
+        print(f"\n[PASS] Test {number} PASSED ({passed}/{passed} checks)")
+    else:
+        print(f"\n[FAIL] Test {number} FAILED ({passed}/{passed+failed} checks)")
+    return passed, failed
+
+
+def fixture(path: str) -> str:
+    with open(os.path.join("tests", "fixtures", path), encoding="utf-8") as f:
+        return f.read()
+
+
+def new_db() -> str:
+    fd, path = tempfile.mkstemp(suffix=".db")
+    os.close(fd)
+    conn = sqlite3.connect(path)
+    with open("database/init.sql", "r", encoding="utf-8") as f:
+        conn.executescript(f.read())
+    conn.close()
+    return path
+
+
+def table_rows(db_path: str) -> dict:
+    conn = sqlite3.connect(db_path)
+    rows = {
+        "rotors": conn.execute("SELECT brand, catalog_ref FROM rotors ORDER BY id").fetchall(),
+        "pads": conn.execute("SELECT brand, catalog_ref FROM pads ORDER BY id").fetchall(),
+        "vehicles": conn.execute("SELECT make, model, year_from FROM vehicles ORDER BY id").fetchall(),
+    }
+    conn.close()
+    return rows
+
+
+PAD_HTML = """
+<html><body>
+    <h1>EBC Yellowstuff Performance Pad FA256R</h1>
+    <table class="product-specifications">
+        <tr><td>Shape Code</td><td>256</td></tr>
+        <tr><td>Pad Length</td><td>120.0mm</td></tr>
+        <tr><td>Pad Height</td><td>52.5mm</td></tr>
+        <tr><td>Pad Thickness</td><td>17.5mm</td></tr>
+        <tr><td>Part Number</td><td>FA256R</td></tr>
+    </table>
+</body></html>
+"""
+
+VEHICLE_HTML = """
+<html><body>
+    <h1>BMW 3 Series Vehicle Specifications</h1>
+    <table class="vehicle-specs">
+        <tr><th>Make</th><td>BMW</td></tr>
+        <tr><th>Model</th><td>3 Series</td></tr>
+        <tr><th>Year From</th><td>2005</td></tr>
+        <tr><th>Bolt Pattern</th><td>5x120</td></tr>
+        <tr><th>Center Bore</th><td>72.6</td></tr>
+    </table>
+</body></html>
+"""
+
+# (group, seed, html): seed = (source, url, notes, page_type)
+PAGES = [
+    ("rotors", ("autodoc", "http://autodoc.test/list", "", "list"), fixture("rotor_lists/autodoc_list_01.html")),
+    ("rotors", ("dba", "http://dba.test/rotor", "", "product"), fixture("product_pages/dba_rotor_01.html")),
+    ("pads", ("ebc", "http://ebc.test/fa256r", "", "product"), PAD_HTML),
+    ("pads", ("ebc", "http://ebc.test/fa256r-copy", "", "product"), PAD_HTML),
+    ("pads", ("ebc", "http://ebc.test/empty", "", "product"), "<html><body></body></html>"),
+    ("vehicles", ("wheelsize", "http://ws.test/bmw", "", "product"), VEHICLE_HTML),
+    ("vehicles", ("wheelsize", "http://ws.test/bmw-copy", "", "product"), VEHICLE_HTML),
+]
+
+
+def run_staged(db_path, pages, parse_workers, ordered=True, queue_size=4, write_page=write_parsed_page):
+    """Run the stages over pre-fetched pages, one run() per group."""
+    results = {}
+    with StagedIngest(db_path, write_page, parse_workers=parse_workers,
+                      queue_size=queue_size) as stages:
+        for group in ("rotors", "pads", "vehicles"):
+            group_pages = [p for p in pages if p[0] == group]
+            seeds = [seed for _, seed, _ in group_pages]
+            fetched = [(i, seed[1], html, None) for i, (_, seed, html) in enumerate(group_pages)]
+            results[group] = stages.run(group, seeds, fetched, ordered=ordered)
+    return results, stages
+
+
+results_summary = []
+
+# ============================================================
+# Test 1: Pure parse stage
+# ============================================================
+print("\n[TEST 1] parse_seed_page() - parse, normalize, validate")
+print("-" * 60)
+
+list1 = parse_seed_page("rotors", "autodoc", "list", PAGES[0][2])
+rotor1 = parse_seed_page("rotors", "dba", "product", PAGES[1][2])
+empty1 = parse_seed_page("pads", "ebc", "product", "<html></html>")
+vehicle1 = parse_seed_page("vehicles", "wheelsize", "product", VEHICLE_HTML)
+
+checks1 = [
+    (list1["kind"] == "rotor_list" and list1["extracted"] == 6, "List page: 6 rotors extracted"),
+    (list1["records"] == [] and sum("Missing required fields" in l for l in list1["log"]) == 6, "List rotors without hat height rejected"),
+    (rotor1["records"][0][1]["catalog_ref"] == "DBA42134S", "Product page: 1 valid rotor"),
+    (empty1["records"] == [] and empty1["error"] is None and empty1["log"], "Empty pad page rejected with a message"),
+    (vehicle1["records"][0][1]["hub_bolt_hole_count"] == 5, "Vehicle normalized in the parse stage"),
+    (parse_seed_page("tyres", "x", "product", "")["kind"] is None, "Unknown group ignored"),
+]
+results_summary.append(report(1, checks1))
+
+# ============================================================
+# Test 2: Staged run == inline processors
+# ============================================================
+print("\n[TEST 2] Staged pipeline matches inline process_seed()")
+print("-" * 60)
+
+db_inline = new_db()
+conn = sqlite3.connect(db_inline)
+inline2 = {"rotors": [0, 0], "pads": [0, 0], "vehicles": [0, 0]}
+for group, (source, url, _, page_type), html in PAGES:
+    count = process_seed(conn, group, source, url, page_type, html=html)
+    inline2[group][0] += count
+    inline2[group][1] += count == 0
+conn.commit()
+conn.close()
+
+db_pool = new_db()
+staged2, stages2 = run_staged(db_pool, PAGES, parse_workers=2)
+db_thread = new_db()
+staged2b, _ = run_staged(db_thread, PAGES, parse_workers=0)
+rows2 = table_rows(db_pool)
+stats2 = stages2.stats()
+print(f"Inline: {inline2}, staged: {staged2}")
+
+checks2 = [
+    ({g: [c["inserted"], c["errors"]] for g, c in staged2.items()} == inline2, "Same inserted/error counts per group"),
+    (rows2 == table_rows(db_inline), "Same rows (process pool)"),
+    (table_rows(db_thread) == rows2 and staged2b == staged2, "Same rows (inline parsing)"),
+    (rows2["pads"] == [("ebc", "FA256R")] and len(rows2["vehicles"]) == 1, "Dedup preserved (duplicates skipped)"),
+    (stats2["parse"]["items"] == 7 and stats2["write"]["inserted"] == 3, "Per-stage counters"),
+]
+results_summary.append(report(2, checks2))
+
+# ============================================================
+# Test 3: As-completed mode
+# ============================================================
+print("\n[TEST 3] ordered=False writes every page once")
+print("-" * 60)
+
+db3 = new_db()
+staged3, _ = run_staged(db3, PAGES, parse_workers=2, ordered=False, queue_size=2)
+
+checks3 = [
+    (staged3 == staged2, "Same counts as ordered mode"),
+    (sorted(table_rows(db3)["pads"]) == sorted(rows2["pads"]), "Same pads inserted"),
+]
+results_summary.append(report(3, checks3))
+
+# ============================================================
+# Test 4: Backpressure from a slow writer
+# ============================================================
+print("\n[TEST 4] Slow writer throttles fetching")
+print("-" * 60)
+
+lock4 = threading.Lock()
+fetch_starts = []
+written = []
+
+
+def counting_fetch(url):
+    with lock4:
+        fetch_starts.append(url)
+    return PAD_HTML
+
+
+def slow_write(conn, parsed, url):
+    time.sleep(0.02)
+    with lock4:
+        written.append(len(fetch_starts))
+    return 1
+
+
+db4 = new_db()
+seeds4 = [("ebc", f"http://ebc.test/{i}", "", "product") for i in range(40)]
+with StagedIngest(db4, slow_write, parse_workers=0, queue_size=2) as stages4:
+    fetched4 = iter_fetch([s[1] for s in seeds4], concurrency=2, fetch=counting_fetch,
+                          max_buffered=2)
+    counts4 = stages4.run("pads", seeds4, fetched4)
+stats4 = stages4.stats()
+ahead4 = max(started - (i + 1) for i, started in enumerate(written))
+print(f"Max pages fetched ahead of the writer: {ahead4}, stats: {stats4}")
+
+checks4 = [
+    (counts4["inserted"] == 40, "All pages written"),
+    (ahead4 <= 12, "Fetching stays a bounded distance ahead of writing"),
+    (stats4["max_write_queue"] <= 2 and stats4["max_parse_pending"] <= 2, "Queues never exceed queue_size"),
+    (stats4["blocked_s"] > 0.2, "Dispatcher blocked on the writer"),
+]
+results_summary.append(report(4, checks4))
+
+# ============================================================
+# Test 5: Writer failure rolls back
+# ============================================================
+print("\n[TEST 5] Writer error -> exception and rollback")
+print("-" * 60)
+
+
+def failing_write(conn, parsed, url):
+    write_parsed_page(conn, parsed, url)
+    if "copy" in url:
+        raise sqlite3.OperationalError("disk I/O error")
+    return 1
+
+
+db5 = new_db()
+try:
+    run_staged(db5, PAGES, parse_workers=0, write_page=failing_write)
+    error5 = None
+except sqlite3.OperationalError as e:
+    error5 = e
+
+checks5 = [
+    (error5 is not None, "Writer error raised to the caller"),
+    (table_rows(db5) == {"rotors": [], "pads": [], "vehicles": []}, "Nothing committed"),
+]
+results_summary.append(report(5, checks5))
+
+for path in (db_inline, db_pool, db_thread, db3, db4, db5):
+    os.remove(path)
+
+# ============================================================
+# Summary
+# ============================================================
+total_passed = sum(p for p, _ in results_summary)
+total_failed = sum(f for _, f in results_summary)
+
+print("\n" + "="*60)
+print("ALL TESTS COMPLETED")
+print(f"Total: {total_passed} PASSED, {total_failed} FAILED")
+print("="*60)
@@ -0,0 +1,193 @@
+"""
+Test suite for the streaming JSONL reader (database/jsonl_reader.py).
+Covers schema validation, plain / gzip / zstd input, decoding in worker
+processes, and ingest_jsonl() into an explicit database path.
+"""
+
+import gzip
+import json
+import os
+import sqlite3
+import sys
+import tempfile
+sys.path.insert(0, '.')
+
+from database import ingest_pipeline, jsonl_reader
+from database.jsonl_reader import read_records, validate_record
+
+print("="*60)
+print("STREAMING JSONL READER TESTS")
+print("="*60)
+
+
+def report(number: int, checks: list) -> tuple:
+    passed = sum(1 for check, _ in checks if check)
+    failed = len(checks) - passed
+    for check, message in checks:
+        status = "[PASS]" if check else "[FAIL]"
+        print(f"{status} {message}")
+    if failed == 0:
+        print(f"\n[PASS] Test {number} PASSED ({passed}/{passed} checks)")
+    else:
+        print(f"\n[FAIL] Test {number} FAILED ({passed}/{passed+failed} checks)")
+    return passed, failed
+
+
+def rotor(i: int, **extra) -> dict:
+    record = {
+        "outer_diameter_mm": 300.0 + i % 50, "nominal_thickness_mm": 28.0,
+        "hat_height_mm": 45.0, "overall_height_mm": 52.0, "center_bore_mm": 64.1,
+        "bolt_circle_mm": 114.3, "bolt_hole_count": 5, "ventilation_type": "vented",
+        "directionality": "non_directional", "brand": "DBA", "catalog_ref": f"DBA{i:05d}",
+    }
+    record.update(extra)
+    return record
+
+
+def rejected(record) -> str:
+    try:
+        validate_record("rotors", record)
+        return ""
+    except ValueError as e:
+        return str(e)
+
+
+# 13 lines: 2 blank, 1 malformed, 2 invalid records
+LINES = [json.dumps(rotor(i)) for i in range(8)]
+LINES[2] = json.dumps(rotor(2, offset_mm=None, mounting_type="2_piece_floating"))
+LINES.insert(3, "")
+LINES.insert(5, '{"brand": "DBA", "catalog_ref":')
+LINES.insert(6, json.dumps(rotor(90, bolt_hole_count="5")))
+LINES.insert(9, "   ")
+LINES.append(json.dumps(rotor(91, ventilation_type="wavy")))
+
+
+def write_file(lines: list, opener=open, suffix: str = ".jsonl") -> str:
+    fd, path = tempfile.mkstemp(suffix=suffix)
+    os.close(fd)
+    with opener(path, "wt", encoding="utf-8") as f:
+        f.write("\n".join(lines) + "\n")
+    return path
+
+
+results_summary = []
+
+# ============================================================
+# Test 1: Schema validation
+# ============================================================
+print("\n[TEST 1] validate_record() against data_scraper/schema_rotor.json")
+print("-" * 60)
+
+checks1 = [
+    (rejected(rotor(1)) == "" and rejected(rotor(1, offset_mm=None, rotor_weight_kg=8)) == "",
+     "Valid records (nullable fields, int for number)"),
+    ("missing required" in rejected({k: v for k, v in rotor(1).items() if k != "brand"}),
+     "Missing required field"),
+    ("unknown field 'source'" in rejected(rotor(1, source="dba")), "Unknown field (no such column)"),
+    ("bolt_hole_count" in rejected(rotor(1, bolt_hole_count=5.5))
+     and "bolt_hole_count" in rejected(rotor(1, bolt_hole_count=True)),
+     "Integer field: float and bool rejected"),
+    ("'wavy'" in rejected(rotor(1, ventilation_type="wavy"))
+     and "'wavy'" in rejected(rotor(2, ventilation_type="wavy")), "Enum checked on every record"),
+    ("JSON object" in rejected([1, 2]) and "'300'" in rejected(rotor(1, outer_diameter_mm="300")),
+     "Non-object and string-for-number rejected"),
+]
+results_summary.append(report(1, checks1))
+
+# ============================================================
+# Test 2: read_records()
+# ============================================================
+print("\n[TEST 2] read_records() - compressed input, errors, workers")
+print("-" * 60)
+
+plain2 = write_file(LINES)
+packed2 = write_file(LINES, gzip.open, ".jsonl.gz")
+serial2 = list(read_records(plain2, "rotors", chunk_lines=4))
+gzip2 = list(read_records(packed2, "rotors"))
+pooled2 = list(read_records(plain2, "rotors", workers=2, chunk_lines=3))
+errors2 = {number: str(error) for number, record, error in serial2 if error is not None}
+unchecked2 = [record for _, record, error in read_records(plain2, "rotors", validate=False)
+              if error is None]
+saved_orjson = jsonl_reader.orjson
+jsonl_reader.orjson = None
+try:
+    stdlib2 = list(read_records(plain2, "rotors"))
+finally:
+    jsonl_reader.orjson = saved_orjson
+
+fd, zstd2 = tempfile.mkstemp(suffix=".jsonl.zst")
+os.close(fd)
+if jsonl_reader.zstandard is not None:
+    with open(zstd2, "wb") as f:
+        f.write(jsonl_reader.zstandard.ZstdCompressor().compress(("\n".join(LINES) + "\n").encode()))
+    zstd_ok2 = [(n, r) for n, r, _ in read_records(zstd2, "rotors")] == [(n, r) for n, r, _ in serial2]
+else:
+    with open(zstd2, "wb") as f:
+        f.write(jsonl_reader.ZSTD_MAGIC + b"\x00" * 16)
+    try:
+        list(read_records(zstd2, "rotors"))
+        zstd_ok2 = False
+    except ImportError as e:
+        zstd_ok2 = "zstandard" in str(e)
+
+records2 = [record for _, record, error in serial2 if error is None]
+checks2 = [
+    (len(serial2) == 11 and len(records2) == 8, "Blank lines skipped, 8 records + 3 errors"),
+    ([r["catalog_ref"] for r in records2] == [f"DBA{i:05d}" for i in range(8)], "File order kept"),
+    (sorted(errors2) == [6, 7, 13] and "bolt_hole_count" in errors2[7] and "'wavy'" in errors2[13],
+     f"Line numbers of the bad lines: {sorted(errors2)}"),
+    (records2[2]["offset_mm"] is None, "null decoded as None"),
+    ([(n, r) for n, r, _ in gzip2] == [(n, r) for n, r, _ in serial2] and zstd_ok2,
+     "gzip (and zstd, or a clear ImportError) detected from content"),
+    ([(n, r) for n, r, _ in pooled2] == [(n, r) for n, r, _ in serial2], "Worker processes: same results"),
+    ([(n, r) for n, r, _ in stdlib2] == [(n, r) for n, r, _ in serial2] and len(unchecked2) == 10,
+     "json fallback matches orjson; validate=False keeps invalid records"),
+]
+results_summary.append(report(2, checks2))
+
+# ============================================================
+# Test 3: ingest_jsonl() with an explicit database
+# ============================================================
+print("\n[TEST 3] ingest_jsonl(db_path=...) from a gzip file")
+print("-" * 60)
+
+fd, db3 = tempfile.mkstemp(suffix=".db")
+os.close(fd)
+conn = sqlite3.connect(db3)
+with open("database/init.sql", "r", encoding="utf-8") as f:
+    conn.executescript(f.read())
+conn.close()
+saved_db_path = ingest_pipeline.DB_PATH
+ingest_pipeline.DB_PATH = os.path.join(tempfile.gettempdir(), "missing", "bbk.db")
+try:
+    stats3 = ingest_pipeline.ingest_jsonl(packed2, "rotors", db_path=db3, batch_size=3)
+    again3 = ingest_pipeline.ingest_jsonl(plain2, "rotors", db_path=db3, workers=1)
+finally:
+    ingest_pipeline.DB_PATH = saved_db_path
+conn = sqlite3.connect(db3)
+refs3 = [row[0] for row in conn.execute("SELECT catalog_ref FROM rotors ORDER BY catalog_ref")]
+conn.close()
+
+checks3 = [
+    (refs3 == [f"DBA{i:05d}" for i in range(8)], "Valid records written to db_path"),
+    (stats3["lines"] == 11 and stats3["invalid"] == 3 and stats3["rows"] == 8, f"Stats: {stats3}"),
+    (again3["invalid"] == 3 and again3["rows"] == 0 and again3["skipped"] == 8,
+     "Second load (worker process): all duplicates"),
+    (ingest_pipeline.ingest_jsonl(plain2, "wheels", db_path=db3) is None, "Unknown table ignored"),
+]
+results_summary.append(report(3, checks3))
+
+for path in (plain2, packed2, zstd2, db3, db3 + "-wal", db3 + "-shm"):
+    if os.path.exists(path):
+        os.remove(path)
+
+# ============================================================
+# Summary
+# ============================================================
+total_passed = sum(p for p, _ in results_summary)
+total_failed = sum(f for _, f in results_summary)
+
+print("\n" + "="*60)
+print("ALL TESTS COMPLETED")
+print(f"Total: {total_passed} PASSED, {total_failed} FAILED")
+print("="*60)
@@ -0,0 +1,204 @@
+"""
+Test suite for the preloaded natural-key index (database/key_index.py).
+Covers the Bloom filter, KeyIndex.preload(), BatchWriter filtering and the
+key_index option of ingest_jsonl() / StagedIngest.
+"""
+
+import json
+import os
+import sqlite3
+import sys
+import tempfile
+sys.path.insert(0, '.')
+
+from database import ingest_pipeline
+from database.batch_writer import BatchWriter
+from database.ingest_pipeline import ingest_jsonl, write_parsed_page
+from database.ingest_stages import StagedIngest
+from database.key_index import BloomFilter, KeyIndex
+
+print("="*60)
+print("KEY INDEX TESTS")
+print("="*60)
+
+
+def report(number: int, checks: list) -> tuple:
+    passed = sum(1 for check, _ in checks if check)
+    failed = len(checks) - passed
+    for check, message in checks:
+        status = "[PASS]" if check else "[FAIL]"
+        print(f"{status} {message}")
+    if failed == 0:
+        print(f"\n[PASS] Test {number} PASSED ({passed}/{passed} checks)")
+    else:
+        print(f"\n[FAIL] Test {number} FAILED ({passed}/{passed+failed} checks)")
+    return passed, failed
+
+
+def new_db() -> str:
+    fd, path = tempfile.mkstemp(suffix=".db")
+    os.close(fd)
+    conn = sqlite3.connect(path)
+    with open("database/init.sql", "r", encoding="utf-8") as f:
+        conn.executescript(f.read())
+    conn.close()
+    return path
+
+
+def count(db_path: str, table: str) -> int:
+    conn = sqlite3.connect(db_path)
+    n = conn.execute(f"SELECT COUNT(*) FROM {table}").fetchone()[0]
+    conn.close()
+    return n
+
+
+def rotor(i: int, **extra) -> dict:
+    record = {
+        "outer_diameter_mm": 300.0 + i % 50, "nominal_thickness_mm": 28.0,
+        "hat_height_mm": 45.0, "overall_height_mm": 52.0, "center_bore_mm": 64.1,
+        "bolt_circle_mm": 114.3, "bolt_hole_count": 5, "ventilation_type": "vented",
+        "directionality": "non_directional", "brand": "DBA", "catalog_ref": f"DBA{i:05d}",
+    }
+    record.update(extra)
+    return record
+
+
+results_summary = []
+
+# ============================================================
+# Test 1: Bloom filter
+# ============================================================
+print("\n[TEST 1] BloomFilter - no false negatives, bounded false positives")
+print("-" * 60)
+
+bloom1 = BloomFilter(10000, error_rate=0.01)
+for i in range(10000):
+    bloom1.add(("DBA", f"DBA{i:05d}"))
+missing1 = sum(1 for i in range(10000) if ("DBA", f"DBA{i:05d}") not in bloom1)
+false1 = sum(1 for i in range(20000) if ("EBC", f"EBC{i:05d}") in bloom1)
+
+checks1 = [
+    (missing1 == 0, "Every added key found"),
+    (false1 / 20000 < 0.02, f"False-positive rate {false1 / 20000:.4f} near 0.01"),
+    (bloom1.size_bytes < 15000 and bloom1.count == 10000, f"{bloom1.size_bytes} bytes for 10000 keys"),
+]
+results_summary.append(report(1, checks1))
+
+# ============================================================
+# Test 2: Preload
+# ============================================================
+print("\n[TEST 2] KeyIndex.preload() - set and bloom modes")
+print("-" * 60)
+
+db2 = new_db()
+conn2 = sqlite3.connect(db2)
+BatchWriter(conn2).write("rotors", [rotor(i) for i in range(50)])
+conn2.execute("INSERT INTO vehicles (make, model, year_from, hub_bolt_circle_mm, "
+              "hub_bolt_hole_count, hub_center_bore_mm) VALUES ('Audi', 'A4', 2008, 112.0, 5, 57.1)")
+conn2.commit()
+exact2 = KeyIndex.preload(conn2, mode="set")
+bloom2 = KeyIndex.preload(conn2, mode="bloom")
+only2 = KeyIndex.preload(conn2, tables=["vehicles"])
+try:
+    KeyIndex.preload(conn2, mode="trie")
+    error2 = False
+except ValueError:
+    error2 = True
+conn2.close()
+
+checks2 = [
+    (len(exact2) == 51 and ("rotors", ("DBA", "DBA00007")) in exact2, "Stored keys loaded (set)"),
+    (("rotors", ("DBA", "DBA00050")) not in exact2 and ("pads", ("S1", "EBC", "DP1")) not in exact2,
+     "Unknown keys absent"),
+    (("vehicles", ("Audi", "A4", 2008)) in bloom2 and len(bloom2) == 51, "Stored keys loaded (bloom)"),
+    (("rotors", ("DBA", "DBA00007")) not in only2 and "bloom filter" in bloom2.describe(),
+     "Table selection and summary"),
+    (error2, "Unknown mode rejected"),
+]
+results_summary.append(report(2, checks2))
+
+# ============================================================
+# Test 3: BatchWriter filtering
+# ============================================================
+print("\n[TEST 3] BatchWriter - known keys skipped before SQLite")
+print("-" * 60)
+
+db3 = new_db()
+conn3 = sqlite3.connect(db3)
+BatchWriter(conn3).write("rotors", [rotor(i) for i in range(20)])
+conn3.commit()
+writer3 = BatchWriter(conn3, batch_size=8, key_index=KeyIndex.preload(conn3))
+counts3 = writer3.write("rotors", [rotor(i) for i in range(30)])
+for i in range(25, 35):
+    writer3.add("rotors", rotor(i, brand=None) if i == 33 else rotor(i))
+writer3.commit()
+remembered3 = ("rotors", ("DBA", "DBA00034")) in writer3.key_index
+failed_key3 = ("rotors", (None, "DBA00033")) in writer3.key_index
+parsed3 = {"kind": "rotor", "extracted": 1, "log": [], "error": None, "records": [(1, rotor(3))]}
+page3 = write_parsed_page(writer3, parsed3, "http://dba.test/3")
+writer3.rollback()
+
+checks3 = [
+    (counts3 == (10, 20) and writer3.stats["batches"] >= 2, f"(inserted, skipped) = {counts3}"),
+    (count(db3, "rotors") == 34, "New keys written, failing row dropped"),
+    (writer3.stats["filtered"] == 26 and writer3.stats["skipped"] == 26,
+     "Preloaded and just-written keys filtered"),
+    (remembered3 and not failed_key3, "Written keys added, failed rows not"),
+    (page3 == 0 and writer3.key_index is None, "Product page duplicate filtered; rollback drops the index"),
+]
+conn3.close()
+results_summary.append(report(3, checks3))
+
+# ============================================================
+# Test 4: ingest_jsonl() / StagedIngest with a key index
+# ============================================================
+print("\n[TEST 4] Re-ingesting an unchanged catalog")
+print("-" * 60)
+
+db4 = new_db()
+fd, jsonl4 = tempfile.mkstemp(suffix=".jsonl")
+with os.fdopen(fd, "w", encoding="utf-8") as f:
+    for i in range(600):
+        f.write(json.dumps(rotor(i)) + "\n")
+saved_db_path = ingest_pipeline.DB_PATH
+ingest_pipeline.DB_PATH = db4
+try:
+    ingest_jsonl(jsonl4, "rotors", batch_size=100)
+    ingest_jsonl(jsonl4, "rotors", batch_size=100, key_index="bloom")
+    ingest_jsonl(jsonl4, "rotors", batch_size=100, key_index="set")
+finally:
+    ingest_pipeline.DB_PATH = saved_db_path
+
+
+def page_write(writer, parsed, url):
+    page = int(url.rsplit("/", 1)[1])
+    return writer.write("rotors", [rotor(page * 10 + j) for j in range(20)])[0]
+
+
+seeds4 = [("dba", f"http://dba.test/{i}", "", "list") for i in range(4)]
+fetched4 = [(i, s[1], "<html></html>", None) for i, s in enumerate(seeds4)]
+with StagedIngest(db4, page_write, parse_workers=0, key_index="set") as stages4:
+    counts4 = stages4.run("rotors", seeds4, fetched4)
+write4 = stages4.stats()["write"]
+
+checks4 = [
+    (count(db4, "rotors") == 600, "Second and third loads insert nothing"),
+    (counts4["inserted"] == 0 and write4["filtered"] == 80 and write4["skipped"] == 80,
+     "Staged writer skips every known key without SQLite"),
+]
+results_summary.append(report(4, checks4))
+
+os.remove(jsonl4)
+for path in (db2, db3, db4):
+    os.remove(path)
+
+# ============================================================
+# Summary
+# ============================================================
+total_passed = sum(p for p, _ in results_summary)
+total_failed = sum(f for _, f in results_summary)
+
+print("\n" + "="*60)
+print("ALL TESTS COMPLETED")
+print(f"Total: {total_passed} PASSED, {total_failed} FAILED")
+print("="*60)
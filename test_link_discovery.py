@@ -0,0 +1,229 @@
+"""
+Test suite for list page link discovery (extract_list_links() in
+data_scraper/html_rotor_list_scraper.py, database/link_discovery.py).
+Covers URL canonicalization, next-page / product link extraction, depth and
+page limits, and ingest_all() / ingest_frontier() following the links of a
+paginated DBA category on the local fixture server.
+"""
+
+import os
+import sqlite3
+import sys
+import tempfile
+sys.path.insert(0, '.')
+
+import database.ingest_pipeline as ingest_pipeline
+from data_scraper.html_rotor_list_scraper import canonicalize_url, extract_list_links
+from database.link_discovery import LinkDiscovery
+from tests.local_server import LocalServer
+
+print("="*60)
+print("LIST PAGE LINK DISCOVERY TESTS")
+print("="*60)
+
+
+def report(number: int, checks: list) -> tuple:
+    passed = sum(1 for check, _ in checks if check)
+    failed = len(checks) - passed
+    for check, message in checks:
+        status = "[PASS]" if check else "[FAIL]"
+        print(f"{status} {message}")
+    if failed == 0:
+        print(f"\n[PASS] Test {number} PASSED ({passed}/{passed} checks)")
+    else:
+        print(f"\n[FAIL] Test {number} FAILED ({passed}/{passed+failed} checks)")
+    return passed, failed
+
+
+def new_db() -> str:
+    fd, path = tempfile.mkstemp(suffix=".db")
+    os.close(fd)
+    conn = sqlite3.connect(path)
+    with open("database/init.sql", "r", encoding="utf-8") as f:
+        conn.executescript(f.read())
+    conn.close()
+    return path
+
+
+def remove_db(path: str) -> None:
+    for suffix in ("", "-wal", "-shm"):
+        if os.path.exists(path + suffix):
+            os.remove(path + suffix)
+
+
+def category_page(products: list, next_page: str = None) -> str:
+    """DBA (WooCommerce) category page linking to product pages."""
+    items = "\n".join(
+        f'<li class="product"><a href="{href}" class="woocommerce-LoopProduct-link '
+        f'woocommerce-loop-product__link"><h2>Rotor</h2></a></li>' for href in products)
+    nav = f'<a class="next page-numbers" href="{next_page}">&rarr;</a>' if next_page else ""
+    return (f'<html><body><a href="/about.html">About</a><ul class="products">{items}</ul>'
+            f'<nav class="woocommerce-pagination">{nav}</nav></body></html>')
+
+
+results_summary = []
+
+# ============================================================
+# Test 1: Canonical URLs and link extraction
+# ============================================================
+print("\n[TEST 1] canonicalize_url() and extract_list_links()")
+print("-" * 60)
+
+BASE = "https://www.dba.com.au/product-category/street/"
+html1 = category_page(["/product/dba4000/?utm_source=mail#specs",
+                       "https://WWW.DBA.com.au:443/product/dba4000/",
+                       "https://shop.other.com/product/x/",
+                       "../../product/dba5000/?b=2&amp;a=1"],
+                      next_page="page/2/")
+links1 = extract_list_links(html1, "dba", BASE)
+with open(os.path.join("tests", "fixtures", "rotor_lists", "autodoc_list_01.html"), encoding="utf-8") as f:
+    autodoc1 = f.read().replace("</body>", '<link rel="next" href="?page=2"><a class="product-link" '
+                                           'href="/brembo-123">x</a></body>')
+
+checks1 = [
+    (canonicalize_url("HTTP://Example.COM:80/a?z=1&utm_medium=x&a=2&gclid=9#top")
+     == "http://example.com/a?a=2&z=1", "Scheme/host lowercased, default port, tracking and fragment dropped"),
+    (canonicalize_url("mailto:x@y.z") is None and canonicalize_url("javascript:void(0)", BASE) is None,
+     "Non-HTTP links ignored"),
+    (links1 == [("https://www.dba.com.au/product/dba4000/", "product"),
+                ("https://www.dba.com.au/product/dba5000/?a=1&b=2", "product"),
+                ("https://www.dba.com.au/product-category/street/page/2/", "list")],
+     f"DBA: products and next page, deduplicated, same host only: {links1}"),
+    (extract_list_links(autodoc1, "autodoc", "https://www.autodoc.co.uk/car-parts/brake-disc-10132")
+     == [("https://www.autodoc.co.uk/car-parts/brake-disc-10132?page=2", "list")],
+     "AutoDoc: rel=next followed, product pages without parser ignored"),
+]
+results_summary.append(report(1, checks1))
+
+# ============================================================
+# Test 2: Depth and page limits
+# ============================================================
+print("\n[TEST 2] LinkDiscovery - depth, budget, visited pages")
+print("-" * 60)
+
+seed2 = ("dba", "https://www.dba.com.au/c/", "street", "list")
+links2 = [(f"https://www.dba.com.au/p/{i}", "product") for i in range(4)]
+discovery2 = LinkDiscovery(max_depth=2, max_pages=3, visited=["https://WWW.dba.com.au/p/0#x"])
+found2 = discovery2.follow(seed2, links2, depth=0)
+again2 = discovery2.follow(seed2, links2[:3], depth=1)
+deep2 = LinkDiscovery(max_depth=2).follow(seed2, links2, depth=2)
+none2 = LinkDiscovery(max_depth=0).follow(seed2, links2, depth=0)
+
+checks2 = [
+    ([seed[1][-1] for seed in found2] == ["1", "2", "3"] and found2[0][0] == "dba"
+     and found2[0][2] == "street" and found2[0][3] == "product",
+     "New seeds keep source and notes, take the link's page_type"),
+    (again2 == [] and discovery2.stats == {"discovered": 3, "known": 4, "too_deep": 0, "over_budget": 0},
+     f"Visited pages (incl. seed URLs) not followed twice: {discovery2.stats}"),
+    (deep2 == [] and none2 == [], "Links of pages at max_depth not followed"),
+    (LinkDiscovery(max_pages=1).follow(seed2, links2, 0)
+     == [("dba", "https://www.dba.com.au/p/0", "street", "product")], "Page budget"),
+]
+results_summary.append(report(2, checks2))
+
+# ============================================================
+# Test 3: ingest_all() follows pagination and product links
+# ============================================================
+print("\n[TEST 3] ingest_all() on a paginated category (max_depth=2)")
+print("-" * 60)
+
+with open(os.path.join("tests", "fixtures", "product_pages", "dba_rotor_01.html"),
+          encoding="utf-8") as f:
+    ROTOR_HTML = f.read()
+
+site = tempfile.mkdtemp()
+pages = {
+    "cat1.html": category_page(["p0.html", "p1.html?utm_source=list"], "cat2.html"),
+    "cat2.html": category_page(["p1.html", "/p2.html"], "cat3.html"),
+    "cat3.html": category_page(["p3.html", "cat1.html"]),
+}
+pages.update({f"p{i}.html": ROTOR_HTML.replace("DBA42134S", f"DBA4213{i}S") for i in range(4)})
+for name, content in pages.items():
+    with open(os.path.join(site, name), "w", encoding="utf-8") as f:
+        f.write(content)
+server = LocalServer(site).start()
+seeds = [("dba", server.url("cat1.html"), "street", "list")]
+
+
+def rotor_refs(db_path: str) -> list:
+    conn = sqlite3.connect(db_path)
+    refs = [row[0] for row in conn.execute("SELECT catalog_ref FROM rotors ORDER BY catalog_ref")]
+    conn.close()
+    return refs
+
+
+db3 = new_db()
+original_db_path = ingest_pipeline.DB_PATH
+original_iter_seed_urls = ingest_pipeline.iter_seed_urls
+ingest_pipeline.DB_PATH = db3
+ingest_pipeline.iter_seed_urls = lambda kind: iter(seeds if kind == "rotors" else [])
+try:
+    stats3 = ingest_pipeline.ingest_all(group="rotors", parse_workers=0, max_depth=2)
+    requests3 = list(server.request_log)
+    server.request_log.clear()
+    flat3 = ingest_pipeline.ingest_all(group="rotors", parse_workers=0, max_depth=0)
+    requests3b = list(server.request_log)
+finally:
+    ingest_pipeline.DB_PATH = original_db_path
+    ingest_pipeline.iter_seed_urls = original_iter_seed_urls
+conn = sqlite3.connect(db3)
+journal3 = {url.rsplit("/", 1)[-1]: status for url, status in
+            conn.execute("SELECT url, status FROM ingest_journal")}
+conn.close()
+
+checks3 = [
+    (requests3 == ["/cat1.html", "/p0.html", "/p1.html", "/cat2.html", "/p2.html", "/cat3.html"],
+     f"Breadth-first, each page fetched once, depth 3 not followed: {requests3}"),
+    (rotor_refs(db3) == ["DBA42130S", "DBA42131S", "DBA42132S"] and stats3["rotors"] == 3,
+     "Rotors of the linked product pages inserted"),
+    (stats3["discovered"] == 5 and journal3.get("p2.html") == "inserted",
+     "Discovered pages counted and journaled"),
+    (requests3b == ["/cat1.html"] and flat3["discovered"] == 0, "max_depth=0: seed pages only"),
+]
+results_summary.append(report(3, checks3))
+remove_db(db3)
+
+# ============================================================
+# Test 4: ingest_frontier() adds discovered links to the frontier
+# ============================================================
+print("\n[TEST 4] ingest_frontier() - links enqueued with depth")
+print("-" * 60)
+
+db4 = new_db()
+ingest_pipeline.iter_seed_urls = lambda kind: iter(seeds if kind == "rotors" else [])
+server.request_log.clear()
+try:
+    stats4 = ingest_pipeline.ingest_frontier(group="rotors", db_path=db4, lease_size=2)
+finally:
+    ingest_pipeline.iter_seed_urls = original_iter_seed_urls
+    server.stop()
+requests4 = sorted(server.request_log)
+conn = sqlite3.connect(db4)
+rows4 = {url.rsplit("/", 1)[-1]: (depth, (parent or "").rsplit("/", 1)[-1], status)
+         for url, depth, parent, status in
+         conn.execute("SELECT url, depth, discovered_from, status FROM crawl_frontier")}
+conn.close()
+
+checks4 = [
+    (requests4 == sorted(f"/{name}" for name in pages), f"Every page fetched once: {requests4}"),
+    (rows4["cat1.html"] == (0, "", "done") and rows4["cat3.html"] == (2, "cat2.html", "done")
+     and rows4["p3.html"] == (3, "cat3.html", "done"), "Depth and parent page recorded"),
+    (len(rows4) == 7 and stats4["discovered"] == 6 and len(rotor_refs(db4)) == 4,
+     f"6 pages discovered, 4 rotors: {stats4['discovered']}"),
+]
+results_summary.append(report(4, checks4))
+remove_db(db4)
+for name in os.listdir(site):
+    os.remove(os.path.join(site, name))
+os.rmdir(site)
+
+# ============================================================
+# Summary
+# ============================================================
+total_passed = sum(p for p, _ in results_summary)
+total_failed = sum(f for _, f in results_summary)
+
+print("\n" + "="*60)
+print("ALL TESTS COMPLETED")
+print(f"Total: {total_passed} PASSED, {total_failed} FAILED")
+print("="*60)
@@ -0,0 +1,204 @@
+"""
+Test suite for the streaming catalog list parsers
+(data_scraper/html_rotor_list_scraper.py iter_* / stream_rotor_list).
+Checks chunked parsing against the whole-page parsers, incremental yielding,
+flat peak memory on large generated pages and streaming over HTTP from a
+local stand-in server.
+"""
+
+import os
+import sys
+import tracemalloc
+sys.path.insert(0, '.')
+
+from data_scraper import http_client
+from data_scraper.html_rotor_list_scraper import (
+    iter_autodoc_list,
+    iter_powerstop_list,
+    iter_rotor_list_page,
+    parse_autodoc_list,
+    parse_rotor_list_page,
+    stream_rotor_list,
+)
+from data_scraper.html_scraper import fetch_html, stream_html
+from tests.local_server import LocalServer
+
+print("="*60)
+print("STREAMING LIST PARSER TESTS")
+print("="*60)
+
+
+def report(number: int, checks: list) -> tuple:
+    passed = sum(1 for check, _ in checks if check)
+    failed = len(checks) - passed
+    for check, message in checks:
+        status = "[PASS]" if check else "[FAIL]"
+        print(f"{status} {message}")
+    if failed == 0:
+        print(f"\n[PASS] Test {number} PASSED ({passed}/{passed} checks)")
+    else:
+        print(f"\n[FAIL] Test {number} FAILED ({passed}/{passed+failed} checks)")
+    return passed, failed
+
+
+def fixture(name: str) -> str:
+    with open(os.path.join("tests", "fixtures", "rotor_lists", name), encoding="utf-8") as f:
+        return f.read()
+
+
+def split(text: str, size: int) -> list:
+    return [text[i:i + size] for i in range(0, len(text), size)]
+
+
+FIXTURES = [
+    ("autodoc", "autodoc_list_01.html"),
+    ("mister-auto", "misterauto_list_01.html"),
+    ("powerstop", "powerstop_list_01.html"),
+]
+
+results_summary = []
+
+# ============================================================
+# Test 1: Chunked input gives the whole-page result
+# ============================================================
+print("\n[TEST 1] iter_rotor_list_page() on chunked fixtures")
+print("-" * 60)
+
+checks1 = []
+for source, name in FIXTURES:
+    html = fixture(name)
+    expected = parse_rotor_list_page(html, source)
+    same = all(list(iter_rotor_list_page(split(html, size), source)) == expected
+               for size in (1, 7, 64, 4096))
+    checks1.append((len(expected) > 0 and same,
+                    f"{source}: {len(expected)} rotors, identical for chunk sizes 1/7/64/4096"))
+
+try:
+    iter_rotor_list_page(["<html>"], "unknown")
+    unknown1 = False
+except NotImplementedError:
+    unknown1 = True
+checks1.append((unknown1, "Unknown source raises before iteration"))
+results_summary.append(report(1, checks1))
+
+# ============================================================
+# Test 2: Rotors are yielded as their block closes
+# ============================================================
+print("\n[TEST 2] Incremental yielding")
+print("-" * 60)
+
+consumed2 = []
+
+
+def tracked(chunks):
+    for chunk in chunks:
+        consumed2.append(chunk)
+        yield chunk
+
+
+html2 = fixture("powerstop_list_01.html")
+chunks2 = split(html2, 256)
+rotors2 = iter_powerstop_list(tracked(chunks2))
+first2 = next(rotors2)
+
+# Last product followed by other markup (previously dropped by the block regex)
+html2b = fixture("autodoc_list_01.html").replace(
+    "</body>", '<footer><div class="links">About</div></footer></body>')
+
+checks2 = [
+    (first2 == parse_rotor_list_page(html2, "powerstop")[0], "First rotor parsed"),
+    (len(consumed2) < len(chunks2) // 2,
+     f"First rotor yielded after {len(consumed2)}/{len(chunks2)} chunks"),
+    (len(list(iter_autodoc_list(split(html2b, 100)))) == 6 and len(parse_autodoc_list(html2b)) == 6,
+     "AutoDoc product closed by balanced </div>, not by </body>"),
+]
+results_summary.append(report(2, checks2))
+
+# ============================================================
+# Test 3: Peak memory does not grow with page size
+# ============================================================
+print("\n[TEST 3] Flat peak memory")
+print("-" * 60)
+
+CARD = fixture("powerstop_list_01.html").split('<article class="rotor-card"')[1].split("</article>")[0]
+
+
+def generated_page(cards: int):
+    yield "<html><body><div class='catalog'>"
+    for i in range(cards):
+        yield f'<article class="rotor-card" data-i="{i}"{CARD}</article>\n'
+    yield "</div></body></html>"
+
+
+def chunked(pieces, size: int = 16 * 1024):
+    buffer = ""
+    for piece in pieces:
+        buffer += piece
+        while len(buffer) >= size:
+            yield buffer[:size]
+            buffer = buffer[size:]
+    yield buffer
+
+
+def peak_bytes(cards: int) -> tuple:
+    tracemalloc.start()
+    count = sum(1 for _ in iter_powerstop_list(chunked(generated_page(cards))))
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return count, peak
+
+
+page_mb3 = len("".join(generated_page(5000))) / 1e6
+small3, large3 = peak_bytes(500), peak_bytes(5000)
+print(f"Peak: {small3[1] / 1024:.0f} KB for 500 cards, {large3[1] / 1024:.0f} KB for 5000 cards ({page_mb3:.1f} MB)")
+
+checks3 = [
+    (small3[0] == 500 and large3[0] == 5000, "Every generated card parsed"),
+    (large3[1] < small3[1] * 1.5, "10x the page size, same peak memory"),
+    (large3[1] < page_mb3 * 1e6 / 4, "Peak well below the page size"),
+]
+results_summary.append(report(3, checks3))
+
+# ============================================================
+# Test 4: Streaming from HTTP
+# ============================================================
+print("\n[TEST 4] stream_html() / stream_rotor_list()")
+print("-" * 60)
+
+server = LocalServer(os.path.join("tests", "fixtures")).start()
+misterauto_url = server.url("rotor_lists/misterauto_list_01.html")
+
+# Tiny chunks split the UTF-8 accents of the French page
+text4 = "".join(stream_html(misterauto_url, chunk_size=3))
+rotors4 = list(stream_rotor_list(misterauto_url, "mister-auto", chunk_size=512))
+
+server.script("/nocharset.html", 200, {"Content-Type": "text/html"}, "Ventilé".encode("utf-8"))
+nocharset4 = "".join(stream_html(server.url("nocharset.html"), chunk_size=1))
+server.script("/missing.html", 404)
+try:
+    list(stream_html(server.url("missing.html")))
+    missing4 = False
+except Exception:
+    missing4 = True
+
+checks4 = [
+    (text4 == fetch_html(misterauto_url), "Streamed text equals fetch_html()"),
+    (rotors4 == parse_rotor_list_page(text4, "mister-auto"), f"stream_rotor_list(): {len(rotors4)} rotors"),
+    (nocharset4 == "Ventilé", "No charset -> UTF-8, split characters decoded"),
+    (missing4, "HTTP errors raised"),
+]
+results_summary.append(report(4, checks4))
+
+http_client.close_session()
+server.stop()
+
+# ============================================================
+# Summary
+# ============================================================
+total_passed = sum(p for p, _ in results_summary)
+total_failed = sum(f for _, f in results_summary)
+
+print("\n" + "="*60)
+print("ALL TESTS COMPLETED")
+print(f"Total: {total_passed} PASSED, {total_failed} FAILED")
+print("="*60)
@@ -0,0 +1,169 @@
+"""
+Test suite for batch parsing over a process pool (data_scraper/parallel_parse.py).
+Checks that parallel results match serial parsing on the fixture corpus,
+ordering modes, chunking, lazy input and per-page error capture.
+"""
+
+import os
+import sys
+sys.path.insert(0, '.')
+
+from data_scraper.html_rotor_list_scraper import parse_rotor_list_page
+from data_scraper.html_scraper import normalize_rotor, parse_dba_rotor_page
+from data_scraper.parallel_parse import parse_page, parse_pages
+
+print("="*60)
+print("PARALLEL PARSE TESTS")
+print("="*60)
+
+
+def report(number: int, checks: list) -> tuple:
+    passed = sum(1 for check, _ in checks if check)
+    failed = len(checks) - passed
+    for check, message in checks:
+        status = "[PASS]" if check else "[FAIL]"
+        print(f"{status} {message}")
+    if failed == 0:
+        print(f"\n[PASS] Test {number} PASSED ({passed}/{passed} checks)")
+    else:
+        print(f"\n[FAIL] Test {number} FAILED ({passed}/{passed+failed} checks)")
+    return passed, failed
+
+
+def fixture(path: str) -> str:
+    with open(os.path.join("tests", "fixtures", path), encoding="utf-8") as f:
+        return f.read()
+
+
+PAD_HTML = """
+<html><body>
+    <h1>EBC Yellowstuff Performance Pad FA256R</h1>
+    <table class="product-specifications">
+        <tr><td>Shape Code</td><td>256</td></tr>
+        <tr><td>Pad Length</td><td>120.0mm</td></tr>
+        <tr><td>Pad Height</td><td>52.5mm</td></tr>
+        <tr><td>Pad Thickness</td><td>17.5mm</td></tr>
+        <tr><td>Part Number</td><td>FA256R</td></tr>
+    </table>
+</body></html>
+"""
+
+VEHICLE_HTML = """
+<html><body>
+    <table class="vehicle-specs">
+        <tr><th>Make</th><td>BMW</td></tr>
+        <tr><th>Model</th><td>3 Series</td></tr>
+        <tr><th>Year From</th><td>2005</td></tr>
+        <tr><th>Bolt Pattern</th><td>5x120</td></tr>
+        <tr><th>Center Bore</th><td>72.6</td></tr>
+    </table>
+</body></html>
+"""
+
+CORPUS = [
+    ("autodoc", "list", fixture("rotor_lists/autodoc_list_01.html")),
+    ("mister-auto", "rotor_list", fixture("rotor_lists/misterauto_list_01.html")),
+    ("powerstop", "rotor_list", fixture("rotor_lists/powerstop_list_01.html")),
+    ("dba", "rotor", fixture("product_pages/dba_rotor_01.html")),
+    ("ebc", "pad", PAD_HTML),
+    ("wheelsize", "vehicle", VEHICLE_HTML),
+]
+
+results_summary = []
+
+# ============================================================
+# Test 1: parse_page() matches the individual parsers
+# ============================================================
+print("\n[TEST 1] parse_page() - normalized records per page kind")
+print("-" * 60)
+
+autodoc1 = parse_page(*CORPUS[0])
+expected_autodoc = [normalize_rotor(r, source="autodoc")
+                    for r in parse_rotor_list_page(CORPUS[0][2], "autodoc")]
+try:
+    parse_page("dba", "product", "")
+    unknown1 = False
+except ValueError:
+    unknown1 = True
+
+checks1 = [
+    (autodoc1 == expected_autodoc and len(autodoc1) == 6, "List page -> 6 normalized rotors"),
+    (parse_page(*CORPUS[3]) == [parse_dba_rotor_page(CORPUS[3][2])], "Rotor product page"),
+    (parse_page(*CORPUS[4])[0]["catalog_ref"] == "FA256R", "Pad page"),
+    (parse_page(*CORPUS[5])[0]["make"] == "BMW", "Vehicle page normalized"),
+    (parse_page("autodoc", "list", "<html></html>") == [], "Empty list page -> no records"),
+    (unknown1, "Ambiguous page_type rejected"),
+]
+results_summary.append(report(1, checks1))
+
+# ============================================================
+# Test 2: Parallel == serial, ordered
+# ============================================================
+print("\n[TEST 2] parse_pages(workers=2) matches serial parsing")
+print("-" * 60)
+
+corpus2 = CORPUS * 10
+serial2 = list(parse_pages(corpus2, workers=0))
+parallel2 = list(parse_pages(corpus2, workers=2, chunksize=4))
+print(f"Pages: {len(corpus2)}, records: {sum(len(r[1]) for r in parallel2)}")
+
+checks2 = [
+    ([r[0] for r in parallel2] == list(range(len(corpus2))), "Results in input order"),
+    (parallel2 == serial2, "Same records as serial parsing"),
+    ([len(r[1]) for r in parallel2[:6]] == [6, 8, 7, 1, 1, 1], "Records per fixture page"),
+    (all(r[2] is None for r in parallel2), "No errors"),
+]
+results_summary.append(report(2, checks2))
+
+# ============================================================
+# Test 3: Unordered mode, lazy input, chunk sizes
+# ============================================================
+print("\n[TEST 3] ordered=False, generator input, chunksize=1")
+print("-" * 60)
+
+consumed = []
+
+
+def lazy_corpus():
+    for item in corpus2:
+        consumed.append(1)
+        yield item
+
+
+gen3 = parse_pages(lazy_corpus(), workers=2, chunksize=1, ordered=False)
+first3 = next(gen3)
+consumed_at_first = len(consumed)
+unordered3 = [first3] + list(gen3)
+
+checks3 = [
+    (sorted(unordered3, key=lambda r: r[0]) == serial2, "Same results once sorted by index"),
+    (consumed_at_first < len(corpus2), "Input consumed lazily (bounded chunks in flight)"),
+]
+results_summary.append(report(3, checks3))
+
+# ============================================================
+# Test 4: Per-page errors
+# ============================================================
+print("\n[TEST 4] Errors captured per page")
+print("-" * 60)
+
+corpus4 = [CORPUS[3], ("dba", "brochure", ""), ("unknown-site", "rotor_list", "<html></html>"), CORPUS[4]]
+results4 = list(parse_pages(corpus4, workers=2, chunksize=2))
+
+checks4 = [
+    (isinstance(results4[1][2], ValueError) and results4[1][1] == [], "Bad page_type reported on its page"),
+    (results4[2][2] is not None, "Unsupported list source reported"),
+    (results4[0][2] is None and results4[3][2] is None, "Other pages in the same chunks parsed"),
+]
+results_summary.append(report(4, checks4))
+
+# ============================================================
+# Summary
+# ============================================================
+total_passed = sum(p for p, _ in results_summary)
+total_failed = sum(f for _, f in results_summary)
+
+print("\n" + "="*60)
+print("ALL TESTS COMPLETED")
+print(f"Total: {total_passed} PASSED, {total_failed} FAILED")
+print("="*60)
@@ -0,0 +1,260 @@
+"""
+Test suite for fetch retries and per-domain circuit breaking
+(data_scraper/retry_policy.py). Covers error classification, the backoff
+schedule, breaker state transitions, and the fetch engine / probe_url()
+recovering from scripted 503s on the local fixture server while a failing
+host is paused and the other hosts keep flowing.
+"""
+
+import os
+import socket
+import sys
+import tempfile
+import time
+import urllib.error
+sys.path.insert(0, '.')
+
+import requests
+
+from data_scraper.domain_scheduler import DomainScheduler
+from data_scraper.fetch_engine import iter_fetch
+from data_scraper.html_cache import CacheMiss
+from data_scraper.http_client import http_get
+from data_scraper.retry_policy import CircuitBreaker, RetryPolicy, is_retryable
+from tools.site_access_audit import probe_url
+from tests.local_server import LocalServer
+
+print("="*60)
+print("RETRY POLICY / CIRCUIT BREAKER TESTS")
+print("="*60)
+
+
+def report(number: int, checks: list) -> tuple:
+    passed = sum(1 for check, _ in checks if check)
+    failed = len(checks) - passed
+    for check, message in checks:
+        status = "[PASS]" if check else "[FAIL]"
+        print(f"{status} {message}")
+    if failed == 0:
+        print(f"\n[PASS] Test {number} PASSED ({passed}/{passed} checks)")
+    else:
+        print(f"\n[FAIL] Test {number} FAILED ({passed}/{passed+failed} checks)")
+    return passed, failed
+
+
+def http_error(status: int, headers: dict = None) -> requests.HTTPError:
+    response = requests.Response()
+    response.status_code = status
+    response.headers.update(headers or {})
+    return requests.HTTPError(f"HTTP {status}", response=response)
+
+
+def get_text(url: str) -> str:
+    response = http_get(url, timeout=5)
+    response.raise_for_status()
+    return response.text
+
+
+results_summary = []
+
+# ============================================================
+# Test 1: Error classification
+# ============================================================
+print("\n[TEST 1] is_retryable()")
+print("-" * 60)
+
+checks1 = [
+    (all(is_retryable(http_error(code)) for code in (429, 500, 502, 503, 504)),
+     "429 and 5xx responses retried"),
+    (not is_retryable(http_error(404)) and not is_retryable(http_error(403)), "404 / 403 not retried"),
+    (is_retryable(requests.Timeout()) and is_retryable(requests.ConnectionError())
+     and is_retryable(socket.timeout()), "Timeouts and connection errors retried"),
+    (is_retryable(urllib.error.HTTPError("http://x", 503, "busy", {}, None))
+     and not is_retryable(urllib.error.HTTPError("http://x", 410, "gone", {}, None)),
+     "urllib errors classified by status"),
+    (not is_retryable(CacheMiss("offline")) and not is_retryable(ValueError("parse")),
+     "Cache misses and parse errors not retried"),
+]
+results_summary.append(report(1, checks1))
+
+# ============================================================
+# Test 2: Backoff schedule and call()
+# ============================================================
+print("\n[TEST 2] RetryPolicy - exponential backoff, jitter, Retry-After, call()")
+print("-" * 60)
+
+fixed2 = RetryPolicy(max_attempts=5, base_delay=0.5, max_delay=3.0, jitter=False)
+jittered2 = RetryPolicy(base_delay=1.0, seed=7)
+samples2 = [jittered2.delay(3) for _ in range(200)]
+
+attempts2 = []
+def flaky(failures: int, error: Exception):
+    def fetch():
+        attempts2.append(1)
+        if len(attempts2) <= failures:
+            raise error
+        return "<html>ok</html>"
+    return fetch
+
+slept2 = []
+policy2 = RetryPolicy(max_attempts=3, base_delay=0.5, jitter=False)
+recovered2 = policy2.call(flaky(2, http_error(503)), "http://a.test/p", sleep=slept2.append)
+calls2 = len(attempts2)
+outcomes2 = []
+for failures, error in ((5, http_error(503)), (5, http_error(404))):
+    attempts2.clear()
+    try:
+        policy2.call(flaky(failures, error), "http://a.test/p", sleep=slept2.append)
+    except requests.HTTPError as e:
+        outcomes2.append((len(attempts2), e.response.status_code))
+
+checks2 = [
+    ([fixed2.delay(n) for n in range(1, 6)] == [0.5, 1.0, 2.0, 3.0, 3.0],
+     "Delay doubles per attempt, capped at max_delay"),
+    (all(0 <= d <= 4.0 for d in samples2) and max(samples2) - min(samples2) > 2,
+     "Full jitter spreads delays over [0, backoff]"),
+    (fixed2.delay(1, http_error(429, {"Retry-After": "2"})) == 2.0
+     and fixed2.delay(1, http_error(503, {"Retry-After": "120"})) == 3.0,
+     "Retry-After honoured when longer, capped at max_delay"),
+    (recovered2 == "<html>ok</html>" and calls2 == 3 and slept2[:2] == [0.5, 1.0],
+     "Two 503s then success: recovered after backoff"),
+    (outcomes2 == [(3, 503), (1, 404)], f"Gives up after max_attempts, 404 at once: {outcomes2}"),
+    (policy2.stats["retries"] == 4 and policy2.stats["recovered"] == 1
+     and policy2.stats["exhausted"] == 1, f"Stats: {policy2.stats}"),
+]
+results_summary.append(report(2, checks2))
+
+# ============================================================
+# Test 3: Circuit breaker state transitions
+# ============================================================
+print("\n[TEST 3] CircuitBreaker - open, half-open probe, close")
+print("-" * 60)
+
+breaker3 = CircuitBreaker(failure_threshold=2, cooldown_s=0.1)
+A, B = "http://a.test/p1", "http://b.test/p1"
+breaker3.record_failure(A, http_error(503))
+breaker3.record_failure(A, http_error(404))
+reset3 = breaker3.state(A)
+breaker3.record_failure(A, requests.Timeout())
+tripped3 = breaker3.record_failure(A, http_error(502))
+open3 = (breaker3.state(A), breaker3.wait("http://A.test/p2") > 0, breaker3.wait(B))
+time.sleep(0.12)
+probe3 = breaker3.wait(A)
+held3 = breaker3.wait(A)
+breaker3.record_failure(A, http_error(503))
+reopened3 = (breaker3.state(A), breaker3.stats()["a.test"]["trips"])
+time.sleep(0.12)
+breaker3.wait(A)
+breaker3.record_success(A)
+
+checks3 = [
+    (reset3 == "closed", "A non-transient error resets the failure count"),
+    (tripped3 and open3[:2] == ("open", True), "Threshold of consecutive failures opens the domain"),
+    (open3[2] == 0.0, "Other domains unaffected"),
+    (probe3 == 0.0 and held3 > 0, "After the cooldown a single probe goes through"),
+    (reopened3 == ("open", 2), "Failed probe opens the circuit again"),
+    (breaker3.state(A) == "closed" and breaker3.wait(A) == 0.0, "Successful probe closes it"),
+]
+results_summary.append(report(3, checks3))
+
+# ============================================================
+# Test 4: Fetch engine and probe_url() recover from 503s
+# ============================================================
+print("\n[TEST 4] iter_fetch(retry=...) and probe_url(retry=...) against scripted 503s")
+print("-" * 60)
+
+site = tempfile.mkdtemp()
+for i in range(4):
+    with open(os.path.join(site, f"p{i}.html"), "w", encoding="utf-8") as f:
+        f.write(f"<html><body>page {i}</body></html>")
+server = LocalServer(site).start()
+server.script("/p1.html", 503)
+server.script("/p1.html", 502)
+server.script("/p2.html", 503, {"Retry-After": "0"})
+
+retry4 = RetryPolicy(max_attempts=3, base_delay=0.01)
+urls4 = [server.url(f"p{i}.html") for i in range(3)] + [server.url("missing.html")]
+results4 = list(iter_fetch(urls4, concurrency=2, fetch=get_text, retry=retry4))
+log4 = sorted(server.request_log)
+plain4 = list(iter_fetch([server.url("p3.html")], fetch=get_text))
+server.request_log.clear()
+server.script("/p3.html", 503)
+seed4 = {"kind": "rotor", "source": "dba", "url": server.url("p3.html")}
+probe4 = probe_url(seed4, retry=RetryPolicy(base_delay=0.01))
+probe_log4 = list(server.request_log)
+server.script("/p3.html", 503)
+noretry4 = probe_url(seed4)
+
+checks4 = [
+    ([r[2] for r in results4[:3]] == [f"<html><body>page {i}</body></html>" for i in range(3)],
+     "Pages recovered after transient errors, in seed order"),
+    (results4[3][2] is None and results4[3][3].response.status_code == 404, "404 reported once"),
+    (log4 == ["/missing.html", "/p0.html"] + ["/p1.html"] * 3 + ["/p2.html"] * 2,
+     f"Retries hit the server, the 404 is not retried: {log4}"),
+    (retry4.stats["retries"] == 3 and retry4.stats["recovered"] == 2, f"Stats: {retry4.stats}"),
+    (probe4["status_code"] == 200 and probe_log4 == ["/p3.html"] * 2, "probe_url() retries a 503"),
+    (noretry4["status_code"] == 503 and noretry4["suspected_bot_protection"],
+     "Without a policy the probe reports the first 503"),
+    (plain4[0][2] is not None, "No policy: engine unchanged"),
+]
+results_summary.append(report(4, checks4))
+
+# ============================================================
+# Test 5: A failing host is paused, the others keep flowing
+# ============================================================
+print("\n[TEST 5] Scheduler + breaker - failing host tripped, healthy host unaffected")
+print("-" * 60)
+
+bad_site = tempfile.mkdtemp()
+bad = LocalServer(bad_site).start()
+for i in range(6):
+    for _ in range(10):
+        bad.script(f"/b{i}.html", 503)
+server.request_log.clear()
+good_urls = [server.url(f"p{i % 4}.html") for i in range(8)]
+bad_urls = [bad.url(f"b{i}.html") for i in range(6)]
+mixed5 = [url for pair in zip(bad_urls, good_urls) for url in pair] + good_urls[6:]
+retry5 = RetryPolicy(max_attempts=2, base_delay=0.01)
+breaker5 = CircuitBreaker(failure_threshold=3, cooldown_s=0.5)
+scheduler5 = DomainScheduler(rate_per_sec=1000, burst=100, max_in_flight=2)
+start5 = time.monotonic()
+order5 = []
+for index, url, html, error in iter_fetch(mixed5, concurrency=4, ordered=False, fetch=get_text,
+                                          scheduler=scheduler5, retry=retry5, breaker=breaker5):
+    order5.append((url in bad_urls, error is None, time.monotonic() - start5))
+    if url not in bad_urls and sum(1 for is_bad, _, _ in order5 if not is_bad) == len(good_urls):
+        paused5 = len(bad.request_log)
+bad.stop()
+server.stop()
+good_done5 = max(t for is_bad, _, t in order5 if not is_bad)
+bad_done5 = max(t for is_bad, _, t in order5 if is_bad)
+state5 = breaker5.stats()
+
+checks5 = [
+    (len(order5) == 14 and all(ok for is_bad, ok, _ in order5 if not is_bad),
+     "Every page of the healthy host fetched"),
+    (all(not ok for is_bad, ok, _ in order5 if is_bad), "Failing host's pages reported failed"),
+    (good_done5 < 0.5 <= bad_done5, f"Healthy host done ({good_done5:.2f}s) while the failing "
+                                    f"one is paused ({bad_done5:.2f}s)"),
+    (sum(s["trips"] for s in state5.values()) >= 1 and len(state5) == 1,
+     f"Only the failing host tripped: {state5}"),
+    (paused5 <= 3 + 2 and len(bad.request_log) == 12,
+     f"Paused host spared: {paused5} requests during the cooldown (threshold 3 + 2 in flight), "
+     f"its pages tried again after it"),
+]
+results_summary.append(report(5, checks5))
+for directory in (site, bad_site):
+    for name in os.listdir(directory):
+        os.remove(os.path.join(directory, name))
+    os.rmdir(directory)
+
+# ============================================================
+# Summary
+# ============================================================
+total_passed = sum(p for p, _ in results_summary)
+total_failed = sum(f for _, f in results_summary)
+
+print("\n" + "="*60)
+print("ALL TESTS COMPLETED")
+print(f"Total: {total_passed} PASSED, {total_failed} FAILED")
+print("="*60)
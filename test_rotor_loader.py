@@ -0,0 +1,197 @@
+"""
+Test suite for the streaming rotor loader (rotor_analysis/clustering.py:
+iter_rotor_chunks(), iter_rotors()). Covers chunking, column projection,
+brand / diameter filters, the dict / tuple / numpy row formats, and
+run_clustering() streaming the same clusters whatever the chunk size, with
+memory bounded by the chunk rather than the table.
+"""
+
+import json
+import os
+import sqlite3
+import sys
+import tempfile
+import tracemalloc
+sys.path.insert(0, '.')
+
+from rotor_analysis.clustering import (
+    CLUSTER_COLUMNS,
+    ROTOR_COLUMNS,
+    build_clusters,
+    iter_rotor_chunks,
+    iter_rotors,
+    load_rotors_from_db,
+    run_clustering,
+)
+from rotor_analysis.columnar import load_rotor_columns, numpy_available
+
+print("="*60)
+print("STREAMING ROTOR LOADER TESTS")
+print("="*60)
+
+
+def report(number: int, checks: list) -> tuple:
+    passed = sum(1 for check, _ in checks if check)
+    failed = len(checks) - passed
+    for check, message in checks:
+        status = "[PASS]" if check else "[FAIL]"
+        print(f"{status} {message}")
+    if failed == 0:
+        print(f"\n[PASS] Test {number} PASSED ({passed}/{passed} checks)")
+    else:
+        print(f"\n[FAIL] Test {number} FAILED ({passed}/{passed+failed} checks)")
+    return passed, failed
+
+
+def make_db(path: str, count: int) -> None:
+    conn = sqlite3.connect(path)
+    with open("database/init.sql", "r", encoding="utf-8") as f:
+        conn.executescript(f.read())
+    conn.executemany(
+        "INSERT INTO rotors (outer_diameter_mm, nominal_thickness_mm, hat_height_mm, "
+        "overall_height_mm, center_bore_mm, bolt_circle_mm, bolt_hole_count, ventilation_type, "
+        "directionality, offset_mm, brand, catalog_ref) "
+        "VALUES (?, ?, 40.0, ?, 66.6, 112, 5, 'vented', 'non_directional', ?, ?, ?)",
+        [(250.0 + (i % 150), 20.0 + (i % 14) / 2, 45.0 + i % 9,
+          float(i % 50) if i % 4 == 0 else None, f"BRAND{i % 3}", f"REF{i:06d}")
+         for i in range(count)])
+    conn.commit()
+    conn.close()
+
+
+directory = tempfile.mkdtemp()
+db = os.path.join(directory, "rotors.db")
+make_db(db, 2500)
+results_summary = []
+
+# ============================================================
+# Test 1: Chunks and row formats
+# ============================================================
+print("\n[TEST 1] iter_rotor_chunks() - chunk sizes and row formats")
+print("-" * 60)
+
+chunks1 = list(iter_rotor_chunks(db, chunk_size=1000))
+tuples1 = list(iter_rotor_chunks(db, ["brand", "catalog_ref"], 1000, row_format="tuple"))
+all1 = load_rotors_from_db(db)
+
+checks1 = [
+    ([len(c) for c in chunks1] == [1000, 1000, 500], "2500 rotors in chunks of 1000, 1000, 500"),
+    (all1 == [row for chunk in chunks1 for row in chunk] and tuple(all1[0]) == ROTOR_COLUMNS,
+     "load_rotors_from_db() returns every column of every rotor"),
+    (tuples1[0][0] == ("BRAND0", "REF000000") and sum(map(len, tuples1)) == 2500,
+     "Tuple rows in projection order"),
+    (list(iter_rotors(db, ["catalog_ref"], 7))[2498:] == [{"catalog_ref": "REF002498"},
+                                                          {"catalog_ref": "REF002499"}],
+     "iter_rotors() flattens the chunks"),
+]
+if numpy_available():
+    arrays1 = list(iter_rotor_chunks(db, CLUSTER_COLUMNS, 1000, row_format="numpy"))
+    checks1.append(
+        (arrays1[0]["outer_diameter_mm"].dtype.kind == "f" and arrays1[0]["brand"][1] == "BRAND1"
+         and arrays1[0]["offset_mm"][1] != arrays1[0]["offset_mm"][1]
+         and sum(len(a) for a in arrays1) == 2500,
+         "numpy chunks: float64 geometry with NaN for NULL, object text"))
+results_summary.append(report(1, checks1))
+
+# ============================================================
+# Test 2: Filters and validation
+# ============================================================
+print("\n[TEST 2] Brand / diameter filters, invalid arguments")
+print("-" * 60)
+
+brand2 = list(iter_rotors(db, ["brand"], brands="BRAND1"))
+range2 = list(iter_rotors(db, ["brand", "outer_diameter_mm"], brands=["BRAND0", "BRAND2"],
+                          min_diameter_mm=300, max_diameter_mm=310))
+invalid2 = []
+for kwargs in ({"columns": ["catalog_ref; DROP TABLE rotors"]}, {"chunk_size": 0},
+               {"row_format": "arrow"}):
+    try:
+        next(iter_rotor_chunks(db, **kwargs))
+    except ValueError:
+        invalid2.append(True)
+
+checks2 = [
+    (len(brand2) == 833 and all(r["brand"] == "BRAND1" for r in brand2), "Single brand filter"),
+    (range2 and all(r["brand"] != "BRAND1" and 300 <= r["outer_diameter_mm"] <= 310 for r in range2)
+     and len(range2) == sum(1 for r in all1 if r["brand"] != "BRAND1"
+                            and 300 <= r["outer_diameter_mm"] <= 310),
+     f"Brands + inclusive diameter range ({len(range2)} rotors)"),
+    (invalid2 == [True] * 3, "Unknown column, chunk_size 0, unknown format -> ValueError"),
+    (list(iter_rotors(db, brands=[])) == [], "Empty brand list matches nothing"),
+]
+results_summary.append(report(2, checks2))
+
+# ============================================================
+# Test 3: run_clustering() streams the same clusters
+# ============================================================
+print("\n[TEST 3] run_clustering(chunk_size=..., filters) output")
+print("-" * 60)
+
+outputs3 = {}
+engines3 = ("python", "numpy") if numpy_available() else ("python",)
+for engine in engines3:
+    for chunk_size in (1, 333, 10000):
+        path = os.path.join(directory, f"{engine}_{chunk_size}.json")
+        run_clustering(db, path, engine=engine, chunk_size=chunk_size)
+        with open(path, "r", encoding="utf-8") as f:
+            outputs3[(engine, chunk_size)] = f.read()
+filtered3 = os.path.join(directory, "filtered.json")
+run_clustering(db, filtered3, engine=engines3[-1], brands=["BRAND2"], min_diameter_mm=320)
+with open(filtered3, "r", encoding="utf-8") as f:
+    filtered3 = json.load(f)
+expected3 = build_clusters(r for r in all1 if r["brand"] == "BRAND2"
+                           and r["outer_diameter_mm"] >= 320)
+
+checks3 = [
+    (len(set(outputs3.values())) == 1, f"Same file for every engine and chunk size ({len(outputs3)} runs)"),
+    (json.loads(outputs3[("python", 1)])["meta"]["cluster_count"] == len(build_clusters(all1)),
+     "Same clusters as build_clusters() on the full list"),
+    (filtered3["meta"]["cluster_count"] == len(expected3)
+     and {m["brand"] for c in filtered3["clusters"] for m in c["members"]} == {"BRAND2"},
+     "Filters applied to the clustering"),
+]
+if numpy_available():
+    columns3 = load_rotor_columns(db, 100, brands="BRAND0")
+    checks3.append((len(columns3["outer_diameter_mm"]) == len(columns3["brand"]) == 834,
+                    "load_rotor_columns() concatenates filtered chunks"))
+results_summary.append(report(3, checks3))
+
+# ============================================================
+# Test 4: Memory bounded by the chunk
+# ============================================================
+print("\n[TEST 4] Streaming memory vs loading the table")
+print("-" * 60)
+
+big4 = os.path.join(directory, "big.db")
+make_db(big4, 30000)
+tracemalloc.start()
+rows4 = load_rotors_from_db(big4)
+full4 = tracemalloc.get_traced_memory()[1]
+del rows4
+tracemalloc.reset_peak()
+base4 = tracemalloc.get_traced_memory()[0]
+streamed4 = sum(1 for _ in iter_rotors(big4, chunk_size=500))
+stream_peak4 = tracemalloc.get_traced_memory()[1] - base4
+tracemalloc.stop()
+
+checks4 = [
+    (streamed4 == 30000, "Every rotor streamed"),
+    (stream_peak4 * 20 < full4,
+     f"Streaming peak {stream_peak4 // 1024} KiB vs {full4 // 1024} KiB for the full list"),
+]
+results_summary.append(report(4, checks4))
+
+for name in os.listdir(directory):
+    os.remove(os.path.join(directory, name))
+os.rmdir(directory)
+
+# ============================================================
+# Summary
+# ============================================================
+total_passed = sum(p for p, _ in results_summary)
+total_failed = sum(f for _, f in results_summary)
+
+print("\n" + "="*60)
+print("ALL TESTS COMPLETED")
+print(f"Total: {total_passed} PASSED, {total_failed} FAILED")
+print("="*60)
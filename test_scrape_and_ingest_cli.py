@@ -13,18 +13,23 @@ import scrape_and_ingest
 mock_calls = []
 
 
-def mock_ingest_all(group=None):
+def mock_ingest_all(group=None, **kwargs):
     """
     Mock replacement for database.ingest_pipeline.ingest_all.
     Records calls without executing real ingestion.
     """
-    mock_calls.append({"group": group})
+    mock_calls.append({"group": group, **kwargs})
 
 
 # Replace real ingest_all with mock
 original_ingest_all = scrape_and_ingest.ingest_all
 scrape_and_ingest.ingest_all = mock_ingest_all
 
+# Frontier workers are recorded in the same list
+original_ingest_frontier = scrape_and_ingest.ingest_frontier
+scrape_and_ingest.ingest_frontier = lambda group=None, **kwargs: mock_calls.append(
+    {"group": group, "frontier": True, **kwargs})
+
 
 print("="*60)
 print("MISSION 8 - SCRAPE_AND_INGEST CLI TESTS")
@@ -171,11 +176,339 @@ else:
     print(f"\n[FAIL] Test 5 FAILED ({passed5}/{passed5+failed5} checks)")
 
 
+# ============================================================
+# Test 6: --concurrency / --as-completed
+# ============================================================
+print("\n[TEST 6] --concurrency 16 --as-completed -> concurrent fetch engine")
+print("-" * 60)
+
+mock_calls.clear()
+scrape_and_ingest.main(["--only", "rotors", "--concurrency", "16", "--as-completed",
+                        "--parse-workers", "3"])
+scrape_and_ingest.main([])
+default_call = mock_calls[-1]
+
+checks6 = [
+    (len(mock_calls) == 2, "ingest_all called once per invocation"),
+    (mock_calls[0]["concurrency"] == 16, "concurrency parameter is 16"),
+    (mock_calls[0]["ordered"] is False, "ordered parameter is False"),
+    (mock_calls[0]["parse_workers"] == 3, "parse_workers parameter is 3"),
+    (default_call["parse_workers"] is None, "Default parser pool size"),
+    (default_call["concurrency"] == 1, "Default concurrency is 1 (sequential)"),
+    (default_call["ordered"] is True, "Default is seed order"),
+    (default_call["scheduler"] is None, "No per-domain scheduler by default"),
+]
+
+passed6 = sum(1 for check, _ in checks6 if check)
+failed6 = len(checks6) - passed6
+
+print(f"Mock call recorded: {mock_calls}")
+for check, message in checks6:
+    status = "[PASS]" if check else "[FAIL]"
+    print(f"{status} {message}")
+
+if failed6 == 0:
+    print(f"\n[PASS] Test 6 PASSED ({passed6}/{passed6} checks)")
+else:
+    print(f"\n[FAIL] Test 6 FAILED ({passed6}/{passed6+failed6} checks)")
+
+
+# ============================================================
+# Test 7: --domain-rate / --domain-max-in-flight
+# ============================================================
+print("\n[TEST 7] --domain-rate 2.5 --domain-max-in-flight 3 -> DomainScheduler")
+print("-" * 60)
+
+mock_calls.clear()
+scrape_and_ingest.main(["--concurrency", "8", "--domain-rate", "2.5",
+                        "--domain-max-in-flight", "3"])
+scheduler7 = mock_calls[0]["scheduler"]
+
+checks7 = [
+    (scheduler7 is not None, "Scheduler passed to ingest_all"),
+    (scheduler7 is not None and scheduler7.rate_per_sec == 2.5, "Per-domain rate is 2.5 req/s"),
+    (scheduler7 is not None and scheduler7.max_in_flight == 3, "Per-domain max in flight is 3"),
+]
+
+passed7 = sum(1 for check, _ in checks7 if check)
+failed7 = len(checks7) - passed7
+
+print(f"Mock call recorded: {mock_calls}")
+for check, message in checks7:
+    status = "[PASS]" if check else "[FAIL]"
+    print(f"{status} {message}")
+
+if failed7 == 0:
+    print(f"\n[PASS] Test 7 PASSED ({passed7}/{passed7} checks)")
+else:
+    print(f"\n[FAIL] Test 7 FAILED ({passed7}/{passed7+failed7} checks)")
+
+
+# ============================================================
+# Test 8: --record / --replay
+# ============================================================
+print("\n[TEST 8] --record DIR / --replay DIR -> HTTP archive")
+print("-" * 60)
+
+import tempfile
+from data_scraper import html_cache, http_archive
+
+archive_dir = tempfile.mkdtemp()
+mock_calls.clear()
+scrape_and_ingest.main(["--record", archive_dir])
+recorded8 = http_archive.get_archive()
+cache_while_recording = html_cache.get_cache()
+open(f"{archive_dir}/index.jsonl", "a").close()
+scrape_and_ingest.main(["--replay", archive_dir, "--domain-rate", "2"])
+replayed8 = http_archive.get_archive()
+replay_call = mock_calls[-1]
+scrape_and_ingest.main(["--no-cache"])
+after8 = http_archive.get_archive()
+
+checks8 = [
+    (recorded8 is not None and recorded8.mode == "record", "--record enables the archive in record mode"),
+    (cache_while_recording is None, "HTML cache bypassed while recording"),
+    (replayed8 is not None and replayed8.mode == "replay", "--replay enables the archive in replay mode"),
+    (replay_call["scheduler"] is None, "No politeness scheduler when replaying"),
+    (after8 is None, "Archive off for a normal run"),
+]
+
+passed8 = sum(1 for check, _ in checks8 if check)
+failed8 = len(checks8) - passed8
+
+for check, message in checks8:
+    status = "[PASS]" if check else "[FAIL]"
+    print(f"{status} {message}")
+
+if failed8 == 0:
+    print(f"\n[PASS] Test 8 PASSED ({passed8}/{passed8} checks)")
+else:
+    print(f"\n[FAIL] Test 8 FAILED ({passed8}/{passed8+failed8} checks)")
+
+
+# ============================================================
+# Test 9: --html-backend
+# ============================================================
+print("\n[TEST 9] --html-backend -> parser backend of the product page parsers")
+print("-" * 60)
+
+from data_scraper import spec_extract
+
+scrape_and_ingest.main(["--no-cache", "--html-backend", "auto"])
+auto9 = spec_extract.get_html_backend()
+scrape_and_ingest.main(["--no-cache"])
+default9 = spec_extract.get_html_backend()
+
+checks9 = [
+    (spec_extract.backend_available(auto9), f"auto selects an installed backend ({auto9})"),
+    (default9 == "html.parser", "Default backend is html.parser"),
+    (scrape_and_ingest.parse_args(["--html-backend", "lxml"]).html_backend == "lxml", "Backend name parsed"),
+]
+
+passed9 = sum(1 for check, _ in checks9 if check)
+failed9 = len(checks9) - passed9
+
+for check, message in checks9:
+    status = "[PASS]" if check else "[FAIL]"
+    print(f"{status} {message}")
+
+if failed9 == 0:
+    print(f"\n[PASS] Test 9 PASSED ({passed9}/{passed9} checks)")
+else:
+    print(f"\n[FAIL] Test 9 FAILED ({passed9}/{passed9+failed9} checks)")
+
+
+# ============================================================
+# Test 10: --batch-size / --commit-interval / --key-index / --upsert
+# ============================================================
+print("\n[TEST 10] --batch-size / --commit-interval / --key-index / --upsert -> batched writer")
+print("-" * 60)
+
+from database.batch_writer import DEFAULT_BATCH_SIZE, DEFAULT_COMMIT_INTERVAL
+
+mock_calls.clear()
+scrape_and_ingest.main(["--no-cache"])
+scrape_and_ingest.main(["--no-cache", "--batch-size", "50", "--commit-interval", "200"])
+scrape_and_ingest.main(["--no-cache", "--commit-interval", "0"])
+scrape_and_ingest.main(["--no-cache", "--key-index", "bloom", "--key-error-rate", "0.01"])
+scrape_and_ingest.main(["--no-cache", "--upsert"])
+try:
+    scrape_and_ingest.parse_args(["--upsert", "--key-index", "set"])
+    conflict10 = False
+except SystemExit:
+    conflict10 = True
+
+checks10 = [
+    (mock_calls[0]["batch_size"] == DEFAULT_BATCH_SIZE
+     and mock_calls[0]["commit_interval"] == DEFAULT_COMMIT_INTERVAL, "Defaults passed"),
+    (mock_calls[1]["batch_size"] == 50 and mock_calls[1]["commit_interval"] == 200, "Values passed"),
+    (mock_calls[2]["commit_interval"] is None, "0 -> single commit at the end"),
+    (mock_calls[0]["key_index"] is None and mock_calls[3]["key_index"] == "bloom"
+     and mock_calls[3]["key_error_rate"] == 0.01, "Key index off by default, mode passed"),
+    (mock_calls[0]["upsert"] is False and mock_calls[4]["upsert"] is True and conflict10,
+     "--upsert passed, rejected with --key-index"),
+]
+
+passed10 = sum(1 for check, _ in checks10 if check)
+failed10 = len(checks10) - passed10
+
+for check, message in checks10:
+    status = "[PASS]" if check else "[FAIL]"
+    print(f"{status} {message}")
+
+if failed10 == 0:
+    print(f"\n[PASS] Test 10 PASSED ({passed10}/{passed10} checks)")
+else:
+    print(f"\n[FAIL] Test 10 FAILED ({passed10}/{passed10+failed10} checks)")
+
+
+# ============================================================
+# Test 11: --resume
+# ============================================================
+print("\n[TEST 11] --resume -> skip seeds already inserted")
+print("-" * 60)
+
+mock_calls.clear()
+scrape_and_ingest.main(["--no-cache"])
+scrape_and_ingest.main(["--no-cache", "--resume", "--only", "pads"])
+
+checks11 = [
+    (mock_calls[0]["resume"] is False, "Fresh run by default"),
+    (mock_calls[1]["resume"] is True and mock_calls[1]["group"] == "pads", "--resume passed"),
+]
+
+passed11 = sum(1 for check, _ in checks11 if check)
+failed11 = len(checks11) - passed11
+
+for check, message in checks11:
+    status = "[PASS]" if check else "[FAIL]"
+    print(f"{status} {message}")
+
+if failed11 == 0:
+    print(f"\n[PASS] Test 11 PASSED ({passed11}/{passed11} checks)")
+else:
+    print(f"\n[FAIL] Test 11 FAILED ({passed11}/{passed11+failed11} checks)")
+
+
+# ============================================================
+# Test 12: --frontier
+# ============================================================
+print("\n[TEST 12] --frontier -> crawl frontier worker")
+print("-" * 60)
+
+mock_calls.clear()
+scrape_and_ingest.main(["--no-cache", "--frontier"])
+scrape_and_ingest.main(["--no-cache", "--frontier", "--only", "rotors", "--worker-id", "w1",
+                        "--lease-size", "5", "--lease-seconds", "60", "--shared-db"])
+try:
+    scrape_and_ingest.parse_args(["--frontier", "--resume"])
+    rejected12 = False
+except SystemExit:
+    rejected12 = True
+
+checks12 = [
+    (mock_calls[0].get("frontier") and mock_calls[0]["group"] is None
+     and mock_calls[0]["profile"] == "bulk_load" and mock_calls[0]["worker_id"] is None,
+     "ingest_frontier called instead of ingest_all"),
+    (mock_calls[1]["group"] == "rotors" and mock_calls[1]["worker_id"] == "w1"
+     and mock_calls[1]["lease_size"] == 5 and mock_calls[1]["lease_s"] == 60.0
+     and mock_calls[1]["profile"] == "shared", "Worker id, lease size/seconds and --shared-db passed"),
+    (len(mock_calls) == 2 and rejected12, "--frontier with --resume rejected"),
+]
+
+passed12 = sum(1 for check, _ in checks12 if check)
+failed12 = len(checks12) - passed12
+
+for check, message in checks12:
+    status = "[PASS]" if check else "[FAIL]"
+    print(f"{status} {message}")
+
+if failed12 == 0:
+    print(f"\n[PASS] Test 12 PASSED ({passed12}/{passed12} checks)")
+else:
+    print(f"\n[FAIL] Test 12 FAILED ({passed12}/{passed12+failed12} checks)")
+
+
+# ============================================================
+# Test 13: --max-depth / --max-pages
+# ============================================================
+print("\n[TEST 13] --max-depth / --max-pages -> list page link following")
+print("-" * 60)
+
+mock_calls.clear()
+scrape_and_ingest.main(["--no-cache"])
+scrape_and_ingest.main(["--no-cache", "--max-depth", "0", "--max-pages", "50"])
+scrape_and_ingest.main(["--no-cache", "--frontier", "--max-depth", "1"])
+
+checks13 = [
+    (mock_calls[0]["max_depth"] == scrape_and_ingest.DEFAULT_MAX_DEPTH
+     and mock_calls[0]["max_pages"] == scrape_and_ingest.DEFAULT_MAX_PAGES, "Defaults passed"),
+    (mock_calls[1]["max_depth"] == 0 and mock_calls[1]["max_pages"] == 50, "Limits passed to ingest_all"),
+    (mock_calls[2].get("frontier") and mock_calls[2]["max_depth"] == 1, "Limits passed to ingest_frontier"),
+]
+
+passed13 = sum(1 for check, _ in checks13 if check)
+failed13 = len(checks13) - passed13
+
+for check, message in checks13:
+    status = "[PASS]" if check else "[FAIL]"
+    print(f"{status} {message}")
+
+if failed13 == 0:
+    print(f"\n[PASS] Test 13 PASSED ({passed13}/{passed13} checks)")
+else:
+    print(f"\n[FAIL] Test 13 FAILED ({passed13}/{passed13+failed13} checks)")
+
+
+# ============================================================
+# Test 14: --max-attempts / --breaker-threshold
+# ============================================================
+print("\n[TEST 14] --max-attempts / --retry-base-delay / --breaker-* -> retries and circuit breaker")
+print("-" * 60)
+
+mock_calls.clear()
+scrape_and_ingest.main(["--no-cache"])
+scrape_and_ingest.main(["--no-cache", "--max-attempts", "5", "--retry-base-delay", "2",
+                        "--breaker-threshold", "10", "--breaker-cooldown", "30"])
+scrape_and_ingest.main(["--no-cache", "--max-attempts", "1", "--breaker-threshold", "0"])
+scrape_and_ingest.main(["--no-cache", "--frontier", "--max-attempts", "4"])
+try:
+    scrape_and_ingest.parse_args(["--max-attempts", "0"])
+    rejected14 = False
+except SystemExit:
+    rejected14 = True
+
+default14, custom14, off14, frontier14 = mock_calls[:4]
+checks14 = [
+    (default14["retry"].max_attempts == scrape_and_ingest.DEFAULT_MAX_ATTEMPTS
+     and default14["breaker"].failure_threshold == scrape_and_ingest.DEFAULT_FAILURE_THRESHOLD,
+     "Retries and circuit breaker on by default"),
+    (custom14["retry"].max_attempts == 5 and custom14["retry"].base_delay == 2.0
+     and custom14["breaker"].failure_threshold == 10 and custom14["breaker"].cooldown_s == 30.0,
+     "Custom retry / breaker settings passed"),
+    (off14["retry"] is None and off14["breaker"] is None, "--max-attempts 1 / --breaker-threshold 0 turn them off"),
+    (frontier14.get("frontier") and frontier14["retry"].max_attempts == 4, "Policy passed to ingest_frontier"),
+    (rejected14, "--max-attempts 0 rejected"),
+]
+
+passed14 = sum(1 for check, _ in checks14 if check)
+failed14 = len(checks14) - passed14
+
+for check, message in checks14:
+    status = "[PASS]" if check else "[FAIL]"
+    print(f"{status} {message}")
+
+if failed14 == 0:
+    print(f"\n[PASS] Test 14 PASSED ({passed14}/{passed14} checks)")
+else:
+    print(f"\n[FAIL] Test 14 FAILED ({passed14}/{passed14+failed14} checks)")
+
+
 # ============================================================
 # Summary
 # ============================================================
-total_passed = passed1 + passed2 + passed3 + passed4 + passed5
-total_failed = failed1 + failed2 + failed3 + failed4 + failed5
+total_passed = passed1 + passed2 + passed3 + passed4 + passed5 + passed6 + passed7 + passed8 + passed9 + passed10 + passed11 + passed12 + passed13 + passed14
+total_failed = failed1 + failed2 + failed3 + failed4 + failed5 + failed6 + failed7 + failed8 + failed9 + failed10 + failed11 + failed12 + failed13 + failed14
 
 print("\n" + "="*60)
 print("ALL TESTS COMPLETED")
@@ -189,8 +522,19 @@ if total_failed == 0:
     print("  - --only rotors -> group='rotors'")
     print("  - --only pads -> group='pads'")
     print("  - --only vehicles -> group='vehicles'")
+    print("  - --concurrency N -> concurrency=N")
+    print("  - --record / --replay DIR -> HTTP archive")
+    print("  - --html-backend NAME -> product page parser backend")
+    print("  - --batch-size / --commit-interval N -> batched DB writer")
+    print("  - --key-index set|bloom -> preloaded natural keys")
+    print("  - --upsert -> update records whose content changed")
+    print("  - --resume -> skip seeds the journal records as inserted")
+    print("  - --frontier -> lease seeds from the crawl frontier (ingest_frontier)")
+    print("  - --max-depth / --max-pages -> list page links followed")
+    print("  - --max-attempts / --breaker-threshold -> retries and circuit breaker")
 else:
     print(f"\n[FAIL] {total_failed} test(s) failed")
 
 # Restore original function (cleanup)
 scrape_and_ingest.ingest_all = original_ingest_all
+scrape_and_ingest.ingest_frontier = original_ingest_frontier
@@ -0,0 +1,247 @@
+"""
+Test suite for the ingest checkpoint journal (database/seed_journal.py).
+Covers seed registration, journal marks written with the records by the
+staged writer, and an interrupted ingest_all() run resumed with resume=True
+against the local fixture server.
+"""
+
+import os
+import sqlite3
+import sys
+import tempfile
+sys.path.insert(0, '.')
+
+import database.ingest_pipeline as ingest_pipeline
+from database.ingest_pipeline import write_parsed_page
+from database.ingest_stages import StagedIngest
+from database.migrations import SCHEMA_VERSION, migrate, schema_version
+from database.seed_journal import journal_summary, register_seeds
+from tests.local_server import LocalServer
+
+print("="*60)
+print("INGEST JOURNAL TESTS")
+print("="*60)
+
+
+def report(number: int, checks: list) -> tuple:
+    passed = sum(1 for check, _ in checks if check)
+    failed = len(checks) - passed
+    for check, message in checks:
+        status = "[PASS]" if check else "[FAIL]"
+        print(f"{status} {message}")
+    if failed == 0:
+        print(f"\n[PASS] Test {number} PASSED ({passed}/{passed} checks)")
+    else:
+        print(f"\n[FAIL] Test {number} FAILED ({passed}/{passed+failed} checks)")
+    return passed, failed
+
+
+def new_db(sql_filter=None) -> str:
+    fd, path = tempfile.mkstemp(suffix=".db")
+    os.close(fd)
+    conn = sqlite3.connect(path)
+    with open("database/init.sql", "r", encoding="utf-8") as f:
+        sql = f.read()
+    conn.executescript(sql_filter(sql) if sql_filter else sql)
+    conn.close()
+    return path
+
+
+def remove_db(path: str) -> None:
+    for suffix in ("", "-wal", "-shm"):
+        if os.path.exists(path + suffix):
+            os.remove(path + suffix)
+
+
+def journal(db_path: str) -> dict:
+    conn = sqlite3.connect(db_path)
+    rows = conn.execute("SELECT url, status, attempts, records, last_error FROM ingest_journal")
+    entries = {url.rsplit("/", 1)[-1]: (status, attempts, records, error)
+               for url, status, attempts, records, error in rows}
+    conn.close()
+    return entries
+
+
+def fixture(path: str) -> str:
+    with open(os.path.join("tests", "fixtures", path), encoding="utf-8") as f:
+        return f.read()
+
+
+results_summary = []
+
+# ============================================================
+# Test 1: Registration and migration
+# ============================================================
+print("\n[TEST 1] register_seeds() - fresh run vs resume")
+print("-" * 60)
+
+SEEDS1 = [("dba", f"http://dba.test/{i}", "", "product") for i in range(4)]
+
+db1 = new_db()
+conn = sqlite3.connect(db1)
+fresh1 = register_seeds(conn, "rotors", SEEDS1)
+conn.execute("UPDATE ingest_journal SET status = 'inserted' WHERE url LIKE '%/0' OR url LIKE '%/1'")
+conn.execute("UPDATE ingest_journal SET status = 'failed' WHERE url LIKE '%/2'")
+conn.commit()
+resumed1 = register_seeds(conn, "rotors", SEEDS1 + [("dba", "http://dba.test/9", "", "product")],
+                          resume=True)
+summary1 = journal_summary(conn)
+other1 = register_seeds(conn, "pads", SEEDS1[:1], resume=True)
+restarted1 = register_seeds(conn, "rotors", SEEDS1)
+summary1b = journal_summary(conn, "rotors")
+conn.close()
+
+
+def without_journal(sql: str) -> str:
+    start = sql.index("-- ------------------------------------------------------------\n--  Ingest journal")
+    end = sql.index("-- Schema version")
+    return sql[:start] + sql[end:].replace(f"user_version = {SCHEMA_VERSION};", "user_version = 2;")
+
+
+db1b = new_db(without_journal)
+conn = sqlite3.connect(db1b)
+applied1 = migrate(conn, verbose=False)
+tables1 = {row[0] for row in conn.execute("SELECT name FROM sqlite_master WHERE type = 'table'")}
+conn.close()
+
+checks1 = [
+    (fresh1 == set() and summary1 == {"pending": 2, "inserted": 2, "failed": 1},
+     f"Resume keeps stored statuses, adds new seeds: {summary1}"),
+    (resumed1 == {"http://dba.test/0", "http://dba.test/1"}, "Resume returns the inserted seeds"),
+    (other1 == set(), "Journal is per group"),
+    (restarted1 == set() and summary1b == {"pending": 5, "inserted": 0, "failed": 0},
+     "Fresh run marks every seed pending again"),
+    (applied1[3] == {"ingest_journal": 1} and "ingest_journal" in tables1
+     and schema_version(sqlite3.connect(db1b)) == SCHEMA_VERSION, "Migration 3 creates the table"),
+]
+results_summary.append(report(1, checks1))
+for path in (db1, db1b):
+    remove_db(path)
+
+# ============================================================
+# Test 2: Writer marks
+# ============================================================
+print("\n[TEST 2] StagedIngest(journal=True) - outcome per seed")
+print("-" * 60)
+
+ROTOR_HTML = fixture("product_pages/dba_rotor_01.html")
+
+
+def rotor_page(i: int) -> str:
+    return ROTOR_HTML.replace("DBA42134S", f"DBA4213{i}S")
+
+
+db2 = new_db()
+seeds2 = [
+    ("autodoc", "http://autodoc.test/list", "", "list"),
+    ("dba", "http://dba.test/rotor", "", "product"),
+    ("dba", "http://dba.test/rotor-copy", "", "product"),
+    ("dba", "http://dba.test/down", "", "product"),
+]
+pages2 = [fixture("rotor_lists/autodoc_list_01.html"), rotor_page(0), rotor_page(0), None]
+fetched2 = [(i, seed[1], html, None if html else "HTTP 503")
+            for i, (seed, html) in enumerate(zip(seeds2, pages2))]
+with StagedIngest(db2, write_parsed_page, parse_workers=0, journal=True,
+                  journal_commit_interval=2) as stages2:
+    stages2.run("rotors", seeds2, fetched2)
+entries2 = journal(db2)
+
+checks2 = [
+    (entries2["list"][:3] == ("inserted", 1, 0), "List page without valid rotors: inserted, 0 records"),
+    (entries2["rotor"][:3] == ("inserted", 1, 1) and entries2["rotor-copy"][:3] == ("inserted", 1, 0),
+     "Product page: 1 record, its duplicate 0"),
+    (entries2["down"][0] == "failed" and entries2["down"][3] == "fetch: HTTP 503", "Fetch error journaled"),
+    (stages2.counters["write"]["journaled"] == 4, "4 seeds journaled"),
+]
+results_summary.append(report(2, checks2))
+remove_db(db2)
+
+# ============================================================
+# Test 3: Interrupted run, then resume
+# ============================================================
+print("\n[TEST 3] ingest_all() crash mid-run, then resume=True")
+print("-" * 60)
+
+site3 = tempfile.mkdtemp()
+for i in range(4):
+    with open(os.path.join(site3, f"p{i}.html"), "w", encoding="utf-8") as f:
+        f.write(rotor_page(i))
+server = LocalServer(site3).start()
+seeds3 = [("dba", server.url(f"p{i}.html"), "", "product") for i in range(4)]
+seeds3.append(("dba", server.url("missing.html"), "", "product"))
+db3 = new_db()
+
+
+def crashing_write(writer, parsed, url):
+    if url.endswith("p2.html"):
+        raise RuntimeError("simulated crash")
+    return write_parsed_page(writer, parsed, url)
+
+
+def rotor_count(db_path: str) -> int:
+    conn = sqlite3.connect(db_path)
+    count = conn.execute("SELECT COUNT(*) FROM rotors").fetchone()[0]
+    conn.close()
+    return count
+
+
+original_db_path = ingest_pipeline.DB_PATH
+original_iter_seed_urls = ingest_pipeline.iter_seed_urls
+original_write = ingest_pipeline.write_parsed_page
+ingest_pipeline.DB_PATH = db3
+ingest_pipeline.iter_seed_urls = lambda kind: iter(seeds3 if kind == "rotors" else [])
+try:
+    ingest_pipeline.write_parsed_page = crashing_write
+    try:
+        # One commit per inserted row: p1's row commits p0's journal mark
+        ingest_pipeline.ingest_all(group="rotors", parse_workers=0, commit_interval=1)
+        crashed3 = False
+    except RuntimeError:
+        crashed3 = True
+    ingest_pipeline.write_parsed_page = original_write
+    after_crash3 = {name: entry[0] for name, entry in journal(db3).items()}
+    rows_crash3 = rotor_count(db3)
+
+    server.request_log.clear()
+    stats3 = ingest_pipeline.ingest_all(group="rotors", parse_workers=0, resume=True)
+    fetched3 = sorted(server.request_log)
+    server.request_log.clear()
+    again3 = ingest_pipeline.ingest_all(group="rotors", parse_workers=0, resume=True)
+    refetched3 = list(server.request_log)
+finally:
+    ingest_pipeline.DB_PATH = original_db_path
+    ingest_pipeline.iter_seed_urls = original_iter_seed_urls
+    ingest_pipeline.write_parsed_page = original_write
+    server.stop()
+final3 = journal(db3)
+
+checks3 = [
+    (crashed3 and after_crash3 == {"p0.html": "inserted", "p1.html": "pending", "p2.html": "pending",
+                                   "p3.html": "pending", "missing.html": "pending"},
+     f"After the crash: committed mark kept, the rest pending {after_crash3}"),
+    (rows_crash3 == 2, "Rows committed before the crash kept (p1's mark was not)"),
+    (stats3["resumed"] == 1 and fetched3 == ["/missing.html", "/p1.html", "/p2.html", "/p3.html"],
+     f"Resume fetches only the unfinished seeds: {fetched3}"),
+    (final3["p1.html"][:3] == ("inserted", 1, 0) and final3["p2.html"][:3] == ("inserted", 1, 1)
+     and rotor_count(db3) == 4, "p1 found as duplicate, p2 and p3 inserted"),
+    (final3["missing.html"][0] == "failed" and final3["missing.html"][1] == 2
+     and "404" in final3["missing.html"][3] and refetched3 == ["/missing.html"],
+     "Failed seed retried on every resume"),
+    (again3["journal"] == {"pending": 0, "inserted": 4, "failed": 1}, f"Journal summary: {again3['journal']}"),
+]
+results_summary.append(report(3, checks3))
+remove_db(db3)
+for name in os.listdir(site3):
+    os.remove(os.path.join(site3, name))
+os.rmdir(site3)
+
+# ============================================================
+# Summary
+# ============================================================
+total_passed = sum(p for p, _ in results_summary)
+total_failed = sum(f for _, f in results_summary)
+
+print("\n" + "="*60)
+print("ALL TESTS COMPLETED")
+print(f"Total: {total_passed} PASSED, {total_failed} FAILED")
+print("="*60)
@@ -0,0 +1,166 @@
+"""
+Test suite for the shared specification extraction (data_scraper/spec_extract.py).
+Covers rule table priority and syntax, the single-pass node collection
+(including nested tables/lists) and the product page parsers built on them.
+"""
+
+import sys
+sys.path.insert(0, '.')
+
+from bs4 import BeautifulSoup
+
+from data_scraper.html_scraper import (
+    DBA_TABLE_RULES,
+    WHEELSIZE_TABLE_RULES,
+    parse_dba_rotor_page,
+    parse_ebc_pad_page,
+    parse_wheelsize_vehicle_page,
+)
+from data_scraper.spec_extract import LabelRules, apply_label_rules, collect_spec_nodes
+
+print("="*60)
+print("SPEC EXTRACTION TESTS")
+print("="*60)
+
+
+def report(number: int, checks: list) -> tuple:
+    passed = sum(1 for check, _ in checks if check)
+    failed = len(checks) - passed
+    for check, message in checks:
+        status = "[PASS]" if check else "[FAIL]"
+        print(f"{status} {message}")
+    if failed == 0:
+        print(f"\n[PASS] Test {number} PASSED ({passed}/{passed} checks)")
+    else:
+        print(f"\n[FAIL] Test {number} FAILED ({passed}/{passed+failed} checks)")
+    return passed, failed
+
+
+results_summary = []
+
+# ============================================================
+# Test 1: Rule tables
+# ============================================================
+print("\n[TEST 1] LabelRules - priority, exclusions, syntax")
+print("-" * 60)
+
+try:
+    LabelRules([("pcd | ", "bolt_circle_mm")])
+    invalid1 = False
+except ValueError:
+    invalid1 = True
+
+checks1 = [
+    (DBA_TABLE_RULES.match("pcd diameter")[0] == "bolt_circle_mm", "PCD checked before diameter"),
+    (DBA_TABLE_RULES.match("rotor diameter")[0] == "outer_diameter_mm", "Diameter without bolt/pcd"),
+    (DBA_TABLE_RULES.match("bolt diameter")[0] is None, "Excluded term blocks the alternative"),
+    (DBA_TABLE_RULES.match("rotor thickness")[0] is None
+     and DBA_TABLE_RULES.match("nominal rotor thickness")[0] == "nominal_thickness_mm", "Second alternative of a rule"),
+    (DBA_TABLE_RULES.match("ventilation")[1] is str.lower, "Transform returned with the field"),
+    (WHEELSIZE_TABLE_RULES.match("years")[0] == "years_raw"
+     and WHEELSIZE_TABLE_RULES.match("model year")[0] == "model", "Wheel-Size year rules in order"),
+    (DBA_TABLE_RULES.match("finish") == (None, None), "Unknown label -> (None, None)"),
+    (invalid1, "Empty alternative rejected at compile time"),
+]
+results_summary.append(report(1, checks1))
+
+# ============================================================
+# Test 2: Single-pass collection
+# ============================================================
+print("\n[TEST 2] collect_spec_nodes() - find_all() nesting semantics")
+print("-" * 60)
+
+html2 = """
+<html><body>
+    <h1>First title</h1><h1>Second title</h1>
+    <table>
+        <tr><td>Outer</td><td>1<table><tr><td>Inner</td><td>2</td></tr></table></td></tr>
+        <tr><td>Lonely</td></tr>
+    </table>
+    <dl><dt>A</dt><dd>1</dd><dt>B</dt><dt>C</dt><dd>3</dd></dl>
+    <div class="menu">no data</div>
+    <div class="product-info" data-diameter="330mm"><span class="Product-Code">X1</span></div>
+    <span data-make="Honda">Honda</span>
+</body></html>
+"""
+nodes2 = collect_spec_nodes(BeautifulSoup(html2, "html.parser"))
+rows2 = [(a.get_text(), b.get_text()) for a, b in nodes2["table_rows"]]
+pairs2 = [(a.get_text(), b.get_text()) for a, b in nodes2["dl_pairs"]]
+
+checks2 = [
+    (rows2 == [("Outer", "1Inner2"), ("Inner", "2"), ("Inner", "2")],
+     "Nested table rows seen by both tables, single-cell row skipped"),
+    (pairs2 == [("A", "1"), ("B", "3")], "dt/dd zipped per dl"),
+    ([(t.name, c) for t, c in nodes2["data_elements"]] == [("div", "product-info"), ("span", "")],
+     "Only div/span with data-* attributes"),
+    (nodes2["product_code"].get_text() == "X1", "product-code class matched case-insensitively"),
+    (nodes2["h1"].get_text() == "First title", "First h1"),
+]
+results_summary.append(report(2, checks2))
+
+# ============================================================
+# Test 3: apply_label_rules()
+# ============================================================
+print("\n[TEST 3] apply_label_rules() - later rows win, lazy values")
+print("-" * 60)
+
+raw3 = {}
+apply_label_rules(nodes2["table_rows"], LabelRules([("inner", "inner"), ("outer", "outer")]),
+                  raw3, lambda text: text.strip())
+
+checks3 = [
+    (raw3 == {"outer": "1Inner2", "inner": "2"}, "Fields mapped in document order"),
+]
+results_summary.append(report(3, checks3))
+
+# ============================================================
+# Test 4: Parsers on mixed strategies
+# ============================================================
+print("\n[TEST 4] Product page parsers")
+print("-" * 60)
+
+rotor4 = parse_dba_rotor_page("""
+<html><body>
+    <h1>DBA 4000 Drilled Rotor DBA 42134 DBA42134XS</h1>
+    <table>
+        <tr><td>PCD Diameter</td><td>114.3mm</td></tr>
+        <tr><td>Diameter</td><td>330mm</td></tr>
+        <tr><td>Hat Height</td><td>46mm</td></tr>
+    </table>
+    <dl><dt>Thickness</dt><dd>28mm</dd></dl>
+    <div class="spec" data-hat-height="47mm"></div>
+</body></html>
+""")
+pad4 = parse_ebc_pad_page("""
+<html><body>
+    <h1>EBC Pad DP4256R</h1>
+    <table><tr><td>Shape Code</td><td>256</td></tr><tr><td>Length</td><td>120mm</td></tr></table>
+</body></html>
+""")
+vehicle4 = parse_wheelsize_vehicle_page("""
+<html><body>
+    <div class="vehicle-card" data-make="Honda" data-model="Civic"></div>
+    <span data-pcd="5x114.3"></span>
+</body></html>
+""")
+
+checks4 = [
+    (rotor4["bolt_circle_mm"] == 114.3 and rotor4["outer_diameter_mm"] == 330, "DBA table rules"),
+    (rotor4["hat_height_mm"] == 47 and rotor4["nominal_thickness_mm"] == 28, "DBA dl + data attributes"),
+    (rotor4["catalog_ref"] == "DBA42134XS" and rotor4["ventilation_type"] == "drilled", "DBA title fallbacks"),
+    (pad4["shape_id"] == "256" and pad4["catalog_ref"] == "DP4256R", "EBC shape code not taken as ref"),
+    (vehicle4.get("make") == "Honda" and vehicle4.get("model") == "Civic", "Wheel-Size data attributes (classed div)"),
+    (vehicle4.get("hub_bolt_hole_count_raw") == "5", "Wheel-Size data-pcd split"),
+]
+results_summary.append(report(4, checks4))
+
+# ============================================================
+# Summary
+# ============================================================
+total_passed = sum(p for p, _ in results_summary)
+total_failed = sum(f for _, f in results_summary)
+
+print("\n" + "="*60)
+print("ALL TESTS COMPLETED")
+print(f"Total: {total_passed} PASSED, {total_failed} FAILED")
+print("="*60)
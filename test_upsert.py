@@ -0,0 +1,274 @@
+"""
+Test suite for change tracking and upserts (database/batch_writer.py).
+Covers content_hash(), the tracking columns written on insert, upsert of
+changed / unchanged records, and migration 2 on a database without the
+tracking columns.
+"""
+
+import json
+import os
+import re
+import sqlite3
+import sys
+import tempfile
+sys.path.insert(0, '.')
+
+from database import ingest_pipeline
+from database.batch_writer import BatchWriter, content_hash
+from database.ingest_pipeline import ingest_jsonl, write_parsed_page
+from database.migrations import SCHEMA_VERSION, migrate, schema_version
+
+print("="*60)
+print("UPSERT / CHANGE TRACKING TESTS")
+print("="*60)
+
+
+def report(number: int, checks: list) -> tuple:
+    passed = sum(1 for check, _ in checks if check)
+    failed = len(checks) - passed
+    for check, message in checks:
+        status = "[PASS]" if check else "[FAIL]"
+        print(f"{status} {message}")
+    if failed == 0:
+        print(f"\n[PASS] Test {number} PASSED ({passed}/{passed} checks)")
+    else:
+        print(f"\n[FAIL] Test {number} FAILED ({passed}/{passed+failed} checks)")
+    return passed, failed
+
+
+def create_test_db(sql_filter=None) -> sqlite3.Connection:
+    conn = sqlite3.connect(":memory:")
+    with open("database/init.sql", "r", encoding="utf-8") as f:
+        sql = f.read()
+    conn.executescript(sql_filter(sql) if sql_filter else sql)
+    return conn
+
+
+def rotor(i: int, **extra) -> dict:
+    record = {
+        "outer_diameter_mm": 300.0 + i % 50, "nominal_thickness_mm": 28.0,
+        "hat_height_mm": 45.0, "overall_height_mm": 52.0, "center_bore_mm": 64.1,
+        "bolt_circle_mm": 114.3, "bolt_hole_count": 5, "ventilation_type": "vented",
+        "directionality": "non_directional", "brand": "DBA", "catalog_ref": f"DBA{i:05d}",
+    }
+    record.update(extra)
+    return record
+
+
+def tracking(conn, ref: str) -> tuple:
+    return conn.execute("SELECT outer_diameter_mm, content_hash, first_seen, last_seen "
+                        "FROM rotors WHERE catalog_ref = ?", (ref,)).fetchone()
+
+
+OLD = "2000-01-01T00:00:00+00:00"
+
+results_summary = []
+
+# ============================================================
+# Test 1: content_hash()
+# ============================================================
+print("\n[TEST 1] content_hash() - canonical record hash")
+print("-" * 60)
+
+reordered1 = dict(reversed(list(rotor(1).items())))
+checks1 = [
+    (content_hash(rotor(1)) == content_hash(reordered1), "Key order ignored"),
+    (content_hash(rotor(1)) == content_hash(rotor(1, offset_mm=None)), "NULL fields ignored"),
+    (content_hash(rotor(1)) != content_hash(rotor(1, outer_diameter_mm=350.0)), "Changed value detected"),
+    (len(content_hash(rotor(1))) == 32, "128-bit hex digest"),
+    (content_hash(rotor(1, outer_diameter_mm=300, bolt_hole_count=5.0))
+     == content_hash(rotor(1, outer_diameter_mm=300.0)), "Integers hash as floats (300 == 300.0)"),
+]
+results_summary.append(report(1, checks1))
+
+# ============================================================
+# Test 2: Tracking columns on insert
+# ============================================================
+print("\n[TEST 2] Inserts record content_hash, first_seen and last_seen")
+print("-" * 60)
+
+conn = create_test_db()
+writer2 = BatchWriter(conn, commit_interval=None)
+counts2 = writer2.write("rotors", [rotor(1), rotor(2)])
+again2 = writer2.write("rotors", [rotor(1, outer_diameter_mm=999.0)])
+row2 = tracking(conn, "DBA00001")
+stored2 = conn.execute("SELECT * FROM rotors WHERE catalog_ref = 'DBA00002'")
+names2 = [d[0] for d in stored2.description]
+record2 = dict(zip(names2, stored2.fetchone()))
+for name in ("id", "content_hash", "first_seen", "last_seen"):
+    record2.pop(name)
+
+checks2 = [
+    (counts2 == (2, 0) and again2 == (0, 1), "Insert mode still skips duplicates"),
+    (row2[0] == 301.0 and row2[1] == content_hash(rotor(1)), "First record and its hash kept"),
+    (row2[2] is not None and row2[2] == row2[3], "first_seen == last_seen on insert"),
+    (content_hash(record2) == content_hash(rotor(2)), "Row read back hashes like the record"),
+]
+results_summary.append(report(2, checks2))
+conn.close()
+
+# ============================================================
+# Test 3: Upsert
+# ============================================================
+print("\n[TEST 3] Upsert - changed rows updated, unchanged rows only seen")
+print("-" * 60)
+
+conn = create_test_db()
+BatchWriter(conn).write("rotors", [rotor(i) for i in range(4)])
+conn.execute("UPDATE rotors SET first_seen = ?, last_seen = ?", (OLD, OLD))
+writer3 = BatchWriter(conn, batch_size=3, upsert=True)
+counts3 = writer3.write("rotors", [rotor(0), rotor(1, outer_diameter_mm=310.0),
+                                   rotor(2, offset_mm=35.0), rotor(4), rotor(5, brand=None)])
+changed3 = tracking(conn, "DBA00001")
+unchanged3 = tracking(conn, "DBA00000")
+unseen3 = tracking(conn, "DBA00003")
+offset3 = conn.execute("SELECT offset_mm FROM rotors WHERE catalog_ref = 'DBA00002'").fetchone()[0]
+
+checks3 = [
+    (counts3 == (1, 4), f"(inserted, not inserted) = {counts3}"),
+    (writer3.stats["updated"] == 2 and writer3.stats["skipped"] == 1 and writer3.stats["failed"] == 1,
+     "2 updated, 1 unchanged, 1 failed"),
+    (changed3[0] == 310.0 and changed3[1] == content_hash(rotor(1, outer_diameter_mm=310.0)),
+     "Changed spec and hash written"),
+    (changed3[2] == OLD and changed3[3] != OLD and offset3 == 35.0, "first_seen kept, last_seen moved"),
+    (unchanged3[1] == content_hash(rotor(0)) and unchanged3[2] == OLD and unchanged3[3] != OLD,
+     "Unchanged row: only last_seen moved"),
+    (unseen3[3] == OLD and conn.execute("SELECT COUNT(*) FROM rotors").fetchone()[0] == 5,
+     "Rows not seen untouched, new row inserted"),
+]
+results_summary.append(report(3, checks3))
+
+parsed3 = {"kind": "rotor_list", "extracted": 2, "log": [], "error": None,
+           "records": [(1, rotor(0)), (2, rotor(3, hat_height_mm=46.0))]}
+page3 = write_parsed_page(writer3, parsed3, "http://autodoc.test/list")
+updated3 = writer3.stats["updated"]
+product3 = {"kind": "rotor", "extracted": 1, "log": [], "error": None,
+            "records": [(1, rotor(0, hat_height_mm=47.0))]}
+single3 = write_parsed_page(writer3, product3, "http://dba.test/0")
+try:
+    BatchWriter(conn, upsert=True, key_index=object())
+    conflict3 = False
+except ValueError:
+    conflict3 = True
+
+checks3b = [
+    (page3 == 0 and updated3 == 3, "Catalog page: 1 updated, 1 unchanged"),
+    (single3 == 0 and writer3.stats["updated"] == 4, "Product page update counted"),
+    (conflict3, "upsert + key_index rejected"),
+]
+
+# Integer input for REAL columns: read back as floats, same content
+integer3 = rotor(60, outer_diameter_mm=330, nominal_thickness_mm=32)
+writer3.write("rotors", [integer3])
+before3 = writer3.stats["updated"]
+writer3.write("rotors", [rotor(60, outer_diameter_mm=330.0, nominal_thickness_mm=32.0)])
+stored3 = conn.execute("SELECT * FROM rotors WHERE catalog_ref = 'DBA00060'")
+read3 = dict(zip([d[0] for d in stored3.description], stored3.fetchone()))
+for name in ("id", "content_hash", "first_seen", "last_seen"):
+    read3.pop(name)
+
+checks3b += [
+    (read3["outer_diameter_mm"] == 330.0 and content_hash(read3) == content_hash(integer3),
+     "Integer record read back (as floats) hashes like the record"),
+    (writer3.stats["updated"] == before3, "Same record with float values: unchanged"),
+]
+results_summary.append(report("3b", checks3b))
+conn.close()
+
+# Re-crawl of known rows: updates and last_seen moves count toward commits
+conn = create_test_db()
+BatchWriter(conn).write("rotors", [rotor(i) for i in range(20)])
+recrawl3 = BatchWriter(conn, batch_size=5, commit_interval=10, upsert=True)
+recrawl3.write("rotors", [rotor(i, hat_height_mm=46.0) for i in range(10)]
+               + [rotor(i) for i in range(10, 20)])
+
+checks3c = [
+    (recrawl3.stats["updated"] == 10 and recrawl3.stats["skipped"] == 10,
+     "10 updated, 10 unchanged"),
+    (recrawl3.stats["commits"] == 2, f"Commit every 10 rows written ({recrawl3.stats['commits']} commits)"),
+]
+results_summary.append(report("3c", checks3c))
+conn.close()
+
+# ============================================================
+# Test 4: Migration 2 and ingest_jsonl(upsert=True)
+# ============================================================
+print("\n[TEST 4] Migration of a database without tracking columns")
+print("-" * 60)
+
+
+def v1_schema(sql: str) -> str:
+    sql = re.sub(r",\s*-- Change tracking.*?last_seen TEXT", "", sql, flags=re.S)
+    return sql.replace(f"PRAGMA user_version = {SCHEMA_VERSION};", "PRAGMA user_version = 1;")
+
+
+fd, db4 = tempfile.mkstemp(suffix=".db")
+os.close(fd)
+conn = sqlite3.connect(db4)
+with open("database/init.sql", "r", encoding="utf-8") as f:
+    conn.executescript(v1_schema(f.read()))
+for i in range(3):
+    record = rotor(i)
+    conn.execute(f"INSERT INTO rotors ({','.join(record)}) VALUES ({','.join('?' * len(record))})",
+                 list(record.values()))
+conn.commit()
+columns_before4 = {row[1] for row in conn.execute("PRAGMA table_info(rotors)")}
+try:
+    BatchWriter(conn, upsert=True).write("rotors", [rotor(0)])
+    legacy_error4 = False
+except ValueError:
+    legacy_error4 = True
+plain4 = BatchWriter(conn).write("rotors", [rotor(0)])
+applied4 = migrate(conn, verbose=False)
+hashes4 = [row[0] for row in conn.execute("SELECT content_hash FROM rotors ORDER BY id")]
+# Version 6 database hashed before integers hashed as floats
+conn.execute("UPDATE rotors SET content_hash = 'stale'")
+conn.execute("PRAGMA user_version = 6")
+conn.commit()
+rehashed4 = migrate(conn, verbose=False)
+stale4 = conn.execute("SELECT COUNT(*) FROM rotors WHERE content_hash = 'stale'").fetchone()[0]
+conn.close()
+
+fd, jsonl4 = tempfile.mkstemp(suffix=".jsonl")
+with os.fdopen(fd, "w", encoding="utf-8") as f:
+    for record in (rotor(0), rotor(1, nominal_thickness_mm=30.0), rotor(3)):
+        f.write(json.dumps(record) + "\n")
+saved_db_path = ingest_pipeline.DB_PATH
+ingest_pipeline.DB_PATH = db4
+try:
+    ingest_jsonl(jsonl4, "rotors", upsert=True)
+finally:
+    ingest_pipeline.DB_PATH = saved_db_path
+conn = sqlite3.connect(db4)
+rows4 = conn.execute("SELECT catalog_ref, nominal_thickness_mm, first_seen, last_seen "
+                     "FROM rotors ORDER BY id").fetchall()
+conn.close()
+
+checks4 = [
+    ("content_hash" not in columns_before4 and schema_version(create_test_db()) == SCHEMA_VERSION,
+     "Legacy schema vs current schema"),
+    (legacy_error4 and plain4 == (0, 1), "Before migration: upsert refused, plain inserts work"),
+    (applied4[2] == {"rotors": 3, "pads": 0, "vehicles": 0}, f"Migration 2 applied: {applied4}"),
+    (hashes4 == [content_hash(rotor(i)) for i in range(3)], "Hashes backfilled from stored rows"),
+    (rehashed4 == {7: {"rotors": 3, "pads": 0, "vehicles": 0}} and stale4 == 0,
+     "Migration 7 rehashes every row"),
+    (rows4[0][2] is None and rows4[0][3] is not None, "Unchanged legacy row: only last_seen set"),
+    (rows4[1][1] == 30.0 and rows4[1][2] is None, "Changed legacy row updated"),
+    (rows4[2][3] is None and rows4[3][0] == "DBA00003" and rows4[3][2] is not None,
+     "Unseen row untouched, new row tracked"),
+]
+results_summary.append(report(4, checks4))
+
+os.remove(jsonl4)
+os.remove(db4)
+
+# ============================================================
+# Summary
+# ============================================================
+total_passed = sum(p for p, _ in results_summary)
+total_failed = sum(f for _, f in results_summary)
+
+print("\n" + "="*60)
+print("ALL TESTS COMPLETED")
+print(f"Total: {total_passed} PASSED, {total_failed} FAILED")
+print("="*60)
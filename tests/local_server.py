@@ -0,0 +1,124 @@
+"""
+Local stand-in HTTP server for network tests.
+
+Serves a directory over http://127.0.0.1:<port>/ from a background thread so
+fetchers can be exercised against the HTML fixtures without touching live
+catalog sites.
+
+Usage:
+    with LocalServer("tests/fixtures/rotor_lists") as server:
+        html = fetch_html(server.url("autodoc_list_01.html"))
+        server.request_log   # ["/autodoc_list_01.html", ...]
+
+        # Scripted responses (consumed in order, then files are served again)
+        server.script("/busy.html", 429, {"Retry-After": "1"})
+"""
+
+import functools
+import os
+import threading
+import time
+from http.server import SimpleHTTPRequestHandler, ThreadingHTTPServer
+
+
+class _QuietHandler(SimpleHTTPRequestHandler):
+    """Static file handler that records requests instead of logging them."""
+
+    # Keep-alive, like real catalog hosts (connections are tracked per client port)
+    protocol_version = "HTTP/1.1"
+    disable_nagle_algorithm = True
+
+    extensions_map = {
+        **SimpleHTTPRequestHandler.extensions_map,
+        ".html": "text/html; charset=utf-8",
+    }
+
+    def setup(self):
+        super().setup()
+        # One handler instance per TCP connection: emulate handshake cost
+        if self.server.owner.connect_delay:
+            time.sleep(self.server.owner.connect_delay)
+
+    def do_GET(self):
+        owner = self.server.owner
+        with owner.lock:
+            owner.request_log.append(self.path)
+            owner.headers_log.append(dict(self.headers))
+            owner.connections.add(self.client_address)
+            scripted = owner.scripted.get(self.path)
+            response = scripted.pop(0) if scripted else None
+        if owner.delay:
+            time.sleep(owner.delay)
+        if response is None:
+            super().do_GET()
+            return
+
+        status, headers, body = response
+        self.send_response(status)
+        for name, value in headers.items():
+            self.send_header(name, value)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+class LocalServer:
+    """
+    Threaded HTTP server bound to an ephemeral localhost port.
+
+    Args:
+        directory: Directory served as the document root
+        delay: Seconds to sleep before answering each request (simulates latency)
+        connect_delay: Seconds to sleep once per new TCP connection (simulates
+                       TCP/TLS handshake cost)
+    """
+
+    def __init__(self, directory: str, delay: float = 0.0, connect_delay: float = 0.0):
+        self.directory = os.path.abspath(directory)
+        self.delay = delay
+        self.connect_delay = connect_delay
+        self.request_log = []
+        self.headers_log = []
+        self.connections = set()
+        self.scripted = {}
+        self.lock = threading.Lock()
+        self._httpd = None
+        self._thread = None
+
+    def start(self) -> "LocalServer":
+        handler = functools.partial(_QuietHandler, directory=self.directory)
+        self._httpd = ThreadingHTTPServer(("127.0.0.1", 0), handler)
+        self._httpd.daemon_threads = True
+        self._httpd.owner = self
+        self._thread = threading.Thread(target=self._httpd.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        if self._httpd is not None:
+            self._httpd.shutdown()
+            self._httpd.server_close()
+            self._httpd = None
+
+    def script(self, path: str, status: int, headers: dict = None, body: bytes = b"") -> None:
+        """Queue a canned response for the next request to path."""
+        with self.lock:
+            self.scripted.setdefault(path, []).append((status, headers or {}, body))
+
+    @property
+    def base_url(self) -> str:
+        host, port = self._httpd.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def url(self, path: str) -> str:
+        """Absolute URL for a path relative to the served directory."""
+        return f"{self.base_url}/{path.lstrip('/')}"
+
+    def __enter__(self) -> "LocalServer":
+        return self.start()
+
+    def __exit__(self, *exc) -> None:
+        self.stop()
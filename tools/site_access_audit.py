@@ -14,11 +14,21 @@ import json
 import os
 import re
 import sys
-import urllib.request
 from typing import Dict, List, Optional
-from urllib.error import HTTPError, URLError
 from urllib.parse import urlparse
 
+import requests
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from data_scraper.domain_scheduler import (
+    DomainScheduler,
+    interleave_by_domain,
+    retry_after_from_error,
+)
+from data_scraper.http_client import http_get
+from data_scraper.retry_policy import RetryPolicy
+
 
 # ============================================================
 # Seed Collection
@@ -69,13 +79,19 @@ def collect_seeds() -> List[Dict]:
 # URL Probing
 # ============================================================
 
-def probe_url(seed: Dict, save_html: bool = False) -> Dict:
+def probe_url(seed: Dict, save_html: bool = False,
+              scheduler: Optional[DomainScheduler] = None,
+              retry: Optional[RetryPolicy] = None) -> Dict:
     """
     Probe a single URL to check accessibility and bot protection.
     
     Args:
         seed: Dict with kind, source, url, etc.
         save_html: Whether to save HTML sample on success
+        scheduler: Optional per-domain politeness scheduler; the probe waits
+                   for its domain's slot, and Retry-After pauses the domain
+        retry: Optional retry policy; timeouts and 5xx/429 responses are
+               retried with backoff before the probe reports them
     
     Returns:
         Dict with status_code, error, suspected_bot_protection, html_sample_path, etc.
@@ -98,67 +114,77 @@ def probe_url(seed: Dict, save_html: bool = False) -> Dict:
         "html_length": 0,
     }
     
+    def fetch():
+        # Shared pooled session (realistic User-Agent/Accept headers included);
+        # the domain slot is held per attempt, not during retry backoffs
+        if scheduler is not None:
+            scheduler.acquire(url)
+        try:
+            response = http_get(url, timeout=10)
+            response.raise_for_status()
+            return response
+        finally:
+            if scheduler is not None:
+                scheduler.release(url)
+    
     try:
-        # Realistic User-Agent
-        req = urllib.request.Request(
-            url,
-            headers={
-                'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36',
-                'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,*/*;q=0.8',
-                'Accept-Language': 'en-US,en;q=0.9',
-            }
-        )
+        response = fetch() if retry is None else retry.call(fetch, url)
         
-        with urllib.request.urlopen(req, timeout=10) as response:
-            result["status_code"] = response.status
-            html = response.read().decode('utf-8', errors='replace')
-            result["html_length"] = len(html)
-            
-            # Check for bot protection signatures
-            bot_signatures = [
-                "cloudflare",
-                "attention required",
-                "enable javascript",
-                "captcha",
-                "access denied",
-                "bot protection",
-                "please verify you are a human",
-            ]
+        result["status_code"] = response.status_code
+        html = response.content.decode('utf-8', errors='replace')
+        result["html_length"] = len(html)
+        
+        # Check for bot protection signatures
+        bot_signatures = [
+            "cloudflare",
+            "attention required",
+            "enable javascript",
+            "captcha",
+            "access denied",
+            "bot protection",
+            "please verify you are a human",
+        ]
+        
+        html_lower = html.lower()
+        for sig in bot_signatures:
+            if sig in html_lower:
+                result["suspected_bot_protection"] = True
+                break
+        
+        # Check for JS-only sites (very short HTML with minimal content)
+        if len(html) < 5000 and "<noscript>" in html_lower:
+            result["suspected_bot_protection"] = True
+        
+        # Save HTML sample if requested and no bot protection
+        if save_html and not result["suspected_bot_protection"]:
+            sample_dir = f"artifacts/site_html_samples/{seed['kind']}/{domain}"
+            os.makedirs(sample_dir, exist_ok=True)
             
-            html_lower = html.lower()
-            for sig in bot_signatures:
-                if sig in html_lower:
-                    result["suspected_bot_protection"] = True
-                    break
+            filename = f"{seed['source']}_{seed['page_type']}.html"
+            filepath = os.path.join(sample_dir, filename)
             
-            # Check for JS-only sites (very short HTML with minimal content)
-            if len(html) < 5000 and "<noscript>" in html_lower:
-                result["suspected_bot_protection"] = True
+            with open(filepath, "w", encoding="utf-8") as f:
+                f.write(html)
             
-            # Save HTML sample if requested and no bot protection
-            if save_html and not result["suspected_bot_protection"]:
-                sample_dir = f"artifacts/site_html_samples/{seed['kind']}/{domain}"
-                os.makedirs(sample_dir, exist_ok=True)
-                
-                filename = f"{seed['source']}_{seed['page_type']}.html"
-                filepath = os.path.join(sample_dir, filename)
-                
-                with open(filepath, "w", encoding="utf-8") as f:
-                    f.write(html)
-                
-                result["html_sample_path"] = filepath
-                result["_html_content"] = html  # For field analysis
+            result["html_sample_path"] = filepath
+            result["_html_content"] = html  # For field analysis
     
-    except HTTPError as e:
-        result["status_code"] = e.code
-        result["error"] = f"HTTP {e.code}: {e.reason}"
+    except requests.HTTPError as e:
+        code = e.response.status_code
+        result["status_code"] = code
+        result["error"] = f"HTTP {code}: {e.response.reason}"
         
         # 403/503 typically indicates bot protection
-        if e.code in [403, 503]:
+        if code in [403, 503]:
             result["suspected_bot_protection"] = True
+        
+        # Honour Retry-After (429/503) for the next requests to this domain
+        retry_after = retry_after_from_error(e)
+        if scheduler is not None and retry_after:
+            scheduler.defer(url, retry_after)
     
-    except URLError as e:
-        result["error"] = f"URL Error: {e.reason}"
+    except requests.RequestException as e:
+        result["error"] = f"URL Error: {e}"
     
     except Exception as e:
         result["error"] = f"Exception: {type(e).__name__}: {str(e)}"
@@ -380,12 +406,19 @@ def _detect_vehicle_fields(html: str, html_lower: str) -> Dict[str, bool]:
 # Main Audit Orchestration
 # ============================================================
 
-def run_audit(save_html: bool = True) -> Dict:
+def run_audit(save_html: bool = True,
+              scheduler: Optional[DomainScheduler] = None,
+              retry: Optional[RetryPolicy] = None) -> Dict:
     """
     Run full site access audit.
     
+    Seeds are probed round-robin across domains under a per-domain politeness
+    scheduler, so no site sees bursts of requests; results keep seed order.
+    
     Args:
         save_html: Whether to save HTML samples for accessible sites
+        scheduler: Politeness scheduler (default: DomainScheduler())
+        retry: Retry policy of the probes (default: RetryPolicy())
     
     Returns:
         Dict with audit results
@@ -412,11 +445,17 @@ def run_audit(save_html: bool = True) -> Dict:
     
     # Step 2: Probe all URLs
     print("\n[STEP 2] Probing URLs for accessibility...")
+    if scheduler is None:
+        scheduler = DomainScheduler()
+    if retry is None:
+        retry = RetryPolicy()
     results = []
+    probe_order = interleave_by_domain(range(len(seeds)), key=lambda i: seeds[i]["url"])
     
-    for i, seed in enumerate(seeds, 1):
+    for i, seed_index in enumerate(probe_order, 1):
+        seed = seeds[seed_index]
         print(f"\n  [{i}/{len(seeds)}] {seed['kind']}/{seed['source']}: {seed['url']}")
-        result = probe_url(seed, save_html=save_html)
+        result = probe_url(seed, save_html=save_html, scheduler=scheduler, retry=retry)
         
         # Print status
         if result["status_code"] == 200:
@@ -431,7 +470,14 @@ def run_audit(save_html: bool = True) -> Dict:
         else:
             print(f"    -> ERROR: {result['error']}")
         
-        results.append(result)
+        results.append((seed_index, result))
+    
+    # Restore seed order for the reports
+    results = [result for _, result in sorted(results, key=lambda r: r[0])]
+    print("\n  Per-domain politeness stats:")
+    scheduler.print_stats()
+    r = retry.stats
+    print(f"  Retries: {r['retries']}, {r['recovered']} probes recovered, {r['exhausted']} gave up")
     
     # Step 3: Analyze HTML fields for accessible sites
     print("\n[STEP 3] Analyzing HTML for field availability...")